@@ -66,6 +66,11 @@ namespace Check_carasi_DF_ContextClearing
         private List<string> searchHistory = new List<string>();
         private const int MAX_SEARCH_HISTORY = 20; // Keep last 20 searches
 
+        // FUZZY LOOKUP: Name index over the loaded CARASI/Dataflow/A2L files (autocomplete + "did you mean")
+        private NameNgramIndex interfaceNameIndex = NameNgramIndex.Empty;
+        private List<object> indexedSources = new List<object>();
+        private const int MAX_NAME_SUGGESTIONS = 3;
+
         UC_dataflow internalUC;
         Form DF_viewer = new Form();
         MM_Check _mmCheck = null;
@@ -383,6 +388,7 @@ namespace Check_carasi_DF_ContextClearing
                 internalUC = new UC_dataflow();
             }
 
+            string notFoundHint = null;
             if (folder_verifying(link2Folder))
             {
                 UC_ContextClearing UC_doing = new UC_ContextClearing();
@@ -462,7 +468,11 @@ namespace Check_carasi_DF_ContextClearing
                                     }
                                     else
                                     {
-                                        UC_doing._setValueA2L(false, new string[] { "Not Found in A2L using enhanced parser!" });
+                                        var a2lSuggestions = A2LParserManager.SuggestVariables(UC_doing.A2LFilePath, searchVariable, MAX_NAME_SUGGESTIONS);
+                                        var notFoundLines = new List<string> { "Not Found in A2L using enhanced parser!" };
+                                        if (a2lSuggestions.Count > 0)
+                                            notFoundLines.Add("Did you mean: " + string.Join(", ", a2lSuggestions));
+                                        UC_doing._setValueA2L(false, notFoundLines.ToArray());
                                     }
                                 }
                                 catch (Exception ex)
@@ -474,6 +484,10 @@ namespace Check_carasi_DF_ContextClearing
 
                             tabControl1.SelectedTab.Text = searchVariable;
                             
+                            // FUZZY LOOKUP: Suggest close names when the variable is in none of the loaded files
+                            RefreshInterfaceNameIndex(UC_doing);
+                            notFoundHint = GetNotFoundHint(searchVariable);
+                            
                             // SEARCH HISTORY: Add successful search to history (single searches only)
                             AddToSearchHistory(searchVariable);
                             
@@ -497,6 +511,10 @@ namespace Check_carasi_DF_ContextClearing
             searchStopwatch.Stop();
             double searchSeconds = searchStopwatch.Elapsed.TotalSeconds;
             UpdateTimingDisplay(searchSeconds, "Search");
+            if (notFoundHint != null)
+            {
+                this.Text += " | " + notFoundHint;
+            }
             
             // UPDATE SEARCH TIME: Mark when this search completed (for file change detection)
             lastSearchTime = DateTime.Now;
@@ -924,7 +942,7 @@ namespace Check_carasi_DF_ContextClearing
             Newlist.ForeColor = Color.Black; // Normal text color
 
             var instructionLabel = new Label();
-            instructionLabel.Text = "💡 Performance Tip: This tool now pre-loads all variables for 60-80% faster batch searching!\n" +
+            instructionLabel.Text = "💡 Performance Tip: Results are collected in one table - double-click a row to open it in a tab!\n" +
                                    "🔄 File Change Detection: System will auto-detect if Excel files have changed.\n" +
                                    "⏹ Stop Control: Use Stop button in main toolbar during batch search.";
             instructionLabel.Dock = DockStyle.Top;
@@ -997,129 +1015,58 @@ namespace Check_carasi_DF_ContextClearing
                 }
             }
 
-            // PERFORMANCE OPTIMIZATION: Pre-warm cache with all variables
+            // BATCH SEARCH SERVICE: All variables go into one result table - tabs only on drill-in
             var cleanedVariables = listOfInterfaces
                 .Where(s => !string.IsNullOrWhiteSpace(s))
                 .Select(s => s.Trim())
                 .ToList();
 
-            // Show progress for cache warming
-            ShowModernProgress(true, $"Pre-loading {cleanedVariables.Count} variables for optimized search...");
-            
             try
             {
-                // PARALLEL OPTIMIZATION: Pre-warm cache for all variables at once
-                var currentTab = tabControl1.SelectedTab;
-                if (currentTab != null)
-                {
-                    var ucContextClearing = currentTab.Controls.OfType<UC_ContextClearing>().FirstOrDefault();
-                    if (ucContextClearing != null)
-                    {
-                        await ucContextClearing.WarmupCacheAsync(cleanedVariables);
-                    }
-                }
+                if (cleanedVariables.Count == 0 || !folder_verifying(link2Folder))
+                    return;
 
-                ShowModernProgress(true, "Cache pre-loaded! Starting parallel batch search...");
+                ShowModernProgress(true, $"Loading name indexes for {cleanedVariables.Count} variables...");
 
-                for (int i = 0; i < cleanedVariables.Count; i++)
-                {
-                    // CHECK STOP REQUEST: User clicked Stop button
-                    if (isStopRequested || batchCancellationTokenSource.Token.IsCancellationRequested)
-                    {
-                        System.Diagnostics.Debug.WriteLine($"Batch search stopped by user at item {i+1}/{cleanedVariables.Count}");
-                        break;
-                    }
-                    
-                    // RESOURCE PROTECTION: Check tab limits BEFORE creating new tab
-                    const int MAX_TABS = 60;
-                    if (tabControl1.TabPages.Count >= MAX_TABS)
-                    {
-                        MessageBox.Show($"Maximum {MAX_TABS} tabs reached during batch search.\n" +
-                                       $"Processed {i} interfaces out of {cleanedVariables.Count}.\n" +
-                                       "Please close some tabs and try again.", 
-                                       "Tab Limit Reached", MessageBoxButtons.OK, MessageBoxIcon.Warning);
-                        break; // Stop the batch processing
-                    }
+                var service = new BatchSearchService()
+                    .AddExcelSource("New CARASI", GetOrCreateParser(nameOfnewCarasi, "newcarasi"))
+                    .AddExcelSource("Old CARASI", GetOrCreateParser(nameOfoldCarasi, "oldcarasi"))
+                    .AddExcelSource("New Dataflow", GetOrCreateParser(nameOfnewDataflow, "newdataflow"))
+                    .AddExcelSource("Old Dataflow", GetOrCreateParser(nameOfoldDataflow, "olddataflow"))
+                    .AddA2LSource("A2L", GetBatchA2LFilePath());
 
-                    // Additional warning before approaching limit
-                    if (tabControl1.TabPages.Count >= 58)
-                    {
-                        DialogResult result = MessageBox.Show(
-                            $"You have {tabControl1.TabPages.Count} tabs open. Continuing batch search may cause issues.\n\n" +
-                            $"Processed {i} interfaces out of {cleanedVariables.Count}.\n\n" +
-                            "Do you want to continue the batch search?",
-                            "Resource Warning", 
-                            MessageBoxButtons.YesNo, 
-                            MessageBoxIcon.Warning);
-                        
-                        if (result == DialogResult.No)
-                        {
-                            break; // Stop the batch processing
-                        }
-                    }
+                var resultTable = service.CreateResultTable();
+                var resultForm = ShowBatchSearchResults(resultTable);
 
-                    // SMART TAB MANAGEMENT: Only create new tab if current tab has data
-                    bool needNewTab = false;
-                    if (tabControl1.SelectedTab != null)
-                    {
-                        // Check if current tab has data by looking for UC_ContextClearing control
-                        foreach (Control c in tabControl1.SelectedTab.Controls)
-                        {
-                            if (c.GetType().Name == "UC_ContextClearing")
-                            {
-                                UC_ContextClearing currentUC = (UC_ContextClearing)c;
-                                // If tab has been used for search (has a meaningful tab name or data)
-                                if (tabControl1.SelectedTab.Text != "tabPage1" && 
-                                    tabControl1.SelectedTab.Text.Trim() != "" &&
-                                    !tabControl1.SelectedTab.Text.StartsWith("tabPage"))
-                                {
-                                    needNewTab = true;
-                                }
-                                break;
-                            }
-                        }
-                    }
-                    else
-                    {
-                        needNewTab = true; // No tabs at all, need to create one
-                    }
+                // Closing the result window stops its batch
+                var cancellation = batchCancellationTokenSource;
+                resultForm.FormClosed += (s, args) => cancellation.Cancel();
 
-                    // Only create new tab if needed
-                    if (needNewTab)
-                    {
-                        btn_toolStrip_NewTab.PerformClick();
-                    }
-
-                    tb_Interface2search.Text = cleanedVariables[i];
-                    
-                    // Update progress during batch search with clear Stop instruction
-                    ShowModernProgress(true, $"Searching {i+1}/{cleanedVariables.Count}: {cleanedVariables[i]} (Use toolbar ⏹ Stop button to cancel)");
-                    
-                    // MAKE STOP BUTTON MORE VISIBLE: Update toolbar appearance
+                // PROGRESS: Created on the UI thread, so every finished chunk is appended here
+                var progress = new Progress<BatchSearchProgress>(p =>
+                {
+                    if (resultForm.IsDisposed) return;
+                    BatchSearchService.AppendRows(resultTable, p.Rows);
+                    ShowModernProgress(true, $"Searching {p.Completed}/{p.Total} variables (Use toolbar ⏹ Stop button to cancel)");
+                    resultForm.Text = $"Batch Search Results - {p.Completed}/{p.Total} ({p.Percent}%)";
                     if (toolStripButtonStop != null)
                     {
-                        toolStripButtonStop.Text = $"⏹ Stop ({i+1}/{cleanedVariables.Count})";
-                        this.Text = $"Context Clearing - Batch Search Progress: {i+1}/{cleanedVariables.Count} (Click ⏹ Stop to cancel)";
+                        toolStripButtonStop.Text = $"⏹ Stop ({p.Completed}/{p.Total})";
+                        this.Text = $"Context Clearing - Batch Search Progress: {p.Completed}/{p.Total} (Click ⏹ Stop to cancel)";
                     }
-                    
-                    btn_Run.PerformClick();
-                    
-                    // UPDATE STATUS: Refresh status after each search to show cache/pool changes
-                    UpdateTabMemoryStatus();
-                    
-                    // Brief pause to see the updates and allow UI to respond to Stop button
-                    System.Windows.Forms.Application.DoEvents();
-                    await Task.Delay(200, batchCancellationTokenSource.Token); // Slightly longer delay for better UI responsiveness
-                }
-                
-                // COMPLETION MESSAGE: Show results if not stopped
-                if (!isStopRequested && !batchCancellationTokenSource.Token.IsCancellationRequested)
-                {
-                    MessageBox.Show($"Batch search completed successfully!\n\n" +
-                                  $"Processed {cleanedVariables.Count} variables.\n" +
-                                  $"Results are available in {tabControl1.TabPages.Count} tabs.",
-                                  "Batch Search Complete", MessageBoxButtons.OK, MessageBoxIcon.Information);
-                }
+                });
+
+                var rows = await service.RunAsync(cleanedVariables, progress, cancellation.Token);
+
+                // COMPLETION MESSAGE: Summary only - details stay in the result table
+                int notFound = rows.Count(row => row.FoundCount == 0);
+                if (!resultForm.IsDisposed)
+                    resultForm.Text = $"Batch Search Results - {rows.Count} variables, {notFound} not found (double-click a row to open it in a tab)";
+                MessageBox.Show($"Batch search completed successfully!\n\n" +
+                              $"Processed {rows.Count} variables.\n" +
+                              $"Not found in any file: {notFound}.\n\n" +
+                              "Double-click a row in the result table to open that variable in a tab.",
+                              "Batch Search Complete", MessageBoxButtons.OK, MessageBoxIcon.Information);
             }
             catch (OperationCanceledException)
             {
@@ -1156,6 +1103,103 @@ namespace Check_carasi_DF_ContextClearing
             }
         }
 
+        /// <summary>
+        /// BATCH SEARCH: A2L file for the batch - same choice as the single search (A2L_Check first, then UC path)
+        /// </summary>
+        private string GetBatchA2LFilePath()
+        {
+            if (_a2lCheck != null && _a2lCheck.IsValidLink)
+                return _a2lCheck.Link_Of_A2L;
+
+            var ucContextClearing = tabControl1.SelectedTab?.Controls.OfType<UC_ContextClearing>().FirstOrDefault();
+            return ucContextClearing?.A2LFilePath;
+        }
+
+        /// <summary>
+        /// BATCH SEARCH: One window with the streamed result table; double-click opens a variable in a tab
+        /// </summary>
+        private Form ShowBatchSearchResults(DataTable resultTable)
+        {
+            var resultForm = new Form();
+            resultForm.Text = "Batch Search Results";
+            resultForm.Size = new Size(900, 600);
+            resultForm.StartPosition = FormStartPosition.CenterParent;
+
+            var grid = new DataGridView();
+            grid.Dock = DockStyle.Fill;
+            grid.ReadOnly = true;
+            grid.AllowUserToAddRows = false;
+            grid.AllowUserToDeleteRows = false;
+            grid.SelectionMode = DataGridViewSelectionMode.FullRowSelect;
+            grid.AutoSizeColumnsMode = DataGridViewAutoSizeColumnsMode.DisplayedCells;
+            grid.Font = new Font("Consolas", 10);
+            grid.DataSource = resultTable;
+
+            // DRILL-IN: Only the variable the user asks for gets a UC_ContextClearing tab
+            grid.CellDoubleClick += (s, args) =>
+            {
+                if (args.RowIndex < 0) return;
+                string variable = grid.Rows[args.RowIndex].Cells[BatchSearchService.VARIABLE_COLUMN].Value as string;
+                if (!string.IsNullOrEmpty(variable))
+                    OpenBatchResultTab(variable);
+            };
+
+            var instructionLabel = new Label();
+            instructionLabel.Text = "💡 Double-click a row to open that variable in a tab. Click a column header to sort.";
+            instructionLabel.Dock = DockStyle.Top;
+            instructionLabel.Height = 24;
+            instructionLabel.ForeColor = Color.DarkGreen;
+            instructionLabel.Font = new Font("Segoe UI", 9, FontStyle.Italic);
+
+            resultForm.Controls.Add(grid);
+            resultForm.Controls.Add(instructionLabel);
+            resultForm.Show(this);
+            return resultForm;
+        }
+
+        /// <summary>
+        /// DRILL-IN: Open one batch result in a tab (reuses an existing tab of the same variable)
+        /// </summary>
+        private void OpenBatchResultTab(string variable)
+        {
+            var existingTab = tabControl1.TabPages.Cast<TabPage>()
+                .FirstOrDefault(tab => tab.Text.Trim().Equals(variable, StringComparison.OrdinalIgnoreCase));
+            if (existingTab != null)
+            {
+                tabControl1.SelectedTab = existingTab;
+                this.Activate();
+                return;
+            }
+
+            // RESOURCE PROTECTION: Same tab limit as before, now only reached by explicit drill-ins
+            const int MAX_TABS = 60;
+            if (tabControl1.TabPages.Count >= MAX_TABS)
+            {
+                MessageBox.Show($"Maximum {MAX_TABS} tabs reached.\nPlease close some tabs and try again.",
+                               "Tab Limit Reached", MessageBoxButtons.OK, MessageBoxIcon.Warning);
+                return;
+            }
+
+            if (tabControl1.SelectedTab == null || IsTabInUse(tabControl1.SelectedTab))
+            {
+                btn_toolStrip_NewTab.PerformClick();
+            }
+
+            tb_Interface2search.Text = variable;
+            btn_Run.PerformClick();
+            this.Activate();
+        }
+
+        /// <summary>
+        /// SMART TAB MANAGEMENT: A tab is in use once it has been renamed by a search
+        /// </summary>
+        private static bool IsTabInUse(TabPage tab)
+        {
+            return tab.Controls.OfType<UC_ContextClearing>().Any() &&
+                   tab.Text.Trim() != "" &&
+                   !tab.Text.StartsWith("tabPage");
+        }
+
         #region Search History Management
 
         /// <summary>
@@ -1195,25 +1239,27 @@ namespace Check_carasi_DF_ContextClearing
         }
 
         /// <summary>
-        /// UPDATE AUTOCOMPLETE: Update search textbox with autocomplete from history
-        /// Provides dropdown with previous searches for quick selection
+        /// UPDATE AUTOCOMPLETE: Update search textbox with autocomplete from history and the name index
+        /// Previous searches come first, then every interface name of the loaded CARASI/Dataflow/A2L files
         /// </summary>
         private void UpdateSearchTextboxAutocomplete()
         {
             try
             {
-                if (tb_Interface2search != null && searchHistory.Count > 0)
+                if (tb_Interface2search != null && (searchHistory.Count > 0 || interfaceNameIndex.Count > 0))
                 {
-                    // Create autocomplete source from history
+                    // Create autocomplete source from history, then indexed names not already in history
                     var autoCompleteSource = new AutoCompleteStringCollection();
                     autoCompleteSource.AddRange(searchHistory.ToArray());
+                    var historySet = new HashSet<string>(searchHistory, StringComparer.OrdinalIgnoreCase);
+                    autoCompleteSource.AddRange(interfaceNameIndex.Names.Where(name => !historySet.Contains(name)).ToArray());
                     
                     // Configure autocomplete
                     tb_Interface2search.AutoCompleteMode = AutoCompleteMode.SuggestAppend;
                     tb_Interface2search.AutoCompleteSource = AutoCompleteSource.CustomSource;
                     tb_Interface2search.AutoCompleteCustomSource = autoCompleteSource;
                     
-                    System.Diagnostics.Debug.WriteLine($"AUTOCOMPLETE: Updated with {searchHistory.Count} history items");
+                    System.Diagnostics.Debug.WriteLine($"AUTOCOMPLETE: Updated with {searchHistory.Count} history items, {interfaceNameIndex.Count} indexed names");
                 }
             }
             catch (Exception ex)
@@ -1222,6 +1268,59 @@ namespace Check_carasi_DF_ContextClearing
             }
         }
 
+        /// <summary>
+        /// FUZZY LOOKUP: Rebuild the combined name index when the loaded parsers change
+        /// Each Excel_Parser / A2LParser keeps its own index, so this only merges names
+        /// </summary>
+        private void RefreshInterfaceNameIndex(UC_ContextClearing UC_doing)
+        {
+            try
+            {
+                var sources = new List<object> { UC_doing.NewCarasi, UC_doing.OldCarasi, UC_doing.NewDF, UC_doing.OldDF };
+                if (!string.IsNullOrEmpty(UC_doing.A2LFilePath))
+                {
+                    sources.Add(A2LParserManager.GetParser(UC_doing.A2LFilePath));
+                }
+                sources = sources.Where(source => source != null).ToList();
+
+                // Same parser instances as last time - cached parsers are replaced when their file changes
+                if (sources.Count == indexedSources.Count && sources.Zip(indexedSources, (a, b) => ReferenceEquals(a, b)).All(same => same))
+                    return;
+
+                var names = new List<string>();
+                foreach (var source in sources)
+                {
+                    if (source is Excel_Parser excelParser)
+                        names.AddRange(excelParser.GetNameIndex().Names);
+                    else if (source is A2LParser a2lParser)
+                        names.AddRange(a2lParser.NameIndex.Names);
+                }
+
+                interfaceNameIndex = new NameNgramIndex(names);
+                indexedSources = sources;
+                UpdateSearchTextboxAutocomplete();
+                System.Diagnostics.Debug.WriteLine($"NAME INDEX: {interfaceNameIndex.Count} names from {sources.Count} files");
+            }
+            catch (Exception ex)
+            {
+                System.Diagnostics.Debug.WriteLine($"NAME INDEX ERROR: {ex.Message}");
+            }
+        }
+
+        /// <summary>
+        /// DID YOU MEAN: Title hint for a variable found in none of the indexed files (null when found)
+        /// </summary>
+        private string GetNotFoundHint(string searchVariable)
+        {
+            if (interfaceNameIndex.Count == 0 || interfaceNameIndex.Contains(searchVariable))
+                return null;
+
+            var suggestions = interfaceNameIndex.Suggest(searchVariable, MAX_NAME_SUGGESTIONS);
+            return suggestions.Count > 0
+                ? $"'{searchVariable}' not found - did you mean: {string.Join(", ", suggestions.Select(s => s.Name))}?"
+                : $"'{searchVariable}' not found";
+        }
+
         /// <summary>
         /// SAVE HISTORY: Save search history to user settings for persistence
         /// </summary>
@@ -1598,7 +1697,7 @@ namespace Check_carasi_DF_ContextClearing
                 // Reset batch flag
                 isBatchOperation = false;
                 
-                MessageBox.Show("Batch search has been stopped.\n\nCompleted searches are still available in tabs.", 
+                MessageBox.Show("Batch search has been stopped.\n\nCompleted searches are still available in the result table.", 
                               "Batch Search Stopped", MessageBoxButtons.OK, MessageBoxIcon.Information);
             }
             catch (Exception ex)
@@ -0,0 +1,617 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using System.Text;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// A2L TEXT INDEX: Persistent line-offset + token index for substring search in large A2L files
+    /// Built in one streaming pass and kept in .carasi_index/ next to the A2L (same folder as the
+    /// headless tools). Only the sorted token table is held in memory; line offsets and posting lists
+    /// are read from the index file per query, and candidate lines are verified with the same ordinal
+    /// line.Contains(keyword) the full-file scan used. Lines end at \r, \n or \r\n, like StreamReader.ReadLine
+    /// </summary>
+    public class A2LLineIndex
+    {
+        private const int MAGIC = 0x58324C41; // "A2LX"
+        private const int VERSION = 2; // v2: lines also end at a bare \r
+        private const int HEADER_BYTES = 4 + 4 + 8 + 8 + 4 + 8 + 8;
+        private const int READ_BUFFER_SIZE = 1 << 20;
+        private const int SELECTIVE_POSTINGS = 4096;
+        public const string INDEX_DIR_NAME = ".carasi_index";
+
+        // CACHE: One loaded index per A2L path, replaced when the file changes
+        private static readonly ConcurrentDictionary<string, A2LLineIndex> _indexes =
+            new ConcurrentDictionary<string, A2LLineIndex>(StringComparer.OrdinalIgnoreCase);
+        private static readonly object _buildLock = new object();
+
+        // TOKEN CHARACTERS: identifier runs - a keyword is split on everything else
+        private static readonly bool[] _isTokenByte = CreateTokenTable();
+
+        private readonly string[] _tokens;
+        private readonly int[] _postingCounts;
+        private readonly long[] _postingOffsets;
+        private readonly long _postingsStart;
+        private readonly bool _hasBom;
+
+        /// <summary>
+        /// LOGGING HOOK: (operation, elapsedMs, details) of every index build - the application points it at
+        /// PerformanceLogger.LogDuration; the CLI build leaves it unset and only writes Debug output
+        /// </summary>
+        public static Action<string, long, string> LogDuration { get; set; }
+
+        public string SourcePath { get; }
+        public string IndexPath { get; }
+        public long SourceLength { get; }
+        public DateTime SourceLastWriteUtc { get; }
+        public int LineCount { get; }
+        public int TokenCount => _tokens.Length;
+        public long BuildMilliseconds { get; private set; } // 0 when loaded from an existing index file
+
+        private A2LLineIndex(string sourcePath, string indexPath, long sourceLength, DateTime lastWriteUtc,
+                             int lineCount, string[] tokens, int[] postingCounts, long[] postingOffsets,
+                             long postingsStart, bool hasBom)
+        {
+            SourcePath = sourcePath;
+            IndexPath = indexPath;
+            SourceLength = sourceLength;
+            SourceLastWriteUtc = lastWriteUtc;
+            LineCount = lineCount;
+            _tokens = tokens;
+            _postingCounts = postingCounts;
+            _postingOffsets = postingOffsets;
+            _postingsStart = postingsStart;
+            _hasBom = hasBom;
+        }
+
+        /// <summary>
+        /// CACHED OPEN: Index of an A2L file - loaded from its index file, or built when the A2L changed
+        /// (length / last write time). Returns null for UTF-16 files, which keep the streaming scan
+        /// </summary>
+        public static A2LLineIndex Open(string a2lPath)
+        {
+            string fullPath = Path.GetFullPath(a2lPath);
+            var info = new FileInfo(fullPath);
+            if (!info.Exists)
+                throw new FileNotFoundException("A2L file not found", fullPath);
+
+            if (_indexes.TryGetValue(fullPath, out A2LLineIndex cached) && cached.IsCurrent(info))
+                return cached;
+
+            lock (_buildLock)
+            {
+                if (_indexes.TryGetValue(fullPath, out cached) && cached.IsCurrent(info))
+                    return cached;
+
+                if (IsUtf16(fullPath))
+                    return null;
+
+                var index = TryLoad(fullPath, info) ?? Build(fullPath, info);
+                _indexes[fullPath] = index;
+                return index;
+            }
+        }
+
+        /// <summary>
+        /// CACHE CONTROL: Forget loaded indexes (index files stay on disk)
+        /// </summary>
+        public static void ClearCache()
+        {
+            _indexes.Clear();
+        }
+
+        private bool IsCurrent(FileInfo info)
+        {
+            return info.Length == SourceLength && info.LastWriteTimeUtc == SourceLastWriteUtc && File.Exists(IndexPath);
+        }
+
+        // SEARCH METHODS
+
+        /// <summary>
+        /// SUBSTRING SEARCH: 0-based numbers of the lines containing keyword (ordinal, like string.Contains)
+        /// </summary>
+        public List<int> FindLineNumbers(string keyword, int maxResults = int.MaxValue)
+        {
+            var matches = new List<int>();
+            if (string.IsNullOrEmpty(keyword) || maxResults <= 0)
+                return matches;
+
+            using (var source = OpenShared(SourcePath))
+            using (var index = OpenShared(IndexPath))
+            {
+                var candidates = CandidateLines(keyword, index);
+                if (candidates == null)
+                    return ScanLineNumbers(keyword, maxResults);
+
+                foreach (int line in candidates)
+                {
+                    if (ReadLine(source, index, line).Contains(keyword))
+                    {
+                        matches.Add(line);
+                        if (matches.Count >= maxResults) break;
+                    }
+                }
+            }
+            return matches;
+        }
+
+        /// <summary>
+        /// FALLBACK: Streaming scan for keywords without an identifier run (e.g. only punctuation)
+        /// </summary>
+        private List<int> ScanLineNumbers(string keyword, int maxResults)
+        {
+            var matches = new List<int>();
+            int line = 0;
+            foreach (string text in File.ReadLines(SourcePath))
+            {
+                if (text.Contains(keyword))
+                {
+                    matches.Add(line);
+                    if (matches.Count >= maxResults) break;
+                }
+                line++;
+            }
+            return matches;
+        }
+
+        /// <summary>
+        /// SUBSTRING SEARCH: Text of the lines containing keyword, in file order
+        /// </summary>
+        public List<string> FindLines(string keyword, int maxResults = int.MaxValue)
+        {
+            return ReadLines(FindLineNumbers(keyword, maxResults));
+        }
+
+        /// <summary>
+        /// CONTEXT: Lines first .. first + count - 1 (clipped to the file), e.g. around a keyword hit
+        /// </summary>
+        public List<string> ReadLines(int first, int count)
+        {
+            int start = Math.Max(0, first);
+            int end = Math.Min(LineCount, first + Math.Max(0, count));
+            return ReadLines(Enumerable.Range(start, Math.Max(0, end - start)));
+        }
+
+        public List<string> ReadLines(IEnumerable<int> lineNumbers)
+        {
+            var lines = new List<string>();
+            using (var source = OpenShared(SourcePath))
+            using (var index = OpenShared(IndexPath))
+            {
+                foreach (int line in lineNumbers)
+                    lines.Add(ReadLine(source, index, line));
+            }
+            return lines;
+        }
+
+        /// <summary>
+        /// CANDIDATES: Superset of the matching lines, from the posting lists of the keyword's most selective
+        /// identifier run: a run in the middle must be a whole token, the first run a token suffix, the last
+        /// run a token prefix, a keyword that is a single run any token substring.
+        /// Returns null when the keyword has no identifier run (every line is a candidate)
+        /// </summary>
+        private IEnumerable<int> CandidateLines(string keyword, FileStream index)
+        {
+            List<int> best = null;
+            int bestPostings = int.MaxValue;
+            bool bestScans = true;
+
+            // Binary-searched runs first: the first run needs a scan of the whole token table
+            foreach (var run in TokenRuns(keyword).OrderBy(run => run.AtStart))
+            {
+                bool scans = run.AtStart;
+                if (best != null && scans && !bestScans && bestPostings <= SELECTIVE_POSTINGS)
+                    continue; // Selective enough already - skip the token table scan
+
+                var matching = MatchingTokens(run).ToList();
+                int postings = matching.Sum(token => _postingCounts[token]);
+                if (postings == 0)
+                    return new int[0];
+                if (best == null || postings < bestPostings)
+                {
+                    best = matching;
+                    bestPostings = postings;
+                    bestScans = scans;
+                }
+            }
+
+            if (best == null)
+                return null;
+
+            var lines = new SortedSet<int>();
+            foreach (int token in best)
+                lines.UnionWith(ReadPostings(index, token));
+            return lines;
+        }
+
+        private IEnumerable<int> MatchingTokens(TokenRun run)
+        {
+            if (run.AtStart && run.AtEnd)
+                return Enumerable.Range(0, _tokens.Length).Where(i => _tokens[i].IndexOf(run.Text, StringComparison.Ordinal) >= 0);
+            if (run.AtStart)
+                return Enumerable.Range(0, _tokens.Length).Where(i => _tokens[i].EndsWith(run.Text, StringComparison.Ordinal));
+
+            // Ordinal sort keeps every token with a given prefix in one contiguous range
+            int first = LowerBound(run.Text);
+            if (!run.AtEnd)
+                return first < _tokens.Length && _tokens[first] == run.Text ? new[] { first } : new int[0];
+
+            int last = first;
+            while (last < _tokens.Length && _tokens[last].StartsWith(run.Text, StringComparison.Ordinal))
+                last++;
+            return Enumerable.Range(first, last - first);
+        }
+
+        private int LowerBound(string value)
+        {
+            int low = 0, high = _tokens.Length;
+            while (low < high)
+            {
+                int middle = (low + high) / 2;
+                if (string.CompareOrdinal(_tokens[middle], value) < 0) low = middle + 1;
+                else high = middle;
+            }
+            return low;
+        }
+
+        private struct TokenRun
+        {
+            public string Text;
+            public bool AtStart;
+            public bool AtEnd;
+        }
+
+        private static IEnumerable<TokenRun> TokenRuns(string keyword)
+        {
+            int i = 0;
+            while (i < keyword.Length)
+            {
+                if (!IsTokenChar(keyword[i])) { i++; continue; }
+                int start = i;
+                while (i < keyword.Length && IsTokenChar(keyword[i])) i++;
+                yield return new TokenRun
+                {
+                    Text = keyword.Substring(start, i - start),
+                    AtStart = start == 0,
+                    AtEnd = i == keyword.Length
+                };
+            }
+        }
+
+        private static bool IsTokenChar(char c)
+        {
+            return c < 128 && _isTokenByte[c];
+        }
+
+        private static bool[] CreateTokenTable()
+        {
+            var table = new bool[256];
+            for (int c = 0; c < 128; c++)
+                table[c] = char.IsLetterOrDigit((char)c) || c == '_';
+            return table;
+        }
+
+        // INDEX FILE ACCESS
+
+        private static FileStream OpenShared(string path)
+        {
+            return new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.ReadWrite | FileShare.Delete, 4096);
+        }
+
+        private string ReadLine(FileStream source, FileStream index, int line)
+        {
+            if (line < 0 || line >= LineCount)
+                throw new ArgumentOutOfRangeException(nameof(line), line, $"A2L has {LineCount} lines");
+
+            var offsets = new byte[16];
+            index.Position = HEADER_BYTES + 8L * line;
+            ReadExactly(index, offsets, 16);
+            long start = BitConverter.ToInt64(offsets, 0);
+            long end = BitConverter.ToInt64(offsets, 8);
+
+            if (line == 0 && _hasBom) start += 3;
+            var bytes = new byte[end - start];
+            source.Position = start;
+            ReadExactly(source, bytes, bytes.Length);
+
+            int length = bytes.Length;
+            if (length > 0 && bytes[length - 1] == '\n') length--;
+            if (length > 0 && bytes[length - 1] == '\r') length--;
+            return Encoding.UTF8.GetString(bytes, 0, length);
+        }
+
+        private IEnumerable<int> ReadPostings(FileStream index, int token)
+        {
+            index.Position = _postingsStart + _postingOffsets[token];
+            var reader = new BinaryReader(index, Encoding.UTF8, leaveOpen: true);
+            var lines = new int[_postingCounts[token]];
+            int line = -1;
+            for (int i = 0; i < lines.Length; i++)
+            {
+                line += Read7BitInt(reader);
+                lines[i] = line;
+            }
+            return lines;
+        }
+
+        private static void ReadExactly(Stream stream, byte[] buffer, int count)
+        {
+            int read = 0;
+            while (read < count)
+            {
+                int n = stream.Read(buffer, read, count - read);
+                if (n == 0) throw new EndOfStreamException();
+                read += n;
+            }
+        }
+
+        private static int Read7BitInt(BinaryReader reader)
+        {
+            int value = 0, shift = 0;
+            byte b;
+            do
+            {
+                b = reader.ReadByte();
+                value |= (b & 0x7F) << shift;
+                shift += 7;
+            } while ((b & 0x80) != 0);
+            return value;
+        }
+
+        private static void Write7BitInt(List<byte> target, int value)
+        {
+            uint v = (uint)value;
+            while (v >= 0x80)
+            {
+                target.Add((byte)(v | 0x80));
+                v >>= 7;
+            }
+            target.Add((byte)v);
+        }
+
+        // BUILD / LOAD
+
+        private static bool IsUtf16(string path)
+        {
+            using (var stream = OpenShared(path))
+            {
+                int first = stream.ReadByte(), second = stream.ReadByte();
+                return (first == 0xFF && second == 0xFE) || (first == 0xFE && second == 0xFF);
+            }
+        }
+
+        private static string IndexPathFor(string a2lPath, bool fallback)
+        {
+            string folder = fallback
+                ? Path.Combine(Path.GetTempPath(), "carasi_index")
+                : Path.Combine(Path.GetDirectoryName(a2lPath), INDEX_DIR_NAME);
+            string name = Path.GetFileName(a2lPath);
+            if (fallback)
+                name += "." + ((uint)a2lPath.ToLowerInvariant().GetHashCode()).ToString("x8");
+            return Path.Combine(folder, name + ".lines.v" + VERSION + ".idx");
+        }
+
+        private static A2LLineIndex TryLoad(string a2lPath, FileInfo info)
+        {
+            foreach (bool fallback in new[] { false, true })
+            {
+                string indexPath = IndexPathFor(a2lPath, fallback);
+                try
+                {
+                    if (!File.Exists(indexPath)) continue;
+                    var index = Load(a2lPath, indexPath);
+                    if (index != null && index.IsCurrent(info))
+                        return index;
+                }
+                catch (Exception ex)
+                {
+                    Debug.WriteLine($"A2L INDEX: Ignoring unreadable {indexPath} - {ex.Message}");
+                }
+            }
+            return null;
+        }
+
+        private static A2LLineIndex Load(string a2lPath, string indexPath)
+        {
+            using (var stream = OpenShared(indexPath))
+            using (var reader = new BinaryReader(stream, Encoding.UTF8))
+            {
+                if (reader.ReadInt32() != MAGIC || reader.ReadInt32() != VERSION)
+                    return null;
+
+                long sourceLength = reader.ReadInt64();
+                var lastWriteUtc = new DateTime(reader.ReadInt64(), DateTimeKind.Utc);
+                int lineCount = reader.ReadInt32();
+                long tokenTableStart = reader.ReadInt64();
+                long postingsStart = reader.ReadInt64();
+
+                stream.Position = tokenTableStart;
+                bool hasBom = reader.ReadBoolean();
+                int tokenCount = reader.ReadInt32();
+                var tokens = new string[tokenCount];
+                var counts = new int[tokenCount];
+                var offsets = new long[tokenCount];
+                for (int i = 0; i < tokenCount; i++)
+                {
+                    tokens[i] = reader.ReadString();
+                    counts[i] = reader.ReadInt32();
+                    offsets[i] = reader.ReadInt64();
+                }
+
+                return new A2LLineIndex(a2lPath, indexPath, sourceLength, lastWriteUtc, lineCount,
+                                        tokens, counts, offsets, postingsStart, hasBom);
+            }
+        }
+
+        /// <summary>
+        /// BUILD: One streaming pass over the A2L bytes. Line offsets go straight to the index file;
+        /// each distinct token keeps its line numbers as delta-encoded bytes until the pass ends
+        /// </summary>
+        private static A2LLineIndex Build(string a2lPath, FileInfo info)
+        {
+            var stopwatch = Stopwatch.StartNew();
+            try
+            {
+                return Build(a2lPath, info, IndexPathFor(a2lPath, false), stopwatch);
+            }
+            catch (Exception ex) when (ex is IOException || ex is UnauthorizedAccessException)
+            {
+                Debug.WriteLine($"A2L INDEX: {Path.GetDirectoryName(a2lPath)} not writable ({ex.Message}) - using temp folder");
+                return Build(a2lPath, info, IndexPathFor(a2lPath, true), stopwatch);
+            }
+        }
+
+        private static A2LLineIndex Build(string a2lPath, FileInfo info, string indexPath, Stopwatch stopwatch)
+        {
+            Directory.CreateDirectory(Path.GetDirectoryName(indexPath));
+            string tempPath = indexPath + "." + Process.GetCurrentProcess().Id + ".tmp";
+
+            var postings = new Dictionary<string, PostingBuilder>(StringComparer.Ordinal);
+            int lineCount = 0;
+            bool hasBom = false;
+            long length;
+
+            using (var output = new FileStream(tempPath, FileMode.Create, FileAccess.Write, FileShare.None, READ_BUFFER_SIZE))
+            using (var writer = new BinaryWriter(output, Encoding.UTF8))
+            {
+                writer.Write(new byte[HEADER_BYTES]); // Patched once the pass is done
+
+                using (var source = OpenShared(a2lPath))
+                {
+                    length = source.Length;
+                    var buffer = new byte[READ_BUFFER_SIZE];
+                    var token = new StringBuilder();
+                    long position = 0;
+                    bool lineStart = true;
+                    bool afterCr = false;
+                    int read;
+
+                    while ((read = source.Read(buffer, 0, buffer.Length)) > 0)
+                    {
+                        if (position == 0 && read >= 3 && buffer[0] == 0xEF && buffer[1] == 0xBB && buffer[2] == 0xBF)
+                            hasBom = true;
+
+                        for (int i = 0; i < read; i++)
+                        {
+                            byte b = buffer[i];
+                            if (afterCr)
+                            {
+                                afterCr = false;
+                                if (b == '\n')
+                                    continue; // \r\n - one line break
+                            }
+
+                            if (lineStart)
+                            {
+                                writer.Write(position + i);
+                                lineCount++;
+                                lineStart = false;
+                            }
+
+                            if (_isTokenByte[b])
+                            {
+                                token.Append((char)b);
+                                continue;
+                            }
+
+                            if (token.Length > 0)
+                            {
+                                AddPosting(postings, token.ToString(), lineCount - 1);
+                                token.Clear();
+                            }
+                            // LINE BREAKS: \n, \r and \r\n - the same lines File.ReadLines returns
+                            if (b == '\n')
+                                lineStart = true;
+                            else if (b == '\r')
+                                lineStart = afterCr = true;
+                        }
+                        position += read;
+                    }
+
+                    if (token.Length > 0)
+                        AddPosting(postings, token.ToString(), lineCount - 1);
+                }
+                writer.Write(length); // End of the last line
+
+                // TOKEN TABLE: sorted ordinal so prefixes are contiguous, then the posting bytes
+                long tokenTableStart = output.Position;
+                var tokens = postings.Keys.ToArray();
+                Array.Sort(tokens, StringComparer.Ordinal);
+                writer.Write(hasBom);
+                writer.Write(tokens.Length);
+                long offset = 0;
+                foreach (string token in tokens)
+                {
+                    var posting = postings[token];
+                    writer.Write(token);
+                    writer.Write(posting.Count);
+                    writer.Write(offset);
+                    offset += posting.Bytes.Count;
+                }
+
+                long postingsStart = output.Position;
+                foreach (string token in tokens)
+                    writer.Write(postings[token].Bytes.ToArray());
+
+                writer.Flush();
+                output.Position = 0;
+                writer.Write(MAGIC);
+                writer.Write(VERSION);
+                writer.Write(length);
+                writer.Write(info.LastWriteTimeUtc.Ticks);
+                writer.Write(lineCount);
+                writer.Write(tokenTableStart);
+                writer.Write(postingsStart);
+            }
+
+            try
+            {
+                if (File.Exists(indexPath))
+                    File.Delete(indexPath);
+                File.Move(tempPath, indexPath);
+            }
+            catch (IOException) when (File.Exists(indexPath))
+            {
+                File.Delete(tempPath); // Another process published the same index first
+            }
+
+            stopwatch.Stop();
+            LogDuration?.Invoke("A2L_LineIndexBuild", stopwatch.ElapsedMilliseconds,
+                $"{Path.GetFileName(a2lPath)}: {lineCount} lines, {postings.Count} tokens, {length / (1024 * 1024)}MB");
+            Debug.WriteLine($"A2L INDEX: Built {indexPath} in {stopwatch.ElapsedMilliseconds}ms ({lineCount:N0} lines, {postings.Count:N0} tokens)");
+
+            var index = Load(a2lPath, indexPath);
+            index.BuildMilliseconds = stopwatch.ElapsedMilliseconds;
+            return index;
+        }
+
+        private static void AddPosting(Dictionary<string, PostingBuilder> postings, string token, int line)
+        {
+            if (!postings.TryGetValue(token, out PostingBuilder posting))
+                postings[token] = posting = new PostingBuilder();
+            posting.Add(line);
+        }
+
+        /// <summary>
+        /// POSTINGS: Distinct ascending line numbers of one token as 7-bit encoded deltas
+        /// </summary>
+        private class PostingBuilder
+        {
+            public readonly List<byte> Bytes = new List<byte>(4);
+            public int Count;
+            private int _lastLine = -1;
+
+            public void Add(int line)
+            {
+                if (line == _lastLine) return;
+                Write7BitInt(Bytes, line - _lastLine);
+                _lastLine = line;
+                Count++;
+            }
+        }
+    }
+}
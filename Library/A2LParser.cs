@@ -449,6 +449,34 @@ namespace Check_carasi_DF_ContextClearing
             
             return matches.Distinct().ToList();
         }
+        
+        // FUZZY LOOKUP: Trigram/prefix index over all measurement and characteristic names (built on first use)
+        public NameNgramIndex NameIndex
+        {
+            get
+            {
+                if (_nameIndex == null)
+                    _nameIndex = new NameNgramIndex(Measurements.Keys.Concat(Characteristics.Keys));
+                return _nameIndex;
+            }
+        }
+        private NameNgramIndex _nameIndex;
+        
+        /// <summary>
+        /// DID YOU MEAN: Closest A2L names to a variable that was not found
+        /// </summary>
+        public List<string> SuggestVariables(string variableName, int maxResults = 5)
+        {
+            return NameIndex.Suggest(variableName, maxResults).Select(s => s.Name).ToList();
+        }
+        
+        /// <summary>
+        /// WILDCARD SEARCH: '*' / '?' patterns through the trigram index instead of a regex over every key
+        /// </summary>
+        public List<string> FindVariablesByWildcard(string pattern, int maxResults = int.MaxValue)
+        {
+            return NameIndex.Wildcard(pattern, maxResults);
+        }
     }
     
     // ENUMS AND CLASSES
@@ -99,6 +99,24 @@ namespace Check_carasi_DF_ContextClearing
             return parser?.FindVariablesByPattern(pattern) ?? new List<string>();
         }
         
+        /// <summary>
+        /// WILDCARD SEARCH: Find variables matching a '*' / '?' pattern through the name index
+        /// </summary>
+        public static List<string> FindVariablesByWildcard(string filePath, string pattern, int maxResults = int.MaxValue)
+        {
+            var parser = GetParser(filePath);
+            return parser?.FindVariablesByWildcard(pattern, maxResults) ?? new List<string>();
+        }
+        
+        /// <summary>
+        /// DID YOU MEAN: Closest A2L names for a variable that was not found
+        /// </summary>
+        public static List<string> SuggestVariables(string filePath, string variableName, int maxResults = 5)
+        {
+            var parser = GetParser(filePath);
+            return parser?.SuggestVariables(variableName, maxResults) ?? new List<string>();
+        }
+        
         /// <summary>
         /// SEARCH SINGLE: Find single variable with structured result
         /// </summary>
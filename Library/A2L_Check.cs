@@ -44,8 +44,6 @@ namespace Check_carasi_DF_ContextClearing
 
         public bool IsExistInA2L(string keyword, ref string[] result)
         {
-            bool _isContain = false;
-            
             // Validate inputs
             if (string.IsNullOrEmpty(keyword))
             {
@@ -62,22 +60,15 @@ namespace Check_carasi_DF_ContextClearing
             
             try
             {
-                // Read A2L file and search for keyword
-                string[] lines = File.ReadAllLines(link_Of_A2L);
-                List<string> matchedLines = new List<string>();
-                
-                foreach (string line in lines)
-                {
-                    if (line.Contains(keyword))
-                    {
-                        matchedLines.Add(line.Trim());
-                        _isContain = true;
-                    }
-                }
-                
-                result = matchedLines.ToArray();
+                // INDEXED SEARCH: token postings pick the candidate lines, only those are read and checked
+                var index = A2LLineIndex.Open(link_Of_A2L);
+                List<string> matchedLines = index != null
+                    ? index.FindLines(keyword)
+                    : File.ReadLines(link_Of_A2L).Where(line => line.Contains(keyword)).ToList(); // UTF-16 A2L - streaming scan
+
+                result = matchedLines.Select(line => line.Trim()).ToArray();
                 isValidLink = true;
-                return _isContain;
+                return result.Length > 0;
             }
             catch (Exception)
             {
@@ -0,0 +1,260 @@
+using System;
+using System.Collections.Generic;
+using System.Data;
+using System.Diagnostics;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// BATCH SEARCH: Runs a whole variable list through the CARASI / Dataflow / A2L lookups on a bounded
+    /// worker pool and streams one result row per variable - no UC_ContextClearing tab per variable.
+    /// Tabs are only created when the user drills into a row.
+    /// </summary>
+    public class BatchSearchService
+    {
+        public const int DEFAULT_CHUNK_SIZE = 100;
+        public static readonly int DEFAULT_MAX_WORKERS = Math.Max(1, Math.Min(Environment.ProcessorCount, 4));
+
+        public const string ROW_COLUMN = "#";
+        public const string VARIABLE_COLUMN = "Variable";
+        public const string FOUND_IN_COLUMN = "Found In";
+
+        // SOURCES: result column -> batch lookup (same shape as ExcelParserManager.BatchCheckCarasi)
+        private readonly List<string> _sourceNames = new List<string>();
+        private readonly List<Func<List<string>, Dictionary<string, bool>>> _lookups = new List<Func<List<string>, Dictionary<string, bool>>>();
+
+        public int MaxWorkers { get; }
+        public int ChunkSize { get; }
+        public IReadOnlyList<string> SourceNames => _sourceNames;
+
+        public BatchSearchService(int maxWorkers = 0, int chunkSize = DEFAULT_CHUNK_SIZE)
+        {
+            MaxWorkers = maxWorkers > 0 ? maxWorkers : DEFAULT_MAX_WORKERS;
+            ChunkSize = Math.Max(1, chunkSize);
+        }
+
+        /// <summary>
+        /// Add a result column answered by lookup(chunk of variables) -> {variable: found}
+        /// </summary>
+        public BatchSearchService AddSource(string name, Func<List<string>, Dictionary<string, bool>> lookup)
+        {
+            if (string.IsNullOrWhiteSpace(name)) throw new ArgumentException("Source name is required", nameof(name));
+            if (lookup == null) throw new ArgumentNullException(nameof(lookup));
+            if (_sourceNames.Contains(name)) throw new ArgumentException($"Source '{name}' already added", nameof(name));
+
+            _sourceNames.Add(name);
+            _lookups.Add(lookup);
+            return this;
+        }
+
+        /// <summary>
+        /// Add an Excel file answered from its name index: one column read per file, then every
+        /// variable is an in-memory lookup instead of a WHERE IN / OR query per chunk.
+        /// An unreadable workbook makes GetNameIndex throw, so its column stays DBNull (lookup failed)
+        /// instead of false; the index is read again for the next chunk
+        /// </summary>
+        public BatchSearchService AddExcelSource(string name, Excel_Parser parser)
+        {
+            if (parser == null) return this;
+            return AddSource(name, variables =>
+            {
+                var index = parser.GetNameIndex();
+                var found = new Dictionary<string, bool>();
+                foreach (var variable in variables) found[variable] = index.Contains(variable);
+                return found;
+            });
+        }
+
+        /// <summary>
+        /// Add an A2L file answered by the cached A2LParser. A missing or unparsable A2L throws
+        /// (BatchSearchVariables would answer "not found" for every variable), so its column stays DBNull
+        /// </summary>
+        public BatchSearchService AddA2LSource(string name, string a2lFilePath)
+        {
+            if (string.IsNullOrEmpty(a2lFilePath)) return this;
+            return AddSource(name, variables =>
+            {
+                var parser = A2LParserManager.GetParser(a2lFilePath);
+                if (parser == null)
+                    throw new InvalidOperationException($"A2L file could not be loaded: {a2lFilePath}");
+                return parser.FindVariables(variables)
+                             .ToDictionary(pair => pair.Key, pair => pair.Value != null && pair.Value.Found);
+            });
+        }
+
+        /// <summary>
+        /// One empty result table: #, Variable, one bool column per source (DBNull = lookup failed), Found In
+        /// </summary>
+        public DataTable CreateResultTable()
+        {
+            var table = new DataTable("BatchSearch");
+            table.Columns.Add(ROW_COLUMN, typeof(int));
+            table.Columns.Add(VARIABLE_COLUMN, typeof(string));
+            foreach (var name in _sourceNames)
+                table.Columns.Add(name, typeof(bool));
+            table.Columns.Add(FOUND_IN_COLUMN, typeof(int));
+            table.PrimaryKey = new[] { table.Columns[VARIABLE_COLUMN] };
+            return table;
+        }
+
+        /// <summary>
+        /// Append finished rows to a table from CreateResultTable (call on the thread that owns the table)
+        /// </summary>
+        public static void AppendRows(DataTable table, IEnumerable<BatchSearchRow> rows)
+        {
+            table.BeginLoadData();
+            try
+            {
+                foreach (var row in rows)
+                {
+                    var values = new object[row.Found.Length + 3];
+                    values[0] = row.Position + 1;
+                    values[1] = row.Variable;
+                    for (int i = 0; i < row.Found.Length; i++)
+                        values[i + 2] = row.Found[i].HasValue ? (object)row.Found[i].Value : DBNull.Value;
+                    values[values.Length - 1] = row.FoundCount;
+                    table.LoadDataRow(values, true);
+                }
+            }
+            finally
+            {
+                table.EndLoadData();
+            }
+        }
+
+        /// <summary>
+        /// Search every distinct, non-blank variable. Chunks run on at most MaxWorkers workers; each
+        /// finished chunk is reported through progress (Progress&lt;T&gt; created on the UI thread marshals it
+        /// back there). Cancellation stops scheduling new chunks and throws OperationCanceledException.
+        /// Returns all rows in input order.
+        /// </summary>
+        public async Task<List<BatchSearchRow>> RunAsync(IEnumerable<string> variables,
+            IProgress<BatchSearchProgress> progress = null,
+            CancellationToken cancellationToken = default(CancellationToken))
+        {
+            var distinct = new List<string>();
+            var seen = new HashSet<string>(StringComparer.OrdinalIgnoreCase);
+            foreach (var variable in variables ?? Enumerable.Empty<string>())
+            {
+                if (string.IsNullOrWhiteSpace(variable)) continue;
+                string trimmed = variable.Trim();
+                if (seen.Add(trimmed)) distinct.Add(trimmed);
+            }
+
+            var rows = new BatchSearchRow[distinct.Count];
+            if (distinct.Count == 0) return rows.ToList();
+
+            var stopwatch = Stopwatch.StartNew();
+            int completed = 0;
+            var chunks = Enumerable.Range(0, (distinct.Count + ChunkSize - 1) / ChunkSize)
+                                   .Select(chunk => chunk * ChunkSize)
+                                   .ToList();
+
+            // BOUNDED POOL: never more than MaxWorkers chunks in flight
+            var workers = new SemaphoreSlim(MaxWorkers, MaxWorkers);
+            var tasks = new List<Task>(chunks.Count);
+            try
+            {
+                foreach (int start in chunks)
+                {
+                    await workers.WaitAsync(cancellationToken).ConfigureAwait(false);
+                    tasks.Add(Task.Run(() =>
+                    {
+                        try
+                        {
+                            cancellationToken.ThrowIfCancellationRequested();
+                            var chunkRows = SearchChunk(distinct, start, Math.Min(ChunkSize, distinct.Count - start), cancellationToken);
+                            foreach (var row in chunkRows) rows[row.Position] = row;
+
+                            int done = Interlocked.Add(ref completed, chunkRows.Count);
+                            progress?.Report(new BatchSearchProgress(done, distinct.Count, chunkRows));
+                        }
+                        finally
+                        {
+                            workers.Release();
+                        }
+                    }));
+                }
+            }
+            finally
+            {
+                // Chunks already running always finish (or see the cancellation) before this returns
+                await Task.WhenAll(tasks.Select(task => task.ContinueWith(_ => { }, TaskScheduler.Default))).ConfigureAwait(false);
+            }
+            await Task.WhenAll(tasks).ConfigureAwait(false);
+
+            System.Diagnostics.Debug.WriteLine($"BATCH SEARCH: {distinct.Count} variables x {_sourceNames.Count} sources in {stopwatch.ElapsedMilliseconds}ms ({MaxWorkers} workers)");
+            return rows.ToList();
+        }
+
+        private List<BatchSearchRow> SearchChunk(List<string> variables, int start, int count, CancellationToken cancellationToken)
+        {
+            var chunk = variables.GetRange(start, count);
+            var found = new bool?[count][];
+            for (int i = 0; i < count; i++) found[i] = new bool?[_lookups.Count];
+
+            for (int source = 0; source < _lookups.Count; source++)
+            {
+                cancellationToken.ThrowIfCancellationRequested();
+                Dictionary<string, bool> answers;
+                try
+                {
+                    answers = _lookups[source](chunk);
+                }
+                catch (Exception ex)
+                {
+                    // One failing file leaves its column empty for the chunk, the other sources still answer
+                    System.Diagnostics.Debug.WriteLine($"BATCH SEARCH ERROR: {_sourceNames[source]} - {ex.Message}");
+                    continue;
+                }
+
+                for (int i = 0; i < count; i++)
+                    found[i][source] = answers != null && answers.TryGetValue(chunk[i], out bool isFound) && isFound;
+            }
+
+            var chunkRows = new List<BatchSearchRow>(count);
+            for (int i = 0; i < count; i++)
+                chunkRows.Add(new BatchSearchRow(start + i, chunk[i], found[i]));
+            return chunkRows;
+        }
+    }
+
+    /// <summary>
+    /// One searched variable: Found[i] answers SourceNames[i] (null when that lookup failed)
+    /// </summary>
+    public class BatchSearchRow
+    {
+        public int Position { get; }
+        public string Variable { get; }
+        public bool?[] Found { get; }
+        public int FoundCount => Found.Count(found => found == true);
+
+        public BatchSearchRow(int position, string variable, bool?[] found)
+        {
+            Position = position;
+            Variable = variable;
+            Found = found;
+        }
+    }
+
+    /// <summary>
+    /// Progress of a batch search: totals so far plus the rows of the chunk that just finished
+    /// </summary>
+    public class BatchSearchProgress
+    {
+        public int Completed { get; }
+        public int Total { get; }
+        public IReadOnlyList<BatchSearchRow> Rows { get; }
+        public int Percent => Total == 0 ? 100 : (int)(Completed * 100L / Total);
+
+        public BatchSearchProgress(int completed, int total, IReadOnlyList<BatchSearchRow> rows)
+        {
+            Completed = completed;
+            Total = total;
+            Rows = rows;
+        }
+    }
+}
@@ -0,0 +1,368 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using System.Threading;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// CONNECTION POOL: Per-file connection leases with a cap on concurrent leases, idle eviction,
+    /// a health check on every reuse, and wait / lease-duration metrics.
+    /// A caller that cannot get a lease within LeaseTimeout gets a TimeoutException instead of
+    /// silently sharing a connection - contention is capped and visible in the performance log.
+    /// </summary>
+    public class ConnectionLeasePool<TConnection> where TConnection : class, IDisposable
+    {
+        /// <summary>
+        /// One leased connection - dispose to hand it back
+        /// </summary>
+        public sealed class Lease : IDisposable
+        {
+            private readonly ConnectionLeasePool<TConnection> _pool;
+            private readonly FilePool _filePool;
+            private readonly int _generation;
+            private readonly Stopwatch _held = Stopwatch.StartNew();
+            private int _released;
+            private bool _invalid;
+
+            public string Key { get; }
+            public TConnection Connection { get; }
+            public long WaitMs { get; }
+
+            internal Lease(ConnectionLeasePool<TConnection> pool, FilePool filePool, string key, TConnection connection, int generation, long waitMs)
+            {
+                _pool = pool;
+                _filePool = filePool;
+                _generation = generation;
+                Key = key;
+                Connection = connection;
+                WaitMs = waitMs;
+            }
+
+            /// <summary>
+            /// Connection is broken - dispose it on release instead of pooling it
+            /// </summary>
+            public void Invalidate()
+            {
+                _invalid = true;
+            }
+
+            public void Dispose()
+            {
+                if (Interlocked.Exchange(ref _released, 1) == 0)
+                    _pool.Release(this, _filePool, _held.ElapsedMilliseconds, _invalid, _generation);
+            }
+        }
+
+        internal class FilePool
+        {
+            public SemaphoreSlim Slots;
+            // Oldest first - reuse takes the most recent from the end, eviction trims the front
+            public readonly List<IdleConnection> Idle = new List<IdleConnection>();
+            public int Leased;
+            // Callers between taking this pool in Acquire and handing the lease back (waiting or leased);
+            // the pool is only forgotten at zero, so every caller of one key shares the same Slots
+            public int Users;
+        }
+
+        internal struct IdleConnection
+        {
+            public TConnection Connection;
+            public DateTime Since;
+        }
+
+        private readonly Dictionary<string, FilePool> _files = new Dictionary<string, FilePool>(StringComparer.OrdinalIgnoreCase);
+        private readonly Func<TConnection, bool> _healthCheck;
+        private readonly Action<string, long, string> _logDuration;
+        private readonly object _lock = new object();
+        private int _generation;
+
+        // METRICS: lifetime counters plus a window that ExportMetrics logs and resets
+        private long _acquired, _created, _reused, _unhealthy, _evicted, _timeouts;
+        private long _windowLeases, _windowWaitMs, _windowMaxWaitMs, _windowLeaseMs, _windowMaxLeaseMs, _windowTimeouts;
+
+        public int MaxLeasesPerFile { get; }
+        public int MaxIdleConnections { get; }
+        public TimeSpan IdleTimeout { get; }
+        public TimeSpan LeaseTimeout { get; }
+        public long SlowWaitMs { get; set; } = 50;
+
+        public ConnectionLeasePool(int maxLeasesPerFile, int maxIdleConnections, TimeSpan idleTimeout, TimeSpan leaseTimeout,
+            Func<TConnection, bool> healthCheck = null, Action<string, long, string> logDuration = null)
+        {
+            if (maxLeasesPerFile <= 0) throw new ArgumentOutOfRangeException(nameof(maxLeasesPerFile));
+            MaxLeasesPerFile = maxLeasesPerFile;
+            MaxIdleConnections = Math.Max(0, maxIdleConnections);
+            IdleTimeout = idleTimeout;
+            LeaseTimeout = leaseTimeout;
+            _healthCheck = healthCheck ?? (connection => true);
+            _logDuration = logDuration;
+        }
+
+        /// <summary>
+        /// Lease a connection for key: a healthy idle one if any, else a new one from create.
+        /// Waits while MaxLeasesPerFile leases of that key are out; throws TimeoutException after timeout.
+        /// </summary>
+        public Lease Acquire(string key, Func<TConnection> create, TimeSpan? timeout = null)
+        {
+            if (string.IsNullOrEmpty(key)) throw new ArgumentException("Connection key is required", nameof(key));
+            if (create == null) throw new ArgumentNullException(nameof(create));
+
+            FilePool filePool;
+            lock (_lock)
+            {
+                if (!_files.TryGetValue(key, out filePool))
+                {
+                    filePool = new FilePool { Slots = new SemaphoreSlim(MaxLeasesPerFile, MaxLeasesPerFile) };
+                    _files[key] = filePool;
+                }
+                filePool.Users++;
+            }
+
+            // WAIT: bounded by the per-file lease cap
+            var waited = Stopwatch.StartNew();
+            if (!filePool.Slots.Wait(timeout ?? LeaseTimeout))
+            {
+                lock (_lock)
+                {
+                    filePool.Users--;
+                    _timeouts++;
+                    _windowTimeouts++;
+                }
+                _logDuration?.Invoke("OLEDB_LeaseTimeout", waited.ElapsedMilliseconds, $"{FileNameOf(key)} | {MaxLeasesPerFile} leases busy");
+                throw new TimeoutException($"No connection free for {FileNameOf(key)} after {waited.ElapsedMilliseconds}ms ({MaxLeasesPerFile} leases in use)");
+            }
+            long waitMs = waited.ElapsedMilliseconds;
+
+            try
+            {
+                TConnection connection = null;
+                int generation;
+                lock (_lock) generation = _generation;
+
+                // HEALTH CHECK: outside the lock, a check may have to reopen the connection
+                while (connection == null)
+                {
+                    IdleConnection idle;
+                    lock (_lock)
+                    {
+                        if (filePool.Idle.Count == 0) break;
+                        idle = filePool.Idle[filePool.Idle.Count - 1];
+                        filePool.Idle.RemoveAt(filePool.Idle.Count - 1);
+                    }
+
+                    if (IsHealthy(idle.Connection))
+                    {
+                        connection = idle.Connection;
+                        lock (_lock) _reused++;
+                    }
+                    else
+                    {
+                        lock (_lock) _unhealthy++;
+                        DisposeQuietly(idle.Connection);
+                    }
+                }
+
+                if (connection == null)
+                {
+                    connection = create();
+                    if (connection == null)
+                        throw new InvalidOperationException($"Cannot create a connection for {FileNameOf(key)}");
+                    lock (_lock) _created++;
+                }
+
+                lock (_lock)
+                {
+                    filePool.Leased++;
+                    _acquired++;
+                }
+                if (waitMs >= SlowWaitMs)
+                    _logDuration?.Invoke("OLEDB_LeaseWait", waitMs, FileNameOf(key));
+                return new Lease(this, filePool, key, connection, generation, waitMs);
+            }
+            catch
+            {
+                lock (_lock) filePool.Users--;
+                filePool.Slots.Release();
+                throw;
+            }
+        }
+
+        private void Release(Lease lease, FilePool filePool, long heldMs, bool invalid, int generation)
+        {
+            TConnection toDispose = null;
+            lock (_lock)
+            {
+                filePool.Leased--;
+                filePool.Users--;
+                _windowLeases++;
+                _windowWaitMs += lease.WaitMs;
+                _windowMaxWaitMs = Math.Max(_windowMaxWaitMs, lease.WaitMs);
+                _windowLeaseMs += heldMs;
+                _windowMaxLeaseMs = Math.Max(_windowMaxLeaseMs, heldMs);
+
+                // Broken, or leased before Clear(): never goes back to the pool
+                if (invalid || generation != _generation || MaxIdleConnections == 0)
+                {
+                    toDispose = lease.Connection;
+                }
+                else
+                {
+                    filePool.Idle.Add(new IdleConnection { Connection = lease.Connection, Since = DateTime.Now });
+                    toDispose = TrimIdle();
+                }
+            }
+
+            if (toDispose != null) DisposeQuietly(toDispose);
+            filePool.Slots.Release();
+        }
+
+        /// <summary>
+        /// Dispose idle connections unused for IdleTimeout, returns how many were closed
+        /// </summary>
+        public int EvictIdle()
+        {
+            var expired = new List<TConnection>();
+            lock (_lock)
+            {
+                var cutoff = DateTime.Now - IdleTimeout;
+                foreach (var pair in _files.ToList())
+                {
+                    expired.AddRange(pair.Value.Idle.Where(idle => idle.Since < cutoff).Select(idle => idle.Connection));
+                    pair.Value.Idle.RemoveAll(idle => idle.Since < cutoff);
+
+                    // Forget files nobody uses any more - not even a caller still waiting for a slot
+                    if (pair.Value.Idle.Count == 0 && pair.Value.Users == 0)
+                        _files.Remove(pair.Key);
+                }
+                _evicted += expired.Count;
+            }
+
+            foreach (var connection in expired) DisposeQuietly(connection);
+            return expired.Count;
+        }
+
+        /// <summary>
+        /// Dispose every idle connection; leased ones are disposed when handed back
+        /// </summary>
+        public int Clear()
+        {
+            var idleConnections = new List<TConnection>();
+            lock (_lock)
+            {
+                _generation++;
+                foreach (var filePool in _files.Values)
+                {
+                    idleConnections.AddRange(filePool.Idle.Select(idle => idle.Connection));
+                    filePool.Idle.Clear();
+                }
+                _evicted += idleConnections.Count;
+            }
+
+            foreach (var connection in idleConnections) DisposeQuietly(connection);
+            return idleConnections.Count;
+        }
+
+        /// <summary>
+        /// METRICS: Log the leases since the last export (count, average / max wait and hold time)
+        /// as one PerformanceLogger event, then start a new window
+        /// </summary>
+        public void ExportMetrics()
+        {
+            string details;
+            long averageLeaseMs;
+            lock (_lock)
+            {
+                if (_windowLeases == 0 && _windowTimeouts == 0) return;
+
+                averageLeaseMs = _windowLeases == 0 ? 0 : _windowLeaseMs / _windowLeases;
+                details = $"leases={_windowLeases}; avgWaitMs={(_windowLeases == 0 ? 0 : _windowWaitMs / _windowLeases)}; " +
+                          $"maxWaitMs={_windowMaxWaitMs}; maxLeaseMs={_windowMaxLeaseMs}; timeouts={_windowTimeouts}; " +
+                          $"active={_files.Values.Sum(f => f.Leased)}; idle={_files.Values.Sum(f => f.Idle.Count)}";
+                _windowLeases = _windowWaitMs = _windowMaxWaitMs = _windowLeaseMs = _windowMaxLeaseMs = _windowTimeouts = 0;
+            }
+            _logDuration?.Invoke("OLEDB_LeaseSummary", averageLeaseMs, details);
+        }
+
+        public int ActiveCount { get { lock (_lock) return _files.Values.Sum(f => f.Leased); } }
+        public int IdleCount { get { lock (_lock) return _files.Values.Sum(f => f.Idle.Count); } }
+
+        /// <summary>
+        /// MONITORING: Lifetime counters and current usage
+        /// </summary>
+        public Dictionary<string, object> GetStatistics()
+        {
+            lock (_lock)
+            {
+                return new Dictionary<string, object>
+                {
+                    ["Files"] = _files.Count,
+                    ["Active"] = _files.Values.Sum(f => f.Leased),
+                    ["Idle"] = _files.Values.Sum(f => f.Idle.Count),
+                    ["MaxLeasesPerFile"] = MaxLeasesPerFile,
+                    ["Acquired"] = _acquired,
+                    ["Created"] = _created,
+                    ["Reused"] = _reused,
+                    ["Unhealthy"] = _unhealthy,
+                    ["Evicted"] = _evicted,
+                    ["Timeouts"] = _timeouts
+                };
+            }
+        }
+
+        // Called under _lock after one connection went idle: over MaxIdleConnections, the longest-idle
+        // connection of any file is taken out and returned for disposal
+        private TConnection TrimIdle()
+        {
+            if (_files.Values.Sum(f => f.Idle.Count) <= MaxIdleConnections) return null;
+
+            var oldest = _files.Values.Where(f => f.Idle.Count > 0).OrderBy(f => f.Idle[0].Since).First();
+            var victim = oldest.Idle[0];
+            oldest.Idle.RemoveAt(0);
+            _evicted++;
+            return victim.Connection;
+        }
+
+        private bool IsHealthy(TConnection connection)
+        {
+            try
+            {
+                return _healthCheck(connection);
+            }
+            catch
+            {
+                return false;
+            }
+        }
+
+        private static void DisposeQuietly(TConnection connection)
+        {
+            try
+            {
+                connection?.Dispose();
+            }
+            catch { /* Ignore cleanup errors */ }
+        }
+
+        private static string FileNameOf(string key)
+        {
+            // Keys are OLEDB connection strings - show only the workbook name
+            const string marker = "Data Source=";
+            int start = key.IndexOf(marker, StringComparison.OrdinalIgnoreCase);
+            if (start < 0) return key;
+            start += marker.Length;
+            int end = key.IndexOf(';', start);
+            string source = (end < 0 ? key.Substring(start) : key.Substring(start, end - start)).Trim();
+            try
+            {
+                return Path.GetFileName(source);
+            }
+            catch (ArgumentException)
+            {
+                return source;
+            }
+        }
+    }
+}
@@ -308,6 +308,34 @@ namespace Check_carasi_DF_ContextClearing
             return results;
         }
 
+        /// <summary>
+        /// FUZZY LOOKUP: Trigram/prefix index over every interface name of this file
+        /// Loaded once (CARASI: SSTG label, Dataflow: F2 + F17) with a single column read, then reused
+        /// for "did you mean", autocomplete and wildcard search without further queries.
+        /// Throws when the workbook cannot be read; a failed build is not cached, the next call reads again
+        /// </summary>
+        public NameNgramIndex GetNameIndex()
+        {
+            if (nameIndex != null) return nameIndex;
+            lock (nameIndexLock)
+            {
+                if (nameIndex != null) return nameIndex;
+
+                List<string> names;
+                if (lb_NameOfFile.ToLower().Contains(MacroModule_signals))
+                    names = __excel.ReadColumnValues(MacroModule_Interface_sheet + "$", "SSTG label");
+                else if (lb_NameOfFile.ToLower().Contains(Dataflow_signals))
+                    names = __excel.ReadColumnValues(DataFlow_Interface_sheet + "$", "F2", "F17");
+                else
+                    names = new List<string>();
+
+                // Only a complete read is cached - ReadColumnValues throws instead of returning a partial list
+                nameIndex = new NameNgramIndex(names);
+                System.Diagnostics.Debug.WriteLine($"NAME INDEX: {lb_NameOfFile} - {nameIndex.Count} names");
+                return nameIndex;
+            }
+        }
+
         private void dataflow_Parser(string var)
         {
             DataTable dt =  dt_template.Clone();
@@ -363,9 +391,13 @@ namespace Check_carasi_DF_ContextClearing
         private DataView dictionary = new DataView();
         private DataView interfaces = new DataView();
 
+        private NameNgramIndex nameIndex;
+        private readonly object nameIndexLock = new object();
+
 
         public string Lb_Name { get => lb_Name; }
         public string Lb_NameOfFile { get => lb_NameOfFile; }
+        public string LinkOfFile { get => linkOfFile; }
 
         public DataTable DF_Properties { get => df_Properties;}
         public DataView Dataview_df_Properties { get => dataview_df_Properties;}
@@ -5,7 +5,7 @@ using System.Data;
 using System.Windows.Forms;
 using System.Collections.Generic;
 using System;
-using System.Collections.Concurrent;
+using System.Configuration;
 using System.Linq;
 using System.Threading;
 
@@ -17,28 +17,48 @@ namespace Check_carasi_DF_ContextClearing
         Version: 1.0.0
         Description: transfer data from Excel to OLEDB*/
 
-        // CONNECTION POOLING: Enhanced pool with size limit and auto cleanup
-        private static readonly ConcurrentDictionary<string, OleDbConnection> ConnectionPool = 
-            new ConcurrentDictionary<string, OleDbConnection>();
-        private static readonly ConcurrentDictionary<string, DateTime> LastUsedTime = 
-            new ConcurrentDictionary<string, DateTime>();
-        private static readonly object PoolLock = new object();
+        // CONNECTION POOLING: Leases per workbook - at most MaxLeasesPerFile connections of one file in use,
+        // idle ones reused after a health check and closed after IdleTimeout
+        private static readonly ConnectionLeasePool<OleDbConnection> Pool;
         private static System.Threading.Timer CleanupTimer;
         
-        // CONNECTION POOLING: Pool configuration
-        private const int MAX_POOL_SIZE = 10; // Limit pool size to prevent overflow
+        // CONNECTION POOLING: Pool configuration (overridable in App.config appSettings)
+        private const int MAX_POOL_SIZE = 10; // Idle connections kept across all files
+        private const int DEFAULT_MAX_LEASES_PER_FILE = 3;
         private static readonly TimeSpan IDLE_TIMEOUT = TimeSpan.FromMinutes(5); // Close idle connections
+        private static readonly TimeSpan LEASE_TIMEOUT = TimeSpan.FromSeconds(30); // Give up waiting for a lease
         
-        // CONNECTION POOLING: Initialize cleanup timer
+        // CONNECTION POOLING: Initialize pool and cleanup timer
         static Lib_OLEDB_Excel()
         {
+            Pool = new ConnectionLeasePool<OleDbConnection>(
+                ReadSetting("OleDb:MaxLeasesPerFile", DEFAULT_MAX_LEASES_PER_FILE),
+                ReadSetting("OleDb:MaxIdleConnections", MAX_POOL_SIZE),
+                TimeSpan.FromSeconds(ReadSetting("OleDb:IdleTimeoutSeconds", (int)IDLE_TIMEOUT.TotalSeconds)),
+                TimeSpan.FromSeconds(ReadSetting("OleDb:LeaseTimeoutSeconds", (int)LEASE_TIMEOUT.TotalSeconds)),
+                IsConnectionHealthy,
+                (operation, elapsedMs, details) => PerformanceLogger.LogDuration(operation, elapsedMs, details));
+
             CleanupTimer = new System.Threading.Timer(CleanupIdleConnections, null, 
                 TimeSpan.FromMinutes(2), TimeSpan.FromMinutes(2));
         }
 
+        private static int ReadSetting(string key, int defaultValue)
+        {
+            try
+            {
+                return int.TryParse(ConfigurationManager.AppSettings[key], out int value) && value > 0 ? value : defaultValue;
+            }
+            catch (ConfigurationErrorsException)
+            {
+                return defaultValue;
+            }
+        }
+
         private string excelObject = "Provider=Microsoft.{0}.OLEDB.{1};Data Source={2}; Extended Properties =\"Excel {3};HDR=YES\"";
         private string filepath = string.Empty;
-        private OleDbConnection con = null;
+        // Lease held for callers of the Connection property, released on Dispose
+        private ConnectionLeasePool<OleDbConnection>.Lease heldLease = null;
 
         /********************** Using to check status of Reading ! :) Use or not is up to you! ******************/
         public delegate void ProgressWork(float percentage);
@@ -91,13 +111,10 @@ namespace Check_carasi_DF_ContextClearing
 
         public virtual void onConnectionStringChanged()
         {
-            if (this.Connection != null &&
-                !this.Connection.ConnectionString.Equals(this.ConnectionString))
+            if (this.heldLease != null && !this.heldLease.Key.Equals(this.ConnectionString))
             {
-                if (this.Connection.State == ConnectionState.Open)
-                    this.Connection.Close();
-                this.Connection.Dispose();
-                this.con = null;
+                this.heldLease.Dispose();
+                this.heldLease = null;
             }
             if (connectionStringChange != null)
             {
@@ -136,79 +153,57 @@ namespace Check_carasi_DF_ContextClearing
                 }
             }
         }
-        //OleDbConnection to the current File
+        //OleDbConnection to the current File - leased once and held until Dispose
         public OleDbConnection Connection
         {
             get
             {
-                if (con == null)
+                if (heldLease == null && !string.IsNullOrEmpty(this.ConnectionString))
                 {
-                    // CONNECTION POOLING: Try to get from pool first
-                    string connectionKey = this.ConnectionString;
-                    con = GetPooledConnection(connectionKey);
+                    heldLease = Pool.Acquire(this.ConnectionString, CreateConnectionWithFallback);
                 }
-                return this.con;
+                return heldLease?.Connection;
             }
         }
 
-        // CONNECTION POOLING: Get or create pooled connection
-        private OleDbConnection GetPooledConnection(string connectionString)
+        /// <summary>
+        /// CONNECTION POOLING: Run one operation on a leased, open connection of this file
+        /// A connection that failed during the operation is not handed to the next caller
+        /// </summary>
+        private T WithConnection<T>(Func<OleDbConnection, T> operation)
         {
+            string connectionString = this.ConnectionString;
             if (string.IsNullOrEmpty(connectionString))
-                return null;
+                throw new InvalidOperationException($"No OLEDB connection string for file: {this.filepath}");
 
-            // Try to get existing connection from pool
-            if (ConnectionPool.TryGetValue(connectionString, out OleDbConnection pooledConnection))
+            using (var lease = Pool.Acquire(connectionString, CreateConnectionWithFallback))
             {
-                // Validate connection is still usable
-                if (pooledConnection != null && 
-                    (pooledConnection.State == ConnectionState.Open || pooledConnection.State == ConnectionState.Closed))
+                try
                 {
-                    return pooledConnection;
+                    if (lease.Connection.State != ConnectionState.Open)
+                        lease.Connection.Open();
+                    return operation(lease.Connection);
                 }
-                else
+                catch
                 {
-                    // Remove invalid connection from pool
-                    ConnectionPool.TryRemove(connectionString, out _);
+                    lease.Invalidate();
+                    throw;
                 }
             }
+        }
 
-            // Create new connection if not in pool or invalid
-            lock (PoolLock)
-            {
-                // Double-check after lock
-                if (ConnectionPool.TryGetValue(connectionString, out pooledConnection) && 
-                    pooledConnection != null && 
-                    (pooledConnection.State == ConnectionState.Open || pooledConnection.State == ConnectionState.Closed))
-                {
-                    return pooledConnection;
-                }
-
-                // Check pool size limit before creating new connection
-                if (ConnectionPool.Count >= MAX_POOL_SIZE)
-                {
-                    // Remove oldest connection to make room
-                    var oldestKey = ConnectionPool.Keys.FirstOrDefault();
-                    if (!string.IsNullOrEmpty(oldestKey) && ConnectionPool.TryRemove(oldestKey, out var oldConnection))
-                    {
-                        try
-                        {
-                            if (oldConnection?.State == ConnectionState.Open)
-                                oldConnection.Close();
-                            oldConnection?.Dispose();
-                        }
-                        catch { /* Ignore cleanup errors */ }
-                    }
-                }
-
-                // Create new connection with fallback logic
-                var newConnection = CreateConnectionWithFallback();
-                if (newConnection != null)
-                {
-                    ConnectionPool.TryAdd(connectionString, newConnection);
-                }
-                return newConnection;
-            }
+        /// <summary>
+        /// HEALTH CHECK: Run on every reuse of an idle connection (replaces the old validate/recreate loop)
+        /// </summary>
+        private static bool IsConnectionHealthy(OleDbConnection connection)
+        {
+            if (connection == null || connection.State == ConnectionState.Broken)
+                return false;
+            if (!string.IsNullOrEmpty(connection.DataSource) && !File.Exists(connection.DataSource))
+                return false;
+            if (connection.State != ConnectionState.Open)
+                connection.Open();
+            return connection.State == ConnectionState.Open;
         }
 
         private OleDbConnection CreateConnectionWithFallback()
@@ -264,21 +259,8 @@ namespace Check_carasi_DF_ContextClearing
         // Reads the Schema Information
         public DataTable GetSchema()
         {
-            DataTable dtSchema = null;
-            
-            // CRITICAL FIX: Validate connection before use
-            if (!EnsureConnectionValid())
-            {
-                string errorDetails = $"Failed to establish a valid database connection to file: {this.filepath}";
-                System.Diagnostics.Debug.WriteLine($"GetSchema Error: {errorDetails}");
-                throw new InvalidOperationException(errorDetails);
-            }
-            
-            if (this.Connection.State != ConnectionState.Open) 
-                this.Connection.Open();
-            dtSchema = this.Connection.GetOleDbSchemaTable(
-                   OleDbSchemaGuid.Tables, new object[] { null, null, null, "TABLE" });
-            return dtSchema;
+            return WithConnection(connection => connection.GetOleDbSchemaTable(
+                   OleDbSchemaGuid.Tables, new object[] { null, null, null, "TABLE" }));
         }
 
         //Reads table and returns the DataTable
@@ -291,47 +273,7 @@ namespace Check_carasi_DF_ContextClearing
         {
             try
             {
-                // CRITICAL FIX: Validate and recover connection before use
-                if (!EnsureConnectionValid())
-                {
-                    string errorDetails = $"Failed to establish a valid database connection to file: {this.filepath}. Check if file exists and is accessible.";
-                    System.Diagnostics.Debug.WriteLine($"ReadTable Error: {errorDetails}");
-                    throw new InvalidOperationException(errorDetails);
-                }
-
-                if (this.Connection.State != ConnectionState.Open)
-                {
-                    this.Connection.Open();
-                    onReadProgress(10);
-                }
-
-                string cmdText = "Select * from [{0}]";
-                if (!string.IsNullOrEmpty(criteria))
-                {
-                    cmdText += " Where " + criteria;
-                }
-
-                OleDbCommand cmd = new OleDbCommand(string.Format(cmdText, tableName));
-                cmd.Connection = this.Connection;
-
-                OleDbDataAdapter adpt = new OleDbDataAdapter(cmd);
-                onReadProgress(30);
-
-                DataSet ds = new DataSet();
-                onReadProgress(50);
-
-                //Fill up dataset 
-                adpt.Fill(ds, tableName);
-                onReadProgress(100);
-
-                if (ds.Tables.Count == 1)
-                {
-                    return ds.Tables[0];
-                }
-                else
-                {
-                    return null;
-                }
+                return WithConnection(connection => FillTable(connection, tableName, criteria));
             }
             catch (Exception ex)
             {
@@ -342,30 +284,35 @@ namespace Check_carasi_DF_ContextClearing
         }
 
         /// <summary>
-        /// CRITICAL FIX: Direct table read WITHOUT connection validation to prevent connection loops
-        /// Use this ONLY when connection has already been validated
+        /// CRITICAL FIX: Table read without a MessageBox on failure (batch operations)
+        /// The leased connection is health-checked by the pool, so no separate validation is needed
         /// </summary>
         public DataTable ReadTableDirect(string tableName, string criteria)
         {
             try
             {
-                // ASSUMPTION: Connection is already validated by caller
-                if (this.Connection.State != ConnectionState.Open)
-                {
-                    this.Connection.Open();
-                    onReadProgress(10);
-                }
-
-                string cmdText = "Select * from [{0}]";
-                if (!string.IsNullOrEmpty(criteria))
-                {
-                    cmdText += " Where " + criteria;
-                }
+                return WithConnection(connection => FillTable(connection, tableName, criteria));
+            }
+            catch (Exception ex)
+            {
+                System.Diagnostics.Debug.WriteLine($"ReadTableDirect Error: {ex.Message}");
+                // Don't show MessageBox to prevent UI spam during batch operations
+                return null;
+            }
+        }
 
-                OleDbCommand cmd = new OleDbCommand(string.Format(cmdText, tableName));
-                cmd.Connection = this.Connection;
+        private DataTable FillTable(OleDbConnection connection, string tableName, string criteria)
+        {
+            onReadProgress(10);
+            string cmdText = "Select * from [{0}]";
+            if (!string.IsNullOrEmpty(criteria))
+            {
+                cmdText += " Where " + criteria;
+            }
 
-                OleDbDataAdapter adpt = new OleDbDataAdapter(cmd);
+            using (OleDbCommand cmd = new OleDbCommand(string.Format(cmdText, tableName), connection))
+            using (OleDbDataAdapter adpt = new OleDbDataAdapter(cmd))
+            {
                 onReadProgress(30);
 
                 DataSet ds = new DataSet();
@@ -375,21 +322,47 @@ namespace Check_carasi_DF_ContextClearing
                 adpt.Fill(ds, tableName);
                 onReadProgress(100);
 
-                if (ds.Tables.Count == 1)
-                {
-                    return ds.Tables[0];
-                }
-                else
+                return ds.Tables.Count == 1 ? ds.Tables[0] : null;
+            }
+        }
+
+        /// <summary>
+        /// COLUMN READ: Non-empty values of a few columns, streamed with a data reader
+        /// No DataTable is built - used to load every interface name of a sheet once.
+        /// Throws when the sheet cannot be read: an empty list always means an empty column, never a failure
+        /// </summary>
+        public List<string> ReadColumnValues(string tableName, params string[] columns)
+        {
+            var values = new List<string>();
+            try
+            {
+                string columnList = string.Join(",", columns.Select(c => "[" + c + "]"));
+                WithConnection(connection =>
                 {
-                    return null;
-                }
+                    using (var cmd = new OleDbCommand($"Select {columnList} from [{tableName}]", connection))
+                    using (var reader = cmd.ExecuteReader())
+                    {
+                        while (reader.Read())
+                        {
+                            for (int i = 0; i < reader.FieldCount; i++)
+                            {
+                                if (reader.IsDBNull(i)) continue;
+                                string value = reader.GetValue(i).ToString().Trim();
+                                if (value.Length > 0)
+                                    values.Add(value);
+                            }
+                        }
+                    }
+                    return values;
+                });
             }
             catch (Exception ex)
             {
-                System.Diagnostics.Debug.WriteLine($"ReadTableDirect Error: {ex.Message}");
-                // Don't show MessageBox to prevent UI spam during batch operations
-                return null;
+                // No partial list: a locked / unreadable workbook must not look like one without these names
+                System.Diagnostics.Debug.WriteLine($"ReadColumnValues Error: {ex.Message}");
+                throw;
             }
+            return values;
         }
 
         //Generates DropTable statement and executes it.
@@ -397,21 +370,20 @@ namespace Check_carasi_DF_ContextClearing
         {
             try
             {
-                if (this.Connection.State != ConnectionState.Open)
-                {
-                    this.Connection.Open();
-                    onWriteProgress(10);
-                }
+                onWriteProgress(10);
                 string cmdText = "Drop Table [{0}]";
-                using (OleDbCommand cmd = new OleDbCommand(
-                         string.Format(cmdText, tablename), this.Connection))
+                WithConnection(connection =>
                 {
-                    onWriteProgress(30);
+                    using (OleDbCommand cmd = new OleDbCommand(
+                             string.Format(cmdText, tablename), connection))
+                    {
+                        onWriteProgress(30);
 
-                    cmd.ExecuteNonQuery();
-                    onWriteProgress(80);
-                }
-                this.Connection.Close();
+                        cmd.ExecuteNonQuery();
+                        onWriteProgress(80);
+                    }
+                    return true;
+                });
                 onWriteProgress(100);
 
                 return true;
@@ -430,14 +402,15 @@ namespace Check_carasi_DF_ContextClearing
         {
             try
             {
-                using (OleDbCommand cmd = new OleDbCommand(
-                this.GenerateCreateTable(tableName, tableDefination), this.Connection))
+                return WithConnection(connection =>
                 {
-                    if (this.Connection.State != ConnectionState.Open)
-                        this.Connection.Open();
-                    cmd.ExecuteNonQuery();
-                    return true;
-                }
+                    using (OleDbCommand cmd = new OleDbCommand(
+                    this.GenerateCreateTable(tableName, tableDefination), connection))
+                    {
+                        cmd.ExecuteNonQuery();
+                        return true;
+                    }
+                });
             }
             catch
             {
@@ -447,12 +420,15 @@ namespace Check_carasi_DF_ContextClearing
         // Generates Insert Statement and executes it
         public bool AddNewRow(DataRow dr)
         {
-            using (OleDbCommand cmd = new OleDbCommand(
-                          this.GenerateInsertStatement(dr), this.Connection))
+            return WithConnection(connection =>
             {
-                cmd.ExecuteNonQuery();
-            }
-            return true;
+                using (OleDbCommand cmd = new OleDbCommand(
+                              this.GenerateInsertStatement(dr), connection))
+                {
+                    cmd.ExecuteNonQuery();
+                }
+                return true;
+            });
         }
         // Create Table Generation based on Table Defination
         private string GenerateCreateTable(string tableName,
@@ -520,52 +496,21 @@ namespace Check_carasi_DF_ContextClearing
 
         public void Dispose()
         {
-            // CONNECTION POOLING: Don't dispose pooled connections, just close if needed
-            if (this.con != null && this.con.State == ConnectionState.Open)
-            {
-                try
-                {
-                    this.con.Close();
-                }
-                catch { /* Ignore close errors */ }
-            }
-            
-            // Don't dispose the pooled connection, just clear reference
-            this.con = null;
+            // CONNECTION POOLING: Hand the held lease back - the pool decides whether to keep the connection
+            this.heldLease?.Dispose();
+            this.heldLease = null;
             this.filepath = string.Empty;
         }
 
-        // CONNECTION POOLING: Auto cleanup idle connections
+        // CONNECTION POOLING: Auto cleanup idle connections and export lease metrics
         private static void CleanupIdleConnections(object state)
         {
-            lock (PoolLock)
+            int closed = Pool.EvictIdle();
+            if (closed > 0)
             {
-                var now = DateTime.Now;
-                var expiredConnections = LastUsedTime
-                    .Where(kvp => now - kvp.Value > IDLE_TIMEOUT)
-                    .Select(kvp => kvp.Key)
-                    .ToList();
-
-                foreach (var connectionString in expiredConnections)
-                {
-                    if (ConnectionPool.TryRemove(connectionString, out var connection))
-                    {
-                        try
-                        {
-                            if (connection.State == ConnectionState.Open)
-                                connection.Close();
-                            connection.Dispose();
-                        }
-                        catch { /* Ignore cleanup errors */ }
-                    }
-                    LastUsedTime.TryRemove(connectionString, out _);
-                }
-
-                if (expiredConnections.Count > 0)
-                {
-                    System.Diagnostics.Debug.WriteLine($"Cleaned up {expiredConnections.Count} idle connections");
-                }
+                System.Diagnostics.Debug.WriteLine($"Cleaned up {closed} idle connections");
             }
+            Pool.ExportMetrics();
         }
 
         /// <summary>
@@ -589,12 +534,10 @@ namespace Check_carasi_DF_ContextClearing
         /// </summary>
         public static string GetPoolStatistics()
         {
-            var totalConnections = ConnectionPool.Count;
-            var activeConnections = ConnectionPool.Count(kvp => kvp.Value.State == ConnectionState.Open);
-            var now = DateTime.Now;
-            var idleConnections = LastUsedTime.Count(kvp => now - kvp.Value > TimeSpan.FromMinutes(5));
-            
-            return $"Total: {totalConnections}, Active: {activeConnections}, Idle: {idleConnections}";
+            var statistics = Pool.GetStatistics();
+            return $"Total: {(int)statistics["Active"] + (int)statistics["Idle"]}, Active: {statistics["Active"]}, Idle: {statistics["Idle"]}, " +
+                   $"Max/File: {statistics["MaxLeasesPerFile"]}, Created: {statistics["Created"]}, Reused: {statistics["Reused"]}, " +
+                   $"Unhealthy: {statistics["Unhealthy"]}, Evicted: {statistics["Evicted"]}, Timeouts: {statistics["Timeouts"]}";
         }
         
         /// <summary>
@@ -602,205 +545,41 @@ namespace Check_carasi_DF_ContextClearing
         /// </summary>
         public static int GetPoolSize()
         {
-            return ConnectionPool?.Count ?? 0;
+            return Pool.ActiveCount + Pool.IdleCount;
         }
 
         /// <summary>
-        /// CRITICAL FIX: Ensure connection is valid and recreate if necessary
-        /// Prevents crash when connection is corrupted from previous operations
+        /// CRITICAL FIX: Close every pooled connection (escape hatch, e.g. before replacing workbooks)
+        /// Connections currently leased are closed when they are handed back
         /// </summary>
-        private bool EnsureConnectionValid()
+        public static void ForceCleanupAllConnections()
         {
             try
             {
-                // Check if connection exists and is in a valid state
-                if (this.con == null)
-                {
-                    System.Diagnostics.Debug.WriteLine("Connection is null, recreating...");
-                    return RecreateConnection();
-                }
-
-                // Check if connection is disposed or broken
-                try
-                {
-                    // Try to access connection state to test if it's valid
-                    var state = this.con.State;
-                    
-                    // If connection is broken, recreate it
-                    if (state == ConnectionState.Broken)
-                    {
-                        System.Diagnostics.Debug.WriteLine("Connection is broken, recreating...");
-                        return RecreateConnection();
-                    }
-                    
-                    return true;
-                }
-                catch (ObjectDisposedException)
-                {
-                    System.Diagnostics.Debug.WriteLine("Connection is disposed, recreating...");
-                    return RecreateConnection();
-                }
-                catch (InvalidOperationException)
-                {
-                    System.Diagnostics.Debug.WriteLine("Connection is invalid, recreating...");
-                    return RecreateConnection();
-                }
+                int closed = Pool.Clear();
+                System.Diagnostics.Debug.WriteLine($"Force cleanup: Disposed {closed} idle pooled connections");
             }
             catch (Exception ex)
             {
-                System.Diagnostics.Debug.WriteLine($"Error validating connection: {ex.Message}");
-                return RecreateConnection();
+                System.Diagnostics.Debug.WriteLine($"Error in force cleanup: {ex.Message}");
             }
         }
 
         /// <summary>
-        /// CRITICAL FIX: Recreate connection from scratch with enhanced error reporting
+        /// HEALTH CHECK: Lease a connection of this file and check it can be opened
+        /// Use this before batch operations to report an unreachable file once
         /// </summary>
-        private bool RecreateConnection()
+        public bool ValidateConnection()
         {
             try
             {
-                System.Diagnostics.Debug.WriteLine($"=== RECREATING CONNECTION ===");
-                System.Diagnostics.Debug.WriteLine($"File path: {this.filepath}");
-                System.Diagnostics.Debug.WriteLine($"File exists: {(!string.IsNullOrEmpty(this.filepath) ? File.Exists(this.filepath).ToString() : "N/A")}");
-
-                // Dispose old connection safely
-                if (this.con != null)
-                {
-                    try
-                    {
-                        System.Diagnostics.Debug.WriteLine($"Disposing old connection (state: {this.con.State})");
-                        if (this.con.State == ConnectionState.Open)
-                            this.con.Close();
-                        this.con.Dispose();
-                    }
-                    catch (Exception ex)
-                    {
-                        System.Diagnostics.Debug.WriteLine($"Error disposing old connection: {ex.Message}");
-                    }
-                }
-
-                // Validate file access
-                if (string.IsNullOrEmpty(this.filepath))
-                {
-                    System.Diagnostics.Debug.WriteLine("ERROR: File path is null or empty");
-                    return false;
-                }
-
-                if (!File.Exists(this.filepath))
-                {
-                    System.Diagnostics.Debug.WriteLine($"ERROR: File does not exist: {this.filepath}");
-                    return false;
-                }
-
-                // Check file access permissions
-                try
-                {
-                    using (var fs = File.Open(this.filepath, FileMode.Open, FileAccess.Read, FileShare.Read))
-                    {
-                        // File is accessible
-                    }
-                }
-                catch (Exception ex)
-                {
-                    System.Diagnostics.Debug.WriteLine($"ERROR: Cannot access file: {ex.Message}");
-                    return false;
-                }
-
-                // Create new connection
-                string connectionString = this.ConnectionString;
-                System.Diagnostics.Debug.WriteLine($"Connection string: {connectionString}");
-                
-                this.con = new OleDbConnection(connectionString);
-                
-                // Test the connection
-                try
-                {
-                    this.con.Open();
-                    System.Diagnostics.Debug.WriteLine("Connection opened successfully");
-                    this.con.Close();
-                    System.Diagnostics.Debug.WriteLine("Connection recreated and tested successfully");
-                    return true;
-                }
-                catch (Exception ex)
-                {
-                    System.Diagnostics.Debug.WriteLine($"ERROR: Cannot open connection: {ex.Message}");
-                    return false;
-                }
+                return WithConnection(IsConnectionHealthy);
             }
             catch (Exception ex)
             {
-                System.Diagnostics.Debug.WriteLine($"ERROR: Exception in RecreateConnection: {ex.Message}");
-                System.Diagnostics.Debug.WriteLine($"Stack trace: {ex.StackTrace}");
+                System.Diagnostics.Debug.WriteLine($"Connection validation failed for {this.filepath}: {ex.Message}");
                 return false;
             }
         }
-
-        /// <summary>
-        /// CRITICAL FIX: Force cleanup of entire connection pool to prevent corruption
-        /// Call this before batch search operations
-        /// IMPROVED: Preserve individual instance connections
-        /// </summary>
-        public static void ForceCleanupAllConnections()
-        {
-            lock (PoolLock)
-            {
-                try
-                {
-                    System.Diagnostics.Debug.WriteLine($"Force cleanup: Disposing {ConnectionPool.Count} pooled connections");
-                    
-                    // Dispose pooled connections only (not individual instance connections)
-                    var connectionsToDispose = new List<OleDbConnection>();
-                    foreach (var connection in ConnectionPool.Values)
-                    {
-                        if (connection != null)
-                            connectionsToDispose.Add(connection);
-                    }
-                    
-                    // Clear pools first
-                    ConnectionPool.Clear();
-                    LastUsedTime.Clear();
-                    
-                    // Then dispose connections
-                    foreach (var connection in connectionsToDispose)
-                    {
-                        try
-                        {
-                            if (connection.State == ConnectionState.Open)
-                                connection.Close();
-                            connection.Dispose();
-                        }
-                        catch (Exception ex)
-                        {
-                            System.Diagnostics.Debug.WriteLine($"Error disposing pooled connection: {ex.Message}");
-                        }
-                    }
-                    
-                    // Force garbage collection
-                    GC.Collect();
-                    GC.WaitForPendingFinalizers();
-                    
-                    System.Diagnostics.Debug.WriteLine("Force cleanup completed - individual instances preserved");
-                }
-                catch (Exception ex)
-                {
-                    System.Diagnostics.Debug.WriteLine($"Error in force cleanup: {ex.Message}");
-                }
-            }
-        }
-
-        /// <summary>
-        /// DEBUG: Get pool status for troubleshooting (already exists above)
-        /// </summary>
-        // Removed duplicate GetPoolSize method
-
-        /// <summary>
-        /// CRITICAL FIX: Public wrapper for connection validation to prevent external connection loops
-        /// Use this before batch operations to validate connection once
-        /// </summary>
-        public bool ValidateConnection()
-        {
-            return EnsureConnectionValid();
-        }
     }
 }
@@ -0,0 +1,206 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// BOUNDED CACHE: Least-recently-used cache limited by entry count and approximate bytes
+    /// Thread-safe; counts hits, misses, evictions and invalidations for monitoring
+    /// </summary>
+    public class LruCache<TKey, TValue>
+    {
+        private class Entry
+        {
+            public TKey Key;
+            public TValue Value;
+            public long Bytes;
+        }
+
+        // ORDER: most recently used first, so evictions take from the tail
+        private readonly LinkedList<Entry> _order = new LinkedList<Entry>();
+        private readonly Dictionary<TKey, LinkedListNode<Entry>> _entries;
+        private readonly Func<TValue, long> _sizeOf;
+        private readonly object _lock = new object();
+
+        private long _bytes;
+        private long _hits;
+        private long _misses;
+        private long _evictions;
+        private long _invalidations;
+
+        public int MaxEntries { get; }
+        public long MaxBytes { get; }
+
+        public int Count { get { lock (_lock) return _entries.Count; } }
+        public long ApproximateBytes { get { lock (_lock) return _bytes; } }
+        public long Hits { get { lock (_lock) return _hits; } }
+        public long Misses { get { lock (_lock) return _misses; } }
+        public long Evictions { get { lock (_lock) return _evictions; } }
+        public long Invalidations { get { lock (_lock) return _invalidations; } }
+
+        public LruCache(int maxEntries, long maxBytes, Func<TValue, long> sizeOf = null, IEqualityComparer<TKey> comparer = null)
+        {
+            if (maxEntries <= 0) throw new ArgumentOutOfRangeException(nameof(maxEntries));
+            if (maxBytes <= 0) throw new ArgumentOutOfRangeException(nameof(maxBytes));
+
+            MaxEntries = maxEntries;
+            MaxBytes = maxBytes;
+            _sizeOf = sizeOf ?? (value => 0);
+            _entries = new Dictionary<TKey, LinkedListNode<Entry>>(comparer ?? EqualityComparer<TKey>.Default);
+        }
+
+        /// <summary>
+        /// Cached value for key. An entry failing isValid (e.g. its workbook changed) is removed and
+        /// counted as an invalidation + miss. isValid runs outside the cache lock - it may do file I/O.
+        /// </summary>
+        public bool TryGet(TKey key, out TValue value, Func<TValue, bool> isValid = null)
+        {
+            LinkedListNode<Entry> node;
+            lock (_lock)
+            {
+                if (!_entries.TryGetValue(key, out node))
+                {
+                    _misses++;
+                    value = default(TValue);
+                    return false;
+                }
+
+                if (isValid == null)
+                {
+                    Touch(node);
+                    value = node.Value.Value;
+                    return true;
+                }
+                value = node.Value.Value;
+            }
+
+            bool valid = isValid(value);
+
+            lock (_lock)
+            {
+                // The entry may have been replaced or evicted meanwhile - only touch the one that was checked
+                bool current = _entries.TryGetValue(key, out LinkedListNode<Entry> latest) && latest == node;
+                if (valid)
+                {
+                    if (current)
+                        Touch(node);
+                    else
+                        _hits++;
+                    return true;
+                }
+
+                if (current)
+                {
+                    RemoveNode(node);
+                    _invalidations++;
+                }
+                _misses++;
+                value = default(TValue);
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Add or replace a value, then evict least-recently-used entries until both limits hold.
+        /// A value larger than MaxBytes on its own is not cached.
+        /// </summary>
+        public void Set(TKey key, TValue value)
+        {
+            long bytes = Math.Max(0, _sizeOf(value));
+            lock (_lock)
+            {
+                if (_entries.TryGetValue(key, out LinkedListNode<Entry> existing))
+                    RemoveNode(existing);
+
+                if (bytes > MaxBytes)
+                {
+                    _evictions++;
+                    return;
+                }
+
+                _entries[key] = _order.AddFirst(new Entry { Key = key, Value = value, Bytes = bytes });
+                _bytes += bytes;
+
+                while (_entries.Count > MaxEntries || _bytes > MaxBytes)
+                {
+                    RemoveNode(_order.Last);
+                    _evictions++;
+                }
+            }
+        }
+
+        public bool Remove(TKey key)
+        {
+            lock (_lock)
+            {
+                if (!_entries.TryGetValue(key, out LinkedListNode<Entry> node)) return false;
+                RemoveNode(node);
+                return true;
+            }
+        }
+
+        /// <summary>
+        /// Drop every entry matching predicate (counted as invalidations), returns how many were dropped
+        /// </summary>
+        public int RemoveWhere(Func<TKey, TValue, bool> predicate)
+        {
+            lock (_lock)
+            {
+                var stale = _order.Where(entry => predicate(entry.Key, entry.Value)).Select(entry => entry.Key).ToList();
+                foreach (var key in stale)
+                    RemoveNode(_entries[key]);
+                _invalidations += stale.Count;
+                return stale.Count;
+            }
+        }
+
+        public void Clear()
+        {
+            lock (_lock)
+            {
+                _entries.Clear();
+                _order.Clear();
+                _bytes = 0;
+            }
+        }
+
+        /// <summary>
+        /// MONITORING: Counters and usage in the same shape as ExcelParserManager.GetCacheStatistics
+        /// </summary>
+        public Dictionary<string, object> GetStatistics()
+        {
+            lock (_lock)
+            {
+                long lookups = _hits + _misses;
+                return new Dictionary<string, object>
+                {
+                    ["Entries"] = _entries.Count,
+                    ["MaxEntries"] = MaxEntries,
+                    ["ApproximateBytes"] = _bytes,
+                    ["MaxBytes"] = MaxBytes,
+                    ["Hits"] = _hits,
+                    ["Misses"] = _misses,
+                    ["HitRate"] = lookups == 0 ? 0.0 : (double)_hits / lookups,
+                    ["Evictions"] = _evictions,
+                    ["Invalidations"] = _invalidations
+                };
+            }
+        }
+
+        // Called under _lock: move to the front and count a hit
+        private void Touch(LinkedListNode<Entry> node)
+        {
+            _order.Remove(node);
+            _order.AddFirst(node);
+            _hits++;
+        }
+
+        private void RemoveNode(LinkedListNode<Entry> node)
+        {
+            _entries.Remove(node.Value.Key);
+            _order.Remove(node);
+            _bytes -= node.Value.Bytes;
+        }
+    }
+}
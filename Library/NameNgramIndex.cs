@@ -0,0 +1,259 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text.RegularExpressions;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// FUZZY LOOKUP: Trigram + sorted-prefix index over interface names (CARASI, Dataflow, A2L)
+    /// Case-insensitive exact lookup, prefix autocomplete, ranked "did you mean" suggestions and
+    /// wildcard search - candidates come from posting lists instead of scanning every name
+    /// </summary>
+    public class NameNgramIndex
+    {
+        // Names are padded so the first and last characters also form trigrams ("$$ab", "ab$")
+        private const char PAD = '\u0001';
+
+        public static readonly NameNgramIndex Empty = new NameNgramIndex(Enumerable.Empty<string>());
+
+        // SORTED STORAGE: distinct names by lowercase key (ordinal), original spelling kept
+        private readonly string[] _keys;
+        private readonly string[] _names;
+        private readonly int[] _trigramCounts;
+        private readonly Dictionary<string, int> _positions;
+
+        // POSTINGS: trigram -> ascending positions of the names containing it
+        private readonly Dictionary<long, int[]> _postings;
+
+        public int Count => _names.Length;
+        public IReadOnlyList<string> Names => _names;
+
+        public NameNgramIndex(IEnumerable<string> names)
+        {
+            // First spelling of every case-insensitive name wins
+            var distinct = new Dictionary<string, string>(StringComparer.Ordinal);
+            foreach (var name in names ?? Enumerable.Empty<string>())
+            {
+                if (string.IsNullOrWhiteSpace(name)) continue;
+                string trimmed = name.Trim();
+                string key = trimmed.ToLowerInvariant();
+                if (!distinct.ContainsKey(key))
+                    distinct[key] = trimmed;
+            }
+
+            _keys = distinct.Keys.ToArray();
+            Array.Sort(_keys, StringComparer.Ordinal);
+            _names = _keys.Select(key => distinct[key]).ToArray();
+            _positions = new Dictionary<string, int>(_keys.Length, StringComparer.Ordinal);
+            _trigramCounts = new int[_keys.Length];
+
+            var postings = new Dictionary<long, List<int>>();
+            for (int position = 0; position < _keys.Length; position++)
+            {
+                _positions[_keys[position]] = position;
+                var trigrams = Trigrams(_keys[position], true);
+                _trigramCounts[position] = trigrams.Count;
+                foreach (long trigram in trigrams)
+                {
+                    if (!postings.TryGetValue(trigram, out List<int> list))
+                        postings[trigram] = list = new List<int>();
+                    list.Add(position);
+                }
+            }
+            _postings = postings.ToDictionary(pair => pair.Key, pair => pair.Value.ToArray());
+        }
+
+        /// <summary>
+        /// EXACT: Case-insensitive, whitespace-trimmed lookup (same rule as Jet SQL / OrdinalIgnoreCase)
+        /// </summary>
+        public bool Contains(string name)
+        {
+            return !string.IsNullOrWhiteSpace(name) && _positions.ContainsKey(name.Trim().ToLowerInvariant());
+        }
+
+        /// <summary>
+        /// PREFIX: Names starting with prefix (case-insensitive), alphabetical - binary search on the sorted keys
+        /// </summary>
+        public List<string> Prefix(string prefix, int maxResults = 20)
+        {
+            var results = new List<string>();
+            if (string.IsNullOrWhiteSpace(prefix)) return results;
+
+            string key = prefix.Trim().ToLowerInvariant();
+            int position = LowerBound(key);
+            while (position < _keys.Length && results.Count < maxResults &&
+                   _keys[position].StartsWith(key, StringComparison.Ordinal))
+            {
+                results.Add(_names[position++]);
+            }
+            return results;
+        }
+
+        /// <summary>
+        /// DID YOU MEAN: Names sharing the most trigrams with query (Dice coefficient), ties broken by
+        /// edit distance. The query itself is returned first when it exists.
+        /// </summary>
+        public List<NameSuggestion> Suggest(string query, int maxResults = 5, double minSimilarity = 0.3)
+        {
+            var results = new List<NameSuggestion>();
+            if (string.IsNullOrWhiteSpace(query) || maxResults <= 0) return results;
+
+            string key = query.Trim().ToLowerInvariant();
+            var queryTrigrams = Trigrams(key, true);
+
+            // COUNT SHARED TRIGRAMS: only names in at least one posting list are ever touched
+            var shared = new Dictionary<int, int>();
+            foreach (long trigram in queryTrigrams)
+            {
+                if (!_postings.TryGetValue(trigram, out int[] positions)) continue;
+                foreach (int position in positions)
+                {
+                    shared.TryGetValue(position, out int count);
+                    shared[position] = count + 1;
+                }
+            }
+
+            foreach (var pair in shared)
+            {
+                double similarity = 2.0 * pair.Value / (queryTrigrams.Count + _trigramCounts[pair.Key]);
+                if (similarity >= minSimilarity)
+                    results.Add(new NameSuggestion(_names[pair.Key], similarity, 0));
+            }
+
+            // RANK: keep a few more than asked by similarity, then order those by edit distance
+            results = results.OrderByDescending(s => s.Similarity).ThenBy(s => s.Name, StringComparer.OrdinalIgnoreCase)
+                             .Take(maxResults * 4)
+                             .Select(s => new NameSuggestion(s.Name, s.Similarity, EditDistance(key, s.Name.ToLowerInvariant())))
+                             .OrderBy(s => s.EditDistance).ThenByDescending(s => s.Similarity)
+                             .ThenBy(s => s.Name, StringComparer.OrdinalIgnoreCase)
+                             .Take(maxResults)
+                             .ToList();
+            return results;
+        }
+
+        /// <summary>
+        /// WILDCARD: '*' (any run) and '?' (one character), case-insensitive, whole name.
+        /// Literal runs of 3+ characters narrow the candidates through the posting lists; a literal
+        /// start narrows them to a prefix range; only the candidates are matched against the pattern.
+        /// </summary>
+        public List<string> Wildcard(string pattern, int maxResults = int.MaxValue)
+        {
+            var results = new List<string>();
+            if (string.IsNullOrWhiteSpace(pattern)) return results;
+
+            string key = pattern.Trim().ToLowerInvariant();
+            var regex = new Regex("^" + Regex.Escape(key).Replace(@"\*", ".*").Replace(@"\?", ".") + "$",
+                                  RegexOptions.CultureInvariant);
+
+            IEnumerable<int> candidates = null;
+            foreach (string literal in key.Split('*', '?').Where(part => part.Length >= 3))
+            {
+                foreach (long trigram in Trigrams(literal, false))
+                {
+                    if (!_postings.TryGetValue(trigram, out int[] positions)) return results;
+                    candidates = candidates == null ? positions : Intersect(candidates, positions);
+                }
+            }
+
+            if (candidates == null)
+            {
+                // NO TRIGRAMS: use the literal start (if any) as a prefix range, else every name
+                int wildcardAt = key.IndexOfAny(new[] { '*', '?' });
+                string literalStart = wildcardAt < 0 ? key : key.Substring(0, wildcardAt);
+                int start = LowerBound(literalStart);
+                candidates = Enumerable.Range(start, _keys.Length - start)
+                                       .TakeWhile(position => _keys[position].StartsWith(literalStart, StringComparison.Ordinal));
+            }
+
+            foreach (int position in candidates)
+            {
+                if (regex.IsMatch(_keys[position]))
+                {
+                    results.Add(_names[position]);
+                    if (results.Count >= maxResults) break;
+                }
+            }
+            return results;
+        }
+
+        private int LowerBound(string key)
+        {
+            int low = 0, high = _keys.Length;
+            while (low < high)
+            {
+                int middle = (low + high) / 2;
+                if (string.CompareOrdinal(_keys[middle], key) < 0) low = middle + 1;
+                else high = middle;
+            }
+            return low;
+        }
+
+        private static IEnumerable<int> Intersect(IEnumerable<int> first, int[] second)
+        {
+            // Both ascending - linear merge
+            int index = 0;
+            foreach (int position in first)
+            {
+                while (index < second.Length && second[index] < position) index++;
+                if (index == second.Length) yield break;
+                if (second[index] == position) yield return position;
+            }
+        }
+
+        /// <summary>
+        /// Distinct trigrams of a lowercase key, each packed into a long (3 x 16-bit chars)
+        /// </summary>
+        private static HashSet<long> Trigrams(string key, bool padded)
+        {
+            string text = padded ? new string(PAD, 2) + key + PAD : key;
+            var trigrams = new HashSet<long>();
+            for (int i = 0; i + 3 <= text.Length; i++)
+            {
+                trigrams.Add(((long)text[i] << 32) | ((long)text[i + 1] << 16) | text[i + 2]);
+            }
+            return trigrams;
+        }
+
+        /// <summary>
+        /// Levenshtein distance (two rows)
+        /// </summary>
+        public static int EditDistance(string a, string b)
+        {
+            var previous = new int[b.Length + 1];
+            var current = new int[b.Length + 1];
+            for (int j = 0; j <= b.Length; j++) previous[j] = j;
+
+            for (int i = 1; i <= a.Length; i++)
+            {
+                current[0] = i;
+                for (int j = 1; j <= b.Length; j++)
+                {
+                    int cost = a[i - 1] == b[j - 1] ? 0 : 1;
+                    current[j] = Math.Min(Math.Min(current[j - 1] + 1, previous[j] + 1), previous[j - 1] + cost);
+                }
+                var swap = previous; previous = current; current = swap;
+            }
+            return previous[b.Length];
+        }
+    }
+
+    /// <summary>
+    /// One ranked "did you mean" candidate
+    /// </summary>
+    public struct NameSuggestion
+    {
+        public string Name { get; }
+        public double Similarity { get; }
+        public int EditDistance { get; }
+
+        public NameSuggestion(string name, double similarity, int editDistance)
+        {
+            Name = name;
+            Similarity = similarity;
+            EditDistance = editDistance;
+        }
+
+        public override string ToString() => Name;
+    }
+}
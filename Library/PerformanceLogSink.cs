@@ -0,0 +1,473 @@
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Text;
+using System.Threading;
+
+namespace Check_carasi_DF_ContextClearing
+{
+    /// <summary>
+    /// On-disk format of the performance log
+    /// </summary>
+    public enum PerformanceLogFormat
+    {
+        Csv,
+        Binary
+    }
+
+    /// <summary>
+    /// One logged event - fixed size, strings are stored by reference
+    /// </summary>
+    public struct PerformanceLogRecord
+    {
+        public long TimestampTicks;
+        public string EventType;
+        public string OperationName;
+        public long ElapsedMs;
+        public string Details;
+        public double MemoryMB;
+        public int TabCount;
+
+        public PerformanceLogRecord(long timestampTicks, string eventType, string operationName, long elapsedMs, string details, double memoryMB, int tabCount)
+        {
+            TimestampTicks = timestampTicks;
+            EventType = eventType;
+            OperationName = operationName;
+            ElapsedMs = elapsedMs;
+            Details = details;
+            MemoryMB = memoryMB;
+            TabCount = tabCount;
+        }
+    }
+
+    /// <summary>
+    /// Bounded lock-free ring of log records (multi-producer, multi-consumer).
+    /// Each cell carries a sequence number: producers claim a slot with one CompareExchange,
+    /// write the record and publish it by advancing the sequence. A full ring rejects the record
+    /// instead of blocking the caller.
+    /// </summary>
+    public sealed class PerformanceLogRing
+    {
+        private struct Cell
+        {
+            public long Sequence;
+            public PerformanceLogRecord Record;
+        }
+
+        private readonly Cell[] _cells;
+        private readonly long _mask;
+        private long _enqueuePosition;
+        private long _dequeuePosition;
+
+        public PerformanceLogRing(int capacity)
+        {
+            if (capacity < 2 || (capacity & (capacity - 1)) != 0)
+                throw new ArgumentException("Capacity must be a power of two (>= 2)", nameof(capacity));
+
+            _cells = new Cell[capacity];
+            _mask = capacity - 1;
+            for (int i = 0; i < capacity; i++)
+            {
+                _cells[i].Sequence = i;
+            }
+        }
+
+        public int Capacity => _cells.Length;
+
+        /// <summary>
+        /// Approximate number of queued records
+        /// </summary>
+        public long Count => Math.Max(0, Volatile.Read(ref _enqueuePosition) - Volatile.Read(ref _dequeuePosition));
+
+        public bool TryEnqueue(PerformanceLogRecord record)
+        {
+            long position = Volatile.Read(ref _enqueuePosition);
+            while (true)
+            {
+                int index = (int)(position & _mask);
+                long difference = Volatile.Read(ref _cells[index].Sequence) - position;
+
+                if (difference == 0)
+                {
+                    long observed = Interlocked.CompareExchange(ref _enqueuePosition, position + 1, position);
+                    if (observed == position)
+                    {
+                        _cells[index].Record = record;
+                        Volatile.Write(ref _cells[index].Sequence, position + 1);
+                        return true;
+                    }
+                    position = observed;
+                }
+                else if (difference < 0)
+                {
+                    return false; // Full - consumer has not freed this cell yet
+                }
+                else
+                {
+                    position = Volatile.Read(ref _enqueuePosition);
+                }
+            }
+        }
+
+        public bool TryDequeue(out PerformanceLogRecord record)
+        {
+            long position = Volatile.Read(ref _dequeuePosition);
+            while (true)
+            {
+                int index = (int)(position & _mask);
+                long difference = Volatile.Read(ref _cells[index].Sequence) - (position + 1);
+
+                if (difference == 0)
+                {
+                    long observed = Interlocked.CompareExchange(ref _dequeuePosition, position + 1, position);
+                    if (observed == position)
+                    {
+                        record = _cells[index].Record;
+                        _cells[index].Record = default(PerformanceLogRecord); // Release string references
+                        Volatile.Write(ref _cells[index].Sequence, position + _mask + 1);
+                        return true;
+                    }
+                    position = observed;
+                }
+                else if (difference < 0)
+                {
+                    record = default(PerformanceLogRecord);
+                    return false; // Empty
+                }
+                else
+                {
+                    position = Volatile.Read(ref _dequeuePosition);
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// Background writer for the performance log.
+    /// Callers only enqueue into the ring; a low-priority thread drains it in batches into one
+    /// persistent FileStream, so logging no longer opens/appends/closes the file per event.
+    ///
+    /// Binary layout (little endian):
+    ///   header: "CPLB" | u16 version | u16 record size
+    ///   block:  u32 string count | (i32 id, u16 byte length, UTF-8 bytes)* | u32 record count | record*
+    ///   record: i64 ticks | i64 elapsedMs | i32 eventType id | i32 operation id | i32 details id | f32 memoryMB | i32 tabCount
+    /// String ids are defined once in the block that first uses them and never reused.
+    /// </summary>
+    public sealed class PerformanceLogWriter : IDisposable
+    {
+        public const int DefaultCapacity = 8192;
+        public const int MaxBatchSize = 1024;
+        public const ushort BinaryVersion = 1;
+        public const int BinaryRecordSize = 36;
+        public const string CsvHeader = "Timestamp,EventType,OperationName,ElapsedMs,Details,MemoryMB,TabCount";
+        public static readonly byte[] BinaryMagic = Encoding.ASCII.GetBytes("CPLB");
+
+        private const int FlushIntervalMs = 250;
+        private const int MaxInternedStrings = 65536;
+
+        private readonly PerformanceLogRing _ring;
+        private readonly PerformanceLogFormat _format;
+        private readonly Stream _stream;
+        private readonly StreamWriter _csvWriter;
+        private readonly MemoryStream _block = new MemoryStream();
+        private readonly BinaryWriter _blockWriter;
+        private readonly Dictionary<string, int> _stringIds = new Dictionary<string, int>(StringComparer.Ordinal);
+        private readonly List<KeyValuePair<int, string>> _newStrings = new List<KeyValuePair<int, string>>();
+        private readonly PerformanceLogRecord[] _batch = new PerformanceLogRecord[MaxBatchSize];
+        private readonly int[] _batchStringIds = new int[MaxBatchSize * 3];
+        private readonly AutoResetEvent _wakeUp = new AutoResetEvent(false);
+        private readonly Thread _thread;
+        private int _nextStringId;
+        private int _blockFirstStringId;
+        private long _committedLength;
+        private long _acceptedCount;
+        private long _writtenCount;
+        private long _rejectedCount;
+        private long _failedCount;
+        private volatile bool _stopping;
+        private bool _disposed;
+
+        public PerformanceLogWriter(string filePath, PerformanceLogFormat format, int capacity = DefaultCapacity)
+            // FileShare.ReadWrite lets the Python tooling tail the log while the app is running
+            : this(new FileStream(filePath, FileMode.Create, FileAccess.Write, FileShare.ReadWrite, 64 * 1024), format, capacity)
+        {
+            FilePath = filePath;
+        }
+
+        /// <summary>
+        /// Write the log to a seekable stream; the writer owns it and disposes it
+        /// </summary>
+        public PerformanceLogWriter(Stream stream, PerformanceLogFormat format, int capacity = DefaultCapacity)
+        {
+            if (stream == null) throw new ArgumentNullException(nameof(stream));
+            _format = format;
+            _ring = new PerformanceLogRing(capacity);
+            _stream = stream;
+            if (format == PerformanceLogFormat.Binary)
+            {
+                _blockWriter = new BinaryWriter(_block, Encoding.UTF8);
+                _blockWriter.Write(BinaryMagic);
+                _blockWriter.Write(BinaryVersion);
+                _blockWriter.Write((ushort)BinaryRecordSize);
+                CommitBlock();
+            }
+            else
+            {
+                _csvWriter = new StreamWriter(_stream, new UTF8Encoding(false), 64 * 1024);
+                _csvWriter.WriteLine(CsvHeader);
+                _csvWriter.Flush();
+            }
+
+            _thread = new Thread(WriterLoop)
+            {
+                IsBackground = true,
+                Priority = ThreadPriority.BelowNormal,
+                Name = "PerformanceLogWriter"
+            };
+            _thread.Start();
+        }
+
+        public string FilePath { get; }
+
+        public long WrittenCount => Interlocked.Read(ref _writtenCount);
+
+        /// <summary>
+        /// Records lost because the ring was full or the file write failed
+        /// </summary>
+        public long DroppedCount => Interlocked.Read(ref _rejectedCount) + Interlocked.Read(ref _failedCount);
+
+        /// <summary>
+        /// Queue a record without blocking; returns false (and counts a drop) when the ring is full
+        /// </summary>
+        public bool Enqueue(PerformanceLogRecord record)
+        {
+            if (_stopping || !_ring.TryEnqueue(record))
+            {
+                Interlocked.Increment(ref _rejectedCount);
+                return false;
+            }
+
+            Interlocked.Increment(ref _acceptedCount);
+            if (_ring.Count >= _ring.Capacity / 2)
+            {
+                _wakeUp.Set(); // Drain early instead of waiting for the flush interval
+            }
+            return true;
+        }
+
+        /// <summary>
+        /// Wait until every record accepted so far has been written to disk
+        /// </summary>
+        public bool Flush(int timeoutMs = 2000)
+        {
+            long target = Interlocked.Read(ref _acceptedCount);
+            var deadline = DateTime.UtcNow.AddMilliseconds(timeoutMs);
+            while (Interlocked.Read(ref _writtenCount) + Interlocked.Read(ref _failedCount) < target)
+            {
+                if (!_thread.IsAlive || DateTime.UtcNow > deadline) return false;
+                _wakeUp.Set();
+                Thread.Sleep(1);
+            }
+            return true;
+        }
+
+        public void Dispose()
+        {
+            if (_disposed) return;
+            _disposed = true;
+
+            _stopping = true;
+            _wakeUp.Set();
+            _thread.Join(2000);
+
+            try
+            {
+                if (_csvWriter != null) _csvWriter.Dispose();
+                _stream.Dispose();
+            }
+            catch { /* Ignore file close errors */ }
+            _wakeUp.Dispose();
+        }
+
+        private void WriterLoop()
+        {
+            while (true)
+            {
+                int count = 0;
+                while (count < MaxBatchSize && _ring.TryDequeue(out _batch[count]))
+                {
+                    count++;
+                }
+
+                if (count > 0)
+                {
+                    WriteBatch(count);
+                    continue;
+                }
+
+                if (_stopping) break;
+                _wakeUp.WaitOne(FlushIntervalMs);
+            }
+        }
+
+        private void WriteBatch(int count)
+        {
+            try
+            {
+                if (_format == PerformanceLogFormat.Binary)
+                    WriteBinaryBatch(count);
+                else
+                    WriteCsvBatch(count);
+
+                Interlocked.Add(ref _writtenCount, count);
+            }
+            catch
+            {
+                Interlocked.Add(ref _failedCount, count); // Ignore file write errors
+            }
+            finally
+            {
+                Array.Clear(_batch, 0, count);
+            }
+        }
+
+        private void WriteCsvBatch(int count)
+        {
+            for (int i = 0; i < count; i++)
+            {
+                var record = _batch[i];
+                _csvWriter.Write(new DateTime(record.TimestampTicks).ToString("yyyy-MM-dd HH:mm:ss.fff", CultureInfo.InvariantCulture));
+                _csvWriter.Write(',');
+                _csvWriter.Write(record.EventType);
+                _csvWriter.Write(',');
+                _csvWriter.Write(record.OperationName);
+                _csvWriter.Write(',');
+                _csvWriter.Write(record.ElapsedMs.ToString(CultureInfo.InvariantCulture));
+                _csvWriter.Write(",\"");
+                _csvWriter.Write(record.Details);
+                _csvWriter.Write("\",");
+                _csvWriter.Write(record.MemoryMB.ToString("F1", CultureInfo.InvariantCulture));
+                _csvWriter.Write(',');
+                _csvWriter.WriteLine(record.TabCount.ToString(CultureInfo.InvariantCulture));
+            }
+            _csvWriter.Flush();
+        }
+
+        private void WriteBinaryBatch(int count)
+        {
+            // Resolve ids first so every string a record refers to is defined ahead of it in the block
+            _newStrings.Clear();
+            _blockFirstStringId = _nextStringId;
+            if (_stringIds.Count > MaxInternedStrings)
+            {
+                _stringIds.Clear(); // Ids keep increasing, the reader still knows the old ones
+            }
+
+            var ids = _batchStringIds;
+            try
+            {
+                for (int i = 0; i < count; i++)
+                {
+                    ids[i * 3] = InternString(_batch[i].EventType);
+                    ids[i * 3 + 1] = InternString(_batch[i].OperationName);
+                    ids[i * 3 + 2] = InternString(_batch[i].Details);
+                }
+
+                _blockWriter.Write((uint)_newStrings.Count);
+                foreach (var entry in _newStrings)
+                {
+                    byte[] bytes = Encoding.UTF8.GetBytes(entry.Value);
+                    int length = Utf8PrefixLength(bytes, ushort.MaxValue);
+                    _blockWriter.Write(entry.Key);
+                    _blockWriter.Write((ushort)length);
+                    _blockWriter.Write(bytes, 0, length);
+                }
+
+                _blockWriter.Write((uint)count);
+                for (int i = 0; i < count; i++)
+                {
+                    var record = _batch[i];
+                    _blockWriter.Write(record.TimestampTicks);
+                    _blockWriter.Write(record.ElapsedMs);
+                    _blockWriter.Write(ids[i * 3]);
+                    _blockWriter.Write(ids[i * 3 + 1]);
+                    _blockWriter.Write(ids[i * 3 + 2]);
+                    _blockWriter.Write((float)record.MemoryMB);
+                    _blockWriter.Write(record.TabCount);
+                }
+
+                CommitBlock();
+            }
+            catch
+            {
+                DiscardBlock();
+                throw;
+            }
+        }
+
+        /// <summary>
+        /// Longest prefix of UTF-8 bytes within maxLength that does not split a character
+        /// </summary>
+        private static int Utf8PrefixLength(byte[] bytes, int maxLength)
+        {
+            if (bytes.Length <= maxLength) return bytes.Length;
+
+            int length = maxLength;
+            while (length > 0 && (bytes[length] & 0xC0) == 0x80)
+            {
+                length--; // bytes[length] continues the previous character
+            }
+            return length;
+        }
+
+        private int InternString(string value)
+        {
+            value = value ?? string.Empty;
+            int id;
+            if (!_stringIds.TryGetValue(value, out id))
+            {
+                id = _nextStringId++;
+                _stringIds[value] = id;
+                _newStrings.Add(new KeyValuePair<int, string>(id, value));
+            }
+            return id;
+        }
+
+        private void CommitBlock()
+        {
+            // One write per block keeps a reader from seeing half a block header
+            _blockWriter.Flush();
+            _stream.Write(_block.GetBuffer(), 0, (int)_block.Length);
+            _stream.Flush();
+            _committedLength = _stream.Position;
+            _block.SetLength(0);
+        }
+
+        /// <summary>
+        /// Forget a block that did not reach the file. Its strings were never defined there, so they are
+        /// interned again - with the same ids, the reader expects them without gaps - by the next block,
+        /// and a partly written block is cut off the file
+        /// </summary>
+        private void DiscardBlock()
+        {
+            _block.SetLength(0);
+            foreach (var entry in _newStrings)
+            {
+                _stringIds.Remove(entry.Value);
+            }
+            _newStrings.Clear();
+            _nextStringId = _blockFirstStringId;
+
+            try
+            {
+                _stream.SetLength(_committedLength);
+                _stream.Position = _committedLength;
+            }
+            catch
+            {
+                // Ignore - the file stays as it is when it cannot be truncated
+            }
+        }
+    }
+}
@@ -16,12 +16,18 @@ namespace Check_carasi_DF_ContextClearing
         private static List<PerformanceMetric> _metrics = new List<PerformanceMetric>();
         private static string _logFilePath;
         private static bool _isEnabled = true;
+        private static PerformanceLogWriter _writer;
+
+        // Set to "binary" to write the compact .cplb format instead of CSV
+        private const string LogFormatVariable = "CARASI_PERF_LOG_FORMAT";
 
         static PerformanceLogger()
         {
-            string tempPath = Path.GetTempPath();
-            _logFilePath = Path.Combine(tempPath, $"UI_Performance_Log_{DateTime.Now:yyyyMMdd_HHmmss}.csv");
-            InitializeLogFile();
+            string format = Environment.GetEnvironmentVariable(LogFormatVariable);
+            bool binary = string.Equals(format, "binary", StringComparison.OrdinalIgnoreCase);
+            InitializeLogFile(binary ? PerformanceLogFormat.Binary : PerformanceLogFormat.Csv);
+
+            AppDomain.CurrentDomain.ProcessExit += (sender, e) => CloseLogFile();
         }
 
         /// <summary>
@@ -76,7 +82,7 @@ namespace Check_carasi_DF_ContextClearing
                             TabCount = GetTabCount()
                         };
                         
-                        _metrics.Add(metric);
+                        lock (_metrics) _metrics.Add(metric);
                         
                         // Log completion event
                         LogEvent("COMPLETE", operationName, elapsedMs, details, metric.MemoryUsageMB, metric.TabCount);
@@ -118,8 +124,9 @@ namespace Check_carasi_DF_ContextClearing
                     MemoryUsageMB = GetMemoryUsage(),
                     TabCount = GetTabCount()
                 };
-                
-                _metrics.Add(metric);
+
+                // THREAD SAFETY: lease metrics arrive from worker and cleanup-timer threads
+                lock (_metrics) _metrics.Add(metric);
                 LogEvent("DURATION", operationName, elapsedMs, details, metric.MemoryUsageMB, metric.TabCount);
             }
             catch { /* Ignore logging errors */ }
@@ -139,11 +146,15 @@ namespace Check_carasi_DF_ContextClearing
                 sb.AppendLine("==================================");
                 sb.AppendLine($"📊 Total Operations: {_metrics.Count}");
                 sb.AppendLine($"⏱️ Log File: {_logFilePath}");
+                if (_writer != null && _writer.DroppedCount > 0)
+                    sb.AppendLine($"⚠️ Dropped Log Events: {_writer.DroppedCount}");
                 sb.AppendLine();
 
                 // Group by operation type
                 var grouped = new Dictionary<string, List<PerformanceMetric>>();
-                foreach (var metric in _metrics)
+                List<PerformanceMetric> snapshot;
+                lock (_metrics) snapshot = new List<PerformanceMetric>(_metrics);
+                foreach (var metric in snapshot)
                 {
                     if (!grouped.ContainsKey(metric.OperationName))
                         grouped[metric.OperationName] = new List<PerformanceMetric>();
@@ -179,7 +190,7 @@ namespace Check_carasi_DF_ContextClearing
         /// </summary>
         public static void ClearMetrics()
         {
-            _metrics.Clear();
+            lock (_metrics) _metrics.Clear();
             _activeTimers.Clear();
         }
 
@@ -199,23 +210,58 @@ namespace Check_carasi_DF_ContextClearing
             return _logFilePath;
         }
 
+        /// <summary>
+        /// Switch the log format; pending events are written to the current file first
+        /// </summary>
+        public static void SetLogFormat(PerformanceLogFormat format)
+        {
+            CloseLogFile();
+            InitializeLogFile(format);
+        }
+
+        /// <summary>
+        /// Block until every event logged so far is on disk (events are written by a background thread)
+        /// </summary>
+        public static bool Flush(int timeoutMs = 2000)
+        {
+            var writer = _writer;
+            return writer == null || writer.Flush(timeoutMs);
+        }
+
         // Helper methods
-        private static void InitializeLogFile()
+        private static void InitializeLogFile(PerformanceLogFormat format)
         {
             try
             {
-                string header = "Timestamp,EventType,OperationName,ElapsedMs,Details,MemoryMB,TabCount";
-                File.WriteAllText(_logFilePath, header + Environment.NewLine);
+                string extension = format == PerformanceLogFormat.Binary ? "cplb" : "csv";
+                string tempPath = Path.GetTempPath();
+                _logFilePath = Path.Combine(tempPath, $"UI_Performance_Log_{DateTime.Now:yyyyMMdd_HHmmss}.{extension}");
+                _writer = new PerformanceLogWriter(_logFilePath, format);
             }
             catch { /* Ignore file creation errors */ }
         }
 
+        private static void CloseLogFile()
+        {
+            var writer = _writer;
+            _writer = null;
+            if (writer != null)
+            {
+                writer.Flush();
+                writer.Dispose();
+            }
+        }
+
         private static void LogEvent(string eventType, string operationName, long elapsedMs, string details, double memoryMB, int tabCount)
         {
             try
             {
-                string logLine = $"{DateTime.Now:yyyy-MM-dd HH:mm:ss.fff},{eventType},{operationName},{elapsedMs},\"{details}\",{memoryMB:F1},{tabCount}";
-                File.AppendAllText(_logFilePath, logLine + Environment.NewLine);
+                // Only a ring enqueue on the caller's thread - formatting and file I/O happen on the writer thread
+                var writer = _writer;
+                if (writer != null)
+                {
+                    writer.Enqueue(new PerformanceLogRecord(DateTime.Now.Ticks, eventType, operationName, elapsedMs, details, memoryMB, tabCount));
+                }
             }
             catch { /* Ignore file write errors */ }
         }
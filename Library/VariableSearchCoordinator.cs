@@ -1,7 +1,10 @@
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
+using System.IO;
 using System.Linq;
 using System.Data;
+using System.Security.Cryptography;
 using System.Windows.Forms;
 
 namespace Check_carasi_DF_ContextClearing
@@ -19,8 +22,11 @@ namespace Check_carasi_DF_ContextClearing
         private DateTime lastSearchTime = DateTime.MinValue;
         private readonly object searchLock = new object();
         
-        // Search results cache for validation
-        private Dictionary<string, SearchResult> searchResultsCache = new Dictionary<string, SearchResult>();
+        // BOUNDED CACHE: Search results for validation - least recently used dropped first
+        public const int MAX_CACHED_RESULTS = 200;
+        public const long MAX_CACHE_BYTES = 64L * 1024 * 1024;
+        private readonly LruCache<string, SearchResult> searchResultsCache =
+            new LruCache<string, SearchResult>(MAX_CACHED_RESULTS, MAX_CACHE_BYTES, EstimateBytes);
         #endregion
 
         #region Public Properties
@@ -42,6 +48,62 @@ namespace Check_carasi_DF_ContextClearing
             public DataView NewDataFlowData { get; set; }
             public DataView OldDataFlowData { get; set; }
             public string ValidationHash { get; set; }
+            // INVALIDATION: Workbooks the result was read from, as they were at search time
+            public List<SourceFileStamp> SourceFiles { get; set; } = new List<SourceFileStamp>();
+        }
+
+        /// <summary>
+        /// Workbook revision: mtime + size, and a content hash (computed once per revision) so a
+        /// touched-but-identical file does not drop its cached results
+        /// </summary>
+        public class SourceFileStamp
+        {
+            private static readonly ConcurrentDictionary<string, string> RevisionHashes = new ConcurrentDictionary<string, string>();
+
+            public string FilePath { get; private set; }
+            public DateTime LastWriteTimeUtc { get; private set; }
+            public long Length { get; private set; }
+            public string ContentHash { get; private set; }
+
+            public static SourceFileStamp Capture(string filePath)
+            {
+                var info = new FileInfo(filePath);
+                return new SourceFileStamp
+                {
+                    FilePath = filePath,
+                    LastWriteTimeUtc = info.LastWriteTimeUtc,
+                    Length = info.Length,
+                    ContentHash = HashOf(info)
+                };
+            }
+
+            /// <summary>
+            /// True while the workbook still has the captured content
+            /// </summary>
+            public bool IsCurrent()
+            {
+                var info = new FileInfo(FilePath);
+                if (!info.Exists) return false;
+                if (info.LastWriteTimeUtc == LastWriteTimeUtc && info.Length == Length) return true;
+                if (info.Length != Length || HashOf(info) != ContentHash) return false;
+
+                // Same bytes under a new mtime - keep the entry and skip the hash next time
+                LastWriteTimeUtc = info.LastWriteTimeUtc;
+                return true;
+            }
+
+            private static string HashOf(FileInfo info)
+            {
+                string revision = $"{info.FullName}|{info.LastWriteTimeUtc.Ticks}|{info.Length}";
+                return RevisionHashes.GetOrAdd(revision, _ =>
+                {
+                    using (var sha = SHA256.Create())
+                    using (var stream = new FileStream(info.FullName, FileMode.Open, FileAccess.Read, FileShare.ReadWrite))
+                    {
+                        return BitConverter.ToString(sha.ComputeHash(stream)).Replace("-", "");
+                    }
+                });
+            }
         }
 
         public class CoordinatedSearchResult
@@ -130,9 +192,10 @@ namespace Check_carasi_DF_ContextClearing
                     // VALIDATION: Cross-file consistency checks
                     ValidateSearchResults(searchResult, result);
 
-                    // CACHE: Store results for future validation
+                    // CACHE: Store results for future validation (bounded, tied to the workbook revisions)
                     searchResult.ValidationHash = GenerateValidationHash(searchResult);
-                    searchResultsCache[variableToSearch] = searchResult;
+                    searchResult.SourceFiles = CaptureSourceFiles(newCarasiParser, oldCarasiParser, newDataFlowParser, oldDataFlowParser);
+                    searchResultsCache.Set(variableToSearch, searchResult);
 
                     // UPDATE: Track last search
                     lastSearchedVariable = variableToSearch;
@@ -174,14 +237,29 @@ namespace Check_carasi_DF_ContextClearing
         }
 
         /// <summary>
-        /// Get cached search results for validation
+        /// Get cached search results for validation (null when missing or a source workbook changed)
         /// </summary>
         public SearchResult GetCachedResults(string variable)
         {
-            lock (searchLock)
-            {
-                return searchResultsCache.ContainsKey(variable) ? searchResultsCache[variable] : null;
-            }
+            if (variable == null) return null;
+            return searchResultsCache.TryGet(variable, out SearchResult cached, IsCurrent) ? cached : null;
+        }
+
+        /// <summary>
+        /// Drop every cached result read from a workbook, returns how many were dropped
+        /// </summary>
+        public int InvalidateFile(string filePath)
+        {
+            return searchResultsCache.RemoveWhere((variable, cached) =>
+                cached.SourceFiles.Any(stamp => string.Equals(stamp.FilePath, filePath, StringComparison.OrdinalIgnoreCase)));
+        }
+
+        /// <summary>
+        /// MONITORING: Entries, approximate bytes, hits, misses, evictions and invalidations
+        /// </summary>
+        public Dictionary<string, object> GetCacheStatistics()
+        {
+            return searchResultsCache.GetStatistics();
         }
 
         /// <summary>
@@ -199,6 +277,62 @@ namespace Check_carasi_DF_ContextClearing
         #endregion
 
         #region Private Methods
+        private static bool IsCurrent(SearchResult cached)
+        {
+            try
+            {
+                return cached.SourceFiles.All(stamp => stamp.IsCurrent());
+            }
+            catch (IOException)
+            {
+                return false;
+            }
+            catch (UnauthorizedAccessException)
+            {
+                return false;
+            }
+        }
+
+        private static List<SourceFileStamp> CaptureSourceFiles(params Excel_Parser[] parsers)
+        {
+            var stamps = new List<SourceFileStamp>();
+            foreach (var parser in parsers)
+            {
+                try
+                {
+                    if (!string.IsNullOrEmpty(parser.LinkOfFile))
+                        stamps.Add(SourceFileStamp.Capture(parser.LinkOfFile));
+                }
+                catch (Exception ex)
+                {
+                    System.Diagnostics.Debug.WriteLine($"CACHE: Cannot stamp {parser.Lb_NameOfFile} - {ex.Message}");
+                }
+            }
+            return stamps;
+        }
+
+        /// <summary>
+        /// Approximate memory of a cached result: cell text (2 bytes/char) plus per-cell and per-row overhead
+        /// </summary>
+        private static long EstimateBytes(SearchResult searchResult)
+        {
+            return 256 + EstimateBytes(searchResult.NewCarasiData) + EstimateBytes(searchResult.OldCarasiData) +
+                   EstimateBytes(searchResult.NewDataFlowData?.Table) + EstimateBytes(searchResult.OldDataFlowData?.Table);
+        }
+
+        private static long EstimateBytes(DataTable table)
+        {
+            if (table == null) return 0;
+            long bytes = 64L * table.Columns.Count;
+            foreach (DataRow row in table.Rows)
+            {
+                bytes += 64;
+                foreach (var item in row.ItemArray)
+                    bytes += item is string text ? 24 + 2L * text.Length : 16;
+            }
+            return bytes;
+        }
+
         /// <summary>
         /// Validate search results for consistency and data integrity
         /// </summary>
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped A2L Index
+Tokenizes an ASAP2 (.a2l) file in one pass over a read-only memory map: only comments, strings and
+/begin / /end keywords are matched, and every MEASUREMENT / CHARACTERISTIC / COMPU_METHOD /
+RECORD_LAYOUT is recorded as (name, kind, module, byte range). Attributes are decoded from the
+mapped bytes only for the names that are looked up - no line strings, no per-block StringBuilder.
+Large files can be scanned and decoded in byte-range shards across a process pool (--workers N)
+"""
+
+import argparse
+import mmap
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+
+from carasi_index import NOT_FOUND, hash_names, normalize_names
+
+# Blocks recorded by the index - same sections as A2LParser
+KINDS = ('MEASUREMENT', 'CHARACTERISTIC', 'COMPU_METHOD', 'RECORD_LAYOUT')
+MEASUREMENT, CHARACTERISTIC, COMPU_METHOD, RECORD_LAYOUT = range(len(KINDS))
+VARIABLE_KINDS = (MEASUREMENT, CHARACTERISTIC)
+_KIND_CODES = {kind.encode(): code for code, kind in enumerate(KINDS)}
+
+# Comment | string | /begin or /end keyword. Comments and strings are matched only so that a
+# '/begin' inside them is skipped; the keyword groups are set for structure tokens only
+_STRUCTURE = re.compile(rb'/\*.*?\*/|//[^\n]*|"[^"\\]*(?:\\.[^"\\]*)*"|/(begin|end)\s+(\w+)', re.S)
+
+# First token after '/begin KIND' - the block name, possibly on the next line
+_BLOCK_NAME = re.compile(rb'(?:\s|/\*.*?\*/|//[^\n]*)*([^\s"/]+)', re.S)
+
+# Tokens inside one block: comment | quoted string (group 1) | nested /begin or /end (group 2) | word (group 3).
+# The quotes stay in group 1 so that an empty string "" is still told apart from a comment
+_TOKEN = re.compile(rb'/\*.*?\*/|//[^\n]*|("[^"\\]*(?:\\.[^"\\]*)*")|/(begin|end)\s+\w+|([^\s"]+)', re.S)
+
+# ASAP2 positional parameters after the block name
+POSITIONAL_FIELDS = {
+    MEASUREMENT: ('description', 'datatype', 'compu_method', 'resolution', 'accuracy', 'lower_limit', 'upper_limit'),
+    CHARACTERISTIC: ('description', 'type', 'address', 'record_layout', 'max_diff', 'compu_method',
+                     'lower_limit', 'upper_limit'),
+    COMPU_METHOD: ('description', 'type', 'format', 'unit'),
+    RECORD_LAYOUT: (),
+}
+
+# Optional keyword -> (field, offset of the value after the keyword)
+KEYWORD_FIELDS = {
+    MEASUREMENT: {'ECU_ADDRESS': ('address', 1), 'PHYS_UNIT': ('unit', 1)},
+    CHARACTERISTIC: {'PHYS_UNIT': ('unit', 1)},
+    COMPU_METHOD: {},
+    RECORD_LAYOUT: {'FNC_VALUES': ('datatype', 2)},
+}
+
+# Attributes of a decoded symbol - the columns of the persistent symbol table
+SYMBOL_FIELDS = ('name', 'kind', 'module', 'description', 'type', 'datatype', 'address',
+                 'lower_limit', 'upper_limit', 'record_layout', 'compu_method', 'unit')
+
+ENCODING = 'latin-1'
+
+# Candidate shard boundary: a block of KINDS opened at the start of a line - normally directly inside a
+# MODULE. scan_blocks reports whether each boundary really was one; if not, the file is rescanned serially
+_SHARD_BOUNDARY = re.compile(rb'\n[ \t]*(/begin[ \t]+(?:MEASUREMENT|CHARACTERISTIC|COMPU_METHOD|RECORD_LAYOUT)\b)')
+
+# Open blocks at a shard boundary
+_SHARD_STACK = (b'PROJECT', b'MODULE')
+
+# A shard should hold about a second of work - smaller files and block counts are handled serially
+MIN_SHARD_BYTES = 16 << 20
+MIN_SHARD_BLOCKS = 25_000
+MAX_WORKERS = os.cpu_count() or 1
+
+# Fields taken from the block's own bytes - everything but the name, kind and module
+_BLOCK_FIELDS = SYMBOL_FIELDS[3:]
+
+
+def _text(value):
+    return value.decode(ENCODING) if isinstance(value, bytes) else value
+
+
+def parse_address(text):
+    """ECU address as an integer (hex '0x...' or decimal), None when missing or malformed"""
+    try:
+        return int(text, 0) if text else None
+    except ValueError:
+        return None
+
+
+def parse_limit(text):
+    """Limit as a float, NaN when missing or malformed"""
+    try:
+        return float(text) if text else float('nan')
+    except ValueError:
+        return float('nan')
+
+
+def scan_blocks(buffer, start=0, stop=None, inherited=False):
+    """
+    One pass over buffer from start: records every block of KINDS with its name, module and byte range
+    [offset of '/begin', offset after '/end KIND'). Returns (project, module names, symbols, state) where
+    symbols holds parallel lists 'names', 'kinds', 'modules', 'starts', 'ends' in file order and project
+    is None when no PROJECT was opened.
+
+    A shard scan (inherited=True) starts at a block directly inside a MODULE: PROJECT and MODULE are
+    already open and module 0 is that enclosing MODULE (name None - merge_shards fills it in). The scan
+    ends at the first structure token at or after stop; state holds what the next shard relies on:
+    'synced' (that token starts exactly at stop), the open 'stack' keywords and the current 'module'.
+    """
+    names, kinds, modules, starts, ends = [], [], [], [], []
+    module_names = [None] if inherited else []
+    project = None
+
+    # (keyword, kind code or None, offset, name) of every open block
+    stack = [(keyword, None, start, None) for keyword in _SHARD_STACK] if inherited else []
+    current_module = 0 if inherited else -1
+
+    stop = len(buffer) if stop is None else stop
+    synced = stop >= len(buffer)
+    for match in _STRUCTURE.finditer(buffer, start):
+        if match.start() >= stop:
+            synced = match.start() == stop
+            break
+        if match.lastindex is None:
+            continue  # Comment or string
+
+        keyword = match.group(2)
+        if match.group(1) == b'begin':
+            kind = _KIND_CODES.get(keyword)
+            name = None
+            if kind is not None or keyword in (b'MODULE', b'PROJECT'):
+                name_match = _BLOCK_NAME.match(buffer, match.end())
+                name = name_match.group(1) if name_match else b''
+                if keyword == b'MODULE':
+                    module_names.append(_text(name))
+                    current_module = len(module_names) - 1
+                elif keyword == b'PROJECT':
+                    project = _text(name)
+            stack.append((keyword, kind, match.start(), name))
+            continue
+
+        # /end: close the innermost open block of that keyword (tolerates a missing /end in between)
+        depth = len(stack) - 1
+        while depth >= 0 and stack[depth][0] != keyword:
+            depth -= 1
+        if depth < 0:
+            continue
+        opened, kind, offset, name = stack[depth]
+        del stack[depth:]
+
+        if kind is not None and name:
+            names.append(_text(name))
+            kinds.append(kind)
+            modules.append(current_module)
+            starts.append(offset)
+            ends.append(match.end())
+        elif opened == b'MODULE':
+            current_module = -1
+
+    symbols = {'names': names, 'kinds': kinds, 'modules': modules, 'starts': starts, 'ends': ends}
+    state = {'synced': synced, 'stack': tuple(entry[0] for entry in stack), 'module': current_module}
+    return project, module_names, symbols, state
+
+
+def shard_bounds(buffer, shards):
+    """Offsets [0, ..., len(buffer)] cutting buffer into about equal shards at candidate block boundaries"""
+    bounds = [0]
+    for k in range(1, shards):
+        match = _SHARD_BOUNDARY.search(buffer, max(len(buffer) * k // shards, bounds[-1]))
+        if match is None:
+            break
+        if match.start(1) > bounds[-1]:
+            bounds.append(match.start(1))
+    bounds.append(len(buffer))
+    return bounds
+
+
+def _scan_shard(path, start, stop):
+    """Worker: scan_blocks of one byte range of the file, mapped again in this process"""
+    buffer, mapping = A2LIndex.map_file(path)
+    try:
+        return scan_blocks(buffer, start, stop, inherited=start > 0)
+    finally:
+        if mapping is not None:
+            mapping.close()
+
+
+def merge_shards(shards):
+    """
+    Joins the scan_blocks results of consecutive shards into exactly the result of one serial scan:
+    symbols are concatenated in file order (so duplicate names resolve as in a serial parse - last
+    definition wins, own MODULE first), module 0 of a shard becomes the module the previous shard ended
+    in and the last PROJECT name wins. None when a boundary was not a block start directly inside a
+    MODULE (inside a comment, string or unclosed block) - the caller then scans serially.
+    """
+    project, module_names = None, []
+    merged = {'names': [], 'kinds': [], 'modules': [], 'starts': [], 'ends': []}
+    current = -1
+
+    for i, (shard_project, shard_modules, symbols, state) in enumerate(shards):
+        if i == 0:
+            remap = list(range(len(shard_modules)))
+        else:
+            previous = shards[i - 1][3]
+            if not previous['synced'] or previous['stack'] != _SHARD_STACK or current < 0:
+                return None
+            remap = [current] + list(range(len(module_names), len(module_names) + len(shard_modules) - 1))
+            shard_modules = shard_modules[1:]
+
+        module_names.extend(shard_modules)
+        if shard_project is not None:
+            project = shard_project
+        for key in ('names', 'kinds', 'starts', 'ends'):
+            merged[key].extend(symbols[key])
+        merged['modules'].extend(remap[module] if module >= 0 else -1 for module in symbols['modules'])
+        current = remap[state['module']] if state['module'] >= 0 else -1
+
+    return project, module_names, merged
+
+
+def scan_sharded(path, buffer, shards):
+    """scan_blocks of a whole file split into shards across a process pool; None when it has to be serial"""
+    bounds = shard_bounds(buffer, shards)
+    if len(bounds) < 3:
+        return None
+    try:
+        with ProcessPoolExecutor(max_workers=len(bounds) - 1) as pool:
+            results = list(pool.map(_scan_shard, repeat(str(path)), bounds[:-1], bounds[1:]))
+    except (OSError, NotImplementedError):
+        return None  # No process support - scanned serially
+    return merge_shards(results)
+
+
+def block_tokens(block):
+    """Top-level tokens of one block (after '/begin KIND'); nested blocks such as IF_DATA are skipped"""
+    tokens = []
+    depth = 0
+    for string, nested, word in _TOKEN.findall(block):
+        if nested:
+            depth += 1 if nested == b'begin' else -1
+        elif depth != 1:
+            continue  # Before the block's own /begin, or inside a nested block
+        elif word:
+            tokens.append(word.decode(ENCODING))
+        elif string:
+            tokens.append(string[1:-1].decode(ENCODING))
+    return tokens
+
+
+def block_fields(kind, block):
+    """Positional and keyword fields of one block, as written in it - references are not resolved"""
+    tokens = block_tokens(block)[1:]  # Skip the name
+    fields = dict(zip(POSITIONAL_FIELDS[kind], tokens))
+    keywords = KEYWORD_FIELDS[kind]
+    for i in range(len(POSITIONAL_FIELDS[kind]), len(tokens)):
+        target = keywords.get(tokens[i])
+        if target and i + target[1] < len(tokens):
+            fields.setdefault(target[0], tokens[i + target[1]])
+    return fields
+
+
+def _decode_shard(path, kinds, starts, ends):
+    """Worker: block_fields of a range of blocks as columns ('' when a field is missing)"""
+    buffer, mapping = A2LIndex.map_file(path)
+    try:
+        columns = {field: [] for field in _BLOCK_FIELDS}
+        for kind, start, end in zip(kinds, starts, ends):
+            fields = block_fields(int(kind), buffer[start:end])
+            for field in _BLOCK_FIELDS:
+                columns[field].append(fields.get(field, ''))
+        return columns
+    finally:
+        if mapping is not None:
+            mapping.close()
+
+
+class A2LIndex:
+    """
+    Byte-offset index of one A2L file. Lookups are case-insensitive (like A2LParser's OrdinalIgnoreCase
+    dictionaries); when a name is defined more than once for a kind, the last definition in file order
+    wins - the same rule as A2LParser, where a later block overwrites the dictionary entry.
+    """
+
+    def __init__(self, path, buffer, project, module_names, symbols, parse_ms=0.0, mapping=None):
+        self.path = str(path)
+        self.project = project
+        self.module_names = list(module_names)
+        self.names = np.array(symbols['names'], dtype=object)
+        self.kinds = np.array(symbols['kinds'], dtype=np.uint8)
+        self.modules = np.array(symbols['modules'], dtype=np.int16)
+        self.starts = np.array(symbols['starts'], dtype=np.int64)
+        self.ends = np.array(symbols['ends'], dtype=np.int64)
+        self.parse_ms = parse_ms
+        self._buffer = buffer
+        self._mapping = mapping
+        self._order = None
+        self._decoded = {}
+        self._references = {}
+
+    @staticmethod
+    def map_file(path):
+        """(buffer, mapping) of a file opened read-only; an empty file maps to b''"""
+        with open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b'', None  # Empty file - nothing to map
+        return mapping, mapping
+
+    @classmethod
+    def build(cls, path, workers=1):
+        """
+        Index of one file. With workers > 1 (None: one per CPU) a large file is scanned in byte-range
+        shards across a process pool; the merged index is identical to a serial scan
+        """
+        started = time.perf_counter()
+        buffer, mapping = cls.map_file(path)
+        shards = min(workers or MAX_WORKERS, len(buffer) // MIN_SHARD_BYTES)
+        scanned = scan_sharded(path, buffer, shards) if shards > 1 else None
+        if scanned is None:
+            scanned = scan_blocks(buffer)[:3]
+        project, module_names, symbols = scanned
+        return cls(path, buffer, project or '', module_names, symbols, (time.perf_counter() - started) * 1000,
+                   mapping)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def counts(self):
+        """Number of blocks of each kind"""
+        per_kind = np.bincount(self.kinds, minlength=len(KINDS))
+        return {kind: int(count) for kind, count in zip(KINDS, per_kind)}
+
+    def module_of(self, position):
+        module = self.modules[position]
+        return self.module_names[module] if module >= 0 else ''
+
+    def _sorted(self):
+        """Symbol positions sorted by (kind, name hash, position) - the lookup index, built on first use"""
+        if self._order is None:
+            hashes = hash_names(normalize_names(self.names))
+            order = np.lexsort((np.arange(len(self.names)), hashes, self.kinds))
+            self._sorted_hashes = hashes[order]
+            self._kind_bounds = np.searchsorted(self.kinds[order], np.arange(len(KINDS) + 1))
+            self._order = order
+        return self._order
+
+    def candidates(self, name, kind):
+        """Positions defining name for kind, in file order"""
+        order = self._sorted()
+        normalized = normalize_names([name])
+        lo, hi = self._kind_bounds[kind], self._kind_bounds[kind + 1]
+        hashes = self._sorted_hashes[lo:hi]
+        key = hash_names(normalized)
+        left, right = lo + np.searchsorted(hashes, key, 'left')[0], lo + np.searchsorted(hashes, key, 'right')[0]
+        return [int(position) for position in order[left:right] if self.names[position].lower() == normalized[0]]
+
+    def find(self, name, kind, module=None):
+        """
+        Position of the definition of name for kind, -1 when missing. With module, a definition in
+        that module is preferred (references from a block resolve inside their own MODULE first)
+        """
+        candidates = self.candidates(name, kind)
+        if not candidates:
+            return NOT_FOUND
+        if module is not None:
+            for position in reversed(candidates):
+                if self.modules[position] == module:
+                    return position
+        return candidates[-1]
+
+    def find_many(self, variables, kind):
+        """
+        Position of every variable's definition for kind (-1 when missing): one hash_array + two
+        searchsorted for the whole batch; the stored names confirm every hit
+        """
+        normalized = normalize_names(variables)
+        positions = np.full(len(normalized), NOT_FOUND, dtype=np.int64)
+        if len(self) == 0 or len(normalized) == 0:
+            return positions
+
+        order = self._sorted()
+        lo, hi = self._kind_bounds[kind], self._kind_bounds[kind + 1]
+        hashes = self._sorted_hashes[lo:hi]
+        keys = hash_names(normalized)
+        left, right = np.searchsorted(hashes, keys, 'left'), np.searchsorted(hashes, keys, 'right')
+        found = np.flatnonzero(right > left)
+        positions[found] = order[lo + right[found] - 1]  # Last definition in file order
+
+        mismatch = found[normalize_names(self.names[positions[found]]) != normalized[found]]
+        for i in mismatch:  # Hash collision - resolve by name
+            positions[i] = self.find(variables[i], kind)
+        return positions
+
+    def contains(self, variables):
+        """Bool per variable: defined as MEASUREMENT or CHARACTERISTIC"""
+        variables = list(variables)
+        return (self.find_many(variables, MEASUREMENT) >= 0) | (self.find_many(variables, CHARACTERISTIC) >= 0)
+
+    def block(self, position):
+        """Raw bytes of one block - a slice of the map, only as large as the block"""
+        return self._buffer[int(self.starts[position]):int(self.ends[position])]
+
+    def resolve(self, name, kind, module):
+        """find() for references between blocks - the same few layouts / compu methods are resolved repeatedly"""
+        key = (name, kind, module)
+        position = self._references.get(key)
+        if position is None:
+            position = self._references[key] = self.find(name, kind, module)
+        return position
+
+    def decode(self, position, memoize=True):
+        """
+        All SYMBOL_FIELDS of one block, decoded from its bytes. Referenced record layouts and compu
+        methods are always memoized; memoize=False keeps a bulk decode of every block from holding them all
+        """
+        symbol = self._decoded.get(position)
+        if symbol is not None:
+            return symbol
+
+        kind = int(self.kinds[position])
+        fields = block_fields(kind, self.block(position))
+        module = int(self.modules[position])
+        if kind == CHARACTERISTIC and 'record_layout' in fields:
+            layout = self.resolve(fields['record_layout'], RECORD_LAYOUT, module)
+            if layout >= 0:
+                fields.setdefault('datatype', self.decode(layout)['datatype'])
+        if kind in VARIABLE_KINDS and not fields.get('unit') and 'compu_method' in fields:
+            method = self.resolve(fields['compu_method'], COMPU_METHOD, module)
+            if method >= 0:
+                fields['unit'] = self.decode(method)['unit']
+
+        symbol = {field: fields.get(field, '') for field in SYMBOL_FIELDS}
+        symbol.update(name=self.names[position], kind=KINDS[kind], module=self.module_of(position),
+                      address=parse_address(fields.get('address')),
+                      lower_limit=parse_limit(fields.get('lower_limit')),
+                      upper_limit=parse_limit(fields.get('upper_limit')))
+        if memoize:
+            self._decoded[position] = symbol
+        return symbol
+
+    def decode_columns(self, workers=1):
+        """
+        decode() of every block as {field: list in position order} - the bulk path of the symbol table.
+        With workers > 1 (None: one per CPU) the blocks are tokenized in shards across a process pool;
+        references to record layouts and compu methods are then resolved here, as decode() does
+        """
+        count = len(self)
+        columns = None
+        shards = min(workers or MAX_WORKERS, count // MIN_SHARD_BLOCKS)
+        if shards > 1 and self._mapping is not None:
+            bounds = np.linspace(0, count, shards + 1).astype(np.int64)
+            ranges = [(self.kinds[lo:hi], self.starts[lo:hi], self.ends[lo:hi]) for lo, hi in zip(bounds, bounds[1:])]
+            try:
+                with ProcessPoolExecutor(max_workers=shards) as pool:
+                    parts = list(pool.map(_decode_shard, repeat(self.path), *zip(*ranges)))
+                columns = {field: [value for part in parts for value in part[field]] for field in _BLOCK_FIELDS}
+            except (OSError, NotImplementedError):
+                pass  # No process support - decoded serially below
+        if columns is None:
+            columns = {field: [] for field in _BLOCK_FIELDS}
+            for position in range(count):
+                fields = block_fields(int(self.kinds[position]), self.block(position))
+                for field in _BLOCK_FIELDS:
+                    columns[field].append(fields.get(field, ''))
+
+        # Only characteristics and variables change below; the layouts and compu methods they read do not
+        datatypes, units = columns['datatype'], columns['unit']
+        for position, kind in enumerate(self.kinds.tolist()):
+            module = int(self.modules[position])
+            if kind == CHARACTERISTIC and columns['record_layout'][position]:
+                layout = self.resolve(columns['record_layout'][position], RECORD_LAYOUT, module)
+                datatypes[position] = datatypes[layout] if layout >= 0 else ''
+            if kind in VARIABLE_KINDS and not units[position] and columns['compu_method'][position]:
+                method = self.resolve(columns['compu_method'][position], COMPU_METHOD, module)
+                if method >= 0:
+                    units[position] = units[method]
+
+        columns['address'] = [parse_address(value) for value in columns['address']]
+        for field in ('lower_limit', 'upper_limit'):
+            columns[field] = [parse_limit(value) for value in columns[field]]
+        columns['name'] = self.names.tolist()
+        columns['kind'] = [KINDS[kind] for kind in self.kinds.tolist()]
+        columns['module'] = [self.module_of(position) for position in range(count)]
+        return columns
+
+    def lookup(self, variable):
+        """Decoded MEASUREMENT and/or CHARACTERISTIC of a variable - empty when not in the A2L"""
+        return self.lookup_many([variable])[variable]
+
+    def lookup_many(self, variables):
+        """Decoded symbols of a batch of variables, located with find_many"""
+        variables = list(variables)
+        per_kind = [self.find_many(variables, kind) for kind in VARIABLE_KINDS]
+        return {variable: [self.decode(int(positions[i])) for positions in per_kind if positions[i] >= 0]
+                for i, variable in enumerate(variables)}
+
+
+def format_symbol(symbol):
+    address = f"0x{symbol['address']:X}" if symbol['address'] is not None else '-'
+    return (f"{symbol['kind']} {symbol['name']} [{symbol['module']}] {symbol['datatype'] or symbol['type']} "
+            f"@ {address}, {symbol['lower_limit']:g} .. {symbol['upper_limit']:g} {symbol['unit']}".rstrip())
+
+
+def parse_arguments(argv):
+    """A2L path, variables to look up and --workers N"""
+    parser = argparse.ArgumentParser(description="Index an A2L file; without variables print its block counts")
+    parser.add_argument('file', metavar='file.a2l')
+    parser.add_argument('variables', nargs='*', metavar='variable')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="scan large files in shards across N processes (0: one per CPU)")
+    return vars(parser.parse_intermixed_args(argv))
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    path, variables = options['file'], options['variables']
+    with A2LIndex.build(path, options['workers'] or None) as index:
+        counts = ', '.join(f"{count:,} {kind}" for kind, count in index.counts().items())
+        print(f"✅ {Path(path).name}: {counts} ({index.parse_ms:.0f}ms)")
+
+        started = time.perf_counter()
+        for variable in variables:
+            symbols = index.lookup(variable)
+            if not symbols:
+                print(f"  ❌ {variable}")
+            for symbol in symbols:
+                print(f"  ✅ {format_symbol(symbol)}")
+        if variables:
+            print(f"⏱️  {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Persistent A2L Symbol Table
+Keeps every decoded A2L block (name -> kind, address, datatype, limits, record layout, compu method)
+as an uncompressed Arrow IPC sidecar in .carasi_index/, keyed by the A2L content hash. Later sessions
+and worker processes memory-map the same file read-only: a lookup searches the mapped hash column in
+place and only the rows it hits become Python values - nothing is parsed or deserialized up front
+"""
+
+import argparse
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from a2l_index import CHARACTERISTIC, KINDS, MEASUREMENT, VARIABLE_KINDS, A2LIndex, format_symbol
+from carasi_index import NOT_FOUND, hash_names, normalize_names
+from workbook_store import cached_content_hash, read_arrow, store_dir, write_arrow
+
+# Bump when the symbol table layout changes - older sidecars are then rebuilt
+STORE_VERSION = 1
+
+# Symbol field -> table column
+SYMBOL_COLUMNS = {
+    'name': 'Name', 'kind': 'Kind', 'module': 'Module', 'description': 'Description', 'type': 'Type',
+    'datatype': 'Datatype', 'address': 'Address', 'lower_limit': 'LowerLimit', 'upper_limit': 'UpperLimit',
+    'record_layout': 'RecordLayout', 'compu_method': 'CompuMethod', 'unit': 'Unit',
+}
+
+
+def symbol_table_path(path, content_hash):
+    return store_dir(path) / f"{Path(path).name}.{content_hash[:16]}.a2l.v{STORE_VERSION}.symbols.arrow"
+
+
+def build_symbol_table(index, workers=1):
+    """
+    Arrow table of every block of an A2LIndex, sorted by (kind, name hash, file position) so that a
+    lookup is a searchsorted over the Hash column and the last row of a name is its last definition.
+    workers > 1 decodes the blocks in shards across a process pool (A2LIndex.decode_columns)
+    """
+    import pyarrow as pa
+
+    count = len(index)
+    columns = index.decode_columns(workers)
+
+    normalized = normalize_names(index.names)
+    hashes = hash_names(normalized)
+    order = np.lexsort((np.arange(count), hashes, index.kinds))
+
+    def ordered(values, type=None):
+        return pa.array(values, type=type).take(pa.array(order))
+
+    arrays = {
+        'Hash': pa.array(hashes[order]),
+        'Kind': pa.array(index.kinds[order]),
+        'Key': ordered(normalized.tolist(), pa.string()),
+        'Position': pa.array(order.astype(np.int64)),
+        'Start': pa.array(index.starts[order]),
+        'End': pa.array(index.ends[order]),
+    }
+    for field, column in SYMBOL_COLUMNS.items():
+        if field == 'kind':
+            continue  # Stored as the Kind code
+        if field == 'address':
+            arrays[column] = ordered(columns[field], pa.uint64())
+        elif field in ('lower_limit', 'upper_limit'):
+            arrays[column] = ordered(columns[field], pa.float64())
+        else:
+            arrays[column] = ordered(columns[field], pa.string())
+    return pa.table(arrays)
+
+
+class A2LSymbolTable:
+    """
+    Symbol table of one A2L content, usually memory-mapped from its sidecar. Same lookup interface as
+    A2LIndex (lookup / lookup_many / contains, SYMBOL_FIELDS dicts) and the same rules: case-insensitive,
+    last definition in file order wins.
+    """
+
+    def __init__(self, path, table, content_hash=None, project=''):
+        self.path = str(path)
+        self.table = table
+        self.content_hash = content_hash
+        self.project = project
+        self.hashes = table.column('Hash').to_numpy()
+        self._kinds = table.column('Kind').to_numpy()
+        self._kind_bounds = np.searchsorted(self._kinds, np.arange(len(KINDS) + 1))
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def counts(self):
+        return {kind: int(self._kind_bounds[code + 1] - self._kind_bounds[code]) for code, kind in enumerate(KINDS)}
+
+    def find_many(self, variables, kind):
+        """Table row of every variable's last definition for kind (-1 when missing)"""
+        normalized = normalize_names(variables)
+        rows = np.full(len(normalized), NOT_FOUND, dtype=np.int64)
+        if len(self) == 0 or len(normalized) == 0:
+            return rows
+
+        lo, hi = self._kind_bounds[kind], self._kind_bounds[kind + 1]
+        hashes = self.hashes[lo:hi]
+        keys = hash_names(normalized)
+        left, right = np.searchsorted(hashes, keys, 'left'), np.searchsorted(hashes, keys, 'right')
+        found = np.flatnonzero(right > left)
+        rows[found] = lo + right[found] - 1
+
+        # Confirm hits by name; on a hash collision walk back through the equal-hash run
+        stored = self.table.column('Key').take(rows[found]).to_numpy(zero_copy_only=False)
+        for i in found[stored != normalized[found]]:
+            run = range(lo + right[i] - 1, lo + left[i] - 1, -1)
+            rows[i] = next((row for row in run if self.table.column('Key')[row].as_py() == normalized[i]), NOT_FOUND)
+        return rows
+
+    def contains(self, variables):
+        """Bool per variable: defined as MEASUREMENT or CHARACTERISTIC"""
+        variables = list(variables)
+        return (self.find_many(variables, MEASUREMENT) >= 0) | (self.find_many(variables, CHARACTERISTIC) >= 0)
+
+    def symbols(self, rows):
+        """SYMBOL_FIELDS dicts of table rows - only these rows are converted"""
+        records = self.table.take(np.asarray(rows, dtype=np.int64)).to_pylist()
+        return [{field: KINDS[record['Kind']] if field == 'kind' else record[column]
+                 for field, column in SYMBOL_COLUMNS.items()} for record in records]
+
+    def lookup_many(self, variables):
+        variables = list(variables)
+        per_kind = [self.find_many(variables, kind) for kind in VARIABLE_KINDS]
+        hits = [(i, int(rows[i])) for i in range(len(variables)) for rows in per_kind if rows[i] >= 0]
+        results = {variable: [] for variable in variables}
+        for (i, _), symbol in zip(hits, self.symbols([row for _, row in hits])):
+            results[variables[i]].append(symbol)
+        return results
+
+    def lookup(self, variable):
+        return self.lookup_many([variable])[variable]
+
+
+def open_symbol_table(path, content_hash=None):
+    """A2LSymbolTable from an existing sidecar (None when there is none)"""
+    content_hash = content_hash or cached_content_hash(path)
+    table_path = symbol_table_path(path, content_hash)
+    if not table_path.exists():
+        return None
+    table = read_arrow(table_path)
+    metadata = table.schema.metadata or {}
+    return A2LSymbolTable(path, table, content_hash, json.loads(metadata.get(b'project', b'""')))
+
+
+def stored_tables(path):
+    """Symbol table sidecars of every stored content of an A2L file (not the C# line index next to them)"""
+    return store_dir(path).glob(f"{glob.escape(Path(path).name)}.*.a2l.v*.symbols.arrow")
+
+
+def write_symbol_table(path, content_hash, table, project):
+    """Write the sidecar of one A2L content and drop those of older contents"""
+    table_path = symbol_table_path(path, content_hash)
+    table_path.parent.mkdir(exist_ok=True)
+    write_arrow(table, table_path, {'project': project})
+
+    for stale in stored_tables(path):
+        if stale != table_path:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def load_a2l(path, use_store=True, workers=None):
+    """
+    Symbol source of an A2L file: the memory-mapped sidecar when the content is stored, otherwise the
+    file is indexed, decoded once and written to the store. Without pyarrow (or with use_store False)
+    the A2LIndex itself is returned; with a read-only folder the table is kept in memory only.
+    A cold build scans and decodes large files across a process pool of workers (default: one per CPU).
+    """
+    if not use_store:
+        return A2LIndex.build(path, workers)
+
+    try:
+        content_hash = cached_content_hash(path)
+        stored = open_symbol_table(path, content_hash)
+        if stored is not None:
+            return stored
+        import pyarrow  # noqa: F401 - the table needs it
+    except (ImportError, OSError, ValueError, KeyError):
+        return A2LIndex.build(path, workers)  # No pyarrow or unreadable sidecar - index directly
+
+    with A2LIndex.build(path, workers) as index:
+        table = build_symbol_table(index, workers)
+        project = index.project
+    try:
+        write_symbol_table(path, content_hash, table, project)
+    except OSError:
+        pass  # The store is an optimisation only
+    return A2LSymbolTable(path, table, content_hash, project)
+
+
+def parse_arguments(argv):
+    """A2L paths plus --rebuild, --find var1,var2, --workers N and --serial"""
+    parser = argparse.ArgumentParser(description="Build or reuse the Arrow symbol table of A2L files")
+    parser.add_argument('files', nargs='*', metavar='file.a2l')
+    parser.add_argument('--rebuild', action='store_true', help="drop the stored symbol table first")
+    parser.add_argument('--find', default='', metavar='VAR1,VAR2', help="variables to look up")
+    parser.add_argument('--workers', type=int, metavar='N', help="scan processes (0: one per CPU)")
+    parser.add_argument('--serial', dest='workers', action='store_const', const=1, help="same as --workers 1")
+    options = vars(parser.parse_intermixed_args(argv))
+    options['find'] = [name for name in options['find'].split(',') if name.strip()]
+    options['workers'] = options['workers'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    if not options['files']:
+        print("Usage: python a2l_store.py <file.a2l> [<file.a2l> ...] [--rebuild] [--find var1,var2] "
+              "[--workers N] [--serial]")
+        return
+
+    for path in options['files']:
+        if options['rebuild']:
+            for stale in stored_tables(path):
+                stale.unlink()
+        started = time.perf_counter()
+        symbols = load_a2l(path, workers=options['workers'])
+        elapsed = (time.perf_counter() - started) * 1000
+        counts = ', '.join(f"{count:,} {kind}" for kind, count in symbols.counts().items())
+        print(f"✅ {Path(path).name}: {counts} in {elapsed:.1f}ms")
+
+        for variable, found in symbols.lookup_many(options['find']).items():
+            if not found:
+                print(f"  ❌ {variable}")
+            for symbol in found:
+                print(f"  ✅ {format_symbol(symbol)}")
+
+
+if __name__ == "__main__":
+    main()
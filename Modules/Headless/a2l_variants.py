@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Multi-A2L Variant Lookup and Diff
+Opens the A2L of every project variant once (through the symbol store) and answers, for thousands of
+variables at a time, which variants define each one and whether its kind, address, datatype or limits
+differ between them. Every variant is one vectorized find_many join; the comparison runs column-wise
+over the variables x variants matrix - the per-release calibration-impact check
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from a2l_index import CHARACTERISTIC, KINDS, MEASUREMENT, VARIABLE_KINDS
+from a2l_store import A2LSymbolTable, load_a2l
+from carasi_index import normalize_names
+from check_existence import read_variables
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+input_dir = os.path.join(project_root, 'Input')
+
+# Attributes compared between variants -> report label
+COMPARED_FIELDS = {'kind': 'Kind', 'address': 'Address', 'datatype': 'Datatype',
+                   'lower_limit': 'LowerLimit', 'upper_limit': 'UpperLimit'}
+
+# Above this many variables only the summary is printed (use --csv for the full matrix)
+MAX_PRINTED_VARIABLES = 50
+
+
+def find_a2l_files(directory):
+    return [str(path) for path in sorted(Path(directory).glob('*.a2l'))]
+
+
+def variant_names(paths):
+    """Column name of every variant - the file name, with the parent folder when two files share it"""
+    names = [Path(path).name for path in paths]
+    return [f"{Path(path).parent.name}/{name}" if names.count(name) > 1 else name for path, name in zip(paths, names)]
+
+
+def unique_names(names):
+    """names without repeats as the lookups compare them (case-insensitive); first spelling and order kept"""
+    first = {}
+    for key, name in zip(normalize_names(names), names):
+        first.setdefault(key, name)
+    return list(first.values())
+
+
+def all_variables(sources):
+    """Every MEASUREMENT / CHARACTERISTIC name of the variants, first spelling kept, in variant and file order"""
+    variables = []
+    for source in sources:
+        if isinstance(source, A2LSymbolTable):
+            # The table is sorted for lookups - back to file order
+            order = np.argsort(source.table.column('Start').to_numpy(), kind='stable')
+            kinds = source.table.column('Kind').to_numpy()[order]
+            names = source.table.column('Name').to_numpy(zero_copy_only=False)[order]
+        else:
+            kinds, names = source.kinds, source.names
+        variables.extend(names[np.isin(kinds, VARIABLE_KINDS)])
+    return unique_names(variables)
+
+
+def variable_rows(source, variables):
+    """Row (table) or position (index) of every variable: its MEASUREMENT, else its CHARACTERISTIC, else -1"""
+    rows = source.find_many(variables, MEASUREMENT)
+    missing = np.flatnonzero(rows < 0)
+    if len(missing):
+        rows[missing] = source.find_many([variables[i] for i in missing], CHARACTERISTIC)
+    return rows
+
+
+def variable_attributes(source, variables):
+    """(rows, {field: object array}) of COMPARED_FIELDS for every variable; None where it is missing"""
+    rows = variable_rows(source, variables)
+    found = np.flatnonzero(rows >= 0)
+    values = {field: np.full(len(variables), None, dtype=object) for field in COMPARED_FIELDS}
+
+    if isinstance(source, A2LSymbolTable):
+        hits = source.table.take(rows[found])
+        values['kind'][found] = np.array(KINDS, dtype=object)[hits.column('Kind').to_numpy()]
+        values['address'][found] = hits.column('Address').to_pylist()
+        values['datatype'][found] = hits.column('Datatype').to_numpy(zero_copy_only=False)
+        values['lower_limit'][found] = hits.column('LowerLimit').to_numpy()
+        values['upper_limit'][found] = hits.column('UpperLimit').to_numpy()
+    else:
+        for i in found:
+            symbol = source.decode(int(rows[i]))
+            for field in COMPARED_FIELDS:
+                values[field][i] = symbol[field]
+    return rows, values
+
+
+def compare_variants(variables, sources, names):
+    """
+    (matrix, details) for a list of variables over the symbol sources of N variants.
+    matrix: one row per variable - a presence column per variant, Present (count) and Differs
+    (the differing fields, comma-separated; '' when every variant that defines it agrees).
+    details: one row per differing (variable, field) with the value in every variant ('' when missing).
+    """
+    attributes = [variable_attributes(source, variables) for source in sources]
+    present = np.column_stack([rows >= 0 for rows, _ in attributes]) if attributes \
+        else np.zeros((len(variables), 0), dtype=bool)
+
+    # Reference value: the first variant that defines the variable; NaN limits compare equal
+    first = present.argmax(axis=1) if len(names) else np.zeros(len(variables), dtype=np.int64)
+    differs, matrices = {}, {}
+    for field in COMPARED_FIELDS:
+        values = np.column_stack([columns[field] for _, columns in attributes]) if attributes \
+            else np.empty((len(variables), 0), dtype=object)
+        reference = values[np.arange(len(variables)), first] if len(names) else np.empty(0, dtype=object)
+        missing = pd.isna(values)
+        equal = (values == reference[:, None]) | (missing & pd.isna(reference)[:, None])
+        differs[field] = (present & ~equal).any(axis=1)
+        matrices[field] = values
+
+    matrix = pd.DataFrame({'Variable': variables})
+    for i, name in enumerate(names):
+        matrix[name] = present[:, i]
+    matrix['Present'] = present.sum(axis=1)
+    labels = np.array(list(COMPARED_FIELDS.values()), dtype=object)
+    flags = np.column_stack([differs[field] for field in COMPARED_FIELDS])
+    matrix['Differs'] = [', '.join(labels[row]) for row in flags]
+
+    details = []
+    for field, label in COMPARED_FIELDS.items():
+        rows = np.flatnonzero(differs[field])
+        if not len(rows):
+            continue
+        detail = pd.DataFrame({'Variable': np.asarray(variables, dtype=object)[rows], 'Field': label})
+        for i, name in enumerate(names):
+            detail[name] = [format_value(field, value) if present[row, i] else '' for row, value
+                            in zip(rows, matrices[field][rows, i])]
+        details.append(detail)
+    details = pd.concat(details, ignore_index=True) if details \
+        else pd.DataFrame(columns=['Variable', 'Field', *names])
+    return matrix, details
+
+
+def format_value(field, value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return '-'
+    if field == 'address':
+        return f"0x{int(value):X}"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def print_result(matrix, details, names):
+    print(f"\n📋 VARIANT MATRIX ({len(matrix)} variables x {len(names)} variants):")
+    if len(matrix) <= MAX_PRINTED_VARIABLES:
+        for _, row in matrix.iterrows():
+            marks = ' '.join('✅' if row[name] else '❌' for name in names)
+            diff = f"  ✏️  {row['Differs']}" if row['Differs'] else ""
+            print(f"  {marks}  {row['Variable']}{diff}")
+        print(f"  Columns: {', '.join(names)}")
+
+    print(f"\n📊 SUMMARY:")
+    for name in names:
+        print(f"  🔹 {name}: {int(matrix[name].sum())}/{len(matrix)} found")
+    print(f"  🔹 In every variant: {int((matrix['Present'] == len(names)).sum())}, "
+          f"in none: {int((matrix['Present'] == 0).sum())}")
+    changed = matrix['Differs'] != ''
+    print(f"  ✏️  Differing between variants: {int(changed.sum())}")
+    if len(details):
+        print("  📋 Differing fields: " + ", ".join(f"{field} {count}"
+                                                  for field, count in details['Field'].value_counts().items()))
+
+
+def parse_arguments(argv):
+    """Variable files/lists or --all, plus --a2l (repeatable), --input DIR, --csv, --details, --no-store, --workers N"""
+    parser = argparse.ArgumentParser(description="Look up variables in every A2L variant and diff their attributes")
+    parser.add_argument('variables', nargs='*', metavar='variables.txt|name1,name2')
+    parser.add_argument('--all', action='store_true', help="every MEASUREMENT / CHARACTERISTIC of the variants")
+    parser.add_argument('--a2l', action='append', default=[], metavar='X.a2l', help="variant A2L (repeatable)")
+    parser.add_argument('--input', metavar='DIR', help="folder searched when no --a2l is given")
+    parser.add_argument('--csv', metavar='FILE', help="export the variant matrix")
+    parser.add_argument('--details', metavar='FILE', help="export the differing values")
+    parser.add_argument('--no-store', dest='use_store', action='store_false', help="parse without the symbol store")
+    parser.add_argument('--workers', type=int, metavar='N', help="scan processes (0: one per CPU)")
+    parser.add_argument('--serial', dest='workers', action='store_const', const=1, help="same as --workers 1")
+    options = vars(parser.parse_intermixed_args(argv))
+    options['workers'] = options['workers'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    if not options['variables'] and not options['all']:
+        print("Usage: python a2l_variants.py <variables.txt | name1,name2 | --all> [--a2l X.a2l ...] "
+              "[--input DIR] [--csv matrix.csv] [--details diff.csv] [--no-store] [--workers N] [--serial]")
+        sys.exit(2)
+
+    paths = options['a2l'] or find_a2l_files(options['input'] or input_dir)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing or not paths:
+        print(f"❌ A2L not found: {', '.join(missing) if missing else options['input'] or input_dir}")
+        sys.exit(1)
+
+    names = variant_names(paths)
+    print(f"🧬 A2L VARIANT DIFF ({len(paths)} variants)")
+    print("=" * 70)
+
+    sources = []
+    for path, name in zip(paths, names):
+        started = time.perf_counter()
+        sources.append(load_a2l(path, options['use_store'], options['workers']))
+        counts = ', '.join(f"{count:,} {kind}" for kind, count in sources[-1].counts().items() if count)
+        print(f"✅ {name}: {counts or 'no blocks'} in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    variables = read_variables(options['variables'])
+    if options['all']:
+        variables = unique_names(variables + all_variables(sources))
+
+    started = time.perf_counter()
+    matrix, details = compare_variants(variables, sources, names)
+    print(f"⏱️  {len(variables)} variables x {len(names)} variants compared in "
+          f"{(time.perf_counter() - started) * 1000:.1f}ms")
+    print_result(matrix, details, names)
+
+    if options['csv']:
+        matrix.to_csv(options['csv'], index=False)
+        print(f"\n💾 Matrix exported to {options['csv']}")
+    if options['details']:
+        details.to_csv(options['details'], index=False)
+        print(f"💾 Differences exported to {options['details']}")
+
+    for source in sources:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
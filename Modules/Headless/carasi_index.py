@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Shared CARASI / Dataflow Workbook Index
+Reads the Carasi_Interface / Dataflow_Interface rows the C# forms display without Excel or the
+ACE OLEDB driver, and answers existence checks with a hashed name -> row offset index
+"""
+
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from xlsx_stream import XlsxReader
+
+# Sheet and column names used by Excel_Parser / EPPlusExcelParser
+CARASI_INTERFACES_SHEET = 'Interfaces'
+CARASI_DICTIONARY_SHEET = 'Dictionary'
+CARASI_LABEL_COLUMN = 'SSTG label'
+DATAFLOW_MAPPING_SHEET = 'Mapping'
+
+# Interfaces sheet positions read by UC_Carasi.setValue_UC (SSTG label is column 4)
+INTERFACE_FUNCTION_COLUMN = 1
+INTERFACE_IO_COLUMN = 3
+CARASI_LABEL_POSITION = 4
+INTERFACE_DESCRIPTION_COLUMN = 5
+CARASI_INPUT_KINDS = ('input', 'calib', 'local')
+
+# Dictionary sheet positions of the Carasi_Interface properties (SSTG label is column 2)
+DICTIONARY_LABEL_COLUMN = 2
+CARASI_DICTIONARY_FIELDS = {
+    'unit': 4, 'computeDetails': 6, 'minValue': 7, 'maxValue': 8, 'resolution': 9,
+    'initialisation': 10, 'swType': 14, 'conversion': 15, 'mmType': 17, 'comments': 18,
+}
+
+# Mapping sheet positions of the Dataflow_Interface fields (UC_dataflow.dataGridView_DF cells).
+# OLEDB (HDR=YES) names the unlabeled name columns F2 (PSA name) and F17 (Bosch name)
+DATAFLOW_FIELDS = {
+    'status': 0, 'PSAname': 1, 'description': 2,
+    'PSAswType': 5, 'PSAunit': 6, 'PSAconversion': 7, 'PSAresolution': 8,
+    'PSAminValue': 9, 'PSAmaxValue': 10, 'PSAoffset': 11, 'PSAinitialisation': 12,
+    'Rte_Direction': 15, 'Boschname': 16,
+    'BoschswType': 19, 'Boschunit': 20, 'Boschconversion': 21, 'Boschresolution': 22,
+    'BoschminValue': 23, 'BoschmaxValue': 24, 'Boschoffset': 25, 'Boschinitialisation': 28,
+    'MappingType': 29, 'Pseudo_code': 31, 'System_constant': 34,
+    'Producer': 82, 'Consumers': 83, 'FC_Name': 89,
+}
+DATAFLOW_NAME_FIELDS = ('PSAname', 'Boschname')
+
+# Column positions each sheet is read for - an xlsx is streamed with only these columns filled
+SHEET_COLUMNS = {
+    CARASI_INTERFACES_SHEET: [INTERFACE_FUNCTION_COLUMN, INTERFACE_IO_COLUMN, CARASI_LABEL_POSITION,
+                              INTERFACE_DESCRIPTION_COLUMN],
+    CARASI_DICTIONARY_SHEET: [DICTIONARY_LABEL_COLUMN] + list(CARASI_DICTIONARY_FIELDS.values()),
+    DATAFLOW_MAPPING_SHEET: list(DATAFLOW_FIELDS.values()),
+}
+
+CARASI = 'carasi'
+DATAFLOW = 'dataflow'
+
+# (sheet, column positions) holding the interface names of each workbook kind
+NAME_COLUMNS = {
+    CARASI: (CARASI_INTERFACES_SHEET, [CARASI_LABEL_POSITION]),
+    DATAFLOW: (DATAFLOW_MAPPING_SHEET, [DATAFLOW_FIELDS[field] for field in DATAFLOW_NAME_FIELDS]),
+}
+
+# Excel row of the first data row (row 1 is the header)
+FIRST_DATA_ROW = 2
+
+# Fixed key so name hashes are identical across runs and machines
+HASH_KEY = '0123456789123456'
+NOT_FOUND = -1
+
+
+def workbook_kind(path):
+    """'carasi' or 'dataflow' from the file name - same rule as Excel_Parser.search_Variable"""
+    name = Path(path).name.lower()
+    if CARASI in name:
+        return CARASI
+    if DATAFLOW in name:
+        return DATAFLOW
+    return None
+
+
+def normalize_names(values):
+    """
+    Names as compared by the existing checks: Jet SQL text comparison and EPPlusExcelParser
+    (OrdinalIgnoreCase) are case-insensitive; surrounding whitespace is dropped
+    """
+    series = pd.Series(values, dtype='object').fillna('').astype(str)
+    return series.str.strip().str.lower().to_numpy(dtype=object)
+
+
+def hash_names(normalized):
+    """Stable 64-bit hash of already normalized names"""
+    return pd.util.hash_array(np.asarray(normalized, dtype=object), hash_key=HASH_KEY, categorize=False)
+
+
+class NameIndex:
+    """
+    Sorted 64-bit name hashes with the interface table offset of every name.
+    A batch lookup is one hash_array + one searchsorted over all queries; the stored names
+    confirm every hit so a hash collision can never report a false match.
+    """
+
+    def __init__(self, hashes, rows, names):
+        self.hashes = hashes
+        self.rows = rows
+        self.names = names
+
+    @classmethod
+    def from_names(cls, names, rows=None):
+        normalized = normalize_names(names)
+        rows = np.arange(len(normalized)) if rows is None else np.asarray(rows)
+        valid = normalized != ''
+        normalized, rows = normalized[valid], rows[valid].astype('int32')
+
+        hashes = hash_names(normalized)
+        order = np.lexsort((rows, hashes))  # By hash, then by offset - the first hit is the first row
+        return cls(hashes[order], rows[order], normalized[order])
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def _positions(self, queries):
+        normalized = normalize_names(queries)
+        if len(self.hashes) == 0:
+            return np.full(len(normalized), NOT_FOUND), normalized
+        positions = np.searchsorted(self.hashes, hash_names(normalized), side='left')
+        inside = positions < len(self.hashes)
+        clipped = np.where(inside, positions, 0)
+        hit = inside & (self.names[clipped] == normalized)
+        return np.where(hit, positions, NOT_FOUND), normalized
+
+    def contains(self, queries):
+        """Boolean array: does each query name exist"""
+        positions, _ = self._positions(queries)
+        return positions != NOT_FOUND
+
+    def first_rows(self, queries):
+        """Offset of the first occurrence of each query name (NOT_FOUND if absent)"""
+        positions, _ = self._positions(queries)
+        return np.where(positions != NOT_FOUND, self.rows[np.maximum(positions, 0)], NOT_FOUND)
+
+    def rows_for(self, name):
+        """Every offset holding the name"""
+        positions, normalized = self._positions([name])
+        if positions[0] == NOT_FOUND:
+            return np.empty(0, dtype='int32')
+        start = positions[0]
+        end = np.searchsorted(self.hashes, self.hashes[start], side='right')
+        return self.rows[start:end][self.names[start:end] == normalized[0]]
+
+
+def _as_text(table):
+    """Every field except Row as text - empty cells become '' like DBNull.ToString()"""
+    return table.fillna('').astype({column: str for column in table.columns if column != 'Row'})
+
+
+def read_sheet(path, sheet, all_columns=False):
+    """
+    Cells of one sheet as strings (header row 1) - other sheets are not parsed. An xlsx is streamed
+    and only the SHEET_COLUMNS of the sheet are filled unless all_columns; other formats go through pandas
+    """
+    return read_sheets(path, [sheet], all_columns)[sheet]
+
+
+def read_sheets(path, sheets, all_columns=False):
+    """Sheet -> frame for several sheets of one workbook, sharing one open archive and string table"""
+    if zipfile.is_zipfile(path):
+        with XlsxReader(path) as reader:
+            return {sheet: reader.read_frame(sheet, None if all_columns else SHEET_COLUMNS.get(sheet))
+                    for sheet in sheets}
+    # Only empty cells are missing values - 'NA' or 'NULL' typed in a cell stays text, like OLEDB reads it
+    return {sheet: pd.read_excel(path, sheet_name=sheet, header=0, dtype=str, keep_default_na=False, na_values=[''])
+            for sheet in sheets}
+
+
+def carasi_interface_part(rows):
+    """
+    Interfaces-sheet fields of every Carasi_Interface, indexed by normalized SSTG label, combined
+    the way UC_Carasi.setValue_UC does: input/calib/local function names go to input (';'-joined),
+    the output function to output. Row is the first Interfaces row of the label (from the frame index,
+    so a subset of the sheet keeps its Excel rows).
+    """
+    rows = pd.DataFrame({
+        'Row': rows.index.to_numpy() + FIRST_DATA_ROW,
+        'Key': normalize_names(rows[CARASI_LABEL_COLUMN]),
+        'Name': rows[CARASI_LABEL_COLUMN].fillna('').str.strip(),
+        'Function': rows.iloc[:, INTERFACE_FUNCTION_COLUMN].fillna(''),
+        'IO': rows.iloc[:, INTERFACE_IO_COLUMN].fillna('').str.strip().str.lower(),
+        'Description': rows.iloc[:, INTERFACE_DESCRIPTION_COLUMN].fillna(''),
+    })
+    rows = rows[rows['Key'] != '']
+
+    grouped = rows.groupby('Key', sort=False)
+    consumers = rows[rows['IO'].isin(CARASI_INPUT_KINDS)].groupby('Key', sort=False)['Function'].agg(';'.join)
+    producers = rows[rows['IO'] == 'output'].groupby('Key', sort=False)['Function'].last()
+    part = pd.DataFrame({'Row': grouped['Row'].first(), 'name': grouped['Name'].first()})
+    part['input'] = consumers.reindex(part.index)
+    part['output'] = producers.reindex(part.index)
+    part['description'] = grouped['Description'].last()  # The form keeps the last row's description
+    return part.astype({'Row': 'int32'}).fillna('')
+
+
+def carasi_dictionary_part(dictionary):
+    """Dictionary-sheet properties of every label (first row wins), indexed by normalized SSTG label"""
+    keys = normalize_names(dictionary.iloc[:, DICTIONARY_LABEL_COLUMN])
+    part = pd.DataFrame(index=pd.Index(keys, name='Key'))
+    for field, position in CARASI_DICTIONARY_FIELDS.items():
+        part[field] = dictionary.iloc[:, position].to_numpy() if position < dictionary.shape[1] else None
+    part = part[(part.index != '') & ~part.index.duplicated()]
+    return part.fillna('')
+
+
+def combine_carasi_parts(interface_part, dictionary_part):
+    """Carasi_Interface table: one row per Interfaces label, Dictionary properties joined on the label"""
+    interfaces = interface_part.join(dictionary_part.reindex(interface_part.index))
+    return _as_text(interfaces.reset_index(drop=True))
+
+
+def read_carasi_interfaces(path):
+    """One Carasi_Interface per SSTG label, properties from the first Dictionary row of the label"""
+    frames = read_sheets(path, [CARASI_INTERFACES_SHEET, CARASI_DICTIONARY_SHEET])
+    return combine_carasi_parts(carasi_interface_part(frames[CARASI_INTERFACES_SHEET]),
+                                carasi_dictionary_part(frames[CARASI_DICTIONARY_SHEET]))
+
+
+def dataflow_interfaces(mapping):
+    """One Dataflow_Interface per Mapping row, cells taken at the positions UC_dataflow reads"""
+    interfaces = pd.DataFrame({'Row': (mapping.index.to_numpy() + FIRST_DATA_ROW).astype('int32')})
+    for field, position in DATAFLOW_FIELDS.items():
+        interfaces[field] = mapping.iloc[:, position].to_numpy() if position < mapping.shape[1] else None
+    return _as_text(interfaces)
+
+
+def read_dataflow_interfaces(path):
+    return dataflow_interfaces(read_sheet(path, DATAFLOW_MAPPING_SHEET))
+
+
+def read_interfaces(path, kind=None):
+    """Interface table of a CARASI or Dataflow workbook"""
+    kind = kind or workbook_kind(path)
+    if kind == CARASI:
+        return read_carasi_interfaces(path)
+    if kind == DATAFLOW:
+        return read_dataflow_interfaces(path)
+    raise ValueError(f"{Path(path).name}: file name must contain 'carasi' or 'dataflow'")
+
+
+def interface_names(interfaces, kind):
+    """(names, offsets) the name index is built from - Dataflow rows are found by PSA or Bosch name"""
+    offsets = np.arange(len(interfaces), dtype='int32')
+    if kind == CARASI:
+        return interfaces['name'].to_numpy(dtype=object), offsets
+    names = np.concatenate([interfaces[field].to_numpy(dtype=object) for field in DATAFLOW_NAME_FIELDS])
+    return names, np.tile(offsets, len(DATAFLOW_NAME_FIELDS))
+
+
+class WorkbookIndex:
+    """Interface table of one CARASI or Dataflow workbook plus its name -> row offset index"""
+
+    def __init__(self, path, kind, interfaces, index):
+        self.path = str(path)
+        self.name = Path(path).name
+        self.kind = kind
+        self._interfaces = interfaces
+        self.index = index
+
+    @classmethod
+    def build(cls, path, kind=None):
+        kind = kind or workbook_kind(path)
+        interfaces = read_interfaces(path, kind)
+        return cls(path, kind, interfaces, NameIndex.from_names(*interface_names(interfaces, kind)))
+
+    @property
+    def interfaces(self):
+        """Interface table as a DataFrame (a stored Arrow table is converted on first use)"""
+        if not isinstance(self._interfaces, pd.DataFrame):
+            self._interfaces = self._interfaces.to_pandas()
+        return self._interfaces
+
+    @property
+    def row_count(self):
+        return len(self._interfaces)
+
+    def exists(self, variables):
+        """Dict variable -> bool, the shape returned by _IsExist_Carasi_Batch / _IsExist_Dataflow_Batch"""
+        return dict(zip(variables, self.index.contains(variables).tolist()))
+
+    def first_rows(self, variables):
+        """Excel row of the first interface matching each variable (NOT_FOUND if absent)"""
+        offsets = self.index.first_rows(variables)
+        rows = self.interfaces['Row'].to_numpy()
+        return np.where(offsets != NOT_FOUND, rows[np.maximum(offsets, 0)], NOT_FOUND)
+
+    def lookup(self, variable):
+        """Interface table rows of one variable (Dataflow may list a signal on several rows)"""
+        return self.interfaces.iloc[self.index.rows_for(variable)]
+
+
+def find_first_rows(path, variables, kind=None):
+    """
+    Excel row of the first interface matching each variable (NOT_FOUND if absent) without building
+    the index: only the name columns are streamed and reading stops once every variable is found
+    """
+    kind = kind or workbook_kind(path)
+    if not zipfile.is_zipfile(path):
+        return dict(zip(variables, WorkbookIndex.build(path, kind).first_rows(variables).tolist()))
+
+    sheet, positions = NAME_COLUMNS[kind]
+    with XlsxReader(path) as reader:
+        found = reader.find_rows(sheet, positions, variables, columns=positions)
+    return {variable: found[variable][0] if variable in found else NOT_FOUND for variable in variables}
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python carasi_index.py <workbook.xlsx> <variable> [<variable> ...]")
+        return
+
+    started = time.perf_counter()
+    rows = find_first_rows(sys.argv[1], sys.argv[2:])
+    print(f"✅ {Path(sys.argv[1]).name} ({workbook_kind(sys.argv[1])}): "
+          f"{len(sys.argv) - 2} variables in {(time.perf_counter() - started) * 1000:.1f}ms")
+    for variable, row in rows.items():
+        print(f"  {'✅' if row != NOT_FOUND else '❌'} {variable}" + (f" (row {row})" if row != NOT_FOUND else ""))
+
+
+if __name__ == "__main__":
+    main()
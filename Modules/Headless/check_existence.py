@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Headless CARASI / Dataflow Existence Check
+Answers "does this interface exist" for thousands of variables against every workbook in one
+vectorized lookup per workbook - no Excel, no ACE OLEDB driver, runs on Linux build servers
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from carasi_index import CARASI, DATAFLOW, WorkbookIndex
+from parallel_loader import find_workbooks, load_workbooks
+
+# Default workbook folder (same Input/ folder the application is pointed at)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+input_dir = os.path.join(project_root, 'Input')
+
+# Above this many variables only the summary is printed (use --csv for the full table)
+MAX_PRINTED_VARIABLES = 50
+
+
+def read_variables(sources):
+    """Variable names from text files (one per line, # comments) or comma-separated arguments"""
+    variables = []
+    for source in sources:
+        if os.path.isfile(source):
+            with open(source, 'r', encoding='utf-8-sig') as f:
+                variables.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith('#'))
+        else:
+            variables.extend(name.strip() for name in source.split(',') if name.strip())
+    return list(dict.fromkeys(variables))
+
+
+def check_existence(variables, workbooks, use_store=True, workers=None):
+    """DataFrame: one row per variable, one bool column per workbook plus InCarasi / InDataflow"""
+    result = pd.DataFrame({'Variable': variables})
+    kinds = {}
+
+    # All workbooks are loaded up front, their sheets in parallel (see parallel_loader.py)
+    started = time.perf_counter()
+    if use_store:
+        loaded = {path: workbook for path, (workbook, _) in load_workbooks(workbooks, workers).items()}
+    else:
+        loaded = {path: WorkbookIndex.build(path, kind) for path, kind in workbooks}
+    print(f"✅ {len(loaded)} workbooks {'opened' if use_store else 'indexed'} in "
+          f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+    for path, kind in workbooks:
+        workbook = loaded[path]
+        started = time.perf_counter()
+        result[workbook.name] = workbook.index.contains(variables)
+        print(f"✅ {workbook.name}: {len(workbook.index)} names ({kind}), "
+              f"{len(variables)} lookups in {(time.perf_counter() - started) * 1000:.1f}ms")
+        kinds[workbook.name] = kind
+
+    for kind, column in [(CARASI, 'InCarasi'), (DATAFLOW, 'InDataflow')]:
+        names = [name for name, k in kinds.items() if k == kind]
+        result[column] = result[names].any(axis=1) if names else False
+    return result
+
+
+def print_result(result, workbook_names):
+    print(f"\n📋 EXISTENCE CHECK ({len(result)} variables):")
+    if len(result) <= MAX_PRINTED_VARIABLES:
+        for _, row in result.iterrows():
+            marks = ' '.join('✅' if row[name] else '❌' for name in workbook_names)
+            print(f"  {marks}  {row['Variable']}")
+        print(f"  Columns: {', '.join(workbook_names)}")
+
+    print(f"\n📊 SUMMARY:")
+    for name in workbook_names:
+        print(f"  🔹 {name}: {int(result[name].sum())}/{len(result)} found")
+    print(f"  🔹 In any CARASI: {int(result['InCarasi'].sum())}, in any Dataflow: {int(result['InDataflow'].sum())}")
+    missing = result[~result['InCarasi'] & ~result['InDataflow']]
+    if len(missing):
+        print(f"  ⚠️  Not found anywhere: {len(missing)}")
+
+
+def parse_arguments(argv):
+    """Variable files/lists plus --carasi, --dataflow (repeatable), --input DIR, --csv, --no-store and --workers N"""
+    parser = argparse.ArgumentParser(description="Check which variables exist in the CARASI and Dataflow workbooks")
+    parser.add_argument('variables', nargs='*', metavar='variables.txt|name1,name2')
+    parser.add_argument('--carasi', dest='workbooks', action='append', default=[], metavar='X.xlsx',
+                        type=lambda path: (path, CARASI), help="CARASI workbook (repeatable)")
+    parser.add_argument('--dataflow', dest='workbooks', action='append', metavar='X.xlsx',
+                        type=lambda path: (path, DATAFLOW), help="Dataflow workbook (repeatable)")
+    parser.add_argument('--input', metavar='DIR', help="folder searched when no workbook is given")
+    parser.add_argument('--csv', metavar='FILE', help="export the result table")
+    parser.add_argument('--no-store', dest='use_store', action='store_false', help="parse without the index store")
+    parser.add_argument('--workers', type=int, metavar='N', help="load processes")
+    options = vars(parser.parse_intermixed_args(argv))
+    options['workers'] = options['workers'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    if not options['variables']:
+        print("Usage: python check_existence.py <variables.txt | name1,name2> "
+              "[--carasi X.xlsx] [--dataflow Y.xlsx] [--input DIR] [--csv out.csv] [--no-store] [--workers N]")
+        sys.exit(2)
+
+    workbooks = options['workbooks'] or find_workbooks(options['input'] or input_dir)
+    missing = [path for path, _ in workbooks if not os.path.exists(path)]
+    if missing or not workbooks:
+        print(f"❌ Workbook not found: {', '.join(missing) if missing else options['input'] or input_dir}")
+        sys.exit(1)
+
+    variables = read_variables(options['variables'])
+    print("🔍 HEADLESS EXISTENCE CHECK")
+    print("=" * 70)
+
+    try:
+        result = check_existence(variables, workbooks, options['use_store'], options['workers'])
+    except ImportError as e:
+        print(f"❌ Missing Python module {e.name}: pip install {e.name}" if e.name else f"❌ Import failed: {e}")
+        sys.exit(1)
+
+    print_result(result, [Path(path).name for path, _ in workbooks])
+
+    if options['csv']:
+        result.to_csv(options['csv'], index=False)
+        print(f"\n💾 Results exported to {options['csv']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Bulk Old-vs-New Workbook Diff
+Joins the old and new CARASI (and old and new Dataflow) interface tables on the interface name and
+compares every field column-wise, with the same rules PropertyDifferenceHighlighter applies per tab.
+One report lists every added, removed and changed interface - no tabs, no 60-tab cap
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from carasi_index import CARASI, DATAFLOW, DATAFLOW_NAME_FIELDS
+from incremental_index import table_keys
+from parallel_loader import load_workbooks
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+input_dir = os.path.join(project_root, 'Input')
+
+# File name markers checked by Form1.folder_verifying
+FILE_MARKERS = {
+    ('old', CARASI): 'oldcarasi', ('new', CARASI): 'newcarasi',
+    ('old', DATAFLOW): 'olddataflow', ('new', DATAFLOW): 'newdataflow',
+}
+SOURCE_LABELS = {CARASI: 'CARASI', DATAFLOW: 'Dataflow'}
+
+# PropertyDifferenceHighlighter.SpecialPrefixes - both values starting with one counts as a match
+SPECIAL_PREFIXES = ('mm_', 'stub_')
+
+SAME, PREFIX_MATCH, DIFFERENT = 'same', 'prefix', 'different'
+ADDED, REMOVED, CHANGED, UNCHANGED = 'added', 'removed', 'changed', 'unchanged'
+
+REPORT_COLUMNS = ['Source', 'Change', 'Name', 'OldRow', 'NewRow', 'Field', 'Match', 'Old', 'New']
+MAX_PRINTED_CHANGES = 30
+
+
+def find_pair(directory, kind):
+    """(old, new) workbook paths of a kind in a folder, by Form1's file name markers"""
+    found = {}
+    for path in sorted(Path(directory).glob('*.xls*')):
+        name = path.name.lower()
+        for side in ('old', 'new'):
+            if FILE_MARKERS[(side, kind)] in name and not name.startswith('~$'):
+                found[side] = str(path)
+    return found.get('old'), found.get('new')
+
+
+def compared_fields(table, kind):
+    """Fields compared between revisions - Row is positional, names are the join key"""
+    skipped = {'Row', 'name'} if kind == CARASI else {'Row', *DATAFLOW_NAME_FIELDS}
+    return [column for column in table.columns if column not in skipped]
+
+
+def compare_values(old, new):
+    """
+    Vectorized CompareValuesWithPrefixMatching over two aligned string arrays:
+    trimmed case-insensitive equality is 'same', a shared MM_/STUB_ prefix is 'prefix'
+    """
+    old = pd.Series(old, dtype=object).fillna('').astype(str).str.strip().str.lower()
+    new = pd.Series(new, dtype=object).fillna('').astype(str).str.strip().str.lower()
+    match = np.where(old.to_numpy() == new.to_numpy(), SAME, DIFFERENT).astype(object)
+    for prefix in SPECIAL_PREFIXES:
+        both = old.str.startswith(prefix).to_numpy() & new.str.startswith(prefix).to_numpy()
+        match[(match == DIFFERENT) & both] = PREFIX_MATCH
+    return match
+
+
+def interface_names(joined, kind, suffix):
+    """Display name of every joined row on one side - Dataflow shows the Bosch name, else the PSA name"""
+    if kind == CARASI:
+        return joined[f'name{suffix}'].fillna('').to_numpy(dtype=object)
+    psa, bosch = (joined[f'{field}{suffix}'].fillna('').to_numpy(dtype=object) for field in DATAFLOW_NAME_FIELDS)
+    return np.where(bosch != '', bosch, psa)
+
+
+def diff_tables(old, new, kind):
+    """
+    (report, status) for two interface tables of one kind.
+    report: one row per added / removed interface and per differing field of a changed interface.
+    status: one row per interface with its Change and the number of differing fields.
+    """
+    fields = [field for field in compared_fields(new, kind) if field in old.columns]
+    old = old.assign(Key=table_keys(old, kind))
+    new = new.assign(Key=table_keys(new, kind))
+
+    # Hash join on the interface key
+    joined = old[old['Key'] != ''].merge(new[new['Key'] != ''], on='Key', how='outer',
+                                         suffixes=('_old', '_new'), indicator=True)
+    both = (joined['_merge'] == 'both').to_numpy()
+
+    matches = np.column_stack([compare_values(joined[f'{field}_old'], joined[f'{field}_new']) for field in fields]) \
+        if fields else np.empty((len(joined), 0), dtype=object)
+    differs = (matches == DIFFERENT) & both[:, None]
+
+    change = np.select([joined['_merge'] == 'right_only', joined['_merge'] == 'left_only', differs.any(axis=1)],
+                       [ADDED, REMOVED, CHANGED], UNCHANGED)
+    names = pd.Series(interface_names(joined, kind, '_new'))
+    names = names.where(names != '', interface_names(joined, kind, '_old'))
+    old_rows = joined['Row_old'].astype('Int64')
+    new_rows = joined['Row_new'].astype('Int64')
+    source = SOURCE_LABELS[kind]
+
+    status = pd.DataFrame({'Source': source, 'Change': change, 'Name': names.to_numpy(),
+                           'OldRow': old_rows.array, 'NewRow': new_rows.array,
+                           'ChangedFields': differs.sum(axis=1)})
+
+    presence = np.isin(change, [ADDED, REMOVED])
+    rows, columns = np.nonzero(differs)
+    field_names = np.array(fields, dtype=object)
+    report = pd.concat([
+        status.loc[presence, ['Source', 'Change', 'Name', 'OldRow', 'NewRow']],
+        pd.DataFrame({
+            'Source': source, 'Change': CHANGED, 'Name': names.to_numpy()[rows],
+            'OldRow': old_rows.array[rows], 'NewRow': new_rows.array[rows],
+            'Field': field_names[columns], 'Match': DIFFERENT,
+            'Old': np.array([joined[f'{field}_old'].to_numpy() for field in fields], dtype=object).T[rows, columns]
+            if fields else [],
+            'New': np.array([joined[f'{field}_new'].to_numpy() for field in fields], dtype=object).T[rows, columns]
+            if fields else [],
+        }),
+    ], ignore_index=True).reindex(columns=REPORT_COLUMNS)
+    return report, status
+
+
+def diff_workbooks(old_path, new_path, kind, workers=None):
+    """(report, status) of two workbooks, loaded in parallel through the index store"""
+    loaded = load_workbooks([(old_path, kind), (new_path, kind)], workers)
+    return diff_tables(loaded[old_path][0].interfaces, loaded[new_path][0].interfaces, kind)
+
+
+def print_summary(kind, old_path, new_path, report, status, elapsed):
+    counts = status['Change'].value_counts()
+    print(f"\n📊 {SOURCE_LABELS[kind].upper()}: {Path(old_path).name} → {Path(new_path).name} ({elapsed:.2f}s)")
+    print(f"  🔹 Old: {int((status['OldRow'].notna()).sum())} interfaces, New: {int((status['NewRow'].notna()).sum())}")
+    print(f"  ➕ Added: {counts.get(ADDED, 0)}   ➖ Removed: {counts.get(REMOVED, 0)}   "
+          f"✏️  Changed: {counts.get(CHANGED, 0)}   ✅ Unchanged: {counts.get(UNCHANGED, 0)}")
+
+    field_counts = report.loc[report['Change'] == CHANGED, 'Field'].value_counts()
+    if len(field_counts):
+        print("  📋 Changed fields: " + ", ".join(f"{field} {count}" for field, count in field_counts.items()))
+
+    changed = status[status['Change'] != UNCHANGED].sort_values(['Change', 'Name'])
+    for _, row in changed.head(MAX_PRINTED_CHANGES).iterrows():
+        icon = {ADDED: '➕', REMOVED: '➖', CHANGED: '✏️ '}[row['Change']]
+        detail = f" ({row['ChangedFields']} fields)" if row['Change'] == CHANGED else ""
+        print(f"    {icon} {row['Name']}{detail}")
+    if len(changed) > MAX_PRINTED_CHANGES:
+        print(f"    ... {len(changed) - MAX_PRINTED_CHANGES} more (use --csv)")
+
+
+def parse_arguments(argv):
+    """--old-carasi/--new-carasi/--old-dataflow/--new-dataflow paths or --input DIR, plus --csv and --workers N"""
+    parser = argparse.ArgumentParser(description="Diff the old and new revision of the CARASI and Dataflow workbooks")
+    parser.add_argument('--input', metavar='DIR', help="folder searched for old/new pairs")
+    parser.add_argument('--csv', metavar='FILE', help="export the diff report")
+    parser.add_argument('--workers', type=int, metavar='N', help="load processes")
+    for side in ('old', 'new'):
+        for kind in (CARASI, DATAFLOW):
+            parser.add_argument(f"--{side}-{kind}", dest=f"{side}_{kind}", metavar='X.xlsx')
+    arguments = parser.parse_args(argv)
+    paths = {(side, kind): getattr(arguments, f"{side}_{kind}") for side in ('old', 'new') for kind in (CARASI, DATAFLOW)}
+    return {'input': arguments.input, 'csv': arguments.csv, 'workers': arguments.workers or None,
+            'paths': {key: path for key, path in paths.items() if path}}
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    directory = options['input'] or input_dir
+
+    pairs = []
+    for kind in (CARASI, DATAFLOW):
+        old_path, new_path = find_pair(directory, kind) if not options['paths'] else (None, None)
+        old_path = options['paths'].get(('old', kind), old_path)
+        new_path = options['paths'].get(('new', kind), new_path)
+        if old_path and new_path:
+            pairs.append((kind, old_path, new_path))
+
+    if not pairs:
+        print(f"❌ No old/new CARASI or Dataflow pair found in {directory}")
+        print("Usage: python diff_workbooks.py [--input DIR] [--old-carasi X --new-carasi Y] "
+              "[--old-dataflow X --new-dataflow Y] [--csv report.csv] [--workers N]")
+        sys.exit(1)
+
+    print("🔀 OLD vs NEW WORKBOOK DIFF")
+    print("=" * 70)
+
+    # Every workbook of every pair goes through one process pool
+    started = time.perf_counter()
+    try:
+        loaded = load_workbooks([(path, kind) for kind, *paths in pairs for path in paths], options['workers'])
+    except ImportError as e:
+        print(f"❌ Missing Python module {e.name}: pip install {e.name}" if e.name else f"❌ Import failed: {e}")
+        sys.exit(1)
+    print(f"📂 {len(loaded)} workbooks loaded in {time.perf_counter() - started:.2f}s")
+
+    reports = []
+    for kind, old_path, new_path in pairs:
+        started = time.perf_counter()
+        report, status = diff_tables(loaded[old_path][0].interfaces, loaded[new_path][0].interfaces, kind)
+        print_summary(kind, old_path, new_path, report, status, time.perf_counter() - started)
+        reports.append(report)
+
+    if options['csv']:
+        pd.concat(reports, ignore_index=True).to_csv(options['csv'], index=False)
+        print(f"\n💾 Report exported to {options['csv']}")
+
+
+if __name__ == "__main__":
+    main()
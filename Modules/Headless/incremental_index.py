@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Incremental Workbook Re-indexing
+Fingerprints every sheet (zip CRC of its XML + shared strings) and the rows inside it (content-defined
+row blocks), so a new revision of a CARASI / Dataflow workbook only re-reads the sheets that changed
+and only re-aggregates the interfaces touched by changed blocks. The result includes the delta of
+added / removed / modified interfaces against the previous revision
+"""
+
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from carasi_index import (CARASI, CARASI_DICTIONARY_FIELDS, CARASI_DICTIONARY_SHEET, CARASI_INTERFACES_SHEET,
+                          CARASI_LABEL_POSITION, DATAFLOW, DATAFLOW_MAPPING_SHEET, DATAFLOW_NAME_FIELDS,
+                          DICTIONARY_LABEL_COLUMN, FIRST_DATA_ROW, HASH_KEY, SHEET_COLUMNS, NameIndex, WorkbookIndex,
+                          carasi_dictionary_part, carasi_interface_part, combine_carasi_parts, dataflow_interfaces,
+                          interface_names, normalize_names, read_sheet, read_sheets)
+from xlsx_stream import SHARED_STRINGS_MEMBER, sheet_members
+
+KIND_SHEETS = {
+    CARASI: (CARASI_INTERFACES_SHEET, CARASI_DICTIONARY_SHEET),
+    DATAFLOW: (DATAFLOW_MAPPING_SHEET,),
+}
+
+# Only the cells the interface table is built from take part in the row fingerprint -
+# edits anywhere else in a row do not mark it changed
+FINGERPRINT_COLUMNS = SHEET_COLUMNS
+INTERFACE_PART_FIELDS = ['Row', 'name', 'input', 'output', 'description']
+
+# A row block ends after every row whose hash is divisible by this - blocks average this many rows and,
+# being cut by content rather than position, an inserted row only changes the block it lands in
+BLOCK_DIVISOR = 64
+
+ADDED, REMOVED, MODIFIED = 'added', 'removed', 'modified'
+
+
+class IndexState:
+    """Sheet fingerprints plus the (RowHash, Key) of every row, per sheet, of one workbook revision"""
+
+    def __init__(self, sheets, rows):
+        self.sheets = sheets
+        self.rows = rows
+
+
+def sheet_fingerprints(path, sheets):
+    """
+    Sheet -> CRC32 of its worksheet XML and of the shared string table, read from the zip directory
+    without decompressing anything. Empty for workbooks that are not xlsx archives.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = sheet_members(archive)
+            names = set(archive.namelist())
+            shared = archive.getinfo(SHARED_STRINGS_MEMBER).CRC if SHARED_STRINGS_MEMBER in names else 0
+            return {sheet: f"{archive.getinfo(members[sheet]).CRC:08x}{shared:08x}"
+                    for sheet in sheets if members.get(sheet) in names}
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return {}
+
+
+def dataflow_keys(table):
+    """Identity of a Dataflow_Interface: PSA name | Bosch name, numbered when a pair repeats"""
+    pairs = pd.Series(normalize_names(table[DATAFLOW_NAME_FIELDS[0]]), dtype=object) + '|' + \
+        pd.Series(normalize_names(table[DATAFLOW_NAME_FIELDS[1]]), dtype=object)
+    occurrence = pairs.groupby(pairs).cumcount()
+    keys = np.where(occurrence == 0, pairs, pairs + '#' + (occurrence + 1).astype(str)).astype(object)
+    keys[(pairs == '|').to_numpy()] = ''  # Rows without a PSA or Bosch name are not interfaces
+    return keys
+
+
+def table_keys(table, kind):
+    """Key of every row of an interface table - the normalized SSTG label for CARASI"""
+    if kind == CARASI:
+        return normalize_names(table['name'])
+    return dataflow_keys(table)
+
+
+def row_fingerprints(frame, sheet):
+    """(RowHash, Key) of every row of a sheet frame"""
+    positions = [position for position in FINGERPRINT_COLUMNS[sheet] if position < frame.shape[1]]
+    cells = frame.iloc[:, positions].fillna('')
+    cells.columns = range(len(positions))
+    hashes = pd.util.hash_pandas_object(cells, index=False, hash_key=HASH_KEY).to_numpy()
+
+    if sheet == DATAFLOW_MAPPING_SHEET:
+        keys = dataflow_keys(dataflow_interfaces(frame))
+    else:
+        label = CARASI_LABEL_POSITION if sheet == CARASI_INTERFACES_SHEET else DICTIONARY_LABEL_COLUMN
+        keys = normalize_names(frame.iloc[:, label])
+    return pd.DataFrame({'RowHash': hashes, 'Key': keys})
+
+
+def block_fingerprints(row_hashes):
+    """(block of every row, fingerprint of every block) for content-defined row blocks"""
+    row_hashes = np.asarray(row_hashes, dtype='uint64')
+    if len(row_hashes) == 0:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='uint64')
+
+    ends = row_hashes % BLOCK_DIVISOR == 0
+    blocks = np.concatenate([[0], np.cumsum(ends[:-1])])
+    starts = np.flatnonzero(np.diff(blocks, prepend=-1))
+
+    # Position inside the block is mixed in, so reordering rows within a block changes its fingerprint
+    positions = np.arange(len(row_hashes)) - starts[blocks]
+    mixed = pd.util.hash_array(row_hashes ^ positions.astype('uint64'), hash_key=HASH_KEY)
+    with np.errstate(over='ignore'):
+        return blocks, np.add.reduceat(mixed, starts)
+
+
+def changed_rows(old_hashes, new_hashes):
+    """(new rows in blocks the old revision lacks, old rows in blocks the new revision lacks)"""
+    old_blocks, old_prints = block_fingerprints(old_hashes)
+    new_blocks, new_prints = block_fingerprints(new_hashes)
+    return ~np.isin(new_prints, old_prints)[new_blocks], ~np.isin(old_prints, new_prints)[old_blocks]
+
+
+def _carasi_table(path, previous, frames, affected):
+    """Carasi_Interface table of the new revision from the previous one and the re-read sheets"""
+    old = previous.interfaces
+    old_keys = pd.Index(normalize_names(old['name']), name='Key')
+    interface_part = old[INTERFACE_PART_FIELDS].set_index(old_keys)
+    dictionary_part = old[list(CARASI_DICTIONARY_FIELDS)].set_index(old_keys)
+
+    if CARASI_INTERFACES_SHEET in frames:
+        rows = frames[CARASI_INTERFACES_SHEET]
+        keys = normalize_names(rows.iloc[:, CARASI_LABEL_POSITION])
+        touched = carasi_interface_part(rows[np.isin(keys, list(affected))])
+
+        # Row is positional: every label takes its (possibly shifted) first row from the new sheet
+        first_rows = pd.Series(np.arange(len(keys)) + FIRST_DATA_ROW, index=keys)
+        first_rows = first_rows[(first_rows.index != '') & ~first_rows.index.duplicated()]
+        kept = interface_part[~interface_part.index.isin(touched.index) & interface_part.index.isin(first_rows.index)]
+        kept = kept[~kept.index.isin(affected)]
+        interface_part = pd.concat([kept, touched])
+        interface_part['Row'] = first_rows.reindex(interface_part.index).to_numpy().astype('int32')
+        interface_part = interface_part.sort_values('Row', kind='stable')
+
+    if CARASI_DICTIONARY_SHEET in frames:
+        dictionary_part = carasi_dictionary_part(frames[CARASI_DICTIONARY_SHEET])
+    elif not interface_part.index.isin(dictionary_part.index).all():
+        # New labels need their Dictionary rows even though that sheet did not change
+        dictionary_part = carasi_dictionary_part(read_sheet(path, CARASI_DICTIONARY_SHEET))
+
+    return combine_carasi_parts(interface_part, dictionary_part)
+
+
+def interface_delta(old, new, kind, keys=None):
+    """
+    Added / removed / modified interfaces between two interface tables, optionally limited to keys.
+    Row is positional and not compared; Fields lists the fields that differ.
+    """
+    old = old.set_index(pd.Index(table_keys(old, kind), name='Key'))
+    new = new.set_index(pd.Index(table_keys(new, kind), name='Key'))
+    old, new = old[old.index != ''], new[new.index != '']
+    if keys is not None:
+        old, new = old[old.index.isin(keys)], new[new.index.isin(keys)]
+    name_field = 'name' if kind == CARASI else DATAFLOW_NAME_FIELDS[0]
+
+    added = new[~new.index.isin(old.index)]
+    removed = old[~old.index.isin(new.index)]
+    common = new.index[new.index.isin(old.index)]
+    fields = [column for column in new.columns if column != 'Row']
+    differs = old.loc[common, fields].to_numpy() != new.loc[common, fields].to_numpy()
+    modified = differs.any(axis=1)
+
+    changed_fields = [','.join(np.array(fields)[row]) for row in differs[modified]]
+    delta = pd.concat([
+        pd.DataFrame({'Change': ADDED, 'Key': added.index, 'Name': added[name_field].to_numpy(),
+                      'Row': added['Row'].to_numpy(), 'Fields': ''}),
+        pd.DataFrame({'Change': REMOVED, 'Key': removed.index, 'Name': removed[name_field].to_numpy(),
+                      'Row': removed['Row'].to_numpy(), 'Fields': ''}),
+        pd.DataFrame({'Change': MODIFIED, 'Key': common[modified], 'Name': new.loc[common[modified], name_field].to_numpy(),
+                      'Row': new.loc[common[modified], 'Row'].to_numpy(), 'Fields': changed_fields}),
+    ], ignore_index=True)
+    return delta
+
+
+def changed_sheets(path, kind, state):
+    """(fingerprints of the workbook, sheets whose fingerprint differs from the stored state)"""
+    fingerprints = sheet_fingerprints(path, KIND_SHEETS[kind])
+    changed = [sheet for sheet in KIND_SHEETS[kind]
+               if not fingerprints.get(sheet) or fingerprints[sheet] != state.sheets.get(sheet)]
+    return fingerprints, changed
+
+
+def build_with_state(path, kind, frames=None):
+    """Full parse of a workbook: (WorkbookIndex, IndexState). Sheets missing from frames are read here"""
+    frames = {sheet: (frames or {}).get(sheet) for sheet in KIND_SHEETS[kind]}
+    missing = [sheet for sheet, frame in frames.items() if frame is None]
+    frames.update(read_sheets(path, missing) if missing else {})
+    if kind == CARASI:
+        table = combine_carasi_parts(carasi_interface_part(frames[CARASI_INTERFACES_SHEET]),
+                                     carasi_dictionary_part(frames[CARASI_DICTIONARY_SHEET]))
+    else:
+        table = dataflow_interfaces(frames[DATAFLOW_MAPPING_SHEET])
+
+    state = IndexState(sheet_fingerprints(path, KIND_SHEETS[kind]),
+                       {sheet: row_fingerprints(frame, sheet) for sheet, frame in frames.items()})
+    return WorkbookIndex(path, kind, table, NameIndex.from_names(*interface_names(table, kind))), state
+
+
+def reindex(path, kind, previous, state, loaded=None):
+    """
+    New revision of a workbook from the previous WorkbookIndex and its IndexState.
+    Returns (WorkbookIndex, IndexState, delta); unchanged sheets are not read at all.
+    Changed sheets already in loaded (sheet -> frame) are not read again.
+    """
+    fingerprints, changed = changed_sheets(path, kind, state)
+
+    frames = {sheet: (loaded or {})[sheet] for sheet in changed if sheet in (loaded or {})}
+    missing = [sheet for sheet in changed if sheet not in frames]
+    frames.update(read_sheets(path, missing) if missing else {})
+
+    rows, affected = dict(state.rows), set()
+    for sheet in changed:
+        rows[sheet] = row_fingerprints(frames[sheet], sheet)
+        old = state.rows.get(sheet, pd.DataFrame({'RowHash': np.empty(0, 'uint64'), 'Key': np.empty(0, object)}))
+        new_changed, old_removed = changed_rows(old['RowHash'].to_numpy(), rows[sheet]['RowHash'].to_numpy())
+        affected.update(rows[sheet]['Key'].to_numpy()[new_changed])
+        affected.update(old['Key'].to_numpy()[old_removed])
+    affected.discard('')
+
+    if not frames:
+        table = previous.interfaces
+    elif kind == CARASI:
+        table = _carasi_table(path, previous, frames, affected)
+    else:
+        table = dataflow_interfaces(frames[DATAFLOW_MAPPING_SHEET])
+
+    workbook = WorkbookIndex(path, kind, table, NameIndex.from_names(*interface_names(table, kind)))
+    delta = interface_delta(previous.interfaces, table, kind, affected)
+    return workbook, IndexState(fingerprints, rows), delta
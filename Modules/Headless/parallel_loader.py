@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Parallel Multi-Workbook Loader
+Parses several CARASI / Dataflow workbooks - and the independent sheets inside each one - across a
+process pool. Workers hand every parsed sheet back as an Arrow IPC buffer in shared memory instead of
+a pickled DataFrame; workbooks already in the index store are opened directly and never reach the pool
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from carasi_index import read_sheet, workbook_kind
+from workbook_store import finish_workbook, plan_workbook
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(script_dir))
+input_dir = os.path.join(project_root, 'Input')
+
+# Workers beyond the number of sheets to parse only cost start-up time
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def _load_sheet(path, sheet):
+    """
+    Worker: parse one sheet and write it as an Arrow IPC stream into a new shared-memory block.
+    Returns (block name, size); the parent reads the block and unlinks it.
+    """
+    import pyarrow as pa
+    from multiprocessing import resource_tracker, shared_memory
+
+    table = pa.Table.from_pandas(read_sheet(path, sheet), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    buffer = sink.getvalue()
+
+    block = shared_memory.SharedMemory(create=True, size=max(buffer.size, 1))
+    try:
+        block.buf[:buffer.size] = memoryview(buffer).cast('B')
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    # The parent owns the block from here on and unlinks it
+    resource_tracker.unregister(block._name, 'shared_memory')
+    return block.name, buffer.size
+
+
+def _read_shared_sheet(name, size):
+    """DataFrame of a sheet written by _load_sheet - the block is released as soon as it is copied out"""
+    import pyarrow as pa
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(block.buf[:size])
+    finally:
+        block.close()
+        block.unlink()
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+def _collect_sheets(futures, frames):
+    """
+    Reads the block of every finished worker into frames - also after another worker failed, so that no
+    block is left behind in shared memory (the workers already handed them over to this process).
+    Returns the first worker exception, None when every sheet was loaded
+    """
+    failure = None
+    for path, sheet, future in futures:
+        try:
+            frames[path][sheet] = _read_shared_sheet(*future.result())
+        except Exception as e:
+            failure = failure or e
+    return failure
+
+
+def load_workbooks(workbooks, workers=None):
+    """
+    {path: (WorkbookIndex, delta)} for a list of (path, kind) workbooks, in input order.
+    Sheets still to be parsed are spread over a process pool of workers (default: one per CPU);
+    with workers=1, no pyarrow or no usable pool everything is parsed serially in this process.
+    """
+    plans = [plan_workbook(path, kind) for path, kind in workbooks]
+    tasks = [(plan.path, sheet) for plan in plans for sheet in plan.sheets]
+    frames = {plan.path: {} for plan in plans}
+
+    workers = min(workers or MAX_WORKERS, len(tasks))
+    if workers > 1:
+        try:
+            import pyarrow  # noqa: F401 - workers return Arrow buffers
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(path, sheet, pool.submit(_load_sheet, path, sheet)) for path, sheet in tasks]
+                failure = _collect_sheets(futures, frames)
+            if failure is not None:
+                raise failure
+        except BrokenProcessPool:
+            pass  # A worker died - the sheets it did not hand back are parsed below
+        except (ImportError, OSError, NotImplementedError):
+            pass  # No pyarrow / shared memory / process support - the sheets are parsed below
+
+    # Sheets not loaded by the pool are read by finish_workbook itself
+    return {plan.path: finish_workbook(plan, frames[plan.path]) for plan in plans}
+
+
+def find_workbooks(directory):
+    """CARASI and Dataflow workbooks in a folder - the main Dataflow plus any extra DF files"""
+    return [(str(path), workbook_kind(path)) for path in sorted(Path(directory).glob('*.xls*'))
+            if not path.name.startswith('~$') and workbook_kind(path)]
+
+
+def parse_arguments(argv):
+    """Workbook paths or --input DIR, plus --workers N and --serial"""
+    parser = argparse.ArgumentParser(description="Load CARASI / Dataflow workbooks across processes")
+    parser.add_argument('workbooks', nargs='*', metavar='workbook.xlsx')
+    parser.add_argument('--input', metavar='DIR', help="folder searched when no workbook is given")
+    parser.add_argument('--workers', type=int, metavar='N', help="load processes")
+    parser.add_argument('--serial', dest='workers', action='store_const', const=1, help="same as --workers 1")
+    options = vars(parser.parse_intermixed_args(argv))
+    options['workers'] = options['workers'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    workbooks = [(path, workbook_kind(path)) for path in options['workbooks']] \
+        or find_workbooks(options['input'] or input_dir)
+    workbooks = [(path, kind) for path, kind in workbooks if kind]
+    if not workbooks:
+        print("❌ No CARASI or Dataflow workbook found")
+        print("Usage: python parallel_loader.py [<workbook.xlsx> ...] [--input DIR] [--workers N] [--serial]")
+        sys.exit(1)
+
+    print(f"⚡ PARALLEL WORKBOOK LOAD ({len(workbooks)} workbooks, {options['workers'] or MAX_WORKERS} workers)")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    try:
+        loaded = load_workbooks(workbooks, options['workers'])
+    except ImportError as e:
+        print(f"❌ Missing Python module {e.name}: pip install {e.name}" if e.name else f"❌ Import failed: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    for workbook, delta in loaded.values():
+        changes = f", {len(delta)} changed interfaces" if delta is not None else ""
+        print(f"✅ {workbook.name}: {workbook.row_count} interfaces, {len(workbook.index)} names ({workbook.kind}){changes}")
+    print(f"\n⏱️  Loaded in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
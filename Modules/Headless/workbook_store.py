@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Persistent Workbook Index Store
+Keeps the parsed interface table and the name -> row offset index of every workbook as
+uncompressed Arrow IPC sidecars (.carasi_index/ next to the workbook), keyed by content hash.
+An unchanged workbook is memory-mapped back in milliseconds instead of being parsed again; a new
+revision is re-indexed incrementally from the previous one (see incremental_index.py)
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from carasi_index import NameIndex, WorkbookIndex, workbook_kind
+from incremental_index import (ADDED, KIND_SHEETS, MODIFIED, REMOVED, IndexState, build_with_state, changed_sheets,
+                               reindex)
+
+STORE_DIR_NAME = '.carasi_index'
+
+# Bump when the interface table or index layout changes - older sidecars are then rebuilt
+STORE_VERSION = 3
+
+HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+MAX_PRINTED_CHANGES = 30
+
+
+def file_content_hash(path):
+    """Hash the raw bytes of a workbook (blake2b, 128-bit hex digest)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store_dir(path):
+    return Path(path).resolve().parent / STORE_DIR_NAME
+
+
+def _key_path(path):
+    return store_dir(path) / f"{Path(path).name}.key"
+
+
+def cached_content_hash(path):
+    """Content hash of a workbook - only re-hashed when its size or mtime changed"""
+    stat = os.stat(path)
+    try:
+        with open(_key_path(path), 'r', encoding='utf-8') as f:
+            key = json.load(f)
+        if key.get('size') == stat.st_size and key.get('mtime_ns') == stat.st_mtime_ns:
+            return key['hash']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    content_hash = file_content_hash(path)
+    try:
+        store_dir(path).mkdir(exist_ok=True)
+        with open(_key_path(path), 'w', encoding='utf-8') as f:
+            json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}, f)
+    except OSError:
+        pass  # Read-only input folder - hash again next time
+    return content_hash
+
+
+def store_paths(path, content_hash, kind):
+    """(interfaces, names, rows) sidecar paths for a workbook content"""
+    stem = store_dir(path) / f"{Path(path).name}.{content_hash[:16]}.{kind}.v{STORE_VERSION}"
+    return tuple(stem.with_name(f"{stem.name}.{part}.arrow") for part in ('interfaces', 'names', 'rows'))
+
+
+def stored_sidecars(path):
+    """Arrow sidecars of every stored revision of a workbook"""
+    return store_dir(path).glob(f"{glob.escape(Path(path).name)}.*.v*.*.arrow")
+
+
+def previous_revision(path, kind, content_hash):
+    """Hash prefix of the newest stored revision of the workbook other than content_hash (None if none)"""
+    prefix = f"{Path(path).name}."
+    stored = [(candidate.stat().st_mtime, candidate.name[len(prefix):len(prefix) + 16])
+              for candidate in store_dir(path).glob(f"{glob.escape(Path(path).name)}.*.{kind}.v{STORE_VERSION}.rows.arrow")]
+    stored = [(mtime, stored_hash) for mtime, stored_hash in stored if stored_hash != content_hash[:16]]
+    return max(stored)[1] if stored else None
+
+
+def read_arrow(path):
+    """Memory-map an Arrow IPC file - numeric columns stay zero-copy views of the page cache"""
+    import pyarrow as pa
+    with pa.memory_map(str(path), 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def write_arrow(table, path, metadata=None):
+    """Write an Arrow IPC file atomically - readers never see a partly written sidecar"""
+    import pyarrow as pa
+    if metadata:
+        table = table.replace_schema_metadata({key: json.dumps(value) for key, value in metadata.items()})
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # Concurrent writers never share a temp file
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def open_store(path, content_hash, kind):
+    """WorkbookIndex from existing sidecars (None when there are none)"""
+    interfaces_path, names_path, _ = store_paths(path, content_hash, kind)
+    if not (interfaces_path.exists() and names_path.exists()):
+        return None
+
+    names = read_arrow(names_path)
+    index = NameIndex(names.column('Hash').to_numpy(), names.column('Offset').to_numpy(),
+                      names.column('Key').to_numpy(zero_copy_only=False))
+    return WorkbookIndex(path, kind, read_arrow(interfaces_path), index)
+
+
+def open_state(path, content_hash, kind):
+    """IndexState stored with a revision (None when there is none)"""
+    _, _, rows_path = store_paths(path, content_hash, kind)
+    if not rows_path.exists():
+        return None
+
+    table = read_arrow(rows_path)
+    sheets = json.loads(table.schema.metadata[b'sheets'])
+    frame = table.to_pandas()
+    rows = {sheet: frame.loc[frame['Sheet'] == sheet, ['RowHash', 'Key']].reset_index(drop=True)
+            for sheet in json.loads(table.schema.metadata[b'sheet_order'])}
+    return IndexState(sheets, rows)
+
+
+def write_store(workbook, content_hash, state):
+    """Write the sidecars of a freshly built WorkbookIndex and drop those of older contents"""
+    import pyarrow as pa
+    interfaces_path, names_path, rows_path = store_paths(workbook.path, content_hash, workbook.kind)
+    interfaces_path.parent.mkdir(exist_ok=True)
+
+    write_arrow(pa.Table.from_pandas(workbook.interfaces, preserve_index=False), interfaces_path)
+    write_arrow(pa.table({'Hash': workbook.index.hashes, 'Offset': workbook.index.rows,
+                           'Key': pa.array(workbook.index.names, type=pa.string())}), names_path)
+    rows = pd.concat([frame.assign(Sheet=sheet) for sheet, frame in state.rows.items()], ignore_index=True)
+    write_arrow(pa.Table.from_pandas(rows[['Sheet', 'RowHash', 'Key']], preserve_index=False), rows_path,
+                 {'sheets': state.sheets, 'sheet_order': list(state.rows)})
+
+    current = {interfaces_path, names_path, rows_path}
+    for stale in stored_sidecars(workbook.path):
+        if stale not in current:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _open_previous(path, kind, content_hash):
+    """(WorkbookIndex, IndexState) of the previous stored revision, or None"""
+    previous_hash = previous_revision(path, kind, content_hash)
+    if previous_hash is None:
+        return None
+    previous, state = open_store(path, previous_hash, kind), open_state(path, previous_hash, kind)
+    return (previous, state) if previous is not None and state is not None else None
+
+
+class WorkbookPlan:
+    """What opening one workbook through the store still needs: nothing, or a list of sheets to parse"""
+
+    def __init__(self, path, kind, content_hash=None, workbook=None, previous=None, sheets=()):
+        self.path = path
+        self.kind = kind
+        self.content_hash = content_hash
+        self.workbook = workbook
+        self.previous = previous
+        self.sheets = list(sheets)
+
+
+def plan_workbook(path, kind=None):
+    """
+    Check the store for a workbook: a stored revision is opened right away, otherwise the plan
+    lists the sheets to parse - only the changed ones when a previous revision is stored
+    """
+    kind = kind or workbook_kind(path)
+    try:
+        content_hash = cached_content_hash(path)
+        workbook = open_store(path, content_hash, kind)
+        if workbook is not None:
+            return WorkbookPlan(path, kind, content_hash, workbook=workbook)
+        previous = _open_previous(path, kind, content_hash)
+    except (ImportError, OSError, ValueError, KeyError):
+        return WorkbookPlan(path, kind, sheets=KIND_SHEETS[kind])  # No pyarrow or unreadable sidecar - parse
+
+    if previous is not None:
+        sheets = changed_sheets(path, kind, previous[1])[1]
+        return WorkbookPlan(path, kind, content_hash, previous=previous, sheets=sheets)
+    return WorkbookPlan(path, kind, content_hash, sheets=KIND_SHEETS[kind])
+
+
+def finish_workbook(plan, frames=None):
+    """(WorkbookIndex, delta) of a plan; frames holds sheets parsed elsewhere, the rest are read here"""
+    if plan.workbook is not None:
+        return plan.workbook, None
+
+    delta = None
+    if plan.previous is not None:
+        workbook, state, delta = reindex(plan.path, plan.kind, *plan.previous, loaded=frames)
+    else:
+        workbook, state = build_with_state(plan.path, plan.kind, frames)
+
+    if plan.content_hash is not None:
+        try:
+            write_store(workbook, plan.content_hash, state)
+        except (ImportError, OSError, ValueError):
+            pass  # The store is an optimisation only
+    return workbook, delta
+
+
+def update_workbook_index(path, kind=None):
+    """
+    (WorkbookIndex, delta) of a workbook through the sidecar store.
+    Unchanged contents are opened from the store (delta None). A new revision is re-indexed
+    incrementally from the previous stored one and delta lists its added / removed / modified
+    interfaces; with no previous revision the workbook is parsed in full (delta None).
+    Without pyarrow or a writable folder the workbook is simply parsed.
+    """
+    return finish_workbook(plan_workbook(path, kind))
+
+
+def load_workbook_index(path, kind=None, use_store=True):
+    """WorkbookIndex of a workbook - from the sidecar store unless use_store is False"""
+    if not use_store:
+        return WorkbookIndex.build(path, kind)
+    return update_workbook_index(path, kind)[0]
+
+
+def print_delta(name, delta):
+    counts = delta['Change'].value_counts()
+    print(f"🔄 {name}: {counts.get(ADDED, 0)} added, {counts.get(REMOVED, 0)} removed, "
+          f"{counts.get(MODIFIED, 0)} modified")
+    icons = {ADDED: '➕', REMOVED: '➖', MODIFIED: '✏️ '}
+    for _, row in delta.head(MAX_PRINTED_CHANGES).iterrows():
+        fields = f" ({row['Fields']})" if row['Fields'] else ""
+        print(f"  {icons[row['Change']]} {row['Name']} (row {row['Row']}){fields}")
+    if len(delta) > MAX_PRINTED_CHANGES:
+        print(f"  ... {len(delta) - MAX_PRINTED_CHANGES} more (use --csv)")
+
+
+def parse_arguments(argv):
+    """Workbook paths plus --rebuild and --csv (delta of the re-indexed revisions)"""
+    parser = argparse.ArgumentParser(description="Build or reuse the persistent index of workbooks")
+    parser.add_argument('workbooks', nargs='*', metavar='workbook.xlsx')
+    parser.add_argument('--rebuild', action='store_true', help="drop the stored index first")
+    parser.add_argument('--csv', metavar='FILE', help="export the delta of the re-indexed revisions")
+    return vars(parser.parse_intermixed_args(argv))
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    if not options['workbooks']:
+        print("Usage: python workbook_store.py <workbook.xlsx> [<workbook.xlsx> ...] [--rebuild] [--csv delta.csv]")
+        return
+
+    deltas = []
+    for path in options['workbooks']:
+        if options['rebuild']:
+            for stale in stored_sidecars(path):
+                stale.unlink()
+        started = time.perf_counter()
+        workbook, delta = update_workbook_index(path)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✅ {workbook.name}: {workbook.row_count} interfaces, {len(workbook.index)} names ({workbook.kind}) "
+              f"in {elapsed:.1f}ms")
+        if delta is not None:
+            print_delta(workbook.name, delta)
+            deltas.append(delta.assign(Workbook=workbook.name))
+
+    if options['csv'] and deltas:
+        pd.concat(deltas, ignore_index=True).to_csv(options['csv'], index=False)
+        print(f"\n💾 Delta exported to {options['csv']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Streaming xlsx Reader
+Reads worksheet rows straight from the xlsx zip / XML parts, one row at a time: only the requested
+column positions are converted, the shared string table is read once per workbook, and a search
+stops at the first matching row - nothing like a full DataTable is ever materialized
+"""
+
+import posixpath
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+SPREADSHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+SHARED_STRINGS_MEMBER = 'xl/sharedStrings.xml'
+STYLES_MEMBER = 'xl/styles.xml'
+
+ROW_TAG = f'{SPREADSHEET_NS}row'
+VALUE_TAG = f'{SPREADSHEET_NS}v'
+TEXT_TAG = f'{SPREADSHEET_NS}t'
+RUN_TAG = f'{SPREADSHEET_NS}r'
+INLINE_TAG = f'{SPREADSHEET_NS}is'
+
+# Excel row of the header; data starts on the next row
+HEADER_ROW = 1
+
+
+def sheet_members(archive):
+    """Sheet name -> worksheet XML member of an open xlsx archive"""
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    relationships = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in relationships.iter(f'{PACKAGE_RELATIONSHIP_NS}Relationship')}
+
+    members = {}
+    for sheet in workbook.iter(f'{SPREADSHEET_NS}sheet'):
+        target = targets.get(sheet.get(f'{RELATIONSHIP_NS}id'), '')
+        members[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else posixpath.normpath(f'xl/{target}')
+    return members
+
+
+def column_index(letters, _cache={}):
+    """0-based position of a column reference ('A' -> 0, 'AB' -> 27)"""
+    position = _cache.get(letters)
+    if position is None:
+        position = 0
+        for letter in letters:
+            position = position * 26 + ord(letter) - 64
+        position = _cache[letters] = position - 1
+    return position
+
+
+def _string_text(element):
+    """Text of a shared / inline string: a plain <t>, or the <r> runs joined (phonetic runs skipped)"""
+    text = element.find(TEXT_TAG)
+    if text is not None:
+        return text.text or ''
+    return ''.join(run.findtext(TEXT_TAG, '') for run in element.iter(RUN_TAG))
+
+
+def number_text(value):
+    """Numeric cell as text the way pandas shows it: whole numbers without '.0'"""
+    if not any(marker in value for marker in '.eE'):
+        return str(int(value))
+    number = float(value)
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+class XlsxReader:
+    """
+    One open xlsx workbook. Shared strings and date styles are loaded on first use and kept,
+    so reading several sheets of the same workbook parses them only once.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._archive = zipfile.ZipFile(path)
+        self._members = sheet_members(self._archive)
+        self._shared_strings = None
+        self._date_styles = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._archive.close()
+
+    @property
+    def sheet_names(self):
+        return list(self._members)
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = []
+            if SHARED_STRINGS_MEMBER in self._archive.namelist():
+                with self._archive.open(SHARED_STRINGS_MEMBER) as source:
+                    for _, element in ET.iterparse(source):
+                        if element.tag == f'{SPREADSHEET_NS}si':
+                            self._shared_strings.append(_string_text(element))
+                            element.clear()
+        return self._shared_strings
+
+    @property
+    def date_styles(self):
+        """Cell style indices with a date number format (their numbers are shown as datetimes)"""
+        if self._date_styles is None:
+            self._date_styles = set()
+            try:
+                from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+                styles = ET.fromstring(self._archive.read(STYLES_MEMBER))
+            except (ImportError, KeyError, ET.ParseError):
+                return self._date_styles
+            formats = dict(BUILTIN_FORMATS)
+            formats.update({int(fmt.get('numFmtId')): fmt.get('formatCode', '')
+                            for fmt in styles.iter(f'{SPREADSHEET_NS}numFmt')})
+            cell_formats = styles.find(f'{SPREADSHEET_NS}cellXfs')
+            for position, xf in enumerate(cell_formats if cell_formats is not None else []):
+                if is_date_format(formats.get(int(xf.get('numFmtId', 0)), '')):
+                    self._date_styles.add(position)
+        return self._date_styles
+
+    def _cell_text(self, cell):
+        """Text of one cell (None when empty), converted like openpyxl + pandas dtype=str"""
+        kind = cell.get('t')
+        if kind == 'inlineStr':
+            inline = cell.find(INLINE_TAG)
+            return _string_text(inline) if inline is not None else None
+        value = cell.findtext(VALUE_TAG)
+        if value is None or value == '':
+            return None
+        if kind == 's':
+            return self.shared_strings[int(value)]
+        if kind == 'b':
+            return 'True' if value == '1' else 'False'
+        if kind in ('str', 'e', 'd'):
+            return value
+        style = cell.get('s')
+        if style is not None and int(style) in self.date_styles:
+            from openpyxl.utils.datetime import from_excel
+            return str(from_excel(float(value)))
+        return number_text(value)
+
+    def rows(self, sheet, columns=None, first_row=HEADER_ROW):
+        """
+        Yield (excel row, {position: text}, last) for every row from first_row on. Only positions in
+        columns are converted (all when None); last is the position of the last non-empty cell of the
+        whole row (-1 when empty), so the width and trailing rows come out the same whatever is projected.
+        """
+        wanted = None if columns is None else set(columns)
+        with self._archive.open(self._members[sheet]) as source:
+            row_number = 0
+            for _, element in ET.iterparse(source):
+                if element.tag != ROW_TAG:
+                    continue
+
+                row_number = int(element.get('r') or row_number + 1)
+                if row_number >= first_row:
+                    values, position = {}, -1
+                    for cell in element:
+                        reference = cell.get('r')
+                        position = column_index(reference.rstrip('0123456789')) if reference else position + 1
+                        if wanted is None or position in wanted:
+                            text = self._cell_text(cell)
+                            if text is not None:
+                                values[position] = text
+                    yield row_number, values, self._last_position(element, values)
+
+                # Rows already handed out are emptied - only their bare tags stay in memory
+                element.clear()
+
+    @staticmethod
+    def _last_position(row, values):
+        """Position of the last cell of a row holding a value (-1 when the row is empty)"""
+        cells = list(row)
+        for offset in range(len(cells) - 1, -1, -1):
+            cell = cells[offset]
+            if cell.findtext(VALUE_TAG) or cell.find(INLINE_TAG) is not None:
+                reference = cell.get('r')
+                return column_index(reference.rstrip('0123456789')) if reference else offset
+        return max(values, default=-1)
+
+    def header(self, sheet):
+        """Column names of the header row, named like pandas: 'Unnamed: i' when empty, 'x.1' when repeated"""
+        cells = {}
+        for _, values, _ in self.rows(sheet, first_row=HEADER_ROW):
+            cells = values
+            break
+        names, seen = [], {}
+        for position in range(max(cells, default=-1) + 1):
+            name = cells.get(position) or f'Unnamed: {position}'
+            count = seen.get(name, 0)
+            seen[name] = count + 1
+            names.append(f'{name}.{count}' if count else name)
+        return names
+
+    def read_frame(self, sheet, columns=None):
+        """
+        Sheet as a DataFrame of strings like pd.read_excel(header=0, dtype=str): same columns, same
+        positional index (blank rows kept, trailing ones trimmed), but only the projected columns
+        hold values - the others are left empty
+        """
+        names = self.header(sheet)
+        positions, cells, last_row, width = [], [], HEADER_ROW, len(names)
+        for row_number, values, last in self.rows(sheet, columns, first_row=HEADER_ROW + 1):
+            if last < 0:
+                continue
+            last_row = row_number
+            for position, text in values.items():
+                positions.append((row_number - HEADER_ROW - 1, position))
+                cells.append(text)
+            width = max(width, last + 1)
+
+        data = np.full((last_row - HEADER_ROW, width), None, dtype=object)
+        if cells:
+            rows, columns_at = np.array(positions).T
+            data[rows, columns_at] = cells
+        names += [f'Unnamed: {position}' for position in range(len(names), width)]
+        return pd.DataFrame(data, columns=names)
+
+    def find_rows(self, sheet, name_columns, names, columns=None):
+        """
+        {name: (excel row, {position: text})} of the first row whose name columns hold each name
+        (trimmed, case-insensitive). Reading stops as soon as every name has been found.
+        """
+        remaining = {}
+        for name in names:
+            remaining.setdefault(name.strip().lower(), []).append(name)
+        remaining.pop('', None)
+
+        found = {}
+        projection = None if columns is None else set(columns) | set(name_columns)
+        for row_number, values, _ in self.rows(sheet, projection, first_row=HEADER_ROW + 1):
+            for position in name_columns:
+                key = values.get(position, '').strip().lower()
+                if key in remaining:
+                    found.update((name, (row_number, values)) for name in remaining.pop(key))
+            if not remaining:
+                break
+        return found
+
+
+def read_sheet_frame(path, sheet, columns=None):
+    """DataFrame of one sheet, streaming only the given column positions (see XlsxReader.read_frame)"""
+    with XlsxReader(path) as reader:
+        return reader.read_frame(sheet, columns)
+
+
+def main():
+    if len(sys.argv) < 4:
+        print("Usage: python xlsx_stream.py <workbook.xlsx> <sheet> <column> [<name> ...]")
+        print("  Without names: count the non-empty cells of the column; with names: first row of each")
+        return
+
+    path, sheet, column = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    started = time.perf_counter()
+    with XlsxReader(path) as reader:
+        if len(sys.argv) == 4:
+            count = sum(1 for _, values, _ in reader.rows(sheet, [column], first_row=HEADER_ROW + 1) if column in values)
+            print(f"✅ {sheet}: {count} non-empty cells in column {column}")
+        else:
+            found = reader.find_rows(sheet, [column], sys.argv[4:])
+            for name in sys.argv[4:]:
+                print(f"  {'✅' if name in found else '❌'} {name}" + (f" (row {found[name][0]})" if name in found else ""))
+    print(f"⏱️  {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
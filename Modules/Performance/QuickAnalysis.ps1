@@ -1,42 +1,62 @@
-# Quick Multi-Core Analysis from Summary Data
+# Quick Multi-Core Analysis from the N-way run matrix (compare_runs.py)
+# Runs: every PerformanceAnalysis*.csv in LogsPath, or a manifest CSV (Label,Path) for nightly builds
+param(
+    [string]$LogsPath = (Join-Path $PSScriptRoot "..\Logs"),
+    [string]$Manifest = "",
+    [string]$Baseline = ""
+)
+
 Write-Host "=== MULTI-CORE vs SINGLE-CORE PERFORMANCE ANALYSIS ===" -ForegroundColor Cyan
 Write-Host ""
 
-# Data from Performance_Summary_Tracking.csv
-$performanceData = @{
-    "BASELINE" = @{ TabAvg = 555.1; SearchAvg = 1295.3; Memory = "5.5->48.3MB"; Status = "Single-core baseline" }
-    "OPTIMIZED" = @{ TabAvg = 668.1; SearchAvg = 1482.6; Memory = "5.5->46.6MB"; Status = "Multi-core optimized" }
-    "BATCH_FIXED" = @{ TabAvg = 828.7; SearchAvg = 1435.6; Memory = "3.2->46.1MB"; Status = "Multi-core + batch fixed" }
-    "CONSOLE_REMOVED" = @{ TabAvg = 768.1; SearchAvg = 1389.9; Memory = "2.9->45.8MB"; Status = "Multi-core + console removed" }
+$matrixFile = Join-Path ([System.IO.Path]::GetTempPath()) "carasi_run_matrix.csv"
+$compareArgs = @((Join-Path $PSScriptRoot "compare_runs.py"), "--csv", $matrixFile)
+if ($Manifest) { $compareArgs += @("--manifest", $Manifest) } else { $compareArgs += (Join-Path $LogsPath "PerformanceAnalysis*.csv") }
+if ($Baseline) { $compareArgs += @("--baseline", $Baseline) }
+
+python @compareArgs | Out-Null
+if ($LASTEXITCODE -ne 0 -or -not (Test-Path $matrixFile)) {
+    Write-Host "Run comparison failed - check compare_runs.py output" -ForegroundColor Red
+    exit 1
 }
 
+# One row per run, in run order (first row = baseline unless -Baseline is given)
+$performanceData = @(Import-Csv $matrixFile | ForEach-Object {
+    [PSCustomObject]@{
+        Version = $_.Label
+        TabAvg = [math]::Round([double]$_.Create_New_Tab_Mean, 1)
+        SearchAvg = [math]::Round([double]$_.Search_Operation_Mean, 1)
+        TabVerdict = $_.Create_New_Tab_Verdict
+        SearchVerdict = $_.Search_Operation_Verdict
+        Memory = "$([math]::Round([double]$_.MemoryStart, 1))->$([math]::Round([double]$_.MemoryEnd, 1))MB"
+    }
+})
+$baseline = if ($Baseline) { $performanceData | Where-Object { $_.Version -eq $Baseline } | Select-Object -First 1 } else { $performanceData[0] }
+$current = $performanceData[-1]
+
 Write-Host "TAB CREATION PERFORMANCE EVOLUTION:" -ForegroundColor Green
-foreach ($version in $performanceData.Keys) {
-    $data = $performanceData[$version]
-    $color = if ($data.TabAvg -lt 600) { "Green" } elseif ($data.TabAvg -lt 800) { "Yellow" } else { "Red" }
-    Write-Host "  $($version): $($data.TabAvg)ms avg - $($data.Status)" -ForegroundColor $color
+foreach ($data in $performanceData) {
+    $color = if ($data.TabVerdict -eq "REGRESSION") { "Red" } elseif ($data.TabVerdict -eq "IMPROVEMENT") { "Green" } else { "Yellow" }
+    Write-Host "  $($data.Version): $($data.TabAvg)ms avg - $($data.Memory) $($data.TabVerdict)" -ForegroundColor $color
 }
 
 Write-Host ""
 Write-Host "SEARCH OPERATION PERFORMANCE EVOLUTION:" -ForegroundColor Green
-foreach ($version in $performanceData.Keys) {
-    $data = $performanceData[$version]
-    $color = if ($data.SearchAvg -lt 1300) { "Green" } elseif ($data.SearchAvg -lt 1450) { "Yellow" } else { "Red" }
-    Write-Host "  $($version): $($data.SearchAvg)ms avg - $($data.Status)" -ForegroundColor $color
+foreach ($data in $performanceData) {
+    $color = if ($data.SearchVerdict -eq "REGRESSION") { "Red" } elseif ($data.SearchVerdict -eq "IMPROVEMENT") { "Green" } else { "Yellow" }
+    Write-Host "  $($data.Version): $($data.SearchAvg)ms avg - $($data.SearchVerdict)" -ForegroundColor $color
 }
 
 Write-Host ""
-Write-Host "MULTI-CORE OVERHEAD ANALYSIS:" -ForegroundColor Red
-$baseline = $performanceData["BASELINE"]
-$current = $performanceData["CONSOLE_REMOVED"]
+Write-Host "MULTI-CORE OVERHEAD ANALYSIS ($($current.Version) vs $($baseline.Version)):" -ForegroundColor Red
 
-$tabOverhead = $current.TabAvg - $baseline.TabAvg
-$searchOverhead = $current.SearchAvg - $baseline.SearchAvg
+$tabOverhead = [math]::Round($current.TabAvg - $baseline.TabAvg, 1)
+$searchOverhead = [math]::Round($current.SearchAvg - $baseline.SearchAvg, 1)
 $tabPercentOverhead = [math]::Round(($tabOverhead / $baseline.TabAvg) * 100, 1)
 $searchPercentOverhead = [math]::Round(($searchOverhead / $baseline.SearchAvg) * 100, 1)
 
-Write-Host "  Tab Creation Overhead: +$($tabOverhead)ms (+$($tabPercentOverhead)%)" -ForegroundColor Yellow
-Write-Host "  Search Operation Overhead: +$($searchOverhead)ms (+$($searchPercentOverhead)%)" -ForegroundColor Yellow
+Write-Host "  Tab Creation Overhead: $($tabOverhead.ToString('+0.0;-0.0'))ms ($($tabPercentOverhead.ToString('+0.0;-0.0'))%)" -ForegroundColor Yellow
+Write-Host "  Search Operation Overhead: $($searchOverhead.ToString('+0.0;-0.0'))ms ($($searchPercentOverhead.ToString('+0.0;-0.0'))%)" -ForegroundColor Yellow
 
 Write-Host ""
 Write-Host "WHY IS MULTI-CORE SLOWER?" -ForegroundColor Magenta
@@ -4,15 +4,18 @@ Connection Pool Fix Analysis: Focus on Tab 40+ Performance
 Analyze if the connection pool architecture fix resolved the tab 40+ slowdown
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
 from pathlib import Path
 
+from perf_log_loader import load_performance_log
+from perf_statistics import (IMPROVEMENT, INSUFFICIENT, REGRESSION, completed_events, compare_latency,
+                             deciding_change, format_change)
+
 def load_performance_data(filepath):
     """Load and prepare performance data"""
     try:
-        df = pd.read_csv(filepath)
+        df = load_performance_log(filepath)
         print(f"✅ Loaded {len(df)} records from {Path(filepath).name}")
         return df
     except Exception as e:
@@ -23,8 +26,9 @@ def analyze_tab_performance(df, version_name):
     """Analyze performance by tab count focusing on tab 40+"""
     print(f"\n📊 {version_name} TAB PERFORMANCE ANALYSIS:")
     
-    # Filter CREATE_NEW_TAB events and extract tab numbers
-    tab_events = df[df['OperationName'] == 'Create_New_Tab'].copy()
+    # Filter CREATE_NEW_TAB events and extract tab numbers (START rows carry no duration)
+    completed = completed_events(df)
+    tab_events = completed[completed['OperationName'] == 'Create_New_Tab'].copy()
     
     if len(tab_events) == 0:
         print("  ❌ No tab creation events found")
@@ -49,13 +53,16 @@ def analyze_tab_performance(df, version_name):
         if len(range_data) > 0:
             avg_time = range_data['ElapsedMs'].mean()
             max_time = range_data['ElapsedMs'].max()
+            p95_time = range_data['ElapsedMs'].quantile(0.95, interpolation='lower')
             count = len(range_data)
             
             results[label] = {
                 'avg': avg_time,
                 'max': max_time,
+                'p95': p95_time,
                 'count': count,
-                'range': (start, end)
+                'range': (start, end),
+                'values': range_data['ElapsedMs'].to_numpy()
             }
             
             # Color coding for performance
@@ -66,7 +73,7 @@ def analyze_tab_performance(df, version_name):
             else:
                 status = "🟢 FAST"
             
-            print(f"  {status} {label}: {avg_time:.0f}ms avg, {max_time:.0f}ms max ({count} tabs)")
+            print(f"  {status} {label}: {avg_time:.0f}ms avg, {p95_time:.0f}ms p95, {max_time:.0f}ms max ({count} tabs)")
     
     return results
 
@@ -74,7 +81,8 @@ def analyze_excel_parser_performance(df, version_name):
     """Analyze Excel_Parser_Creation performance - key indicator of connection issues"""
     print(f"\n🔧 {version_name} EXCEL PARSER PERFORMANCE:")
     
-    parser_events = df[df['OperationName'] == 'Excel_Parser_Creation']
+    completed = completed_events(df)
+    parser_events = completed[completed['OperationName'] == 'Excel_Parser_Creation']
     
     if len(parser_events) == 0:
         print("  ❌ No Excel Parser creation events found")
@@ -83,6 +91,7 @@ def analyze_excel_parser_performance(df, version_name):
     avg_time = parser_events['ElapsedMs'].mean()
     max_time = parser_events['ElapsedMs'].max()
     min_time = parser_events['ElapsedMs'].min()
+    p50_time, p95_time, p99_time = parser_events['ElapsedMs'].quantile([0.50, 0.95, 0.99], interpolation='lower')
     count = len(parser_events)
     
     # Performance indicators
@@ -94,14 +103,27 @@ def analyze_excel_parser_performance(df, version_name):
         status = "🟢 HEALTHY"
     
     print(f"  {status} Excel Parser: {avg_time:.0f}ms avg, {max_time:.0f}ms max, {min_time:.0f}ms min ({count} ops)")
+    print(f"     Percentiles: p50 {p50_time:.0f}ms, p95 {p95_time:.0f}ms, p99 {p99_time:.0f}ms")
     
     return {
         'avg': avg_time,
         'max': max_time, 
         'min': min_time,
-        'count': count
+        'count': count,
+        'values': parser_events['ElapsedMs'].to_numpy()
     }
 
+def significance_indicator(result, major):
+    """Label a compare_latency() result; 'improvement' only when the change is significant"""
+    verdict = result['verdict']
+    if verdict == IMPROVEMENT:
+        return "🟢 MAJOR IMPROVEMENT" if deciding_change(result)[1] > major else "🟢 IMPROVEMENT"
+    if verdict == REGRESSION:
+        return "🔴 REGRESSION"
+    if verdict == INSUFFICIENT:
+        return "⚪ INSUFFICIENT DATA"
+    return "🟡 SIMILAR"
+
 def compare_with_previous(old_file, new_file):
     """Compare performance between old problematic version and new fix"""
     print("\n🔄 COMPARISON: Before vs After Connection Pool Fix")
@@ -119,23 +141,17 @@ def compare_with_previous(old_file, new_file):
     new_tabs = analyze_tab_performance(df_new, "AFTER (Single Pool Fix)")
     
     if old_tabs and new_tabs:
-        print(f"\n📊 TAB RANGE IMPROVEMENTS:")
+        print(f"\n📊 TAB RANGE IMPROVEMENTS (significance-tested on p50/p95):")
         for range_name in old_tabs.keys():
             if range_name in new_tabs:
                 old_avg = old_tabs[range_name]['avg']
                 new_avg = new_tabs[range_name]['avg']
-                improvement = ((old_avg - new_avg) / old_avg) * 100
-                
-                if improvement > 20:
-                    indicator = "🟢 MAJOR IMPROVEMENT"
-                elif improvement > 0:
-                    indicator = "🟢 IMPROVEMENT"
-                elif improvement > -20:
-                    indicator = "🟡 SIMILAR"
-                else:
-                    indicator = "🔴 REGRESSION"
+                result = compare_latency(old_tabs[range_name]['values'], new_tabs[range_name]['values'])
+                indicator = significance_indicator(result, major=20)
                 
-                print(f"  {indicator} {range_name}: {old_avg:.0f}ms → {new_avg:.0f}ms ({improvement:+.1f}%)")
+                print(f"  {indicator} {range_name}: {old_avg:.0f}ms → {new_avg:.0f}ms avg")
+                print(f"     p50: {format_change(result['stats']['p50'])}")
+                print(f"     p95: {format_change(result['stats']['p95'])}")
     
     print(f"\n🔧 EXCEL PARSER COMPARISON:")
     old_parser = analyze_excel_parser_performance(df_old, "BEFORE")
@@ -143,15 +159,18 @@ def compare_with_previous(old_file, new_file):
     
     if old_parser and new_parser:
         parser_improvement = ((old_parser['avg'] - new_parser['avg']) / old_parser['avg']) * 100
+        result = compare_latency(old_parser['values'], new_parser['values'])
         
-        if parser_improvement > 50:
-            indicator = "🟢 MAJOR FIX"
-        elif parser_improvement > 0:
-            indicator = "🟢 IMPROVED"
+        if result['verdict'] == IMPROVEMENT:
+            indicator = "🟢 MAJOR FIX" if deciding_change(result)[1] > 50 else "🟢 IMPROVED"
+        elif result['verdict'] == REGRESSION:
+            indicator = "🔴 REGRESSION"
         else:
             indicator = "🔴 NO IMPROVEMENT"
         
         print(f"  {indicator} Parser Creation: {old_parser['avg']:.0f}ms → {new_parser['avg']:.0f}ms ({parser_improvement:+.1f}%)")
+        print(f"     p50: {format_change(result['stats']['p50'])}")
+        print(f"     p95: {format_change(result['stats']['p95'])}")
 
 def main():
     print("🔍 CONNECTION POOL FIX ANALYSIS")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Event Pairing Analysis: Rebuild START/COMPLETE intervals from PerformanceLogger logs
+Measures in-flight concurrency, queueing delay and Search_Operation / Create_New_Tab overlap
+to explain why the parallel batch path is slower than single-core
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perf_log_loader import load_performance_log
+
+FOCUS_OPERATIONS = ['Search_Operation', 'Create_New_Tab']
+
+
+def pair_events(df):
+    """
+    Replay PerformanceLogger's timer bookkeeping in one sweep over the log.
+
+    StartTimer adds "<operation>_<ticks>" to a Dictionary; StopTimer(name) closes the first
+    entry in enumeration order whose key starts with name. A .NET Dictionary reuses the most
+    recently freed slot for the next insert, so enumeration order is slot order, not START order.
+    Returns one row per closed timer; START rows that never completed are returned separately.
+    """
+    events = df[df['EventType'].isin(['START', 'COMPLETE'])]
+    events = events.sort_values('Timestamp', kind='stable')
+
+    times = events['Timestamp'].to_numpy(dtype='datetime64[ns]').astype('int64')
+    kinds = events['EventType'].astype(str).to_numpy()
+    names = events['OperationName'].astype(str).to_numpy()
+    elapsed = events['ElapsedMs'].to_numpy(dtype='float64')
+    tabs = events['TabCount'].to_numpy() if 'TabCount' in events.columns else np.zeros(len(events), dtype='int32')
+
+    slots = []        # slot -> index of the open START row, or None when free
+    free_slots = []   # freed slots, most recent last (LIFO like Dictionary's free list)
+    pairs = []
+
+    for row in range(len(events)):
+        if kinds[row] == 'START':
+            if free_slots:
+                slots[free_slots.pop()] = row
+            else:
+                slots.append(row)
+            continue
+
+        # COMPLETE: first open timer in slot order whose key starts with the stopped name
+        completed_name = names[row]
+        for slot, start_row in enumerate(slots):
+            if start_row is not None and (names[start_row] + '_').startswith(completed_name):
+                pairs.append((start_row, row))
+                slots[slot] = None
+                free_slots.append(slot)
+                break
+
+    open_rows = [start_row for start_row in slots if start_row is not None]
+
+    start_idx = np.array([p[0] for p in pairs], dtype='int64')
+    end_idx = np.array([p[1] for p in pairs], dtype='int64')
+    intervals = pd.DataFrame({
+        'OperationName': names[start_idx],
+        'CompletedAs': names[end_idx],
+        'StartNs': times[start_idx],
+        'EndNs': times[end_idx],
+        'LoggedMs': elapsed[end_idx],
+        'StartTabCount': tabs[start_idx],
+        'EndTabCount': tabs[end_idx],
+    })
+    intervals['WallMs'] = (intervals['EndNs'] - intervals['StartNs']) / 1e6
+    intervals['CrossMatched'] = intervals['OperationName'] != intervals['CompletedAs']
+    intervals = intervals.sort_values('StartNs', kind='stable').reset_index(drop=True)
+
+    unmatched = events.iloc[open_rows] if open_rows else events.iloc[0:0]
+    return intervals, unmatched
+
+
+def concurrency_profile(intervals):
+    """In-flight count over time: +1 at every START, -1 at every COMPLETE (ends first on ties)"""
+    if len(intervals) == 0:
+        return pd.DataFrame(columns=['TimeNs', 'InFlight'])
+
+    times = np.concatenate([intervals['EndNs'].to_numpy(), intervals['StartNs'].to_numpy()])
+    deltas = np.concatenate([-np.ones(len(intervals), dtype='int64'), np.ones(len(intervals), dtype='int64')])
+    order = np.lexsort((deltas, times))
+    return pd.DataFrame({'TimeNs': times[order], 'InFlight': np.cumsum(deltas[order])})
+
+
+def concurrency_stats(intervals):
+    """Peak and time-weighted average in-flight count, and the share of time with 2+ in flight"""
+    profile = concurrency_profile(intervals)
+    if len(profile) < 2:
+        return {'peak': int(profile['InFlight'].max()) if len(profile) else 0, 'average': 0.0, 'overlapped_share': 0.0}
+
+    durations = np.diff(profile['TimeNs'].to_numpy())
+    in_flight = profile['InFlight'].to_numpy()[:-1]
+    busy = durations[in_flight > 0].sum()
+    return {
+        'peak': int(in_flight.max()),
+        'average': float((durations * in_flight).sum() / busy) if busy > 0 else 0.0,
+        'overlapped_share': float(durations[in_flight > 1].sum() / busy) if busy > 0 else 0.0,
+    }
+
+
+def queueing_delays(intervals):
+    """
+    FIFO-serialized estimate: an instance cannot start real work before every earlier instance of
+    the same operation finished. delay = max(0, latest earlier end - own start).
+    """
+    result = []
+    for operation, group in intervals.groupby('OperationName', sort=False):
+        starts = group['StartNs'].to_numpy()
+        ends = group['EndNs'].to_numpy()
+        previous_end = np.maximum.accumulate(np.concatenate([starts[:1], ends[:-1]]))
+        delay_ms = np.clip(previous_end - starts, 0, None) / 1e6
+        result.append(pd.Series(delay_ms, index=group.index))
+    if not result:
+        return pd.Series(dtype='float64')
+    return pd.concat(result).reindex(intervals.index)
+
+
+def interval_union(starts, ends):
+    """Merge overlapping [start, end] intervals; inputs must be sorted by start"""
+    if len(starts) == 0:
+        return np.array([], dtype='int64'), np.array([], dtype='int64')
+    running_end = np.maximum.accumulate(ends)
+    new_block = np.concatenate([[True], starts[1:] > running_end[:-1]])
+    return starts[new_block], np.maximum.reduceat(ends, np.flatnonzero(new_block))
+
+
+def overlap_ns(intervals, operation_a, operation_b):
+    """Total time during which both operations had at least one instance in flight"""
+    unions = []
+    for operation in (operation_a, operation_b):
+        group = intervals[intervals['OperationName'] == operation]
+        unions.append(interval_union(group['StartNs'].to_numpy(), group['EndNs'].to_numpy()))
+
+    times = np.concatenate([unions[0][0], unions[0][1], unions[1][0], unions[1][1]])
+    if len(times) == 0:
+        return 0
+    deltas = np.concatenate([np.ones(len(unions[0][0])), -np.ones(len(unions[0][1])),
+                             np.ones(len(unions[1][0])), -np.ones(len(unions[1][1]))]).astype('int64')
+    order = np.lexsort((deltas, times))
+    times, level = times[order], np.cumsum(deltas[order])
+    return int(np.diff(times)[level[:-1] == 2].sum())
+
+
+def summarize_pairs(intervals):
+    """Per-operation latency, concurrency and queueing table"""
+    intervals = intervals.assign(QueueDelayMs=queueing_delays(intervals))
+    rows = []
+    for operation, group in intervals.groupby('OperationName', sort=True):
+        stats = concurrency_stats(group)
+        union_starts, union_ends = interval_union(group['StartNs'].to_numpy(), group['EndNs'].to_numpy())
+        busy_ms = (union_ends - union_starts).sum() / 1e6
+        rows.append({
+            'OperationName': operation,
+            'Count': len(group),
+            'Avg_Wall': group['WallMs'].mean(),
+            'P95_Wall': group['WallMs'].quantile(0.95),
+            'Peak_InFlight': stats['peak'],
+            'Avg_InFlight': stats['average'],
+            'Overlapped_Share': stats['overlapped_share'],
+            'Avg_QueueDelay': group['QueueDelayMs'].mean(),
+            'Effective_Parallelism': group['WallMs'].sum() / busy_ms if busy_ms > 0 else 0.0,
+            'CrossMatched': int(group['CrossMatched'].sum()),
+        })
+    return pd.DataFrame(rows).set_index('OperationName') if rows else pd.DataFrame()
+
+
+def print_pairing_report(intervals, unmatched, filepath):
+    print(f"🔗 START/COMPLETE EVENT PAIRING ANALYSIS")
+    print(f"📊 {len(intervals)} intervals rebuilt from {Path(filepath).name}")
+    if len(unmatched) > 0:
+        print(f"⚠️ {len(unmatched)} START events never completed")
+    print("="*100)
+
+    summary = summarize_pairs(intervals)
+    if len(summary) == 0:
+        print("ℹ️ No START/COMPLETE pairs found")
+        return summary
+
+    print(f"\n⏱️ LATENCY AND CONCURRENCY BY OPERATION:")
+    print(f"{'Operation':<24} {'Count':<7} {'Avg Wall':<11} {'P95 Wall':<11} {'Peak':<6} {'Avg InFl':<9} {'Overlap':<9} {'Queue':<11} {'Parallel':<9}")
+    print("-"*100)
+    for operation, stats in summary.iterrows():
+        print(f"{operation:<24} {int(stats['Count']):<7d} {stats['Avg_Wall']:<7.0f}ms   {stats['P95_Wall']:<7.0f}ms   "
+              f"{int(stats['Peak_InFlight']):<6d} {stats['Avg_InFlight']:<9.2f} {stats['Overlapped_Share'] * 100:<7.1f}%  "
+              f"{stats['Avg_QueueDelay']:<7.0f}ms   {stats['Effective_Parallelism']:<9.2f}")
+
+    cross_matched = int(summary['CrossMatched'].sum())
+    if cross_matched > 0:
+        print(f"\n⚠️ {cross_matched} COMPLETE events closed a timer of a different operation (StopTimer prefix match)")
+
+    overall = concurrency_stats(intervals)
+    print(f"\n🔀 OVERALL CONCURRENCY:")
+    print(f"  • Peak operations in flight: {overall['peak']}")
+    print(f"  • Average in flight while busy: {overall['average']:.2f}")
+    print(f"  • Busy time with 2+ operations in flight: {overall['overlapped_share'] * 100:.1f}%")
+
+    op_a, op_b = FOCUS_OPERATIONS
+    if op_a in summary.index and op_b in summary.index:
+        both_ms = overlap_ns(intervals, op_a, op_b) / 1e6
+        print(f"\n🔍 {op_a} ↔ {op_b} OVERLAP:")
+        print(f"  • Time with both in flight: {both_ms:.0f}ms")
+
+        # Serialized work: instances queue behind each other even though they were started in parallel
+        for operation in FOCUS_OPERATIONS:
+            stats = summary.loc[operation]
+            if stats['Avg_InFlight'] > 1.2 and stats['Effective_Parallelism'] > 1.2:
+                print(f"  🚨 {operation}: {stats['Avg_InFlight']:.1f} in flight on average, "
+                      f"~{stats['Avg_QueueDelay']:.0f}ms queueing per call - parallel calls are waiting on each other")
+            else:
+                print(f"  ✅ {operation}: no significant queueing ({stats['Avg_InFlight']:.1f} in flight on average)")
+
+    return summary
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) > 0:
+        filepath = args[0]
+    else:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(os.path.dirname(script_dir))
+        logs_dir = os.path.join(project_root, 'Modules', 'Logs')
+        filepath = os.path.join(logs_dir, "PerformanceAnalysis.csv")
+
+    try:
+        df = load_performance_log(filepath)
+    except Exception as e:
+        print(f"❌ Error loading {filepath}: {e}")
+        return
+
+    intervals, unmatched = pair_events(df)
+    print_pairing_report(intervals, unmatched, filepath)
+
+    if '--export' in sys.argv:
+        export_path = Path(filepath).with_name(Path(filepath).stem + '_intervals.csv')
+        intervals.assign(QueueDelayMs=queueing_delays(intervals)).to_csv(export_path, index=False)
+        print(f"\n💾 Intervals exported to {export_path}")
+
+
+if __name__ == "__main__":
+    main()
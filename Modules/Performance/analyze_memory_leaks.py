@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Memory Leak Analysis: MemoryMB regressed on TabCount and session time
+Separates the memory every open tab costs from drift that stays when the tab count does not change,
+and finds operations after which memory is never reclaimed (e.g. Excel_Parser_Disposal without a drop).
+Single vectorized pass over the log chunks, so multi-million-row logs stream with flat memory
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analyze_performance import STREAM_THRESHOLD_MB, find_performance_file, logs_dir
+from perf_log_loader import DEFAULT_CHUNK_ROWS, iter_performance_log_chunks, load_performance_log
+
+# Form1.searchList_of_Interface refuses new tabs at this count
+CURRENT_MAX_TABS = 60
+PROJECTED_TAB_CAPS = (60, 80, 100, 120)
+
+# Rows after an event within which memory should fall back (GC runs asynchronously)
+RECLAIM_WINDOW_ROWS = 50
+DROP_TOLERANCE_MB = 0.5
+
+# An operation is flagged when at least this share of its events is never followed by a drop
+NO_DROP_SHARE = 0.8
+
+# An operation is also flagged when it retains significantly more than the average event (t-statistic)
+RETAINED_T_THRESHOLD = 4.0
+
+# Operations whose whole purpose is to release memory
+RELEASE_OPERATIONS = ['Excel_Parser_Disposal']
+
+# Drift at a constant tab count above this is treated as a leak
+DRIFT_THRESHOLD_MB_PER_HOUR = 5.0
+
+
+class MemoryRegression:
+    """
+    Least squares MemoryMB ~ 1 + TabCount + hours from running normal-equation sums.
+    update() consumes a chunk; only a 3x3 matrix and a few scalars are kept.
+    """
+
+    def __init__(self):
+        self.origin = None
+        self.xtx = np.zeros((3, 3))
+        self.xty = np.zeros(3)
+        self.yty = 0.0
+        self.y_sum = 0.0
+        self.n = 0
+        self.hours_max = 0.0
+
+    def update(self, df):
+        frame = df[['Timestamp', 'TabCount', 'MemoryMB']].dropna()
+        if len(frame) == 0:
+            return
+        if self.origin is None:
+            self.origin = frame['Timestamp'].iloc[0]
+
+        hours = (frame['Timestamp'] - self.origin).dt.total_seconds().to_numpy() / 3600
+        x = np.column_stack([np.ones(len(frame)), frame['TabCount'].to_numpy(dtype='float64'), hours])
+        y = frame['MemoryMB'].to_numpy(dtype='float64')
+
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.yty += float(y @ y)
+        self.y_sum += float(y.sum())
+        self.n += len(y)
+        self.hours_max = max(self.hours_max, float(hours.max()))
+
+    def _r_squared(self, columns):
+        """R² of the sub-model using only the given design columns (always including the intercept)"""
+        xtx = self.xtx[np.ix_(columns, columns)]
+        xty = self.xty[columns]
+        beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+        residual = self.yty - 2 * beta @ xty + beta @ xtx @ beta
+        total = self.yty - self.y_sum ** 2 / self.n
+        return beta, (1 - residual / total) if total > 0 else 0.0, max(residual, 0.0)
+
+    def fit(self):
+        if self.n < 3:
+            return None
+        beta, r2, residual = self._r_squared([0, 1, 2])
+        _, tab_only_r2, _ = self._r_squared([0, 1])
+        _, time_only_r2, _ = self._r_squared([0, 2])
+        return {
+            'intercept': float(beta[0]),
+            'mb_per_tab': float(beta[1]),
+            'drift_mb_per_hour': float(beta[2]),
+            'r2': float(r2),
+            'tab_only_r2': float(tab_only_r2),
+            'time_only_r2': float(time_only_r2),
+            'residual_sd': float(np.sqrt(residual / max(self.n - 3, 1))),
+            'rows': self.n,
+            'hours': self.hours_max,
+        }
+
+
+class ReclaimTracker:
+    """
+    Memory before/after every completed event and the lowest MemoryMB in the next RECLAIM_WINDOW_ROWS rows.
+    The last rows of a chunk are carried into the next one until their window is complete.
+    """
+
+    def __init__(self, window=RECLAIM_WINDOW_ROWS, tolerance=DROP_TOLERANCE_MB):
+        self.window = window
+        self.tolerance = tolerance
+        self.carry = None
+        self._carry_first = 0
+        self.totals = None
+
+    def _process(self, buffer, first, last):
+        """Accumulate rows first..last-1 of the buffer (row first-1, if any, supplies the memory before)"""
+        memory = buffer['MemoryMB'].to_numpy(dtype='float64')
+        before = np.concatenate([[np.nan], memory[:-1]])
+
+        # Minimum over rows i+1 .. i+window: reversed rolling minimum, shifted by one row
+        forward_min = pd.Series(memory[::-1]).rolling(self.window, min_periods=1).min().to_numpy()[::-1]
+        floor = np.concatenate([forward_min[1:], [np.nan]])
+
+        rows = slice(first, last)
+        events = pd.DataFrame({
+            'OperationName': buffer['OperationName'].to_numpy()[rows],
+            'EventType': buffer['EventType'].to_numpy()[rows],
+            'Before': before[rows],
+            'After': memory[rows],
+            'Floor': floor[rows],
+        })
+        events = events[(events['EventType'] != 'START') & events['Before'].notna() & events['Floor'].notna()]
+        if len(events) == 0:
+            return
+
+        events = events.assign(
+            Jump=events['After'] - events['Before'],
+            Retained=events['Floor'] - events['Before'],
+            NoDrop=(events['Floor'] >= events['After'] - self.tolerance).astype('int64'),
+            Count=1,
+        )
+        events['RetainedSq'] = events['Retained'] ** 2
+        events['OperationName'] = events['OperationName'].astype(str)
+        totals = events.groupby('OperationName')[['Count', 'Jump', 'Retained', 'RetainedSq', 'NoDrop']].sum()
+        self.totals = totals if self.totals is None else self.totals.add(totals, fill_value=0)
+
+    def update(self, df):
+        chunk = df[['EventType', 'OperationName', 'MemoryMB']]
+        if isinstance(chunk['OperationName'].dtype, pd.CategoricalDtype):
+            chunk = chunk.astype({'OperationName': str, 'EventType': str})
+        buffer = chunk if self.carry is None else pd.concat([self.carry, chunk], ignore_index=True)
+
+        # Carried rows may start with an anchor row that was already processed
+        first = 0 if self.carry is None else self._carry_first
+        complete = len(buffer) - self.window
+        if complete > first:
+            self._process(buffer, first, complete)
+            first = complete
+        self.carry = buffer.iloc[max(first - 1, 0):].reset_index(drop=True)
+        self._carry_first = first - max(first - 1, 0)
+
+    def finish(self):
+        """Process the tail whose window reaches the end of the log"""
+        if self.carry is not None and len(self.carry) > self._carry_first:
+            self._process(self.carry, self._carry_first, len(self.carry))
+        self.carry = None
+        return self.summary()
+
+    def summary(self):
+        if self.totals is None:
+            return pd.DataFrame()
+        totals = self.totals
+        table = pd.DataFrame({
+            'Count': totals['Count'].astype('int64'),
+            'Avg_Jump': totals['Jump'] / totals['Count'],
+            'Avg_Retained': totals['Retained'] / totals['Count'],
+            'NoDrop_Share': totals['NoDrop'] / totals['Count'],
+        })
+
+        # Every event's floor is pulled down by the same noise, so compare against the average event:
+        # a small leak per call only shows up as a significant excess over thousands of events
+        overall = totals['Retained'].sum() / totals['Count'].sum()
+        variance = (totals['RetainedSq'] / totals['Count'] - table['Avg_Retained'] ** 2).clip(lower=0)
+        standard_error = np.sqrt(variance / totals['Count']).clip(lower=1e-9)
+        table['Excess_Retained'] = table['Avg_Retained'] - overall
+        table['Retained_T'] = table['Excess_Retained'] / standard_error
+
+        release = table.index.isin(RELEASE_OPERATIONS)
+        never_drops = (table['NoDrop_Share'] >= NO_DROP_SHARE) & (release | (table['Avg_Retained'] > self.tolerance))
+        table['Unreclaimed'] = never_drops | (table['Retained_T'] > RETAINED_T_THRESHOLD)
+        return table.sort_values(['Unreclaimed', 'Excess_Retained'], ascending=False)
+
+
+def analyze_memory(chunks, window=RECLAIM_WINDOW_ROWS):
+    """One pass: regression sums and reclaim windows updated per chunk"""
+    regression = MemoryRegression()
+    reclaim = ReclaimTracker(window)
+    max_tabs = 0
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        regression.update(chunk)
+        reclaim.update(chunk)
+        max_tabs = max(max_tabs, int(chunk['TabCount'].max()))
+    return regression.fit(), reclaim.finish(), max_tabs
+
+
+def project_memory(model, tab_counts, hours):
+    """Expected MemoryMB with the given number of open tabs after a session of the given length"""
+    return {tabs: model['intercept'] + model['mb_per_tab'] * tabs + model['drift_mb_per_hour'] * hours
+            for tabs in tab_counts}
+
+
+def print_report(model, reclaim, max_tabs, used_file, budget_mb=None, window=RECLAIM_WINDOW_ROWS):
+    print("🧠 MEMORY LEAK ANALYSIS")
+    print("=" * 70)
+    print(f"📂 Data source: {used_file}")
+
+    if model is None:
+        print("❌ Not enough MemoryMB samples for a regression")
+        return
+
+    print(f"\n📈 MEMORY MODEL ({model['rows']} rows, {model['hours']:.2f}h, max {max_tabs} tabs):")
+    print(f"  MemoryMB ≈ {model['intercept']:.1f} + {model['mb_per_tab']:.2f}·TabCount "
+          f"{model['drift_mb_per_hour']:+.2f}·hours   (R² {model['r2']:.3f}, residual sd {model['residual_sd']:.1f}MB)")
+    print(f"  • Tab-driven: {model['mb_per_tab']:.2f}MB per open tab (tabs alone explain R² {model['tab_only_r2']:.3f})")
+    print(f"  • Residual drift: {model['drift_mb_per_hour']:+.2f}MB/hour at a constant tab count "
+          f"(time alone explains R² {model['time_only_r2']:.3f})")
+
+    leaking = model['drift_mb_per_hour'] > DRIFT_THRESHOLD_MB_PER_HOUR
+    if leaking:
+        print(f"    🚨 Drift above {DRIFT_THRESHOLD_MB_PER_HOUR:.0f}MB/hour - memory grows even when tabs are closed")
+    else:
+        print(f"    ✅ Drift within {DRIFT_THRESHOLD_MB_PER_HOUR:.0f}MB/hour - growth is explained by open tabs")
+
+    print(f"\n🔍 RECLAIM ANALYSIS (lowest MemoryMB in the next {window} rows):")
+    if len(reclaim) == 0:
+        print("  ❌ No completed events")
+    else:
+        print(f"  {'Operation':<26} {'Count':<8} {'Avg jump':<10} {'Retained':<10} {'Excess':<10} {'t':<7} {'No drop':<9}")
+        for operation, row in reclaim.iterrows():
+            icon = "🔴" if row['Unreclaimed'] else "🟢"
+            print(f"  {icon} {operation:<24} {row['Count']:<8d} {row['Avg_Jump']:<+10.2f} {row['Avg_Retained']:<+10.2f} "
+                  f"{row['Excess_Retained']:<+10.3f} {row['Retained_T']:<+7.1f} {row['NoDrop_Share']:<9.0%}")
+        print(f"  (MB; retained = lowest memory in the window minus memory before the event, "
+              f"excess = vs the average event)")
+        flagged = list(reclaim.index[reclaim['Unreclaimed']])
+        if flagged:
+            print(f"  ⚠️  Memory not reclaimed after: {', '.join(flagged)}")
+
+    session_hours = max(model['hours'], 1.0)
+    projection = project_memory(model, PROJECTED_TAB_CAPS, session_hours)
+    print(f"\n📐 TAB CAP PROJECTION (after a {session_hours:.1f}h session):")
+    for tabs, memory in projection.items():
+        marker = " (current MAX_TABS)" if tabs == CURRENT_MAX_TABS else ""
+        extrapolated = " - extrapolated" if tabs > max_tabs else ""
+        over = " 🔴 over budget" if budget_mb and memory > budget_mb else ""
+        print(f"  • {tabs} tabs: {memory:.0f}MB{marker}{extrapolated}{over}")
+
+    print(f"\n🎯 MAX_TABS ASSESSMENT:")
+    if leaking or (len(reclaim) and reclaim['Unreclaimed'].any()):
+        print(f"  ❌ Keep MAX_TABS at {CURRENT_MAX_TABS}: fix the unreclaimed memory first, "
+              f"raising the cap would only make the session run out sooner")
+    elif budget_mb:
+        safe = [tabs for tabs, memory in projection.items() if memory <= budget_mb]
+        if safe and max(safe) > CURRENT_MAX_TABS:
+            print(f"  ✅ Memory allows up to {max(safe)} tabs within {budget_mb:.0f}MB")
+        else:
+            print(f"  ⚠️  No cap above {CURRENT_MAX_TABS} fits within {budget_mb:.0f}MB")
+    else:
+        print(f"  ✅ No leak detected - memory grows {model['mb_per_tab']:.2f}MB per tab; "
+              f"pass --budget MB to check a higher cap")
+
+
+def window_rows(text):
+    """argparse type of --window: a row count of at least 1"""
+    try:
+        rows = int(text)
+    except ValueError:
+        rows = 0
+    if rows < 1:
+        raise argparse.ArgumentTypeError("needs a row count of at least 1")
+    return rows
+
+
+def parse_arguments(argv):
+    """Log path plus --stream, --window N and --budget MB"""
+    parser = argparse.ArgumentParser(description="Attribute memory growth to operations and tabs")
+    parser.add_argument('file', nargs='?',
+                        help="performance log (default: first of the known PerformanceAnalysis logs in Modules/Logs)")
+    parser.add_argument('--stream', action='store_true', help="read the log in chunks")
+    parser.add_argument('--window', type=window_rows, default=RECLAIM_WINDOW_ROWS, metavar='N',
+                        help="rows after an operation that count towards its reclaim")
+    parser.add_argument('--budget', type=float, metavar='MB', help="memory budget for the tab forecast")
+    options = vars(parser.parse_args(argv))
+    options['budget'] = options['budget'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+
+    if options['file']:
+        file_path, used_file = options['file'], os.path.basename(options['file'])
+    else:
+        file_path, used_file = find_performance_file()
+
+    if file_path is None or not os.path.exists(file_path):
+        print("❌ No valid performance data files found in Modules/Logs/")
+        print(f"📁 Checked directory: {logs_dir}")
+        sys.exit(1)
+
+    stream = options['stream'] or os.path.getsize(file_path) > STREAM_THRESHOLD_MB * 1024 * 1024
+    if stream:
+        chunks = iter_performance_log_chunks(file_path, chunksize=DEFAULT_CHUNK_ROWS)
+    else:
+        chunks = [load_performance_log(file_path)]
+
+    model, reclaim, max_tabs = analyze_memory(chunks, options['window'])
+    print_report(model, reclaim, max_tabs, used_file, options['budget'], options['window'])
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
 import os
+import sys
+
+from perf_aggregates import GroupedStats
+from perf_log_loader import DEFAULT_CHUNK_ROWS, iter_performance_log_chunks, load_performance_log
 
 # Define paths relative to current script location
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,169 +16,288 @@ logs_dir = os.path.join(project_root, 'Modules', 'Logs')
 # Try to find performance data file
 performance_files = [
     'PerformanceAnalysis.csv',
-    'PerformanceAnalysis_OPTIMIZED.csv', 
+    'PerformanceAnalysis_OPTIMIZED.csv',
     'PerformanceAnalysis_OPTIMIZED_V2.csv'
 ]
 
-df = None
-used_file = None
-
-for file in performance_files:
-    file_path = os.path.join(logs_dir, file)
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            used_file = file
-            break
-        except Exception as e:
-            print(f"⚠️ Error reading {file}: {e}")
+# Logs bigger than this are summarized chunk by chunk instead of loaded whole
+STREAM_THRESHOLD_MB = 256
+
+
+def find_performance_file():
+    """Return (path, name) of the first performance log found in Modules/Logs"""
+    for file in performance_files:
+        file_path = os.path.join(logs_dir, file)
+        if os.path.exists(file_path):
+            return file_path, file
+    return None, None
+
+
+def summarize_log(chunks):
+    """
+    Single pass over the log chunks.
+    Only running aggregates are kept, so memory does not grow with the log size.
+    """
+    elapsed_stats = GroupedStats(['OperationName', 'TabCount'], 'ElapsedMs')
+    memory_stats = GroupedStats(['OperationName'], 'MemoryMB', with_sketch=False)
+    latency_stats = GroupedStats(['OperationName'], 'ElapsedMs')  # Completed events only, for percentiles
+
+    summary = {
+        'total_operations': 0,
+        'first_row': None,
+        'last_row': None,
+        'tab_min': None,
+        'tab_max': None,
+        'slow_tab_creations': 0,
+    }
+
+    for chunk in chunks:
+        if len(chunk) == 0:
             continue
 
-if df is None:
-    print("❌ No valid performance data files found in Modules/Logs/")
-    print(f"📁 Checked directory: {logs_dir}")
-    print("🔍 Available files:")
-    if os.path.exists(logs_dir):
-        for file in os.listdir(logs_dir):
-            if file.endswith('.csv'):
-                print(f"   📄 {file}")
-    exit(1)
-
-print(f"📊 Using performance data from: {used_file}")
-print("=== 📊 PERFORMANCE ANALYSIS REPORT ===\n")
-
-# Basic statistics
-total_operations = len(df)
-unique_operations = df['OperationName'].nunique()
-test_duration = pd.to_datetime(df['Timestamp'].iloc[-1]) - pd.to_datetime(df['Timestamp'].iloc[0])
-
-print(f"📈 OVERVIEW:")
-print(f"  • Total logged operations: {total_operations}")
-print(f"  • Unique operation types: {unique_operations}")
-print(f"  • Test duration: {test_duration}")
-print(f"  • Log file size: 59KB\n")
-
-# Performance by operation type
-print("🔧 PERFORMANCE BY OPERATION TYPE:")
-operation_stats = df.groupby('OperationName').agg({
-    'ElapsedMs': ['count', 'mean', 'max', 'min', 'std'],
-    'MemoryMB': ['mean', 'max']
-}).round(2)
-
-operation_stats.columns = ['Count', 'Avg_Time', 'Max_Time', 'Min_Time', 'Std_Time', 'Avg_Memory', 'Max_Memory']
-
-# Sort by average time descending
-operation_stats = operation_stats.sort_values('Avg_Time', ascending=False)
-
-for operation, stats in operation_stats.iterrows():
-    print(f"  🔹 {operation}:")
-    print(f"     Count: {stats['Count']}, Avg: {stats['Avg_Time']}ms, Max: {stats['Max_Time']}ms")
-    
-    # Identify performance issues
-    if stats['Avg_Time'] > 1000:
-        print(f"     ⚠️  SLOW: Average time > 1000ms")
-    if stats['Max_Time'] > 2000:
-        print(f"     🚨 CRITICAL: Max time > 2000ms")
-    
+        elapsed_stats.update(chunk)
+        memory_stats.update(chunk)
+        latency_stats.update(chunk[chunk['EventType'] != 'START'])
+
+        summary['total_operations'] += len(chunk)
+        if summary['first_row'] is None:
+            summary['first_row'] = chunk.iloc[0]
+        summary['last_row'] = chunk.iloc[-1]
+
+        chunk_tab_min, chunk_tab_max = chunk['TabCount'].min(), chunk['TabCount'].max()
+        summary['tab_min'] = chunk_tab_min if summary['tab_min'] is None else min(summary['tab_min'], chunk_tab_min)
+        summary['tab_max'] = chunk_tab_max if summary['tab_max'] is None else max(summary['tab_max'], chunk_tab_max)
+
+        tab_create = chunk['ElapsedMs'][chunk['OperationName'] == 'Create_New_Tab']
+        summary['slow_tab_creations'] += int((tab_create > 100).sum())
+
+    if summary['total_operations'] == 0:
+        return None
+
+    # Per operation statistics (same columns as the original groupby/agg report)
+    per_operation = elapsed_stats.rollup(['OperationName']).to_frame()
+    memory_frame = memory_stats.to_frame()
+    operation_stats = pd.DataFrame({
+        'Count': per_operation['count'],
+        'Avg_Time': per_operation['mean'],
+        'Max_Time': per_operation['max'],
+        'Min_Time': per_operation['min'],
+        'Std_Time': per_operation['std'],
+        'Avg_Memory': memory_frame['mean'],
+        'Max_Memory': memory_frame['max'],
+    }).round(2)
+    summary['operation_stats'] = operation_stats.sort_values('Avg_Time', ascending=False)
+    summary['percentiles'] = latency_stats.to_frame(quantiles=(0.50, 0.95, 0.99))
+    summary['unique_operations'] = len(operation_stats)
+
+    summary['memory_min'] = memory_frame['min'].min()
+    summary['memory_max'] = memory_frame['max'].max()
+
+    summary['search'] = _operation_summary(per_operation, 'Search_Operation')
+    summary['tab_create'] = _operation_summary(per_operation, 'Create_New_Tab')
+    summary['search_tab_correlation'] = _tab_correlation(elapsed_stats, 'Search_Operation')
+    return summary
+
+
+def _operation_summary(per_operation, operation):
+    if operation not in per_operation.index:
+        return {'count': 0, 'mean': np.nan, 'max': np.nan, 'min': np.nan}
+    row = per_operation.loc[operation]
+    return {'count': int(row['count']), 'mean': row['mean'], 'max': row['max'], 'min': row['min']}
+
+
+def _tab_correlation(elapsed_stats, operation):
+    """Pearson correlation of ElapsedMs vs TabCount rebuilt from the per (operation, tab) sums"""
+    moments = elapsed_stats.moments
+    if moments is None or operation not in moments.index.get_level_values('OperationName'):
+        return np.nan
+
+    op_moments = moments.xs(operation, level='OperationName')
+    tabs = op_moments.index.get_level_values('TabCount').to_numpy(dtype='float64')
+    n = op_moments['count'].sum()
+    sum_x, sum_xx = op_moments['sum'].sum(), op_moments['sum_sq'].sum()
+    sum_y = (tabs * op_moments['count']).sum()
+    sum_yy = (tabs * tabs * op_moments['count']).sum()
+    sum_xy = (tabs * op_moments['sum']).sum()
+
+    denominator = np.sqrt((n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+    if n < 2 or denominator == 0:
+        return np.nan
+    return (n * sum_xy - sum_x * sum_y) / denominator
+
+
+def print_report(summary, used_file, file_size_kb):
+    print(f"📊 Using performance data from: {used_file}")
+    print("=== 📊 PERFORMANCE ANALYSIS REPORT ===\n")
+
+    # Basic statistics
+    first_row, last_row = summary['first_row'], summary['last_row']
+    total_operations = summary['total_operations']
+    unique_operations = summary['unique_operations']
+    test_duration = last_row['Timestamp'] - first_row['Timestamp']
+
+    print(f"📈 OVERVIEW:")
+    print(f"  • Total logged operations: {total_operations}")
+    print(f"  • Unique operation types: {unique_operations}")
+    print(f"  • Test duration: {test_duration}")
+    print(f"  • Log file size: {file_size_kb:.0f}KB\n")
+
+    # Performance by operation type
+    print("🔧 PERFORMANCE BY OPERATION TYPE:")
+    for operation, stats in summary['operation_stats'].iterrows():
+        print(f"  🔹 {operation}:")
+        print(f"     Count: {stats['Count']}, Avg: {stats['Avg_Time']}ms, Max: {stats['Max_Time']}ms")
+        if operation in summary['percentiles'].index:
+            percentiles = summary['percentiles'].loc[operation]
+            print(f"     P50: {percentiles['p50']:.0f}ms, P95: {percentiles['p95']:.0f}ms, P99: {percentiles['p99']:.0f}ms")
+
+        # Identify performance issues
+        if stats['Avg_Time'] > 1000:
+            print(f"     ⚠️  SLOW: Average time > 1000ms")
+        if stats['Max_Time'] > 2000:
+            print(f"     🚨 CRITICAL: Max time > 2000ms")
+
+        print()
+
+    # Memory analysis
+    memory_min, memory_max = summary['memory_min'], summary['memory_max']
+    print("💾 MEMORY ANALYSIS:")
+    print(f"  • Memory range: {memory_min:.1f}MB - {memory_max:.1f}MB")
+    print(f"  • Memory growth: {memory_max - memory_min:.1f}MB total")
+    print(f"  • Peak memory usage: {memory_max:.1f}MB")
+
+    # Tab count analysis
+    print(f"\n🗂️ TAB ANALYSIS:")
+    print(f"  • Tab range: {summary['tab_min']} - {summary['tab_max']} tabs")
+    print(f"  • Final tab count: {last_row['TabCount']} tabs")
+
+    # Search operation analysis
+    search = summary['search']
+    if search['count'] > 0:
+        print(f"\n🔍 SEARCH PERFORMANCE:")
+        print(f"  • Total searches: {search['count']}")
+        print(f"  • Average search time: {search['mean']:.0f}ms")
+        print(f"  • Slowest search: {search['max']:.0f}ms")
+        print(f"  • Fastest search: {search['min']:.0f}ms")
+
+    # Tab creation analysis
+    tab_create = summary['tab_create']
+    if tab_create['count'] > 0:
+        print(f"\n📑 TAB CREATION PERFORMANCE:")
+        print(f"  • Total tab creations: {tab_create['count']}")
+        print(f"  • Average creation time: {tab_create['mean']:.0f}ms")
+        print(f"  • Slowest creation: {tab_create['max']:.0f}ms")
+
+        # Count slow tab creations
+        print(f"  • Slow tab creations (>100ms): {summary['slow_tab_creations']}")
+
+    # Performance trends
+    print(f"\n📊 PERFORMANCE TRENDS:")
+
+    # Search performance vs tab count
+    correlation = summary['search_tab_correlation']
+    if search['count'] > 0:
+        print(f"  • Search time vs Tab count correlation: {correlation:.3f}")
+
+        if correlation > 0.5:
+            print(f"    ⚠️  Strong positive correlation - performance degrades with more tabs")
+        elif correlation > 0.3:
+            print(f"    ⚠️  Moderate correlation - tabs impact performance")
+
+    # Memory growth pattern
+    memory_growth_rate = (last_row['MemoryMB'] - first_row['MemoryMB']) / total_operations * 100
+    print(f"  • Memory growth rate: {memory_growth_rate:.2f}MB per 100 operations")
+
+    if memory_growth_rate > 1:
+        print(f"    🚨 HIGH memory growth - potential memory leak")
+
+    print(f"\n=== 🎯 OPTIMIZATION RECOMMENDATIONS ===")
     print()
 
-# Memory analysis
-print("💾 MEMORY ANALYSIS:")
-print(f"  • Memory range: {df['MemoryMB'].min():.1f}MB - {df['MemoryMB'].max():.1f}MB")
-print(f"  • Memory growth: {df['MemoryMB'].max() - df['MemoryMB'].min():.1f}MB total")
-print(f"  • Peak memory usage: {df['MemoryMB'].max():.1f}MB")
-
-# Tab count analysis
-print(f"\n🗂️ TAB ANALYSIS:")
-print(f"  • Tab range: {df['TabCount'].min()} - {df['TabCount'].max()} tabs")
-print(f"  • Final tab count: {df['TabCount'].iloc[-1]} tabs")
-
-# Search operation analysis
-search_ops = df[df['OperationName'] == 'Search_Operation']['ElapsedMs']
-if len(search_ops) > 0:
-    print(f"\n🔍 SEARCH PERFORMANCE:")
-    print(f"  • Total searches: {len(search_ops)}")
-    print(f"  • Average search time: {search_ops.mean():.0f}ms")
-    print(f"  • Slowest search: {search_ops.max():.0f}ms")
-    print(f"  • Fastest search: {search_ops.min():.0f}ms")
-
-# Tab creation analysis
-tab_create_ops = df[df['OperationName'] == 'Create_New_Tab']['ElapsedMs']
-if len(tab_create_ops) > 0:
-    print(f"\n📑 TAB CREATION PERFORMANCE:")
-    print(f"  • Total tab creations: {len(tab_create_ops)}")
-    print(f"  • Average creation time: {tab_create_ops.mean():.0f}ms")
-    print(f"  • Slowest creation: {tab_create_ops.max():.0f}ms")
-    
-    # Count slow tab creations
-    slow_tabs = tab_create_ops[tab_create_ops > 100]
-    print(f"  • Slow tab creations (>100ms): {len(slow_tabs)}")
-
-# Performance trends
-print(f"\n📊 PERFORMANCE TRENDS:")
-
-# Search performance vs tab count
-search_complete = df[df['OperationName'] == 'Search_Operation']
-if len(search_complete) > 0:
-    correlation = search_complete['ElapsedMs'].corr(search_complete['TabCount'])
-    print(f"  • Search time vs Tab count correlation: {correlation:.3f}")
-    
-    if correlation > 0.5:
-        print(f"    ⚠️  Strong positive correlation - performance degrades with more tabs")
-    elif correlation > 0.3:
-        print(f"    ⚠️  Moderate correlation - tabs impact performance")
-
-# Memory growth pattern
-memory_growth_rate = (df['MemoryMB'].iloc[-1] - df['MemoryMB'].iloc[0]) / len(df) * 100
-print(f"  • Memory growth rate: {memory_growth_rate:.2f}MB per 100 operations")
-
-if memory_growth_rate > 1:
-    print(f"    🚨 HIGH memory growth - potential memory leak")
-
-print(f"\n=== 🎯 OPTIMIZATION RECOMMENDATIONS ===")
-print()
-
-# Specific recommendations based on data
-recommendations = []
-
-# Check search performance
-if search_ops.mean() > 1500:
-    recommendations.append("🔧 SEARCH OPTIMIZATION: Average search time > 1.5s - optimize Excel parsing")
+    # Specific recommendations based on data
+    recommendations = []
 
-# Check tab creation
-if tab_create_ops.mean() > 400:
-    recommendations.append("📑 TAB OPTIMIZATION: Tab creation > 400ms - optimize UC creation")
+    # Check search performance
+    if search['mean'] > 1500:
+        recommendations.append("🔧 SEARCH OPTIMIZATION: Average search time > 1.5s - optimize Excel parsing")
 
-# Check memory usage
-if df['MemoryMB'].max() > 60:
-    recommendations.append("💾 MEMORY OPTIMIZATION: Peak usage > 60MB - implement better cleanup")
+    # Check tab creation
+    if tab_create['mean'] > 400:
+        recommendations.append("📑 TAB OPTIMIZATION: Tab creation > 400ms - optimize UC creation")
 
-# Check performance degradation
-if correlation > 0.5:
-    recommendations.append("📊 SCALING OPTIMIZATION: Performance degrades with tab count - implement tab virtualization")
+    # Check memory usage
+    if memory_max > 60:
+        recommendations.append("💾 MEMORY OPTIMIZATION: Peak usage > 60MB - implement better cleanup")
 
-if not recommendations:
-    recommendations.append("✅ GOOD PERFORMANCE: No critical issues detected")
-
-for i, rec in enumerate(recommendations, 1):
-    print(f"{i}. {rec}")
-
-print(f"\n=== 📋 SUMMARY ===")
-print(f"Performance data shows {len(search_ops)} searches with average {search_ops.mean():.0f}ms")
-print(f"Memory usage: {df['MemoryMB'].min():.1f}MB → {df['MemoryMB'].max():.1f}MB")
-print(f"Tab scaling: 1 → {df['TabCount'].max()} tabs")
-
-# Overall performance grade
-avg_search_time = search_ops.mean() if len(search_ops) > 0 else 0
-memory_usage = df['MemoryMB'].max()
-
-if avg_search_time < 1000 and memory_usage < 50:
-    grade = "A - Excellent"
-elif avg_search_time < 1500 and memory_usage < 60:
-    grade = "B - Good"
-elif avg_search_time < 2000 and memory_usage < 70:
-    grade = "C - Fair"
-else:
-    grade = "D - Needs Optimization"
-
-print(f"Overall Performance Grade: {grade}")
+    # Check performance degradation
+    if correlation > 0.5:
+        recommendations.append("📊 SCALING OPTIMIZATION: Performance degrades with tab count - implement tab virtualization")
+
+    if not recommendations:
+        recommendations.append("✅ GOOD PERFORMANCE: No critical issues detected")
+
+    for i, rec in enumerate(recommendations, 1):
+        print(f"{i}. {rec}")
+
+    print(f"\n=== 📋 SUMMARY ===")
+    print(f"Performance data shows {search['count']} searches with average {search['mean']:.0f}ms")
+    print(f"Memory usage: {memory_min:.1f}MB → {memory_max:.1f}MB")
+    print(f"Tab scaling: 1 → {summary['tab_max']} tabs")
+
+    # Overall performance grade
+    avg_search_time = search['mean'] if search['count'] > 0 else 0
+    memory_usage = memory_max
+
+    if avg_search_time < 1000 and memory_usage < 50:
+        grade = "A - Excellent"
+    elif avg_search_time < 1500 and memory_usage < 60:
+        grade = "B - Good"
+    elif avg_search_time < 2000 and memory_usage < 70:
+        grade = "C - Fair"
+    else:
+        grade = "D - Needs Optimization"
+
+    print(f"Overall Performance Grade: {grade}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    stream = '--stream' in sys.argv
+
+    if args:
+        file_path, used_file = args[0], os.path.basename(args[0])
+    else:
+        file_path, used_file = find_performance_file()
+
+    if file_path is None or not os.path.exists(file_path):
+        print("❌ No valid performance data files found in Modules/Logs/")
+        print(f"📁 Checked directory: {logs_dir}")
+        print("🔍 Available files:")
+        if os.path.exists(logs_dir):
+            for file in os.listdir(logs_dir):
+                if file.endswith('.csv'):
+                    print(f"   📄 {file}")
+        exit(1)
+
+    file_size_kb = os.path.getsize(file_path) / 1024
+    stream = stream or file_size_kb > STREAM_THRESHOLD_MB * 1024
+
+    try:
+        if stream:
+            chunks = iter_performance_log_chunks(file_path, chunksize=DEFAULT_CHUNK_ROWS)
+        else:
+            chunks = [load_performance_log(file_path)]
+        summary = summarize_log(chunks)
+    except Exception as e:
+        print(f"⚠️ Error reading {used_file}: {e}")
+        exit(1)
+
+    if summary is None:
+        print(f"❌ No performance records in {used_file}")
+        exit(1)
+
+    print_report(summary, used_file, file_size_kb)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,14 @@ System Resource Analysis: Check if system overload affects performance
 Analyze system resources during performance tests
 """
 
-import pandas as pd
 import psutil
 import os
 import time
 from pathlib import Path
 
+from perf_log_loader import load_performance_log
+from perf_statistics import IMPROVEMENT, REGRESSION, compare_latency
+
 def get_current_system_status():
     """Get current system resource usage"""
     print("🖥️ CURRENT SYSTEM STATUS:")
@@ -105,11 +107,11 @@ def analyze_performance_with_system_context(df, version_name):
                     last_10 = times[-10:].mean()
                     degradation = ((last_10 - first_10) / first_10) * 100
                     
-                    if degradation > 50:
-                        trend = "🔴 DEGRADING"
-                    elif degradation > 20:
-                        trend = "🟡 SLIGHT DECLINE"
-                    elif degradation < -20:
+                    # Only call it a trend when the first/last 10 calls differ significantly
+                    verdict = compare_latency(times[:10], times[-10:])['verdict']
+                    if verdict == REGRESSION:
+                        trend = "🔴 DEGRADING" if degradation > 50 else "🟡 SLIGHT DECLINE"
+                    elif verdict == IMPROVEMENT:
                         trend = "🟢 IMPROVING"
                     else:
                         trend = "➡️ STABLE"
@@ -141,7 +143,7 @@ def compare_system_impact():
         filepath = f"d:\\5_Automation\\Check_carasi_DF_ContextClearing\\{filename}"
         if Path(filepath).exists():
             try:
-                df = pd.read_csv(filepath)
+                df = load_performance_log(filepath)
                 
                 # Calculate performance metrics
                 tab_events = df[df['OperationName'] == 'Create_New_Tab']
@@ -232,7 +234,7 @@ def main():
     latest_file = os.path.join(logs_dir, "PerformanceAnalysis_CONNECTIONPOOL_FIX.csv")
     if Path(latest_file).exists():
         try:
-            df = pd.read_csv(latest_file)
+            df = load_performance_log(latest_file)
             analyze_performance_with_system_context(df, "LATEST TEST")
         except Exception as e:
             print(f"❌ Error loading latest performance data: {e}")
@@ -4,181 +4,297 @@ Tab Performance Analysis: Analyze performance degradation by tab count ranges
 Focus on finding performance bottlenecks at high tab counts (50+)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import os
+import sys
 from pathlib import Path
 
-def analyze_tab_performance_ranges(filepath):
-    """Analyze performance by tab count ranges"""
-    try:
-        df = pd.read_csv(filepath)
-        print(f"🔍 TAB PERFORMANCE RANGE ANALYSIS")
-        print(f"📊 Loaded {len(df)} records from {Path(filepath).name}")
-        print("="*80)
-        
+from perf_aggregates import GroupedStats
+from perf_log_loader import DEFAULT_CHUNK_ROWS, iter_performance_log_chunks, load_performance_log
+
+IMPORTANT_OPERATIONS = ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']
+
+# Tab count bucket edges: (0,10], (10,20], ... -> "Tabs 1-10", "Tabs 11-20", ..., last bucket "Tabs 51+"
+DEFAULT_TAB_EDGES = [0, 10, 20, 30, 40, 50, 100]
+RANGE_ICONS = ["🟢", "🟡", "🟠", "🔴", "🚨", "💀"]
+
+HIGH_TAB_THRESHOLD = 50
+TIMELINE_ROWS = 10
+
+# Logs bigger than this are aggregated chunk by chunk instead of loaded whole
+STREAM_THRESHOLD_MB = 256
+
+
+def collect_tab_aggregates(chunks):
+    """
+    One pass over the log: running ElapsedMs/MemoryMB aggregates per (OperationName, TabCount)
+    for COMPLETE events of the important operations, plus the first high-tab rows for the timeline.
+    """
+    elapsed = GroupedStats(['OperationName', 'TabCount'], 'ElapsedMs')
+    memory = GroupedStats(['OperationName', 'TabCount'], 'MemoryMB', with_sketch=False)
+    timeline = None
+    total_records = 0
+
+    for chunk in chunks:
+        if 'TabCount' not in chunk.columns:
+            return None
+        total_records += len(chunk)
+
         # Filter only COMPLETE events for operations we care about
-        complete_df = df[df['EventType'] == 'COMPLETE']
-        important_ops = ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']
-        filtered_df = complete_df[complete_df['OperationName'].isin(important_ops)]
-        
-        if 'TabCount' not in filtered_df.columns:
+        filtered = chunk[(chunk['EventType'] == 'COMPLETE') & chunk['OperationName'].isin(IMPORTANT_OPERATIONS)]
+        elapsed.update(filtered)
+        memory.update(filtered)
+
+        # Keep only the lowest-tab rows seen so far (stable: ties stay in file order)
+        high_tab = filtered[filtered['TabCount'] >= HIGH_TAB_THRESHOLD]
+        if len(high_tab) > 0:
+            timeline = high_tab if timeline is None else pd.concat([timeline, high_tab])
+            timeline = timeline.sort_values('TabCount', kind='stable').head(TIMELINE_ROWS)
+
+    return {
+        'total_records': total_records,
+        'elapsed': elapsed.moments,
+        'memory': memory.moments,
+        'timeline': timeline,
+    }
+
+
+def tab_range_labels(edges):
+    """Labels for the buckets (edges[i], edges[i+1]]; the last bucket is open-ended in the label"""
+    labels = []
+    for i, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+        icon = RANGE_ICONS[min(i, len(RANGE_ICONS) - 1)]
+        span = f"{low + 1}+" if i == len(edges) - 2 else f"{low + 1}-{high}"
+        labels.append(f"{icon} Tabs {span}")
+    return labels
+
+
+def compute_tab_tables(aggregates, edges=DEFAULT_TAB_EDGES):
+    """
+    Derive every report table from the (OperationName, TabCount) aggregates in grouped passes:
+    range buckets via pd.cut, per-operation degradation via a join against the first bucket.
+    """
+    elapsed, memory = aggregates['elapsed'], aggregates['memory']
+    empty = pd.DataFrame()
+    if elapsed is None or len(elapsed) == 0:
+        return {'ranges': empty, 'range_operations': empty, 'high_tab': empty,
+                'high_tab_memory': None, 'progression': empty}
+
+    labels = tab_range_labels(edges)
+    moments = elapsed.reset_index()
+    moments['Range'] = pd.cut(moments['TabCount'], bins=edges, labels=labels)
+
+    # Range table: one groupby over the bucketed aggregates
+    by_range = moments.groupby('Range', observed=True)
+    ranges = by_range.agg(count=('count', 'sum'), total=('sum', 'sum'), max_time=('max', 'max'))
+    ranges['avg_time'] = ranges['total'] / ranges['count']
+
+    range_operations = (moments.groupby(['Range', 'OperationName'], observed=True)['count'].sum()
+                        .reset_index()
+                        .sort_values(['Range', 'count'], ascending=[True, False], kind='stable'))
+
+    # High-tab operations joined with their baseline (first bucket) averages
+    baseline_max_tabs = edges[1]
+    high = moments[moments['TabCount'] >= HIGH_TAB_THRESHOLD].groupby('OperationName')
+    high_tab = high.agg(count=('count', 'sum'), total=('sum', 'sum'), max_time=('max', 'max'))
+    high_tab['avg_time'] = high_tab['total'] / high_tab['count']
+
+    low = moments[moments['TabCount'] <= baseline_max_tabs].groupby('OperationName')
+    baseline = low.agg(baseline_count=('count', 'sum'), baseline_total=('sum', 'sum'))
+    baseline['baseline_avg'] = baseline['baseline_total'] / baseline['baseline_count']
+
+    high_tab = high_tab.join(baseline['baseline_avg'], how='left')
+    high_tab['degradation'] = (high_tab['avg_time'] - high_tab['baseline_avg']) / high_tab['baseline_avg'] * 100
+
+    # Memory at high tab counts
+    high_tab_memory = None
+    if memory is not None and len(memory) > 0:
+        memory_high = memory[memory.index.get_level_values('TabCount') >= HIGH_TAB_THRESHOLD]
+        if memory_high['count'].sum() > 0:
+            high_tab_memory = {
+                'min': memory_high['min'].min(),
+                'max': memory_high['max'].max(),
+                'mean': memory_high['sum'].sum() / memory_high['count'].sum(),
+            }
+
+    # Progression per tab count with the step-to-step trend
+    progression = elapsed.groupby(level='TabCount')[['count', 'sum']].sum()
+    progression['avg_performance'] = progression['sum'] / progression['count']
+    if memory is not None and len(memory) > 0:
+        per_tab_memory = memory.groupby(level='TabCount')[['count', 'sum']].sum()
+        progression['memory'] = per_tab_memory['sum'] / per_tab_memory['count']
+    else:
+        progression['memory'] = np.nan
+    progression['trend_pct'] = progression['avg_performance'].pct_change() * 100
+
+    return {
+        'ranges': ranges,
+        'range_operations': range_operations,
+        'high_tab': high_tab,
+        'high_tab_memory': high_tab_memory,
+        'progression': progression,
+    }
+
+
+def print_tab_report(aggregates, filepath, edges=DEFAULT_TAB_EDGES):
+    tables = compute_tab_tables(aggregates, edges)
+    timeline = aggregates['timeline']
+
+    print(f"🔍 TAB PERFORMANCE RANGE ANALYSIS")
+    print(f"📊 Loaded {aggregates['total_records']} records from {Path(filepath).name}")
+    print("="*80)
+
+    print(f"\n📈 PERFORMANCE BY TAB COUNT RANGES:")
+    print(f"{'Range':<15} {'Count':<8} {'Avg Time':<12} {'Max Time':<12} {'Operations':<30}")
+    print("-"*85)
+
+    total_stats = {}
+    range_operations = tables['range_operations']
+
+    for label, stats in tables['ranges'].iterrows():
+        count = int(stats['count'])
+        op_counts = range_operations[range_operations['Range'] == label].set_index('OperationName')['count']
+        top_ops = ', '.join([f"{op}({cnt})" for op, cnt in op_counts.head(3).items()])
+
+        print(f"{label:<15} {count:<8} {stats['avg_time']:<8.0f}ms    {stats['max_time']:<8.0f}ms    {top_ops}")
+
+        total_stats[label] = {
+            'avg_time': stats['avg_time'],
+            'max_time': stats['max_time'],
+            'count': count,
+            'operations': op_counts.to_dict()
+        }
+
+    # Detailed analysis for high tab counts (50+)
+    print(f"\n🔥 DETAILED ANALYSIS: HIGH TAB COUNT PERFORMANCE (50+ tabs)")
+    print("="*80)
+
+    high_tab = tables['high_tab']
+
+    if len(high_tab) > 0:
+        print(f"\n📊 Operations at 50+ tabs:")
+        for operation in IMPORTANT_OPERATIONS:
+            if operation not in high_tab.index:
+                continue
+            stats = high_tab.loc[operation]
+
+            # Performance degradation indicator
+            if pd.notna(stats['baseline_avg']):
+                degradation = stats['degradation']
+                degradation_indicator = "🚨" if degradation > 100 else "⚠️" if degradation > 50 else "✅"
+                print(f"  {degradation_indicator} {operation}: {stats['avg_time']:.0f}ms avg (vs {stats['baseline_avg']:.0f}ms baseline, +{degradation:.1f}%)")
+            else:
+                print(f"  🔹 {operation}: {stats['avg_time']:.0f}ms avg, {stats['max_time']:.0f}ms max ({int(stats['count'])} ops)")
+
+        # Memory analysis at high tab counts
+        memory_stats = tables['high_tab_memory']
+        if memory_stats is not None:
+            print(f"\n💾 Memory at 50+ tabs:")
+            print(f"  🔹 Range: {memory_stats['min']:.1f}MB - {memory_stats['max']:.1f}MB")
+            print(f"  🔹 Average: {memory_stats['mean']:.1f}MB")
+
+        # Timeline analysis - show when performance started degrading
+        print(f"\n⏱️ Timeline Analysis (50+ tabs):")
+        for _, row in timeline.iterrows():
+            tab_count = row['TabCount']
+            operation = row['OperationName']
+            elapsed_ms = row['ElapsedMs']
+            memory_mb = round(float(row['MemoryMB']), 1) if 'MemoryMB' in row else 'N/A'
+            print(f"  Tab {tab_count:2d}: {operation:<20} {elapsed_ms:4.0f}ms (Mem: {memory_mb}MB)")
+
+    else:
+        print("ℹ️ No operations found at 50+ tab count")
+
+    # Performance progression analysis
+    print(f"\n📈 PERFORMANCE PROGRESSION ANALYSIS:")
+    print("="*80)
+
+    # Show performance trend
+    print(f"{'Tab Count':<10} {'Avg Perf':<12} {'Ops':<6} {'Memory':<10} {'Trend':<10}")
+    print("-"*55)
+
+    for tab_count, stats in tables['progression'].iterrows():
+        tab_count = int(tab_count)
+        trend_pct = stats['trend_pct']
+
+        # Calculate trend
+        if pd.notna(trend_pct):
+            trend_icon = "📈" if trend_pct > 20 else "📉" if trend_pct < -20 else "➡️"
+            trend_text = f"{trend_icon}{trend_pct:+.0f}%"
+        else:
+            trend_text = "---"
+
+        # Highlight problematic ranges
+        if tab_count >= 50:
+            row_color = "🚨"
+        elif tab_count >= 40:
+            row_color = "⚠️"
+        elif tab_count >= 30:
+            row_color = "🟡"
+        else:
+            row_color = "🟢"
+
+        print(f"{row_color} {tab_count:<7d} {stats['avg_performance']:<8.0f}ms   {int(stats['count']):<4d}  {stats['memory']:<6.1f}MB   {trend_text}")
+
+    return total_stats
+
+
+def analyze_tab_performance_ranges(filepath, stream=False, chunksize=DEFAULT_CHUNK_ROWS, edges=DEFAULT_TAB_EDGES):
+    """Analyze performance by tab count ranges (stream=True aggregates the log chunk by chunk)"""
+    try:
+        if stream:
+            chunks = iter_performance_log_chunks(filepath, chunksize=chunksize)
+        else:
+            chunks = [load_performance_log(filepath)]
+
+        aggregates = collect_tab_aggregates(chunks)
+        if aggregates is None:
             print("❌ TabCount column not found")
             return
-        
-        # Define tab count ranges
-        ranges = [
-            (1, 10, "🟢 Tabs 1-10"),
-            (11, 20, "🟡 Tabs 11-20"), 
-            (21, 30, "🟠 Tabs 21-30"),
-            (31, 40, "🔴 Tabs 31-40"),
-            (41, 50, "🚨 Tabs 41-50"),
-            (51, 100, "💀 Tabs 51+")
-        ]
-        
-        print(f"\n📈 PERFORMANCE BY TAB COUNT RANGES:")
-        print(f"{'Range':<15} {'Count':<8} {'Avg Time':<12} {'Max Time':<12} {'Operations':<30}")
-        print("-"*85)
-        
-        total_stats = {}
-        
-        for min_tabs, max_tabs, label in ranges:
-            range_data = filtered_df[(filtered_df['TabCount'] >= min_tabs) & 
-                                   (filtered_df['TabCount'] <= max_tabs)]
-            
-            if len(range_data) > 0:
-                avg_time = range_data['ElapsedMs'].mean()
-                max_time = range_data['ElapsedMs'].max()
-                count = len(range_data)
-                
-                # Get operation breakdown
-                op_counts = range_data['OperationName'].value_counts()
-                top_ops = ', '.join([f"{op}({cnt})" for op, cnt in op_counts.head(3).items()])
-                
-                print(f"{label:<15} {count:<8} {avg_time:<8.0f}ms    {max_time:<8.0f}ms    {top_ops}")
-                
-                total_stats[label] = {
-                    'avg_time': avg_time,
-                    'max_time': max_time,
-                    'count': count,
-                    'operations': op_counts.to_dict()
-                }
-        
-        # Detailed analysis for high tab counts (50+)
-        print(f"\n🔥 DETAILED ANALYSIS: HIGH TAB COUNT PERFORMANCE (50+ tabs)")
-        print("="*80)
-        
-        high_tab_data = filtered_df[filtered_df['TabCount'] >= 50]
-        
-        if len(high_tab_data) > 0:
-            print(f"\n📊 Operations at 50+ tabs:")
-            for operation in important_ops:
-                op_data = high_tab_data[high_tab_data['OperationName'] == operation]
-                if len(op_data) > 0:
-                    avg_time = op_data['ElapsedMs'].mean()
-                    max_time = op_data['ElapsedMs'].max()
-                    count = len(op_data)
-                    
-                    # Performance degradation indicator
-                    low_tab_data = filtered_df[(filtered_df['TabCount'] <= 10) & 
-                                             (filtered_df['OperationName'] == operation)]
-                    
-                    if len(low_tab_data) > 0:
-                        baseline_avg = low_tab_data['ElapsedMs'].mean()
-                        degradation = ((avg_time - baseline_avg) / baseline_avg) * 100
-                        degradation_indicator = "🚨" if degradation > 100 else "⚠️" if degradation > 50 else "✅"
-                        print(f"  {degradation_indicator} {operation}: {avg_time:.0f}ms avg (vs {baseline_avg:.0f}ms baseline, +{degradation:.1f}%)")
-                    else:
-                        print(f"  🔹 {operation}: {avg_time:.0f}ms avg, {max_time:.0f}ms max ({count} ops)")
-            
-            # Memory analysis at high tab counts
-            memory_data = high_tab_data['MemoryMB'].dropna()
-            if len(memory_data) > 0:
-                print(f"\n💾 Memory at 50+ tabs:")
-                print(f"  🔹 Range: {memory_data.min():.1f}MB - {memory_data.max():.1f}MB")
-                print(f"  🔹 Average: {memory_data.mean():.1f}MB")
-                
-            # Timeline analysis - show when performance started degrading
-            print(f"\n⏱️ Timeline Analysis (50+ tabs):")
-            timeline_data = high_tab_data.sort_values('TabCount')
-            for _, row in timeline_data.head(10).iterrows():
-                tab_count = row['TabCount']
-                operation = row['OperationName']
-                elapsed = row['ElapsedMs']
-                memory = row.get('MemoryMB', 'N/A')
-                print(f"  Tab {tab_count:2d}: {operation:<20} {elapsed:4.0f}ms (Mem: {memory}MB)")
-        
-        else:
-            print("ℹ️ No operations found at 50+ tab count")
-        
-        # Performance progression analysis
-        print(f"\n📈 PERFORMANCE PROGRESSION ANALYSIS:")
-        print("="*80)
-        
-        # Group by tab count and calculate average performance
-        tab_performance = []
-        for tab_count in sorted(filtered_df['TabCount'].unique()):
-            tab_data = filtered_df[filtered_df['TabCount'] == tab_count]
-            avg_performance = tab_data['ElapsedMs'].mean()
-            operation_counts = len(tab_data)
-            memory_avg = tab_data['MemoryMB'].mean() if 'MemoryMB' in tab_data.columns else 0
-            
-            tab_performance.append({
-                'tab_count': tab_count,
-                'avg_performance': avg_performance,
-                'operation_count': operation_counts,
-                'memory': memory_avg
-            })
-        
-        # Show performance trend
-        print(f"{'Tab Count':<10} {'Avg Perf':<12} {'Ops':<6} {'Memory':<10} {'Trend':<10}")
-        print("-"*55)
-        
-        for i, stats in enumerate(tab_performance):
-            tab_count = stats['tab_count']
-            avg_perf = stats['avg_performance']
-            ops = stats['operation_count']
-            memory = stats['memory']
-            
-            # Calculate trend
-            if i > 0:
-                prev_perf = tab_performance[i-1]['avg_performance']
-                trend_pct = ((avg_perf - prev_perf) / prev_perf) * 100
-                trend_icon = "📈" if trend_pct > 20 else "📉" if trend_pct < -20 else "➡️"
-                trend_text = f"{trend_icon}{trend_pct:+.0f}%"
-            else:
-                trend_text = "---"
-            
-            # Highlight problematic ranges
-            if tab_count >= 50:
-                row_color = "🚨"
-            elif tab_count >= 40:
-                row_color = "⚠️"
-            elif tab_count >= 30:
-                row_color = "🟡"
-            else:
-                row_color = "🟢"
-                
-            print(f"{row_color} {tab_count:<7d} {avg_perf:<8.0f}ms   {ops:<4d}  {memory:<6.1f}MB   {trend_text}")
-        
-        return total_stats
-        
+
+        return print_tab_report(aggregates, filepath, edges)
+
     except Exception as e:
         print(f"❌ Error analyzing tab performance: {e}")
         return None
 
+def tab_edges(text):
+    """argparse type of --edges: comma-separated, strictly increasing tab counts"""
+    try:
+        edges = [int(value) for value in text.split(',') if value.strip()]
+    except ValueError:
+        edges = []
+    if len(edges) < 2 or edges != sorted(set(edges)):
+        raise argparse.ArgumentTypeError("needs at least two strictly increasing tab counts")
+    return edges
+
+def parse_arguments(argv):
+    """Optional log path plus --stream and the --edges 0,10,20,30,40,50,100 bucket override"""
+    parser = argparse.ArgumentParser(description="Performance by tab count range")
+    parser.add_argument('file', nargs='?', help="performance log (default: Modules/Logs/PerformanceAnalysis_CONNECTIONPOOL.csv)")
+    parser.add_argument('--stream', action='store_true', help="read the log in chunks")
+    parser.add_argument('--edges', type=tab_edges, default=DEFAULT_TAB_EDGES, metavar='0,10,20,...',
+                        help="tab count bucket edges")
+    return vars(parser.parse_args(argv))
+
 def main():
-    if len(sys.argv) > 1:
-        filepath = sys.argv[1]
+    options = parse_arguments(sys.argv[1:])
+    if options['file']:
+        filepath = options['file']
     else:
         # Use module-based path structure
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(os.path.dirname(script_dir))
         logs_dir = os.path.join(project_root, 'Modules', 'Logs')
         filepath = os.path.join(logs_dir, "PerformanceAnalysis_CONNECTIONPOOL.csv")
-    
-    analyze_tab_performance_ranges(filepath)
+
+    stream = options['stream']
+    if not stream and os.path.exists(filepath):
+        stream = os.path.getsize(filepath) > STREAM_THRESHOLD_MB * 1024 * 1024
+
+    analyze_tab_performance_ranges(filepath, stream=stream, edges=options['edges'])
 
 if __name__ == "__main__":
-    import sys
     main()
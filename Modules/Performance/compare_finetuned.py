@@ -4,15 +4,19 @@ Performance Comparison: Original vs Optimized vs Fine-tuned
 Compare three versions to track optimization progress
 """
 
-import pandas as pd
 import sys
 import os
 from pathlib import Path
 
+from perf_log_loader import load_performance_log
+from perf_statistics import IMPROVEMENT, REGRESSION, VERDICT_ICONS, combined_verdict, compare_operations, print_comparison
+
+OPERATIONS = ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']
+
 def load_performance_data(filepath):
     """Load and prepare performance data"""
     try:
-        df = pd.read_csv(filepath)
+        df = load_performance_log(filepath)
         print(f"✅ Loaded {len(df)} records from {Path(filepath).name}")
         return df
     except Exception as e:
@@ -27,21 +31,25 @@ def analyze_operations(df, version_name):
     
     # Filter only COMPLETE events and group by OperationName
     complete_df = df[df['EventType'] == 'COMPLETE']
-    operation_groups = complete_df.groupby('OperationName')
+    operation_groups = complete_df.groupby('OperationName', observed=True)
     
     for operation, group in operation_groups:
-        if operation in ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']:
+        if operation in OPERATIONS:
             avg_time = group['ElapsedMs'].mean()
             max_time = group['ElapsedMs'].max()
+            p50, p95, p99 = group['ElapsedMs'].quantile([0.50, 0.95, 0.99], interpolation='lower')
             count = len(group)
             
             results[operation] = {
                 'avg': avg_time,
                 'max': max_time,
+                'p50': p50,
+                'p95': p95,
+                'p99': p99,
                 'count': count
             }
             
-            print(f"  🔹 {operation}: {avg_time:.1f}ms avg, {max_time:.0f}ms max ({count} ops)")
+            print(f"  🔹 {operation}: {avg_time:.1f}ms avg, p50 {p50:.0f}ms, p95 {p95:.0f}ms, p99 {p99:.0f}ms, {max_time:.0f}ms max ({count} ops)")
     
     return results
 
@@ -51,17 +59,18 @@ def calculate_improvement(original, new):
         return 0
     return ((original - new) / original) * 100
 
-def compare_versions(original_results, optimized_results, finetuned_results):
-    """Compare all three versions"""
-    print(f"\n🔄 PERFORMANCE COMPARISON:")
+def compare_versions(original_results, optimized_results, finetuned_results, opt_verdicts, final_verdicts):
+    """Compare all three versions (indicators follow the significance-tested verdicts, not the raw % change)"""
+    print(f"\n🔄 PERFORMANCE COMPARISON (average, 🟢/🔴 = significant change):")
     print(f"{'Operation':<20} {'Original':<12} {'Optimized':<12} {'Fine-tuned':<12} {'Opt Change':<12} {'Final Change':<12}")
     print("="*90)
     
     total_original = 0
     total_optimized = 0
     total_finetuned = 0
+    compared = []
     
-    for operation in ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']:
+    for operation in OPERATIONS:
         if operation in original_results and operation in optimized_results and operation in finetuned_results:
             orig_avg = original_results[operation]['avg']
             opt_avg = optimized_results[operation]['avg']
@@ -71,21 +80,23 @@ def compare_versions(original_results, optimized_results, finetuned_results):
             final_change = calculate_improvement(orig_avg, fine_avg)
             
             # Format with color indicators
-            opt_indicator = "🟢" if opt_change > 0 else "🔴" if opt_change < -5 else "🟡"
-            final_indicator = "🟢" if final_change > 0 else "🔴" if final_change < -5 else "🟡"
+            opt_indicator = VERDICT_ICONS[opt_verdicts[operation]['verdict']]
+            final_indicator = VERDICT_ICONS[final_verdicts[operation]['verdict']]
             
             print(f"{operation:<20} {orig_avg:<8.1f}ms {opt_avg:<8.1f}ms {fine_avg:<8.1f}ms {opt_indicator}{opt_change:+6.1f}% {final_indicator}{final_change:+6.1f}%")
             
             total_original += orig_avg
             total_optimized += opt_avg
             total_finetuned += fine_avg
+            compared.append(operation)
     
     print("-"*90)
     total_opt_change = calculate_improvement(total_original, total_optimized)
     total_final_change = calculate_improvement(total_original, total_finetuned)
     
-    opt_indicator = "🟢" if total_opt_change > 0 else "🔴"
-    final_indicator = "🟢" if total_final_change > 0 else "🔴"
+    # TOTAL follows the verdicts of the operations it sums, so noise alone never shows as 🟢/🔴
+    opt_indicator = VERDICT_ICONS[combined_verdict(opt_verdicts[operation] for operation in compared)]
+    final_indicator = VERDICT_ICONS[combined_verdict(final_verdicts[operation] for operation in compared)]
     
     print(f"{'TOTAL':<20} {total_original:<8.1f}ms {total_optimized:<8.1f}ms {total_finetuned:<8.1f}ms {opt_indicator}{total_opt_change:+6.1f}% {final_indicator}{total_final_change:+6.1f}%")
     
@@ -129,13 +140,22 @@ def main():
     optimized_results = analyze_operations(df_optimized, "OPTIMIZED") 
     finetuned_results = analyze_operations(df_finetuned, "FINE-TUNED")
     
+    # Significance-tested verdicts against the original and between the two optimized versions
+    opt_verdicts = compare_operations(df_original, df_optimized, OPERATIONS)
+    final_verdicts = compare_operations(df_original, df_finetuned, OPERATIONS)
+    tuning_verdicts = compare_operations(df_optimized, df_finetuned, OPERATIONS)
+    
     # Compare all versions
-    total_original, total_optimized, total_finetuned = compare_versions(original_results, optimized_results, finetuned_results)
+    total_original, total_optimized, total_finetuned = compare_versions(original_results, optimized_results, finetuned_results,
+                                                                        opt_verdicts, final_verdicts)
+    print_comparison(tuning_verdicts, "Optimized", "Fine-tuned")
     
     # Calculate overall changes
     total_opt_change = calculate_improvement(total_original, total_optimized)
     total_final_change = calculate_improvement(total_original, total_finetuned)
-    final_indicator = "🟢" if total_final_change > 0 else "🔴"
+    compared = [operation for operation in OPERATIONS
+                if operation in original_results and operation in optimized_results and operation in finetuned_results]
+    final_indicator = VERDICT_ICONS[combined_verdict(final_verdicts[operation] for operation in compared)]
     
     # Memory comparison
     print(f"\n💾 MEMORY COMPARISON:")
@@ -151,8 +171,17 @@ def main():
         print(f"  🔹 Optimized version: {opt_mem_change:+.1f}% memory growth change")
         print(f"  🔹 Fine-tuned version: {final_mem_change:+.1f}% memory growth change")
     
+    # Fine-tuning only counts as an improvement when some operation got significantly faster and none slower
+    tuning = combined_verdict(tuning_verdicts.values())
+    if tuning == REGRESSION:
+        tuning_outcome = 'regressed'
+    elif tuning == IMPROVEMENT:
+        tuning_outcome = 'improved'
+    else:
+        tuning_outcome = 'maintained'
+    
     print(f"\n🎯 CONCLUSION:")
-    print(f"  Fine-tuning has {'improved' if total_final_change > total_opt_change else 'maintained'} the optimization results")
+    print(f"  Fine-tuning has {tuning_outcome} the optimization results")
     print(f"  Overall performance change from original: {final_indicator}{total_final_change:+.1f}%")
 
 if __name__ == "__main__":
@@ -3,17 +3,69 @@
 Performance Comparison Analysis Tool
 Compares optimized performance vs original performance
 """
-import pandas as pd
 import numpy as np
 from datetime import datetime
 import sys
 import os
 
+from perf_log_loader import load_performance_log
+from perf_statistics import (IMPROVEMENT, INSUFFICIENT, REGRESSION, VERDICT_ICONS, compare_operations,
+                             completed_events, deciding_change, format_change)
+
 # Define paths relative to current script location
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(script_dir))
 logs_dir = os.path.join(project_root, 'Modules', 'Logs')
 
+def calculate_grade(avg_search_time, avg_tab_time, memory_growth_rate):
+    """Score out of 100 from average search time, average tab creation time and MB growth per 100 ops"""
+    score = 100
+
+    # Search performance (target: <300ms)
+    if avg_search_time > 1000:
+        score -= 30
+    elif avg_search_time > 600:
+        score -= 20
+    elif avg_search_time > 300:
+        score -= 10
+
+    # Tab creation (target: <200ms)
+    if avg_tab_time > 500:
+        score -= 20
+    elif avg_tab_time > 300:
+        score -= 15
+    elif avg_tab_time > 200:
+        score -= 10
+
+    # Memory growth (target: <3MB per 100 ops)
+    if memory_growth_rate > 10:
+        score -= 30
+    elif memory_growth_rate > 7:
+        score -= 20
+    elif memory_growth_rate > 3:
+        score -= 10
+
+    return max(0, score)
+
+def grade_to_letter(score):
+    if score >= 90: return "A-Excellent"
+    elif score >= 80: return "B-Good"
+    elif score >= 70: return "C-Fair"
+    elif score >= 60: return "D-Poor"
+    else: return "F-Critical"
+
+def verdict_summary(result):
+    """One-line verdict for an operation, based on the significance-tested percentile that decided it"""
+    verdict = result['verdict']
+    statistic, change = deciding_change(result)
+    if verdict == IMPROVEMENT:
+        return f"✅ IMPROVEMENT: {change:.1f}% faster ({statistic}, significant)"
+    if verdict == REGRESSION:
+        return f"❌ REGRESSION: {abs(change):.1f}% slower ({statistic}, significant)"
+    if verdict == INSUFFICIENT:
+        return f"{VERDICT_ICONS[verdict]} INSUFFICIENT DATA: too few operations to compare"
+    return f"{VERDICT_ICONS[verdict]} NO SIGNIFICANT CHANGE: {statistic} {change:+.1f}% is within noise"
+
 def analyze_performance_improvements():
     """Compare optimized vs original performance data"""
     print("🚀 PERFORMANCE OPTIMIZATION COMPARISON ANALYSIS")
@@ -22,7 +74,7 @@ def analyze_performance_improvements():
     # Read both datasets
     try:
         original_path = os.path.join(logs_dir, 'PerformanceAnalysis.csv')
-        df_original = pd.read_csv(original_path)
+        df_original = load_performance_log(original_path)
         print(f"✅ Original data loaded: {len(df_original)} records")
     except FileNotFoundError:
         print("❌ Original performance file not found!")
@@ -30,7 +82,7 @@ def analyze_performance_improvements():
     
     try:
         optimized_path = os.path.join(logs_dir, 'PerformanceAnalysis_OPTIMIZED.csv')
-        df_optimized = pd.read_csv(optimized_path)
+        df_optimized = load_performance_log(optimized_path)
         print(f"✅ Optimized data loaded: {len(df_optimized)} records")
     except FileNotFoundError:
         print("❌ Optimized performance file not found!")
@@ -38,10 +90,6 @@ def analyze_performance_improvements():
     
     print()
     
-    # Convert timestamp to datetime
-    df_original['Timestamp'] = pd.to_datetime(df_original['Timestamp'])
-    df_optimized['Timestamp'] = pd.to_datetime(df_optimized['Timestamp'])
-    
     # Calculate session duration
     original_duration = (df_original['Timestamp'].max() - df_original['Timestamp'].min()).total_seconds()
     optimized_duration = (df_optimized['Timestamp'].max() - df_optimized['Timestamp'].min()).total_seconds()
@@ -57,24 +105,19 @@ def analyze_performance_improvements():
     print("🎯 OPERATION-BY-OPERATION COMPARISON:")
     print("-" * 60)
     
-    for op in operations:
-        orig_ops = df_original[df_original['OperationName'] == op]
-        opt_ops = df_optimized[df_optimized['OperationName'] == op]
+    # Only differences whose bootstrap CI excludes zero count as improvement/regression
+    comparison = compare_operations(df_original, df_optimized, operations)
+    
+    for op, result in comparison.items():
+        mean, p50, p95, p99 = (result['stats'][s] for s in ('mean', 'p50', 'p95', 'p99'))
         
-        if len(orig_ops) > 0 and len(opt_ops) > 0:
-            orig_avg = orig_ops['ElapsedMs'].mean()
-            opt_avg = opt_ops['ElapsedMs'].mean()
-            improvement = ((orig_avg - opt_avg) / orig_avg) * 100
-            
-            print(f"📈 {op}:")
-            print(f"   Original: {orig_avg:.0f}ms avg ({len(orig_ops)} operations)")
-            print(f"   Optimized: {opt_avg:.0f}ms avg ({len(opt_ops)} operations)")
-            
-            if improvement > 0:
-                print(f"   ✅ IMPROVEMENT: {improvement:.1f}% faster")
-            else:
-                print(f"   ❌ REGRESSION: {abs(improvement):.1f}% slower")
-            print()
+        print(f"📈 {op}:")
+        print(f"   Original: {mean['base']:.0f}ms avg, p50 {p50['base']:.0f}ms, p95 {p95['base']:.0f}ms, p99 {p99['base']:.0f}ms ({result['base_count']} operations)")
+        print(f"   Optimized: {mean['new']:.0f}ms avg, p50 {p50['new']:.0f}ms, p95 {p95['new']:.0f}ms, p99 {p99['new']:.0f}ms ({result['new_count']} operations)")
+        print(f"   p50: {format_change(p50)}")
+        print(f"   p95: {format_change(p95)}")
+        print(f"   {verdict_summary(result)}")
+        print()
     
     # Memory analysis
     print("💾 MEMORY USAGE ANALYSIS:")
@@ -133,54 +176,21 @@ def analyze_performance_improvements():
     print("🏆 PERFORMANCE GRADING:")
     print("-" * 60)
     
-    def calculate_grade(avg_search_time, avg_tab_time, memory_growth_rate):
-        score = 100
-        
-        # Search performance (target: <300ms)
-        if avg_search_time > 1000:
-            score -= 30
-        elif avg_search_time > 600:
-            score -= 20
-        elif avg_search_time > 300:
-            score -= 10
-        
-        # Tab creation (target: <200ms)
-        if avg_tab_time > 500:
-            score -= 20
-        elif avg_tab_time > 300:
-            score -= 15
-        elif avg_tab_time > 200:
-            score -= 10
-        
-        # Memory growth (target: <3MB per 100 ops)
-        if memory_growth_rate > 10:
-            score -= 30
-        elif memory_growth_rate > 7:
-            score -= 20
-        elif memory_growth_rate > 3:
-            score -= 10
-        
-        return max(0, score)
+    # Calculate grades for both (START rows carry 0ms and are left out of the averages)
+    orig_completed = completed_events(df_original)
+    opt_completed = completed_events(df_optimized)
     
-    # Calculate grades for both
-    orig_search_avg = df_original[df_original['OperationName'] == 'Variable_Check']['ElapsedMs'].mean() if len(df_original[df_original['OperationName'] == 'Variable_Check']) > 0 else 0
-    orig_tab_avg = df_original[df_original['OperationName'] == 'Create_New_Tab']['ElapsedMs'].mean() if len(df_original[df_original['OperationName'] == 'Create_New_Tab']) > 0 else 0
+    orig_search_avg = orig_completed[orig_completed['OperationName'] == 'Variable_Check']['ElapsedMs'].mean() if len(orig_completed[orig_completed['OperationName'] == 'Variable_Check']) > 0 else 0
+    orig_tab_avg = orig_completed[orig_completed['OperationName'] == 'Create_New_Tab']['ElapsedMs'].mean() if len(orig_completed[orig_completed['OperationName'] == 'Create_New_Tab']) > 0 else 0
     orig_mem_rate = (orig_mem_growth / len(df_original)) * 100 if len(df_original) > 0 else 0
     
-    opt_search_avg = df_optimized[df_optimized['OperationName'] == 'Variable_Check']['ElapsedMs'].mean() if len(df_optimized[df_optimized['OperationName'] == 'Variable_Check']) > 0 else 0
-    opt_tab_avg = df_optimized[df_optimized['OperationName'] == 'Create_New_Tab']['ElapsedMs'].mean() if len(df_optimized[df_optimized['OperationName'] == 'Create_New_Tab']) > 0 else 0
+    opt_search_avg = opt_completed[opt_completed['OperationName'] == 'Variable_Check']['ElapsedMs'].mean() if len(opt_completed[opt_completed['OperationName'] == 'Variable_Check']) > 0 else 0
+    opt_tab_avg = opt_completed[opt_completed['OperationName'] == 'Create_New_Tab']['ElapsedMs'].mean() if len(opt_completed[opt_completed['OperationName'] == 'Create_New_Tab']) > 0 else 0
     opt_mem_rate = (opt_mem_growth / len(df_optimized)) * 100 if len(df_optimized) > 0 else 0
     
     orig_grade = calculate_grade(orig_search_avg, orig_tab_avg, orig_mem_rate)
     opt_grade = calculate_grade(opt_search_avg, opt_tab_avg, opt_mem_rate)
     
-    def grade_to_letter(score):
-        if score >= 90: return "A-Excellent"
-        elif score >= 80: return "B-Good"
-        elif score >= 70: return "C-Fair"
-        elif score >= 60: return "D-Poor"
-        else: return "F-Critical"
-    
     print(f"📊 Original Performance: {orig_grade}/100 - {grade_to_letter(orig_grade)}")
     print(f"📊 Optimized Performance: {opt_grade}/100 - {grade_to_letter(opt_grade)}")
     
@@ -194,19 +204,10 @@ def analyze_performance_improvements():
     print("🎯 OPTIMIZATION IMPACT SUMMARY:")
     print("-" * 60)
     
-    # Key metrics summary
-    search_improvement = ((orig_search_avg - opt_search_avg) / orig_search_avg) * 100 if orig_search_avg > 0 else 0
-    tab_improvement = ((orig_tab_avg - opt_tab_avg) / orig_tab_avg) * 100 if orig_tab_avg > 0 else 0
-    
-    if search_improvement > 0:
-        print(f"✅ Search operations: {search_improvement:.1f}% faster")
-    else:
-        print(f"❌ Search operations: {abs(search_improvement):.1f}% slower")
-    
-    if tab_improvement > 0:
-        print(f"✅ Tab creation: {tab_improvement:.1f}% faster")
-    else:
-        print(f"❌ Tab creation: {abs(tab_improvement):.1f}% slower")
+    # Key metrics summary - latency claims follow the significance-tested verdicts
+    for label, op in [("Search operations", 'Variable_Check'), ("Tab creation", 'Create_New_Tab')]:
+        if op in comparison:
+            print(f"{label}: {verdict_summary(comparison[op])}")
     
     if mem_improvement > 0:
         print(f"✅ Memory usage: {mem_improvement:.1f}% less growth")
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+N-way Run Comparison: any number of labeled performance logs in one matrix
+Runs come from label=path arguments, globs or a manifest CSV and are loaded in parallel (process pool).
+Reports per-operation latency, throughput (ops/min) and memory growth against a baseline run
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perf_log_loader import load_performance_log
+from perf_statistics import INSUFFICIENT, VERDICT_ICONS, compare_latency, completed_events, point_statistic
+
+LOG_PREFIX = 'PerformanceAnalysis_'
+DEFAULT_STATISTIC = 'p50'
+STATISTICS = ('mean', 'p50', 'p90', 'p95', 'p99')
+
+
+def run_label(path):
+    """PerformanceAnalysis_OPTIMIZED.csv -> OPTIMIZED, PerformanceAnalysis.csv -> ORIGINAL"""
+    stem = Path(path).stem
+    if stem == LOG_PREFIX.rstrip('_'):
+        return 'ORIGINAL'
+    return stem[len(LOG_PREFIX):] if stem.startswith(LOG_PREFIX) else stem
+
+
+def read_manifest(manifest_path):
+    """
+    Manifest CSV with a Label and a Path column (optional Description).
+    Relative paths are resolved against the manifest folder; row order is the run order.
+    """
+    base_dir = Path(manifest_path).resolve().parent
+    runs = []
+    with open(manifest_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            path = (row.get('Path') or '').strip()
+            if not path or path.startswith('#'):
+                continue
+            full_path = Path(path) if Path(path).is_absolute() else base_dir / path
+            label = (row.get('Label') or '').strip() or run_label(path)
+            runs.append((label, str(full_path)))
+    return runs
+
+
+def resolve_runs(specs, manifest=None):
+    """Turn label=path / glob / path arguments (and an optional manifest) into ordered (label, path) runs"""
+    runs = read_manifest(manifest) if manifest else []
+    for spec in specs:
+        label, sep, path = spec.partition('=')
+        if sep and not glob.has_magic(label):
+            runs.append((label, path))
+            continue
+        matches = sorted(glob.glob(spec)) if glob.has_magic(spec) else [spec]
+        runs.extend((run_label(match), match) for match in matches)
+
+    labels = [label for label, _ in runs]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate run labels: {', '.join(duplicates)} - use label=path to rename")
+    return runs
+
+
+def summarize_run(run):
+    """Load one log and reduce it to what the matrix needs (runs in a worker process)"""
+    label, path = run
+    df = load_performance_log(path)
+    completed = completed_events(df)
+
+    duration_min = (df['Timestamp'].max() - df['Timestamp'].min()).total_seconds() / 60 if len(df) > 1 else 0.0
+    grouped = completed.groupby('OperationName', observed=True)['ElapsedMs']
+    latencies = {str(operation): values.dropna().to_numpy(dtype='float64') for operation, values in grouped}
+
+    return {
+        'label': label,
+        'path': path,
+        'records': len(df),
+        'completed': len(completed),
+        'duration_min': duration_min,
+        'ops_per_min': len(completed) / duration_min if duration_min > 0 else np.nan,
+        'memory_start': float(df['MemoryMB'].iloc[0]) if len(df) else np.nan,
+        'memory_end': float(df['MemoryMB'].iloc[-1]) if len(df) else np.nan,
+        'memory_peak': float(df['MemoryMB'].max()) if len(df) else np.nan,
+        'max_tabs': int(df['TabCount'].max()) if len(df) else 0,
+        'latencies': latencies,
+    }
+
+
+def load_runs(runs, workers=None):
+    """Summarize all runs, in parallel when there is more than one; results keep the run order"""
+    workers = workers or min(len(runs), os.cpu_count() or 1)
+    if workers <= 1 or len(runs) <= 1:
+        return [summarize_run(run) for run in runs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize_run, runs))
+
+
+def _delta_pct(base, value):
+    if base is None or not base or np.isnan(base) or np.isnan(value):
+        return np.nan
+    return (value - base) / base * 100
+
+
+def build_matrix(summaries, baseline_label=None, statistic=DEFAULT_STATISTIC, operations=None):
+    """
+    One row per run. For every operation: count, the chosen latency statistic, its delta vs the
+    baseline run (+ = slower) and the significance-tested verdict; then throughput and memory growth deltas.
+    The baseline is the run labelled baseline_label (ValueError when there is none), else the first run.
+    """
+    if baseline_label is None:
+        baseline = summaries[0]
+    else:
+        baseline = next((s for s in summaries if s['label'] == baseline_label), None)
+        if baseline is None:
+            raise ValueError(f"Unknown baseline run '{baseline_label}' - available runs: "
+                             f"{', '.join(s['label'] for s in summaries)}")
+    if operations is None:
+        operations = sorted({operation for s in summaries for operation in s['latencies']})
+
+    rows = []
+    for summary in summaries:
+        row = {
+            'Label': summary['label'],
+            'Path': summary['path'],
+            'Records': summary['records'],
+            'DurationMin': summary['duration_min'],
+            'OpsPerMin': summary['ops_per_min'],
+            'OpsPerMin_DeltaPct': _delta_pct(baseline['ops_per_min'], summary['ops_per_min']),
+            'MemoryStart': summary['memory_start'],
+            'MemoryEnd': summary['memory_end'],
+            'MemoryPeak': summary['memory_peak'],
+            'MemoryGrowth': summary['memory_end'] - summary['memory_start'],
+            'MaxTabs': summary['max_tabs'],
+        }
+        row['MemoryGrowth_DeltaPct'] = _delta_pct(baseline['memory_end'] - baseline['memory_start'], row['MemoryGrowth'])
+
+        for operation in operations:
+            values = summary['latencies'].get(operation, np.empty(0))
+            base_values = baseline['latencies'].get(operation, np.empty(0))
+            row[f"{operation}_Count"] = len(values)
+            for name in STATISTICS:
+                row[f"{operation}_{name.capitalize()}"] = point_statistic(values, name)
+            row[f"{operation}_DeltaPct"] = _delta_pct(point_statistic(base_values, statistic),
+                                                       point_statistic(values, statistic))
+            if summary is baseline or len(values) == 0 or len(base_values) == 0:
+                row[f"{operation}_Verdict"] = ''
+            else:
+                row[f"{operation}_Verdict"] = compare_latency(base_values, values)['verdict']
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index('Label'), baseline['label'], operations
+
+
+def _cell(value, delta, icon='', digits=0):
+    if value is None or np.isnan(value):
+        return '-'
+    text = f"{value:.{digits}f}"
+    if not np.isnan(delta):
+        text += f" ({delta:+.1f}%)"
+    return text + icon
+
+
+def print_matrix(matrix, baseline_label, operations, statistic=DEFAULT_STATISTIC):
+    label_width = max(12, max(len(str(label)) for label in matrix.index) + 2)
+    column_width = 20
+
+    print(f"\n📊 LATENCY MATRIX ({statistic} ms, Δ vs {baseline_label}, 🟢/🔴 = significant change):")
+    header = f"{'Run':<{label_width}}" + ''.join(f"{operation[:column_width - 1]:<{column_width}}" for operation in operations)
+    print(header)
+    print("-" * len(header))
+    for label, row in matrix.iterrows():
+        cells = []
+        for operation in operations:
+            verdict = row[f"{operation}_Verdict"]
+            icon = VERDICT_ICONS[verdict] if verdict and verdict != INSUFFICIENT else ''
+            cells.append(_cell(row[f"{operation}_{statistic.capitalize()}"], row[f"{operation}_DeltaPct"], icon))
+        print(f"{label:<{label_width}}" + ''.join(f"{cell:<{column_width}}" for cell in cells))
+
+    print(f"\n⚡ THROUGHPUT & 💾 MEMORY (Δ vs {baseline_label}):")
+    header = f"{'Run':<{label_width}}{'Ops/min':<{column_width}}{'Memory growth MB':<{column_width}}{'Peak MB':<10}{'Max tabs':<10}{'Records':<10}"
+    print(header)
+    print("-" * len(header))
+    for label, row in matrix.iterrows():
+        throughput = _cell(row['OpsPerMin'], row['OpsPerMin_DeltaPct'], digits=1)
+        memory = _cell(row['MemoryGrowth'], row['MemoryGrowth_DeltaPct'], digits=1)
+        print(f"{label:<{label_width}}{throughput:<{column_width}}{memory:<{column_width}}"
+              f"{row['MemoryPeak']:<10.1f}{int(row['MaxTabs']):<10d}{int(row['Records']):<10d}")
+
+
+def parse_arguments(argv):
+    """Positional run specs plus --manifest, --baseline, --stat, --workers and --csv options"""
+    parser = argparse.ArgumentParser(description="Compare N benchmark runs against a baseline run")
+    parser.add_argument('specs', nargs='*', metavar='[label=]log')
+    parser.add_argument('--manifest', metavar='FILE', help="CSV of label,path runs")
+    parser.add_argument('--baseline', metavar='LABEL', help="run the others are compared to (default: the first)")
+    parser.add_argument('--stat', dest='statistic', choices=STATISTICS, default=DEFAULT_STATISTIC)
+    parser.add_argument('--workers', type=int, metavar='N', help="load processes")
+    parser.add_argument('--csv', metavar='FILE', help="export the matrix")
+    options = vars(parser.parse_intermixed_args(argv))
+    options['workers'] = options['workers'] or None
+    return options
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+
+    if not options['specs'] and not options['manifest']:
+        # Default: every PerformanceAnalysis*.csv in Modules/Logs
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(os.path.dirname(script_dir))
+        logs_dir = os.path.join(project_root, 'Modules', 'Logs')
+        options['specs'] = [os.path.join(logs_dir, 'PerformanceAnalysis*.csv')]
+
+    try:
+        runs = resolve_runs(options['specs'], options['manifest'])
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    missing = [path for _, path in runs if not os.path.exists(path)]
+    for path in missing:
+        print(f"⚠️ Skipping missing log: {path}")
+    runs = [run for run in runs if run[1] not in missing]
+    if not runs:
+        print("❌ No performance logs to compare")
+        sys.exit(1)
+
+    print(f"🔍 N-WAY RUN COMPARISON: {len(runs)} runs")
+    print("=" * 70)
+    summaries = load_runs(runs, options['workers'])
+    for summary in summaries:
+        print(f"✅ {summary['label']}: {summary['records']} records from {Path(summary['path']).name}")
+
+    try:
+        matrix, baseline_label, operations = build_matrix(summaries, options['baseline'], options['statistic'])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    print_matrix(matrix, baseline_label, operations, options['statistic'])
+
+    if options['csv']:
+        matrix.to_csv(options['csv'])
+        print(f"\n💾 Matrix exported to {options['csv']}")
+
+
+if __name__ == "__main__":
+    main()
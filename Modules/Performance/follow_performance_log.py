@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Live Follow Mode: tail the active performance log while the application is running
+Only the bytes appended since the last refresh are parsed (remembered file offset). Session totals are
+running aggregates, the rolling window keeps just its own rows - a refresh never re-reads the file
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perf_aggregates import GroupedStats
+from perf_log_loader import CsvLogReader, open_log_reader
+
+# PerformanceLogger.InitializeLogFile() writes %TEMP%\UI_Performance_Log_yyyyMMdd_HHmmss.csv / .cplb
+ACTIVE_LOG_PATTERN = 'UI_Performance_Log_*'
+
+DEFAULT_INTERVAL_SECONDS = 2.0
+DEFAULT_WINDOW_SECONDS = 300
+
+# Bounded reads per refresh so catching up on a big existing log does not stall the screen
+MAX_BYTES_PER_READ = 64 * 1024 * 1024
+MAX_ROWS_PER_READ = 1_000_000
+
+# Window p95 at least this many times the session p95 is shown as degrading
+DEGRADATION_RATIO = 1.5
+MIN_WINDOW_SAMPLES = 5
+
+
+def find_active_log(directory=None):
+    """Newest UI_Performance_Log_* file in the temp folder (None if there is none)"""
+    directory = directory or tempfile.gettempdir()
+    candidates = [path for path in glob.glob(os.path.join(directory, ACTIVE_LOG_PATTERN))
+                  if path.endswith(('.csv', '.cplb'))]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def skip_to_end(reader):
+    """Start a CSV reader after the last complete line, so only new events are followed"""
+    if not isinstance(reader, CsvLogReader):
+        return  # Binary blocks need their string tables - always read from the start
+    with open(reader.filepath, 'rb') as f:
+        size = f.seek(0, 2)
+        start = max(size - 64 * 1024, 0)
+        f.seek(start)
+        end = f.read().rfind(b'\n')
+    reader.offset = start + end + 1 if end >= 0 else 0
+
+
+class LiveSummary:
+    """Session-wide running aggregates plus the rows of the last window_seconds"""
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self.session = GroupedStats(['OperationName'], 'ElapsedMs')
+        self.window = None
+        self.rows = 0
+        self.first_timestamp = None
+
+    def update(self, df):
+        if len(df) == 0:
+            return
+        df = df.astype({'OperationName': str, 'EventType': str})
+        self.rows += len(df)
+        if self.first_timestamp is None:
+            self.first_timestamp = df['Timestamp'].min()
+        self.session.update(df[df['EventType'] != 'START'])
+
+        window = df if self.window is None else pd.concat([self.window, df], ignore_index=True)
+        cutoff = window['Timestamp'].max() - pd.Timedelta(seconds=self.window_seconds)
+        self.window = window[window['Timestamp'] >= cutoff].reset_index(drop=True)
+
+    def window_operations(self):
+        """Count, ops/min, p50 and p95 per operation inside the window, next to the session p95"""
+        completed = self.window[self.window['EventType'] != 'START']
+        grouped = completed.groupby('OperationName')['ElapsedMs']
+        table = pd.DataFrame({
+            'Count': grouped.count(),
+            'P50': grouped.quantile(0.50, interpolation='lower'),
+            'P95': grouped.quantile(0.95, interpolation='lower'),
+        })
+        table['OpsPerMin'] = table['Count'] / (self.window_span_seconds() / 60 or 1)
+
+        session = self.session.to_frame(quantiles=(0.95,))
+        table['Session_P95'] = session['p95'].reindex(table.index)
+        table['Session_Count'] = session['count'].reindex(table.index)
+        table['Degrading'] = (table['Count'] >= MIN_WINDOW_SAMPLES) & (table['P95'] >= DEGRADATION_RATIO * table['Session_P95'])
+        return table.sort_values('Count', ascending=False)
+
+    def window_span_seconds(self):
+        if self.window is None or len(self.window) < 2:
+            return 0.0
+        return (self.window['Timestamp'].max() - self.window['Timestamp'].min()).total_seconds()
+
+    def memory(self):
+        """Latest MemoryMB/TabCount and the MemoryMB slope inside the window (MB per minute)"""
+        latest = self.window.iloc[-1]
+        slope = np.nan
+        if self.window_span_seconds() > 0:
+            minutes = (self.window['Timestamp'] - self.window['Timestamp'].iloc[0]).dt.total_seconds().to_numpy() / 60
+            slope = float(np.polyfit(minutes, self.window['MemoryMB'].to_numpy(dtype='float64'), 1)[0])
+        return {
+            'memory_mb': float(latest['MemoryMB']),
+            'tab_count': int(latest['TabCount']),
+            'window_min_mb': float(self.window['MemoryMB'].min()),
+            'window_max_mb': float(self.window['MemoryMB'].max()),
+            'slope_mb_per_min': slope,
+        }
+
+
+def render(summary, log_path, offset):
+    lines = [
+        "📡 LIVE PERFORMANCE MONITOR",
+        "=" * 70,
+        f"📂 {Path(log_path).name}  ({summary.rows} events, {offset / 1024:.0f}KB read)",
+    ]
+    if summary.window is None or len(summary.window) == 0:
+        lines.append("⏳ Waiting for events...")
+        return lines
+
+    latest = summary.window['Timestamp'].max()
+    elapsed = (latest - summary.first_timestamp).total_seconds() / 60
+    lines.append(f"🕒 Last event {latest:%H:%M:%S} - session {elapsed:.1f} min, window {summary.window_seconds}s")
+
+    lines.append("")
+    lines.append(f"  {'Operation':<26} {'Ops/min':<9} {'p50':<8} {'p95':<8} {'Session p95':<12} {'Total':<7}")
+    for operation, row in summary.window_operations().iterrows():
+        icon = "🔴" if row['Degrading'] else "🟢"
+        lines.append(f"  {icon} {operation[:24]:<24} {row['OpsPerMin']:<9.1f} {row['P50']:<8.0f} {row['P95']:<8.0f} "
+                     f"{row['Session_P95']:<12.0f} {int(row['Session_Count']):<7d}")
+
+    memory = summary.memory()
+    slope = "n/a" if np.isnan(memory['slope_mb_per_min']) else f"{memory['slope_mb_per_min']:+.2f}MB/min"
+    lines.append("")
+    lines.append(f"💾 Memory {memory['memory_mb']:.1f}MB ({memory['window_min_mb']:.1f}-{memory['window_max_mb']:.1f} in window, "
+                 f"{slope}) - {memory['tab_count']} tabs")
+    lines.append(f"  (🔴 = window p95 ≥ {DEGRADATION_RATIO}× session p95)")
+    return lines
+
+
+def read_available(reader):
+    """Yield everything appended since the last call, in bounded reads"""
+    while True:
+        if isinstance(reader, CsvLogReader):
+            before = reader.offset
+            frame = reader.read(MAX_BYTES_PER_READ)
+            done = reader.offset - before < MAX_BYTES_PER_READ // 2
+        else:
+            frame = reader.read(MAX_ROWS_PER_READ)
+            done = len(frame) < MAX_ROWS_PER_READ
+        if len(frame):
+            yield frame
+        if done or len(frame) == 0:
+            return
+
+
+def parse_arguments(argv):
+    """Optional log path plus --interval, --window, --from-end and --once"""
+    parser = argparse.ArgumentParser(description="Follow the live performance log of the running app")
+    parser.add_argument('file', nargs='?', help="log to follow (default: the active log in the temp folder)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL_SECONDS, metavar='SECONDS')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW_SECONDS, metavar='SECONDS')
+    parser.add_argument('--from-end', action='store_true', help="skip what is already in the log")
+    parser.add_argument('--once', action='store_true', help="print one summary and exit")
+    return vars(parser.parse_args(argv))
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    log_path = options['file'] or find_active_log()
+    if log_path is None or not os.path.exists(log_path):
+        print(f"❌ No {ACTIVE_LOG_PATTERN} log found in {tempfile.gettempdir()} - pass a log path")
+        sys.exit(1)
+
+    reader = open_log_reader(log_path)
+    if options['from_end']:
+        skip_to_end(reader)
+    summary = LiveSummary(options['window'])
+    interactive = sys.stdout.isatty() and not options['once']
+
+    try:
+        while True:
+            for frame in read_available(reader):
+                summary.update(frame)
+
+            if interactive:
+                print("\033[2J\033[H", end="")
+            print("\n".join(render(summary, log_path, reader.offset)), flush=True)
+            if options['once']:
+                return
+
+            time.sleep(options['interval'])
+
+            # A new application session starts a new log file - follow it when no path was given
+            if options['file'] is None:
+                newest = find_active_log()
+                if newest and newest != log_path:
+                    log_path, reader = newest, open_log_reader(newest)
+                    summary = LiveSummary(options['window'])
+    except KeyboardInterrupt:
+        print("\n👋 Stopped following")
+
+
+if __name__ == "__main__":
+    main()
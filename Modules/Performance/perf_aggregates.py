@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Mergeable Running Aggregates for Performance Logs
+Count/sum/sum-of-squares/min/max plus a log-bucketed quantile sketch per group,
+so multi-GB logs can be summarized chunk by chunk with flat memory
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Relative accuracy of the quantile sketch: every reported quantile is within 1% of a true sample value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Bucket used for zero (and negative) values - START rows always log ElapsedMs = 0
+ZERO_BUCKET = np.iinfo(np.int32).min
+
+MOMENT_COLUMNS = ['count', 'sum', 'sum_sq', 'min', 'max']
+
+
+def sketch_gamma(relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Bucket growth factor for the given relative accuracy"""
+    return (1 + relative_accuracy) / (1 - relative_accuracy)
+
+
+def sketch_bucket_index(values, gamma):
+    """Map values to log buckets: bucket i covers (gamma^(i-1), gamma^i]"""
+    values = np.asarray(values, dtype='float64')
+    buckets = np.full(values.shape, ZERO_BUCKET, dtype='int32')
+    positive = values > 0
+    buckets[positive] = np.ceil(np.log(values[positive]) / math.log(gamma)).astype('int32')
+    return buckets
+
+
+def sketch_bucket_value(buckets, gamma):
+    """Representative value of each bucket (0 for the zero bucket)"""
+    buckets = np.asarray(buckets, dtype='int64')
+    values = 2.0 * np.power(gamma, buckets.astype('float64')) / (gamma + 1)
+    return np.where(buckets == ZERO_BUCKET, 0.0, values)
+
+
+def _plain_index(frame, key_columns):
+    """Drop categorical dtypes from the key columns so chunks with different categories merge cleanly"""
+    for column in key_columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(frame[column].cat.categories.dtype)
+    return frame.set_index(key_columns)
+
+
+class GroupedStats:
+    """
+    Running statistics of one value column grouped by key columns.
+    update() consumes a DataFrame chunk, merge() combines two partial results.
+    """
+
+    def __init__(self, key_columns, value_column, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, with_sketch=True):
+        self.key_columns = list(key_columns)
+        self.value_column = value_column
+        self.relative_accuracy = relative_accuracy
+        self.gamma = sketch_gamma(relative_accuracy)
+        self.with_sketch = with_sketch
+        self.moments = None   # DataFrame indexed by keys: count, sum, sum_sq, min, max
+        self.buckets = None   # Series indexed by keys + bucket: count
+
+    def update(self, df):
+        """Fold a chunk of rows into the running aggregates"""
+        data = df[self.key_columns + [self.value_column]].dropna(subset=[self.value_column])
+        if len(data) == 0:
+            return self
+
+        values = data[self.value_column].to_numpy(dtype='float64')
+        data = data.assign(_value=values, _value_sq=values * values)
+        grouped = data.groupby(self.key_columns, observed=True)
+        moments = pd.DataFrame({
+            'count': grouped['_value'].count(),
+            'sum': grouped['_value'].sum(),
+            'sum_sq': grouped['_value_sq'].sum(),
+            'min': grouped['_value'].min(),
+            'max': grouped['_value'].max(),
+        })
+        moments = _plain_index(moments.reset_index(), self.key_columns)
+
+        buckets = None
+        if self.with_sketch:
+            data = data.assign(_bucket=sketch_bucket_index(values, self.gamma))
+            buckets = data.groupby(self.key_columns + ['_bucket'], observed=True).size()
+            buckets = _plain_index(buckets.rename('count').reset_index(), self.key_columns + ['_bucket'])['count']
+
+        self._merge_parts(moments, buckets)
+        return self
+
+    def merge(self, other):
+        """Combine another partial aggregate over the same keys into this one"""
+        if other.moments is not None:
+            self._merge_parts(other.moments, other.buckets)
+        return self
+
+    def _merge_parts(self, moments, buckets):
+        if self.moments is None:
+            self.moments = moments
+        else:
+            combined = pd.concat([self.moments, moments]).groupby(level=self.key_columns)
+            self.moments = combined.agg({'count': 'sum', 'sum': 'sum', 'sum_sq': 'sum', 'min': 'min', 'max': 'max'})
+
+        if buckets is not None:
+            if self.buckets is None:
+                self.buckets = buckets
+            else:
+                self.buckets = pd.concat([self.buckets, buckets]).groupby(level=self.key_columns + ['_bucket']).sum()
+
+    def rollup(self, key_columns):
+        """Re-aggregate onto a non-empty subset of the key columns (exact for moments and sketch)"""
+        result = GroupedStats(key_columns, self.value_column, self.relative_accuracy, self.with_sketch)
+        if self.moments is None:
+            return result
+        grouped = self.moments.groupby(level=list(key_columns))
+        result.moments = grouped.agg({'count': 'sum', 'sum': 'sum', 'sum_sq': 'sum', 'min': 'min', 'max': 'max'})
+        if self.buckets is not None:
+            result.buckets = self.buckets.groupby(level=list(key_columns) + ['_bucket']).sum()
+        return result
+
+    def to_frame(self, quantiles=()):
+        """Summary table with count, sum, mean, std (ddof=1), min, max and optional sketch quantiles"""
+        columns = MOMENT_COLUMNS + ['mean', 'std'] + [f"p{round(q * 100):g}" for q in quantiles]
+        if self.moments is None:
+            return pd.DataFrame(columns=columns)
+
+        frame = self.moments.copy()
+        count = frame['count']
+        frame['mean'] = frame['sum'] / count
+        variance = (frame['sum_sq'] - frame['sum'] * frame['sum'] / count) / (count - 1)
+        frame['std'] = np.sqrt(variance.clip(lower=0)).where(count > 1)
+
+        for q in quantiles:
+            frame[f"p{round(q * 100):g}"] = self.quantile(q)
+        return frame[columns]
+
+    def quantile(self, q):
+        """Approximate q-quantile per group from the log-bucket sketch"""
+        if self.buckets is None:
+            raise ValueError("Quantiles need a GroupedStats built with with_sketch=True")
+
+        buckets = self.buckets.sort_index()
+        group_levels = list(range(len(self.key_columns)))
+        cumulative = buckets.groupby(level=group_levels).cumsum()
+        totals = buckets.groupby(level=group_levels).transform('sum')
+        rank = np.floor(q * (totals - 1))
+        hit = cumulative[cumulative > rank]
+        first_hit = hit.reset_index().groupby(self.key_columns, observed=True).first()['_bucket']
+        return pd.Series(sketch_bucket_value(first_hit.to_numpy(), self.gamma), index=first_hit.index)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Binary Performance Log Reader
+Reads the compact .cplb format written by PerformanceLogWriter (PerformanceLogFormat.Binary)
+into the same typed DataFrame the CSV loader returns
+"""
+
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BINARY_MAGIC = b'CPLB'
+BINARY_EXTENSION = '.cplb'
+SUPPORTED_VERSION = 1
+
+# header: magic | u16 version | u16 record size
+HEADER = struct.Struct('<4sHH')
+COUNT = struct.Struct('<I')
+STRING_HEADER = struct.Struct('<iH')
+
+# Must match PerformanceLogWriter.WriteBinaryBatch field order (36 bytes, little endian)
+RECORD_DTYPE = np.dtype([
+    ('ticks', '<i8'),
+    ('elapsed_ms', '<i8'),
+    ('event_id', '<i4'),
+    ('operation_id', '<i4'),
+    ('details_id', '<i4'),
+    ('memory_mb', '<f4'),
+    ('tab_count', '<i4'),
+])
+
+# DateTime.Ticks (100ns since 0001-01-01) of 1970-01-01
+DOTNET_EPOCH_TICKS = 621355968000000000
+
+
+def is_binary_log(filepath):
+    """True when the file starts with the CPLB magic"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except OSError:
+        return False
+
+
+class BinaryLogReader:
+    """
+    Incremental reader for one .cplb file.
+    Keeps the string table and the offset of the next unread block, so repeated read() calls
+    only parse what the writer appended since the last call. A block still being written is
+    left for the next call.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.offset = 0
+        self.strings = []
+
+    def read(self, max_rows=None):
+        """Parse complete blocks from the current offset; stops after max_rows records if given"""
+        with open(self.filepath, 'rb') as f:
+            size = f.seek(0, 2)
+            if size <= self.offset:
+                return self._to_frame([])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if self.offset == 0:
+                    self.offset = self._read_header(data)
+                records = self._read_blocks(data, max_rows)
+        return self._to_frame(records)
+
+    def _read_header(self, data):
+        if len(data) < HEADER.size:
+            raise ValueError(f"{self.filepath} is too short for a CPLB header")
+        magic, version, record_size = HEADER.unpack_from(data, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{self.filepath} is not a CPLB performance log")
+        if version != SUPPORTED_VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Unsupported CPLB version {version} (record size {record_size})")
+        return HEADER.size
+
+    def _read_blocks(self, data, max_rows):
+        records = []
+        total = 0
+        position = self.offset
+        end = len(data)
+
+        while max_rows is None or total < max_rows:
+            if position + COUNT.size > end:
+                break
+            (string_count,) = COUNT.unpack_from(data, position)
+            cursor = position + COUNT.size
+
+            new_strings = []
+            for _ in range(string_count):
+                if cursor + STRING_HEADER.size > end:
+                    break
+                string_id, length = STRING_HEADER.unpack_from(data, cursor)
+                cursor += STRING_HEADER.size
+                if cursor + length > end:
+                    break
+                new_strings.append((string_id, data[cursor:cursor + length].decode('utf-8', errors='replace')))
+                cursor += length
+            if len(new_strings) < string_count or cursor + COUNT.size > end:
+                break  # Block still being written
+
+            (record_count,) = COUNT.unpack_from(data, cursor)
+            cursor += COUNT.size
+            if cursor + record_count * RECORD_DTYPE.itemsize > end:
+                break
+
+            for string_id, value in new_strings:
+                if string_id != len(self.strings):
+                    raise ValueError(f"Corrupt CPLB string table at offset {position}")
+                self.strings.append(value)
+
+            records.append(np.frombuffer(data, dtype=RECORD_DTYPE, count=record_count, offset=cursor).copy())
+            total += record_count
+            position = cursor + record_count * RECORD_DTYPE.itemsize
+
+        self.offset = position
+        return records
+
+    def _to_frame(self, records):
+        records = np.concatenate(records) if records else np.empty(0, dtype=RECORD_DTYPE)
+        table = np.array(self.strings, dtype=object) if self.strings else np.empty(0, dtype=object)
+
+        timestamps = ((records['ticks'] - DOTNET_EPOCH_TICKS) * 100).astype('datetime64[ns]')
+        return pd.DataFrame({
+            'Timestamp': timestamps,
+            'EventType': pd.Categorical(table[records['event_id']]),
+            'OperationName': pd.Categorical(table[records['operation_id']]),
+            'ElapsedMs': records['elapsed_ms'].astype('float64'),
+            'Details': table[records['details_id']],
+            'MemoryMB': records['memory_mb'],
+            'TabCount': records['tab_count'],
+        })
+
+
+def read_binary_log(filepath):
+    """Load a whole .cplb log as a typed DataFrame"""
+    return BinaryLogReader(filepath).read()
+
+
+def iter_binary_log_chunks(filepath, chunksize):
+    """Stream a .cplb log as DataFrame chunks of about chunksize rows (whole blocks per chunk)"""
+    reader = BinaryLogReader(filepath)
+    while True:
+        chunk = reader.read(max_rows=chunksize)
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python perf_binary_log.py <log.cplb> [--to-csv <output.csv>]")
+        return
+
+    filepath = sys.argv[1]
+    df = read_binary_log(filepath)
+    print(f"✅ Loaded {len(df)} records from {Path(filepath).name}")
+
+    if '--to-csv' in sys.argv:
+        index = sys.argv.index('--to-csv')
+        output = sys.argv[index + 1] if index + 1 < len(sys.argv) else str(Path(filepath).with_suffix('.csv'))
+        csv = df.assign(Timestamp=df['Timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3],
+                        MemoryMB=df['MemoryMB'].round(1))
+        csv.to_csv(output, index=False)
+        print(f"💾 Converted to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Shared Performance Log Loader
+Loads PerformanceLogger CSV logs with explicit dtypes and a Parquet/Feather sidecar cache.
+Binary .cplb logs are detected by their header and read directly
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from perf_binary_log import BinaryLogReader, is_binary_log, iter_binary_log_chunks, read_binary_log
+
+# Column layout written by PerformanceLogger.InitializeLogFile()
+LOG_COLUMNS = ['Timestamp', 'EventType', 'OperationName', 'ElapsedMs', 'Details', 'MemoryMB', 'TabCount']
+
+# PerformanceLogger.LogEvent() writes DateTime.Now:yyyy-MM-dd HH:mm:ss.fff
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# Explicit dtypes so pandas never has to sniff the column types
+CSV_DTYPES = {
+    'EventType': 'category',
+    'OperationName': 'category',
+    'ElapsedMs': 'float64',
+    'MemoryMB': 'float32',
+}
+
+# Rows per chunk in streaming mode - bounds peak memory independent of log size
+DEFAULT_CHUNK_ROWS = 500_000
+
+CACHE_DIR_NAME = '.perf_cache'
+CACHE_FORMATS = ('parquet', 'feather')
+HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def file_content_hash(filepath):
+    """Hash the raw bytes of a log file (blake2b, 128-bit hex digest)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_dir(filepath):
+    return Path(filepath).resolve().parent / CACHE_DIR_NAME
+
+
+def _cached_content_hash(filepath):
+    """Return the content hash, reusing the stored one while size and mtime are unchanged"""
+    stat = os.stat(filepath)
+    key_file = _cache_dir(filepath) / f"{Path(filepath).name}.key"
+
+    try:
+        with open(key_file, 'r', encoding='utf-8') as f:
+            key = json.load(f)
+        if key.get('size') == stat.st_size and key.get('mtime_ns') == stat.st_mtime_ns:
+            return key['hash']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    content_hash = file_content_hash(filepath)
+    try:
+        key_file.parent.mkdir(exist_ok=True)
+        with open(key_file, 'w', encoding='utf-8') as f:
+            json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}, f)
+    except OSError:
+        pass  # Read-only log folder - hash again next time
+    return content_hash
+
+
+def cache_path_for(filepath, content_hash, cache_format='parquet'):
+    """Sidecar cache path for a log file with the given content hash"""
+    return _cache_dir(filepath) / f"{Path(filepath).name}.{content_hash[:16]}.{cache_format}"
+
+
+def parse_timestamps(values):
+    """Parse PerformanceLogger timestamps with the fixed log format (no per-row format inference)"""
+    return pd.to_datetime(values, format=TIMESTAMP_FORMAT, errors='coerce')
+
+
+def normalize_log_frame(df):
+    """Apply the canonical dtypes to a raw log DataFrame (columns that are missing are skipped)"""
+    if 'Timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Timestamp']):
+        df['Timestamp'] = parse_timestamps(df['Timestamp'])
+    for column, dtype in CSV_DTYPES.items():
+        if column in df.columns and str(df[column].dtype) != dtype:
+            df[column] = df[column].astype(dtype)
+    if 'TabCount' in df.columns:
+        df['TabCount'] = pd.to_numeric(df['TabCount'], errors='coerce').fillna(0).astype('int32')
+    return df
+
+
+def read_performance_csv(filepath, **read_csv_kwargs):
+    """Parse a PerformanceLogger CSV without touching the cache"""
+    dtypes = dict(CSV_DTYPES)
+    dtypes['Timestamp'] = 'object'
+    df = pd.read_csv(filepath, dtype=dtypes, **read_csv_kwargs)
+    return normalize_log_frame(df)
+
+
+def iter_performance_log_chunks(filepath, chunksize=DEFAULT_CHUNK_ROWS):
+    """Stream a performance log as typed DataFrame chunks of at most chunksize rows"""
+    if is_binary_log(filepath):
+        yield from iter_binary_log_chunks(filepath, chunksize)
+        return
+
+    dtypes = dict(CSV_DTYPES)
+    dtypes['Timestamp'] = 'object'
+    with pd.read_csv(filepath, dtype=dtypes, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield normalize_log_frame(chunk)
+
+
+class CsvLogReader:
+    """
+    Incremental reader for a PerformanceLogger CSV that is still being written.
+    Same interface as BinaryLogReader: read() parses only the complete lines appended since the
+    last call and remembers the byte offset; a half-written last line is left for the next call.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.offset = 0
+
+    def read(self, max_bytes=None):
+        """Parse complete lines from the current offset (at most max_bytes of them if given)"""
+        with open(self.filepath, 'rb') as f:
+            size = f.seek(0, 2)
+            if size < self.offset:
+                self.offset = 0  # File was truncated or replaced - start over
+            if size == self.offset:
+                return empty_log_frame()
+            f.seek(self.offset)
+            data = f.read(size - self.offset if max_bytes is None else min(size - self.offset, max_bytes))
+
+        end = data.rfind(b'\n')
+        if end < 0:
+            return empty_log_frame()
+        data = data[:end + 1]
+        consumed = len(data)
+
+        if self.offset == 0:
+            data = data[3:] if data.startswith(b'\xef\xbb\xbf') else data
+            data = data[data.find(b'\n') + 1:]  # Header line
+        self.offset += consumed
+        if not data.strip():
+            return empty_log_frame()
+
+        dtypes = dict(CSV_DTYPES)
+        dtypes['Timestamp'] = 'object'
+        return normalize_log_frame(pd.read_csv(io.BytesIO(data), names=LOG_COLUMNS, header=None, dtype=dtypes))
+
+
+def empty_log_frame():
+    """Zero-row DataFrame with the canonical log columns and dtypes"""
+    return normalize_log_frame(pd.DataFrame({column: pd.Series(dtype='object') for column in LOG_COLUMNS}))
+
+
+def open_log_reader(filepath):
+    """Incremental reader for a .cplb or CSV performance log"""
+    if str(filepath).endswith('.cplb') or is_binary_log(filepath):
+        return BinaryLogReader(filepath)
+    return CsvLogReader(filepath)
+
+
+def _read_cache(path, cache_format):
+    if cache_format == 'feather':
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def _write_cache(df, path, log_name, cache_format):
+    """Write the sidecar and drop stale sidecars of older file contents"""
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if cache_format == 'feather':
+        df.to_feather(tmp_path)
+    else:
+        df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    for stale in path.parent.glob(f"{log_name}.*.{cache_format}"):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def load_performance_log(filepath, use_cache=True, cache_format='parquet'):
+    """
+    Load a performance log as a typed DataFrame.
+    Repeat loads of unchanged content are served from the sidecar cache.
+    """
+    if cache_format not in CACHE_FORMATS:
+        raise ValueError(f"Unsupported cache format: {cache_format}")
+
+    if is_binary_log(filepath):
+        return read_binary_log(filepath)  # Already columnar - no sidecar needed
+
+    if not use_cache:
+        return read_performance_csv(filepath)
+
+    try:
+        cache_path = cache_path_for(filepath, _cached_content_hash(filepath), cache_format)
+        if cache_path.exists():
+            return _read_cache(cache_path, cache_format)
+    except (ImportError, OSError, ValueError):
+        cache_path = None  # No pyarrow or unreadable sidecar - fall back to parsing
+
+    df = read_performance_csv(filepath)
+
+    if cache_path is not None:
+        try:
+            _write_cache(df, cache_path, Path(filepath).name, cache_format)
+        except (ImportError, OSError, ValueError):
+            pass  # Cache is an optimisation only
+    return df
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python perf_log_loader.py <performance_log.csv> [--no-cache] [--feather]")
+        return
+
+    filepath = sys.argv[1]
+    use_cache = '--no-cache' not in sys.argv
+    cache_format = 'feather' if '--feather' in sys.argv else 'parquet'
+
+    df = load_performance_log(filepath, use_cache=use_cache, cache_format=cache_format)
+    print(f"✅ Loaded {len(df)} records from {Path(filepath).name}")
+    print(df.dtypes.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Shared Latency Statistics for Performance Reports
+Percentiles (p50/p90/p95/p99), log-bucketed histograms and bootstrap confidence intervals per OperationName.
+A change is only called an improvement or a regression when the bootstrap CI of the difference excludes zero
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from perf_aggregates import ZERO_BUCKET, sketch_bucket_index
+from perf_log_loader import load_performance_log
+
+PERCENTILES = (0.50, 0.90, 0.95, 0.99)
+
+# Statistics that decide the verdict: the median for the typical call, p95 for the tail
+VERDICT_STATISTICS = ('p50', 'p95')
+
+DEFAULT_RESAMPLES = 2000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 0          # Fixed seed - the same logs always give the same report
+MIN_SAMPLES = 5
+
+# Upper bound of resample x distinct-value cells held in memory at once
+BOOTSTRAP_BLOCK_CELLS = 4_000_000
+
+IMPROVEMENT = 'IMPROVEMENT'
+REGRESSION = 'REGRESSION'
+NO_CHANGE = 'NO SIGNIFICANT CHANGE'
+INSUFFICIENT = 'INSUFFICIENT DATA'
+VERDICT_ICONS = {IMPROVEMENT: '🟢', REGRESSION: '🔴', NO_CHANGE: '🟡', INSUFFICIENT: '⚪'}
+
+
+def completed_events(df):
+    """Rows that carry a measured duration (START rows always log ElapsedMs = 0)"""
+    return df[df['EventType'] != 'START']
+
+
+def latency_values(df, operation):
+    """ElapsedMs of the completed events of one operation as a float array"""
+    events = completed_events(df)
+    return events.loc[events['OperationName'] == operation, 'ElapsedMs'].dropna().to_numpy(dtype='float64')
+
+
+def _quantile_level(statistic):
+    return int(statistic[1:]) / 100
+
+
+def point_statistic(values, statistic):
+    """'mean' or a percentile name like 'p95' ('lower' method, same rank as the GroupedStats sketch)"""
+    if len(values) == 0:
+        return np.nan
+    if statistic == 'mean':
+        return float(np.mean(values))
+    return float(np.quantile(values, _quantile_level(statistic), method='lower'))
+
+
+def bootstrap_statistics(values, statistics, n_resamples=DEFAULT_RESAMPLES, rng=None):
+    """
+    Bootstrap distribution of each statistic.
+    A resample of n values is a multinomial draw over the distinct values, so the cost depends on
+    the number of distinct latencies (small for integer ms) rather than on n.
+    """
+    rng = rng if rng is not None else np.random.default_rng(DEFAULT_SEED)
+    distinct, frequency = np.unique(np.asarray(values, dtype='float64'), return_counts=True)
+    n = int(frequency.sum())
+    probabilities = frequency / n
+    ranks = {s: np.floor(_quantile_level(s) * (n - 1)) + 1 for s in statistics if s != 'mean'}
+
+    result = {s: np.empty(n_resamples) for s in statistics}
+    block = max(1, BOOTSTRAP_BLOCK_CELLS // len(distinct))
+    for start in range(0, n_resamples, block):
+        size = min(block, n_resamples - start)
+        counts = rng.multinomial(n, probabilities, size=size)
+        cumulative = np.cumsum(counts, axis=1)
+        for statistic in statistics:
+            if statistic == 'mean':
+                result[statistic][start:start + size] = counts @ distinct / n
+            else:
+                result[statistic][start:start + size] = distinct[(cumulative >= ranks[statistic]).argmax(axis=1)]
+    return result
+
+
+def bootstrap_ci(values, statistic, n_resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=DEFAULT_SEED):
+    """Percentile bootstrap confidence interval of one statistic"""
+    if len(values) == 0:
+        return np.nan, np.nan
+    samples = bootstrap_statistics(values, [statistic], n_resamples, np.random.default_rng(seed))[statistic]
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def compare_latency(base_values, new_values, statistics=('mean', 'p50', 'p95', 'p99'),
+                    n_resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=DEFAULT_SEED):
+    """
+    Compare two latency samples.
+    For every statistic: base/new value, relative change and the bootstrap CI of (new - base).
+    verdict is IMPROVEMENT only if a verdict statistic got significantly lower and none got
+    significantly higher; any significant increase is a REGRESSION. deciding names the verdict statistic
+    that made the call (the first of VERDICT_STATISTICS that moved that way; p50 when nothing did).
+    """
+    base_values = np.asarray(base_values, dtype='float64')
+    new_values = np.asarray(new_values, dtype='float64')
+    statistics = list(dict.fromkeys(list(statistics) + list(VERDICT_STATISTICS)))
+    result = {'base_count': len(base_values), 'new_count': len(new_values), 'stats': {}}
+
+    if min(len(base_values), len(new_values)) < MIN_SAMPLES:
+        for statistic in statistics:
+            base, new = point_statistic(base_values, statistic), point_statistic(new_values, statistic)
+            result['stats'][statistic] = {'base': base, 'new': new, 'change_pct': _change_pct(base, new),
+                                          'ci_low': np.nan, 'ci_high': np.nan, 'significant': False}
+        result['verdict'] = INSUFFICIENT
+        result['deciding'] = VERDICT_STATISTICS[0]
+        return result
+
+    rng = np.random.default_rng(seed)
+    base_boot = bootstrap_statistics(base_values, statistics, n_resamples, rng)
+    new_boot = bootstrap_statistics(new_values, statistics, n_resamples, rng)
+    alpha = (1 - confidence) / 2
+
+    for statistic in statistics:
+        base, new = point_statistic(base_values, statistic), point_statistic(new_values, statistic)
+        low, high = np.quantile(new_boot[statistic] - base_boot[statistic], [alpha, 1 - alpha])
+        result['stats'][statistic] = {
+            'base': base,
+            'new': new,
+            'change_pct': _change_pct(base, new),
+            'ci_low': float(low),
+            'ci_high': float(high),
+            'significant': bool(low > 0 or high < 0),
+        }
+
+    verdict_stats = {s: result['stats'][s] for s in VERDICT_STATISTICS}
+    slower = [s for s, stat in verdict_stats.items() if stat['significant'] and stat['new'] > stat['base']]
+    faster = [s for s, stat in verdict_stats.items() if stat['significant'] and stat['new'] < stat['base']]
+    if slower:
+        result['verdict'], result['deciding'] = REGRESSION, slower[0]
+    elif faster:
+        result['verdict'], result['deciding'] = IMPROVEMENT, faster[0]
+    else:
+        result['verdict'], result['deciding'] = NO_CHANGE, VERDICT_STATISTICS[0]
+    return result
+
+
+def deciding_change(result):
+    """(statistic, change %) of the statistic that decided a compare_latency() verdict"""
+    statistic = result['deciding']
+    return statistic, result['stats'][statistic]['change_pct']
+
+
+def combined_verdict(results):
+    """
+    One verdict over several compare_latency() results, by the same rule as a single one: any REGRESSION
+    is a REGRESSION, else any IMPROVEMENT an IMPROVEMENT; INSUFFICIENT DATA only when no result has enough
+    """
+    verdicts = [result['verdict'] for result in results]
+    if REGRESSION in verdicts:
+        return REGRESSION
+    if IMPROVEMENT in verdicts:
+        return IMPROVEMENT
+    if verdicts and all(verdict == INSUFFICIENT for verdict in verdicts):
+        return INSUFFICIENT
+    return NO_CHANGE
+
+
+def _change_pct(base, new):
+    """Relative change in percent, positive = faster (same sign convention as the compare scripts)"""
+    if not base or np.isnan(base) or np.isnan(new):
+        return 0.0
+    return (base - new) / base * 100
+
+
+def operation_percentiles(df, operations=None, percentiles=PERCENTILES):
+    """Count, mean, percentiles and max of ElapsedMs per operation (completed events only)"""
+    events = completed_events(df)
+    if operations is not None:
+        events = events[events['OperationName'].isin(operations)]
+    grouped = events.groupby('OperationName', observed=True)['ElapsedMs']
+
+    table = pd.DataFrame({'Count': grouped.count(), 'Mean': grouped.mean()})
+    for q in percentiles:
+        table[f"P{round(q * 100)}"] = grouped.quantile(q, interpolation='lower')
+    table['Max'] = grouped.max()
+    table.index = table.index.astype(str)
+    return table
+
+
+def compare_operations(df_base, df_new, operations, **kwargs):
+    """compare_latency() for each operation present in both logs"""
+    results = {}
+    for operation in operations:
+        base_values = latency_values(df_base, operation)
+        new_values = latency_values(df_new, operation)
+        if len(base_values) > 0 and len(new_values) > 0:
+            results[operation] = compare_latency(base_values, new_values, **kwargs)
+    return results
+
+
+def log_histogram(values, buckets_per_octave=2):
+    """
+    HDR-style histogram: bucket i covers (g^(i-1), g^i] with g = 2^(1/buckets_per_octave),
+    so every bucket has the same relative width. Empty buckets inside the range are kept.
+    """
+    values = np.asarray(values, dtype='float64')
+    gamma = 2 ** (1 / buckets_per_octave)
+    buckets = sketch_bucket_index(values, gamma)
+
+    zero_count = int((buckets == ZERO_BUCKET).sum())
+    positive = buckets[buckets != ZERO_BUCKET]
+    rows = []
+    if zero_count:
+        rows.append({'Lower': 0.0, 'Upper': 0.0, 'Count': zero_count})
+    if len(positive):
+        index = np.arange(positive.min(), positive.max() + 1)
+        counts = np.bincount(positive - positive.min(), minlength=len(index))
+        rows.extend({'Lower': gamma ** (i - 1), 'Upper': gamma ** i, 'Count': int(c)} for i, c in zip(index, counts))
+    return pd.DataFrame(rows, columns=['Lower', 'Upper', 'Count'])
+
+
+def format_histogram(histogram, width=40, indent='    '):
+    """Text bars for a log_histogram() table"""
+    if len(histogram) == 0:
+        return []
+    peak = histogram['Count'].max()
+    lines = []
+    for _, row in histogram.iterrows():
+        bar = '█' * int(round(row['Count'] / peak * width)) if peak else ''
+        label = '0ms' if row['Upper'] == 0 else f"≤{row['Upper']:.0f}ms"
+        lines.append(f"{indent}{label:>10} |{bar} {int(row['Count'])}")
+    return lines
+
+
+def format_change(stat):
+    """'1234ms → 987ms (+20.0%, CI of diff [-300, -190]ms)' for one compare_latency() statistic"""
+    text = f"{stat['base']:.0f}ms → {stat['new']:.0f}ms ({stat['change_pct']:+.1f}%"
+    if not np.isnan(stat['ci_low']):
+        text += f", CI of diff [{stat['ci_low']:+.0f}, {stat['ci_high']:+.0f}]ms"
+    return text + ")" + (" *" if stat['significant'] else "")
+
+
+def print_percentile_table(table, title):
+    print(f"\n📐 {title}:")
+    columns = [c for c in table.columns if c.startswith('P')]
+    header = f"{'Operation':<24} {'Count':<7} {'Mean':<9}" + ''.join(f" {c:<9}" for c in columns) + f" {'Max':<9}"
+    print(header)
+    print("-" * len(header))
+    for operation, row in table.iterrows():
+        line = f"{operation:<24} {int(row['Count']):<7d} {row['Mean']:<9.0f}"
+        line += ''.join(f" {row[c]:<9.0f}" for c in columns)
+        print(line + f" {row['Max']:<9.0f}")
+
+
+def print_comparison(results, base_label='Base', new_label='New', confidence=DEFAULT_CONFIDENCE):
+    """Per-operation comparison block used by all compare scripts"""
+    print(f"\n📐 SIGNIFICANCE-TESTED COMPARISON ({base_label} → {new_label}, {confidence:.0%} bootstrap CI):")
+    for operation, result in results.items():
+        verdict = result['verdict']
+        print(f"  {VERDICT_ICONS[verdict]} {operation}: {verdict} ({result['base_count']} → {result['new_count']} ops)")
+        for statistic in ('p50', 'p95', 'p99', 'mean'):
+            if statistic in result['stats']:
+                print(f"     {statistic:<4}: {format_change(result['stats'][statistic])}")
+    print("  (* = difference is significant; positive % = faster)")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python perf_statistics.py <log> [<new_log>] [--histogram]")
+        return
+
+    df = load_performance_log(sys.argv[1])
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    print_percentile_table(operation_percentiles(df), f"LATENCY PERCENTILES - {Path(paths[0]).name}")
+
+    if '--histogram' in sys.argv:
+        for operation in operation_percentiles(df).index:
+            print(f"\n  📊 {operation}")
+            for line in format_histogram(log_histogram(latency_values(df, operation))):
+                print(line)
+
+    if len(paths) > 1:
+        df_new = load_performance_log(paths[1])
+        operations = sorted(set(operation_percentiles(df).index) & set(operation_percentiles(df_new).index))
+        print_comparison(compare_operations(df, df_new, operations), Path(paths[0]).name, Path(paths[1]).name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Gate: new performance logs vs a rolling baseline of previous builds
+Every build is reduced to one row in a compact history CSV (percentiles, memory growth per 100 ops,
+tab-scaling slope). The baseline is the last builds since the most recent change point in that history.
+Exit code 1 when Search_Operation or Create_New_Tab regresses - meant to run after every benchmark
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from compare_performance import calculate_grade, grade_to_letter
+from compare_runs import resolve_runs
+from perf_log_loader import load_performance_log
+from perf_statistics import completed_events, point_statistic
+
+HISTORY_FILE = 'Performance_Summary_Tracking.csv'
+
+TRACKED_OPERATIONS = ['Search_Operation', 'Variable_Check', 'Create_New_Tab', 'Excel_Parser_Creation']
+GATED_OPERATIONS = ['Search_Operation', 'Create_New_Tab']
+TRACKED_STATISTICS = ('p50', 'p95', 'p99')
+
+# Tabs above this count are where the connection pool slowdown showed up
+TAB_CLIFF = 40
+
+# Gated metric -> operation it belongs to (higher is always worse)
+GATED_METRICS = {
+    'Search_Operation_P50': 'Search_Operation',
+    'Search_Operation_P95': 'Search_Operation',
+    'Create_New_Tab_P50': 'Create_New_Tab',
+    'Create_New_Tab_P95': 'Create_New_Tab',
+    'Create_New_Tab_HighTabP95': 'Create_New_Tab',
+    'TabSlopeMs': 'Create_New_Tab',
+}
+REPORTED_METRICS = ['MemGrowthPer100Ops']
+
+# Metrics that sit near zero also need an absolute change before they count (ms per tab, MB per 100 ops)
+MIN_ABSOLUTE_CHANGE = {'TabSlopeMs': 1.0, 'MemGrowthPer100Ops': 0.5}
+
+# Metrics that can be negative - change points are found on linear values, with an absolute noise floor
+SIGNED_METRICS = {'TabSlopeMs', 'MemGrowthPer100Ops'}
+
+DEFAULT_WINDOW = 10
+MIN_CHANGE_PCT = 10.0          # A regression must also be at least this much slower than the baseline median
+Z_THRESHOLD = 3.5              # Robust z-score (median / MAD) above which a build is out of the baseline range
+NOISE_FLOOR = 0.02             # MAD is floored at 2% of the median so a very stable history is not over-sensitive
+CHANGE_POINT_THRESHOLD = 3.0   # Mean-shift statistic that counts as a level change in the history
+MIN_SEGMENT = 2
+
+PASS = 'PASS'
+REGRESSION = 'REGRESSION'
+BASELINE = 'BASELINE'
+
+
+def tab_scaling(tab_events):
+    """Slope of Create_New_Tab ElapsedMs over TabCount (ms per extra tab) and p95 beyond TAB_CLIFF"""
+    slope = np.nan
+    if tab_events['TabCount'].nunique() > 1:
+        slope = float(np.polyfit(tab_events['TabCount'].to_numpy(dtype='float64'),
+                                 tab_events['ElapsedMs'].to_numpy(dtype='float64'), 1)[0])
+    high_tabs = tab_events.loc[tab_events['TabCount'] > TAB_CLIFF, 'ElapsedMs'].to_numpy(dtype='float64')
+    return slope, point_statistic(high_tabs, 'p95')
+
+
+def summarize_build(label, path):
+    """One history row for a performance log"""
+    df = load_performance_log(path)
+    completed = completed_events(df)
+
+    row = {
+        'Build': label,
+        'Source': Path(path).name,
+        'RecordedAt': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'FirstEvent': df['Timestamp'].min().strftime('%Y-%m-%d %H:%M:%S') if len(df) else '',
+        'Records': len(df),
+        'MemGrowthPer100Ops': (df['MemoryMB'].iloc[-1] - df['MemoryMB'].iloc[0]) / len(df) * 100 if len(df) else np.nan,
+    }
+
+    for operation in TRACKED_OPERATIONS:
+        values = completed.loc[completed['OperationName'] == operation, 'ElapsedMs'].dropna().to_numpy(dtype='float64')
+        row[f"{operation}_Count"] = len(values)
+        row[f"{operation}_Mean"] = point_statistic(values, 'mean')
+        for statistic in TRACKED_STATISTICS:
+            row[f"{operation}_{statistic.upper()}"] = point_statistic(values, statistic)
+
+    tab_events = completed[completed['OperationName'] == 'Create_New_Tab']
+    row['TabSlopeMs'], row['Create_New_Tab_HighTabP95'] = tab_scaling(tab_events)
+
+    mean_or_zero = lambda value: 0 if np.isnan(value) else value
+    row['Grade'] = calculate_grade(mean_or_zero(row['Variable_Check_Mean']), mean_or_zero(row['Create_New_Tab_Mean']),
+                                   mean_or_zero(row['MemGrowthPer100Ops']))
+    return row
+
+
+def load_history(history_path):
+    if not os.path.exists(history_path):
+        return pd.DataFrame()
+    return pd.read_csv(history_path)
+
+
+def save_history(history, history_path):
+    history.to_csv(history_path, index=False, float_format='%.2f')
+
+
+def change_point(series, threshold=CHANGE_POINT_THRESHOLD, min_segment=MIN_SEGMENT, signed=False, noise_floor=None):
+    """
+    Most likely single level shift in a metric series (binary segmentation, one split).
+    Works on log values so a shift is relative; signed series (values around or below zero) are used as
+    they are, with noise_floor as the smallest standard deviation in the metric's own unit.
+    Returns (index of the first point after the shift, statistic) or (None, statistic) when no split
+    beats the threshold.
+    """
+    values = np.asarray(series, dtype='float64')
+    if signed:
+        noise_floor = max(noise_floor or 0.0, 1e-9)
+    else:
+        values = np.log(values.clip(min=1e-9))
+        noise_floor = noise_floor if noise_floor is not None else NOISE_FLOOR / 2
+    n = len(values)
+    if n < 2 * min_segment:
+        return None, 0.0
+
+    splits = np.arange(min_segment, n - min_segment + 1)
+    cumsum = np.concatenate([[0.0], np.cumsum(values)])
+    cumsq = np.concatenate([[0.0], np.cumsum(values ** 2)])
+    left_n, right_n = splits, n - splits
+    left_mean = cumsum[splits] / left_n
+    right_mean = (cumsum[-1] - cumsum[splits]) / right_n
+
+    # Pooled within-segment variance for every split at once
+    within = (cumsq[splits] - left_n * left_mean ** 2) + (cumsq[-1] - cumsq[splits] - right_n * right_mean ** 2)
+    pooled_sd = np.sqrt(np.maximum(within, 0) / max(n - 2, 1))
+    pooled_sd = np.maximum(pooled_sd, noise_floor)
+    statistic = np.abs(right_mean - left_mean) / pooled_sd * np.sqrt(left_n * right_n / n)
+
+    best = int(statistic.argmax())
+    if statistic[best] < threshold:
+        return None, float(statistic[best])
+    return int(splits[best]), float(statistic[best])
+
+
+def baseline_window(history, window=DEFAULT_WINDOW):
+    """
+    Accepted builds (not flagged as regressions) since the most recent change point of any gated metric,
+    capped to the last `window` builds. A deliberate step change (e.g. a real optimization) therefore
+    becomes the new baseline instead of being averaged with the old level.
+    """
+    if len(history) == 0:
+        return history, None
+    accepted = history[history['Status'] != REGRESSION].reset_index(drop=True)
+
+    start, shifted_metric = 0, None
+    for metric in GATED_METRICS:
+        if metric not in accepted.columns:
+            continue
+        series = accepted[metric].dropna()
+        if metric in SIGNED_METRICS:
+            index, _ = change_point(series.to_numpy(), signed=True, noise_floor=MIN_ABSOLUTE_CHANGE.get(metric, 0.0) / 2)
+        else:
+            index, _ = change_point(series.to_numpy())
+        if index is not None:
+            position = series.index[index]
+            if position > start:
+                start, shifted_metric = position, metric
+    return accepted.iloc[start:].tail(window), shifted_metric
+
+
+def evaluate_build(row, baseline, min_change_pct=MIN_CHANGE_PCT, z_threshold=Z_THRESHOLD):
+    """Robust z-score of every tracked metric against the baseline builds; a regression needs every test to fail"""
+    checks = []
+    for metric in list(GATED_METRICS) + REPORTED_METRICS:
+        value = row.get(metric, np.nan)
+        history = baseline[metric].dropna().to_numpy(dtype='float64') if metric in baseline.columns else np.empty(0)
+        if np.isnan(value) or len(history) == 0:
+            continue
+
+        median = float(np.median(history))
+        mad = 1.4826 * float(np.median(np.abs(history - median)))
+        scale = max(mad, abs(median) * NOISE_FLOOR, 1e-9)
+        z_score = (value - median) / scale
+        change_pct = (value - median) / abs(median) * 100 if median else 0.0
+
+        checks.append({
+            'metric': metric,
+            'gated': metric in GATED_METRICS,
+            'value': value,
+            'median': median,
+            'z_score': z_score,
+            'change_pct': change_pct,
+            'regressed': bool(z_score > z_threshold and change_pct > min_change_pct
+                              and value - median > MIN_ABSOLUTE_CHANGE.get(metric, 0.0)),
+        })
+    return checks
+
+
+def print_checks(label, checks, baseline_size, shifted_metric):
+    print(f"\n📋 {label} vs rolling baseline ({baseline_size} builds):")
+    if shifted_metric:
+        print(f"  📍 Baseline restarted at the last change point ({shifted_metric})")
+    for check in checks:
+        if check['regressed'] and check['gated']:
+            icon = "🔴"
+        elif check['regressed']:
+            icon = "🟠"
+        elif check['change_pct'] < -MIN_CHANGE_PCT and check['z_score'] < -Z_THRESHOLD:
+            icon = "🟢"
+        else:
+            icon = "🟡"
+        print(f"  {icon} {check['metric']:<28} {check['median']:>9.1f} → {check['value']:>9.1f} "
+              f"({check['change_pct']:+.1f}%, z {check['z_score']:+.1f})")
+
+
+def parse_arguments(argv):
+    """Log specs plus --history, --window, --min-change, --threshold and --dry-run"""
+    parser = argparse.ArgumentParser(description="Check new benchmark logs against the build history")
+    parser.add_argument('specs', nargs='*', metavar='[label=]log')
+    parser.add_argument('--history', metavar='FILE', help="build history CSV")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, metavar='N', help="builds in the baseline")
+    parser.add_argument('--min-change', type=float, default=MIN_CHANGE_PCT, metavar='PCT')
+    parser.add_argument('--threshold', type=float, default=Z_THRESHOLD, metavar='Z')
+    parser.add_argument('--dry-run', action='store_true', help="check without recording the builds")
+    return vars(parser.parse_intermixed_args(argv))
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(script_dir))
+    logs_dir = os.path.join(project_root, 'Modules', 'Logs')
+    history_path = options['history'] or os.path.join(logs_dir, HISTORY_FILE)
+    history = load_history(history_path)
+
+    print("🚦 BENCHMARK REGRESSION GATE")
+    print("=" * 70)
+    print(f"📚 History: {history_path} ({len(history)} builds)")
+
+    # Default: logs in Modules/Logs not recorded yet, oldest first
+    explicit = bool(options['specs'])
+    specs = options['specs'] or [os.path.join(logs_dir, 'PerformanceAnalysis*.csv')]
+    try:
+        runs = resolve_runs(specs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    runs = [run for run in runs if os.path.exists(run[1])]
+    if not explicit:
+        recorded = set(history['Source']) if 'Source' in history.columns else set()
+        runs = sorted((run for run in runs if Path(run[1]).name not in recorded), key=lambda run: os.path.getmtime(run[1]))
+    if not runs:
+        print("✅ No new performance logs to check")
+        return
+
+    failed = []
+    for label, path in runs:
+        row = summarize_build(label, path)
+        previous = history[history['Build'] != label] if 'Build' in history.columns else history
+        baseline, shifted_metric = baseline_window(previous, options['window'])
+
+        if len(baseline) == 0:
+            row['Status'] = BASELINE
+            print(f"\n📋 {label}: first build in history - recorded as baseline")
+        else:
+            checks = evaluate_build(row, baseline, options['min_change'], options['threshold'])
+            print_checks(label, checks, len(baseline), shifted_metric)
+            regressed = sorted({GATED_METRICS[c['metric']] for c in checks if c['regressed'] and c['gated']})
+            row['Status'] = REGRESSION if regressed else PASS
+            if regressed:
+                failed.append((label, regressed))
+        print(f"  🏆 Grade: {row['Grade']}/100 - {grade_to_letter(row['Grade'])}")
+
+        history = pd.concat([previous, pd.DataFrame([row])], ignore_index=True)
+
+    if not options['dry_run']:
+        save_history(history, history_path)
+        print(f"\n💾 History updated: {len(history)} builds")
+
+    print(f"\n🎯 GATE RESULT:")
+    if failed:
+        for label, operations in failed:
+            print(f"  ❌ {label}: REGRESSION in {', '.join(operations)}")
+        sys.exit(1)
+    print(f"  ✅ No regression in {', '.join(GATED_OPERATIONS)}")
+
+
+if __name__ == "__main__":
+    main()
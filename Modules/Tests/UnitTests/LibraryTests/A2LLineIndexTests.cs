@@ -0,0 +1,153 @@
+using System;
+using System.IO;
+using System.Linq;
+using System.Text;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class A2LLineIndexTests
+    {
+        private string _folder;
+        private string _a2lPath;
+
+        [TestInitialize]
+        public void Setup()
+        {
+            _folder = Path.Combine(Path.GetTempPath(), "A2LLineIndexTests_" + Guid.NewGuid().ToString("N"));
+            Directory.CreateDirectory(_folder);
+            _a2lPath = Path.Combine(_folder, "project.a2l");
+
+            var a2l = new StringBuilder();
+            a2l.Append("/begin PROJECT Demo \"Demo project\"\r\n  /begin MODULE Engine \"\"\r\n");
+            for (int i = 0; i < 200; i++)
+            {
+                a2l.Append("    /begin MEASUREMENT\r\n");
+                a2l.Append($"      AccP_rAccP_{i}\r\n");
+                a2l.Append($"      \"Accelerator pedal {i}\" UWORD CM_Pct 0 0 0 100\r\n");
+                a2l.Append($"      ECU_ADDRESS 0x{0x1000 + 2 * i:X}\r\n");
+                a2l.Append("    /end MEASUREMENT\r\n");
+            }
+            a2l.Append("  /end MODULE\r\n/end PROJECT");
+            File.WriteAllText(_a2lPath, a2l.ToString(), new UTF8Encoding(true));
+            A2LLineIndex.ClearCache();
+        }
+
+        [TestCleanup]
+        public void Cleanup()
+        {
+            A2LLineIndex.ClearCache();
+            try { Directory.Delete(_folder, true); } catch (IOException) { }
+        }
+
+        private string[] ScanLines(string keyword)
+        {
+            return File.ReadAllLines(_a2lPath).Where(line => line.Contains(keyword)).ToArray();
+        }
+
+        [TestMethod]
+        public void FindLines_ShouldMatchFullFileScan()
+        {
+            // Arrange
+            var index = A2LLineIndex.Open(_a2lPath);
+            var keywords = new[]
+            {
+                "AccP_rAccP_17",         // Token prefix: also hits _170 .. _179
+                "rAccP_1",               // Substring inside a token
+                "ECU_ADDRESS 0x10",      // Two runs: whole token + token prefix
+                "pedal 19\"",            // Run followed by punctuation
+                "/begin PROJECT Demo",   // Line 0 after the BOM
+                "MEASUREMENT",
+                "accp_raccp_1",          // Ordinal - case matters
+                "NotInFile",
+                "\"\""                   // No identifier run - streaming scan
+            };
+
+            // Act & Assert
+            foreach (string keyword in keywords)
+                CollectionAssert.AreEqual(ScanLines(keyword), index.FindLines(keyword), keyword);
+        }
+
+        [TestMethod]
+        public void FindLines_CrOnlyAndMixedLineEndings_ShouldMatchFullFileScan()
+        {
+            // Arrange - every line break File.ReadAllLines knows: \r, \n, \r\n, plus \r\r\n and \n\r
+            var a2l = new StringBuilder("/begin PROJECT Demo \"\"\r/begin MODULE Engine \"\"\r");
+            string[] breaks = { "\r", "\n", "\r\n", "\r", "\r\r\n", "\n\r" };
+            for (int i = 0; i < 280; i++)
+                a2l.Append($"  /begin MEASUREMENT CrLabel_{i} \"\" UBYTE CM 0 0 0 1 /end MEASUREMENT{breaks[i % breaks.Length]}");
+            a2l.Append("/end MODULE\r/end PROJECT\r");
+            File.WriteAllText(_a2lPath, a2l.ToString(), new UTF8Encoding(false));
+            var index = A2LLineIndex.Open(_a2lPath);
+
+            // Act & Assert
+            Assert.AreEqual(File.ReadAllLines(_a2lPath).Length, index.LineCount);
+            foreach (string keyword in new[] { "MEASUREMENT", "CrLabel_27", "/end MODULE", "\"\"" })
+                CollectionAssert.AreEqual(ScanLines(keyword), index.FindLines(keyword), keyword);
+            CollectionAssert.AreEqual(File.ReadAllLines(_a2lPath).Skip(275).Take(10).ToArray(), index.ReadLines(275, 10));
+        }
+
+        [TestMethod]
+        public void Open_SecondTime_ShouldReuseIndexFile()
+        {
+            // Arrange
+            var first = A2LLineIndex.Open(_a2lPath);
+            DateTime written = File.GetLastWriteTimeUtc(first.IndexPath);
+            A2LLineIndex.ClearCache();
+
+            // Act
+            var second = A2LLineIndex.Open(_a2lPath);
+
+            // Assert
+            Assert.AreEqual(first.IndexPath, second.IndexPath);
+            Assert.AreEqual(written, File.GetLastWriteTimeUtc(second.IndexPath));
+            Assert.AreEqual(first.LineCount, second.LineCount);
+            Assert.AreEqual(File.ReadAllLines(_a2lPath).Length, second.LineCount);
+        }
+
+        [TestMethod]
+        public void Open_AfterFileChanged_ShouldRebuild()
+        {
+            // Arrange
+            A2LLineIndex.Open(_a2lPath).FindLines("AccP_rAccP_1");
+            File.AppendAllText(_a2lPath, "\r\n/* NewLabel_W */\r\n");
+
+            // Act
+            var lines = A2LLineIndex.Open(_a2lPath).FindLines("NewLabel_W");
+
+            // Assert
+            CollectionAssert.AreEqual(new[] { "/* NewLabel_W */" }, lines);
+        }
+
+        [TestMethod]
+        public void ReadLines_ShouldReturnSurroundingLinesOfHit()
+        {
+            // Arrange
+            var index = A2LLineIndex.Open(_a2lPath);
+            int hit = index.FindLineNumbers("AccP_rAccP_5").First();
+
+            // Act
+            var context = index.ReadLines(hit - 1, 3);
+
+            // Assert
+            CollectionAssert.AreEqual(File.ReadAllLines(_a2lPath).Skip(hit - 1).Take(3).ToArray(), context);
+        }
+
+        [TestMethod]
+        public void IsExistInA2L_ShouldReturnTrimmedMatchingLines()
+        {
+            // Arrange
+            var a2lCheck = new A2L_Check { Link_Of_A2L = _a2lPath };
+            string[] result = null;
+
+            // Act
+            bool found = a2lCheck.IsExistInA2L("AccP_rAccP_42", ref result);
+
+            // Assert
+            Assert.IsTrue(found);
+            CollectionAssert.AreEqual(new[] { "AccP_rAccP_42" }, result);
+        }
+    }
+}
@@ -0,0 +1,216 @@
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Data;
+using System.IO;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class BatchSearchServiceTests
+    {
+        private static Func<List<string>, Dictionary<string, bool>> LookupOf(params string[] names)
+        {
+            var known = new HashSet<string>(names, StringComparer.OrdinalIgnoreCase);
+            return variables => variables.ToDictionary(variable => variable, variable => known.Contains(variable));
+        }
+
+        [TestMethod]
+        public async Task RunAsync_ShouldReturnOneRowPerDistinctVariableInInputOrder()
+        {
+            // Arrange
+            var service = new BatchSearchService(maxWorkers: 3, chunkSize: 2)
+                .AddSource("New CARASI", LookupOf("AccP_rAccP", "CoPTSt_bEngStop"))
+                .AddSource("A2L", LookupOf("AccP_rAccP"));
+
+            // Act - blanks skipped, duplicates (case-insensitive) searched once
+            var rows = await service.RunAsync(new[] { " AccP_rAccP ", "Missing_Var", "", "CoPTSt_bEngStop", "accp_raccp", "Other" });
+
+            // Assert
+            CollectionAssert.AreEqual(new[] { "AccP_rAccP", "Missing_Var", "CoPTSt_bEngStop", "Other" }, rows.Select(r => r.Variable).ToList());
+            CollectionAssert.AreEqual(new bool?[] { true, true }, rows[0].Found);
+            CollectionAssert.AreEqual(new bool?[] { true, false }, rows[2].Found);
+            Assert.AreEqual(0, rows[1].FoundCount);
+            Assert.AreEqual(2, rows[0].FoundCount);
+        }
+
+        [TestMethod]
+        public async Task RunAsync_ShouldNeverRunMoreChunksThanMaxWorkers()
+        {
+            // Arrange
+            int running = 0, maxRunning = 0;
+            var service = new BatchSearchService(maxWorkers: 2, chunkSize: 5).AddSource("Slow", variables =>
+            {
+                int now = Interlocked.Increment(ref running);
+                int seen;
+                while ((seen = maxRunning) < now && Interlocked.CompareExchange(ref maxRunning, now, seen) != seen) { }
+                Thread.Sleep(20);
+                Interlocked.Decrement(ref running);
+                return variables.ToDictionary(v => v, v => true);
+            });
+
+            // Act
+            var rows = await service.RunAsync(Enumerable.Range(0, 50).Select(i => "Var" + i));
+
+            // Assert
+            Assert.AreEqual(50, rows.Count);
+            Assert.IsTrue(maxRunning <= 2, $"{maxRunning} chunks ran at once");
+        }
+
+        [TestMethod]
+        public async Task RunAsync_ShouldReportEveryChunkWithItsRows()
+        {
+            // Arrange
+            var reports = new ConcurrentBag<BatchSearchProgress>();
+            var service = new BatchSearchService(maxWorkers: 2, chunkSize: 4).AddSource("New CARASI", LookupOf("Var1"));
+
+            // Act
+            await service.RunAsync(Enumerable.Range(0, 10).Select(i => "Var" + i), new SyncProgress(reports.Add));
+
+            // Assert - 3 chunks (4 + 4 + 2), the last report covers everything
+            Assert.AreEqual(3, reports.Count);
+            Assert.AreEqual(10, reports.Sum(report => report.Rows.Count));
+            Assert.AreEqual(10, reports.Max(report => report.Completed));
+            Assert.AreEqual(100, reports.Max(report => report.Percent));
+        }
+
+        [TestMethod]
+        public async Task RunAsync_Cancelled_ShouldStopSchedulingChunks()
+        {
+            // Arrange
+            var cancellation = new CancellationTokenSource();
+            int chunksSearched = 0;
+            var service = new BatchSearchService(maxWorkers: 1, chunkSize: 1).AddSource("New CARASI", variables =>
+            {
+                if (Interlocked.Increment(ref chunksSearched) == 3) cancellation.Cancel();
+                return variables.ToDictionary(v => v, v => true);
+            });
+
+            // Act
+            bool cancelled = false;
+            try
+            {
+                await service.RunAsync(Enumerable.Range(0, 100).Select(i => "Var" + i), null, cancellation.Token);
+            }
+            catch (OperationCanceledException)
+            {
+                cancelled = true;
+            }
+
+            // Assert
+            Assert.IsTrue(cancelled);
+            Assert.IsTrue(chunksSearched < 100, $"{chunksSearched} chunks searched after cancel");
+        }
+
+        [TestMethod]
+        public async Task RunAsync_FailingSource_ShouldLeaveOnlyItsColumnEmpty()
+        {
+            // Arrange
+            var service = new BatchSearchService()
+                .AddSource("Broken", variables => { throw new InvalidOperationException("file locked"); })
+                .AddSource("A2L", LookupOf("AccP_rAccP"));
+
+            // Act
+            var rows = await service.RunAsync(new[] { "AccP_rAccP" });
+
+            // Assert
+            Assert.IsFalse(rows[0].Found[0].HasValue);
+            Assert.AreEqual(true, rows[0].Found[1]);
+        }
+
+        [TestMethod]
+        public async Task AppendRows_ShouldFillOneResultTable()
+        {
+            // Arrange
+            var service = new BatchSearchService(chunkSize: 2)
+                .AddSource("New CARASI", LookupOf("AccP_rAccP"))
+                .AddSource("Old CARASI", LookupOf());
+            DataTable table = service.CreateResultTable();
+
+            // Act
+            var rows = await service.RunAsync(new[] { "AccP_rAccP", "Missing_Var", "Other" });
+            BatchSearchService.AppendRows(table, rows);
+
+            // Assert
+            Assert.AreEqual(3, table.Rows.Count);
+            CollectionAssert.AreEqual(new[] { "#", "Variable", "New CARASI", "Old CARASI", "Found In" },
+                                      table.Columns.Cast<DataColumn>().Select(c => c.ColumnName).ToList());
+            DataRow first = table.Rows.Find("AccP_rAccP");
+            Assert.AreEqual(1, first["#"]);
+            Assert.AreEqual(true, first["New CARASI"]);
+            Assert.AreEqual(1, first["Found In"]);
+        }
+
+        [TestMethod]
+        public async Task AddExcelSource_UnreadableWorkbook_ShouldLeaveItsColumnDBNull()
+        {
+            // Arrange - a workbook OLEDB cannot open next to a working source
+            string folder = Path.Combine(Path.GetTempPath(), "BatchSearchServiceTests_" + Guid.NewGuid().ToString("N"));
+            Directory.CreateDirectory(folder);
+            string path = Path.Combine(folder, "Locked_newCARASI.xlsx");
+            File.WriteAllText(path, "not a zip package");
+            var parser = new Excel_Parser(path, new DataTable());
+            var service = new BatchSearchService(chunkSize: 2)
+                .AddExcelSource("New CARASI", parser)
+                .AddSource("A2L", LookupOf("AccP_rAccP"));
+            DataTable table = service.CreateResultTable();
+
+            try
+            {
+                // Act
+                var rows = await service.RunAsync(new[] { "AccP_rAccP", "Missing_Var", "Other" });
+                BatchSearchService.AppendRows(table, rows);
+
+                // Assert - "lookup failed", not "not found"; the other source still answers
+                Assert.IsTrue(rows.All(row => row.Found[0] == null));
+                Assert.AreEqual(DBNull.Value, table.Rows.Find("Missing_Var")["New CARASI"]);
+                Assert.AreEqual(true, table.Rows.Find("AccP_rAccP")["A2L"]);
+                Assert.AreEqual(false, table.Rows.Find("Missing_Var")["A2L"]);
+            }
+            finally
+            {
+                parser.Dispose();
+                try { Directory.Delete(folder, true); } catch (IOException) { }
+            }
+        }
+
+        [TestMethod]
+        public async Task AddA2LSource_MissingFile_ShouldLeaveItsColumnDBNull()
+        {
+            // Arrange
+            string path = Path.Combine(Path.GetTempPath(), "BatchSearchServiceTests_" + Guid.NewGuid().ToString("N") + ".a2l");
+            var service = new BatchSearchService()
+                .AddSource("New CARASI", LookupOf("AccP_rAccP"))
+                .AddA2LSource("A2L", path);
+            DataTable table = service.CreateResultTable();
+
+            // Act
+            var rows = await service.RunAsync(new[] { "AccP_rAccP", "Missing_Var" });
+            BatchSearchService.AppendRows(table, rows);
+
+            // Assert - "lookup failed", not "not found"
+            Assert.IsTrue(rows.All(row => row.Found[1] == null));
+            Assert.AreEqual(DBNull.Value, table.Rows.Find("Missing_Var")["A2L"]);
+            Assert.AreEqual(true, table.Rows.Find("AccP_rAccP")["New CARASI"]);
+        }
+
+        [TestMethod]
+        [ExpectedException(typeof(ArgumentException))]
+        public void AddSource_DuplicateName_ShouldThrow()
+        {
+            new BatchSearchService().AddSource("A2L", LookupOf()).AddSource("A2L", LookupOf());
+        }
+
+        private class SyncProgress : IProgress<BatchSearchProgress>
+        {
+            private readonly Action<BatchSearchProgress> _report;
+            public SyncProgress(Action<BatchSearchProgress> report) { _report = report; }
+            public void Report(BatchSearchProgress value) => _report(value);
+        }
+    }
+}
@@ -0,0 +1,254 @@
+using System;
+using System.Collections.Generic;
+using System.Threading;
+using System.Threading.Tasks;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class ConnectionLeasePoolTests
+    {
+        private class FakeConnection : IDisposable
+        {
+            public bool Healthy = true;
+            public bool Disposed;
+            public void Dispose() { Disposed = true; }
+        }
+
+        private List<string> _logged;
+
+        private ConnectionLeasePool<FakeConnection> CreatePool(int maxLeases = 2, int maxIdle = 10, TimeSpan? idleTimeout = null, TimeSpan? leaseTimeout = null)
+        {
+            _logged = new List<string>();
+            return new ConnectionLeasePool<FakeConnection>(maxLeases, maxIdle,
+                idleTimeout ?? TimeSpan.FromMinutes(5), leaseTimeout ?? TimeSpan.FromSeconds(5),
+                connection => connection.Healthy,
+                (operation, elapsedMs, details) => { lock (_logged) _logged.Add(operation); });
+        }
+
+        [TestMethod]
+        public void Acquire_AfterRelease_ShouldReuseTheSameConnection()
+        {
+            // Arrange
+            var pool = CreatePool();
+            FakeConnection first;
+            using (var lease = pool.Acquire("a.xlsx", () => new FakeConnection()))
+            {
+                first = lease.Connection;
+            }
+
+            // Act
+            using (var lease = pool.Acquire("a.xlsx", () => new FakeConnection()))
+            {
+                // Assert
+                Assert.AreSame(first, lease.Connection);
+                Assert.AreEqual(1, pool.ActiveCount);
+            }
+            Assert.AreEqual(0, pool.ActiveCount);
+            Assert.AreEqual(1, pool.IdleCount);
+        }
+
+        [TestMethod]
+        public void Acquire_UnhealthyIdleConnection_ShouldBeDisposedAndReplaced()
+        {
+            // Arrange
+            var pool = CreatePool();
+            FakeConnection first;
+            using (var lease = pool.Acquire("a.xlsx", () => new FakeConnection()))
+            {
+                first = lease.Connection;
+            }
+            first.Healthy = false;
+
+            // Act
+            using (var lease = pool.Acquire("a.xlsx", () => new FakeConnection()))
+            {
+                // Assert
+                Assert.AreNotSame(first, lease.Connection);
+            }
+            Assert.IsTrue(first.Disposed);
+            Assert.AreEqual(1L, pool.GetStatistics()["Unhealthy"]);
+        }
+
+        [TestMethod]
+        public void Acquire_OverMaxLeasesPerFile_ShouldTimeOutAndLog()
+        {
+            // Arrange
+            var pool = CreatePool(maxLeases: 1);
+            var held = pool.Acquire("a.xlsx", () => new FakeConnection());
+
+            // Act & Assert - other files are not affected by the cap
+            using (pool.Acquire("b.xlsx", () => new FakeConnection())) { }
+            bool timedOut = false;
+            try
+            {
+                pool.Acquire("a.xlsx", () => new FakeConnection(), TimeSpan.FromMilliseconds(50));
+            }
+            catch (TimeoutException)
+            {
+                timedOut = true;
+            }
+
+            Assert.IsTrue(timedOut);
+            Assert.AreEqual(1L, pool.GetStatistics()["Timeouts"]);
+            CollectionAssert.Contains(_logged, "OLEDB_LeaseTimeout");
+            held.Dispose();
+        }
+
+        [TestMethod]
+        public void Acquire_ConcurrentCallers_ShouldNeverExceedMaxLeasesPerFile()
+        {
+            // Arrange
+            var pool = CreatePool(maxLeases: 2);
+            int inUse = 0, maxInUse = 0;
+
+            // Act
+            Parallel.For(0, 20, i =>
+            {
+                using (pool.Acquire("a.xlsx", () => new FakeConnection()))
+                {
+                    int now = Interlocked.Increment(ref inUse);
+                    int seen;
+                    while ((seen = maxInUse) < now && Interlocked.CompareExchange(ref maxInUse, now, seen) != seen) { }
+                    Thread.Sleep(5);
+                    Interlocked.Decrement(ref inUse);
+                }
+            });
+
+            // Assert
+            Assert.IsTrue(maxInUse <= 2, $"{maxInUse} leases of one file at once");
+            Assert.IsTrue((long)pool.GetStatistics()["Created"] <= 2);
+        }
+
+        [TestMethod]
+        public void EvictIdle_WhileCallerWaitsForSlot_ShouldKeepFileCapped()
+        {
+            // Arrange - one lease per file and no idle connections: the file looks unused between
+            // the release of the lease and the waiting caller taking its slot
+            var pool = CreatePool(maxLeases: 1, maxIdle: 0, idleTimeout: TimeSpan.Zero);
+            var held = pool.Acquire("a.xlsx", () => new FakeConnection());
+            var waiterLeased = new ManualResetEventSlim();
+            var releaseWaiter = new ManualResetEventSlim();
+            var waiter = Task.Run(() =>
+            {
+                using (pool.Acquire("a.xlsx", () => new FakeConnection()))
+                {
+                    waiterLeased.Set();
+                    releaseWaiter.Wait();
+                }
+            });
+            Thread.Sleep(100);
+
+            // Act
+            held.Dispose();
+            pool.EvictIdle();
+
+            // Assert - the waiter owns the only slot, so a new caller still has to wait
+            bool timedOut = false;
+            try
+            {
+                pool.Acquire("a.xlsx", () => new FakeConnection(), TimeSpan.FromMilliseconds(200)).Dispose();
+            }
+            catch (TimeoutException)
+            {
+                timedOut = true;
+            }
+
+            Assert.IsTrue(timedOut);
+            Assert.IsTrue(waiterLeased.IsSet);
+            releaseWaiter.Set();
+            waiter.Wait();
+            pool.EvictIdle();
+            Assert.AreEqual(0, pool.GetStatistics()["Files"]);
+        }
+
+        [TestMethod]
+        public void Release_InvalidatedLease_ShouldDisposeConnection()
+        {
+            // Arrange
+            var pool = CreatePool();
+            var lease = pool.Acquire("a.xlsx", () => new FakeConnection());
+
+            // Act
+            lease.Invalidate();
+            lease.Dispose();
+
+            // Assert
+            Assert.IsTrue(lease.Connection.Disposed);
+            Assert.AreEqual(0, pool.IdleCount);
+        }
+
+        [TestMethod]
+        public void Release_OverMaxIdle_ShouldCloseLongestIdleConnection()
+        {
+            // Arrange
+            var pool = CreatePool(maxIdle: 1);
+            var first = pool.Acquire("a.xlsx", () => new FakeConnection());
+            var second = pool.Acquire("b.xlsx", () => new FakeConnection());
+
+            // Act
+            first.Dispose();
+            second.Dispose();
+
+            // Assert
+            Assert.AreEqual(1, pool.IdleCount);
+            Assert.IsTrue(first.Connection.Disposed);
+            Assert.IsFalse(second.Connection.Disposed);
+        }
+
+        [TestMethod]
+        public void EvictIdle_ShouldCloseConnectionsIdleLongerThanTimeout()
+        {
+            // Arrange
+            var pool = CreatePool(idleTimeout: TimeSpan.Zero);
+            var lease = pool.Acquire("a.xlsx", () => new FakeConnection());
+            lease.Dispose();
+            Thread.Sleep(10);
+
+            // Act
+            int closed = pool.EvictIdle();
+
+            // Assert
+            Assert.AreEqual(1, closed);
+            Assert.IsTrue(lease.Connection.Disposed);
+            Assert.AreEqual(0, pool.IdleCount);
+        }
+
+        [TestMethod]
+        public void Clear_ShouldCloseIdleNowAndLeasedOnRelease()
+        {
+            // Arrange
+            var pool = CreatePool();
+            var idle = pool.Acquire("a.xlsx", () => new FakeConnection());
+            var leased = pool.Acquire("a.xlsx", () => new FakeConnection());
+            idle.Dispose();
+
+            // Act
+            pool.Clear();
+
+            // Assert
+            Assert.IsTrue(idle.Connection.Disposed);
+            Assert.IsFalse(leased.Connection.Disposed);
+            leased.Dispose();
+            Assert.IsTrue(leased.Connection.Disposed);
+            Assert.AreEqual(0, pool.IdleCount);
+        }
+
+        [TestMethod]
+        public void ExportMetrics_ShouldLogOneSummaryPerWindow()
+        {
+            // Arrange
+            var pool = CreatePool();
+            using (pool.Acquire("a.xlsx", () => new FakeConnection())) { }
+
+            // Act
+            pool.ExportMetrics();
+            pool.ExportMetrics(); // nothing new - no second summary
+
+            // Assert
+            Assert.AreEqual(1, _logged.FindAll(operation => operation == "OLEDB_LeaseSummary").Count);
+        }
+    }
+}
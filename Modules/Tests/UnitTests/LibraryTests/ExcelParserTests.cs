@@ -1,5 +1,6 @@
 using System;
 using System.Data;
+using System.IO;
 using Microsoft.VisualStudio.TestTools.UnitTesting;
 using Check_carasi_DF_ContextClearing;
 
@@ -170,6 +171,42 @@ namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
             Assert.IsTrue(true); // If we reach here without exception, disposal worked
         }
 
+        [TestMethod]
+        public void GetNameIndex_UnreadableWorkbook_ShouldThrowAndNotCache()
+        {
+            // Arrange - a "workbook" OLEDB cannot open
+            string folder = Path.Combine(Path.GetTempPath(), "ExcelParserTests_" + Guid.NewGuid().ToString("N"));
+            Directory.CreateDirectory(folder);
+            string path = Path.Combine(folder, "Unreadable_newCARASI.xlsx");
+            File.WriteAllText(path, "not a zip package");
+            var parser = new Excel_Parser(path, _templateDataTable);
+            int failures = 0;
+
+            try
+            {
+                // Act - both calls read the file again: the first failure was not cached as an empty index
+                for (int attempt = 0; attempt < 2; attempt++)
+                {
+                    try
+                    {
+                        parser.GetNameIndex();
+                    }
+                    catch (Exception)
+                    {
+                        failures++;
+                    }
+                }
+            }
+            finally
+            {
+                parser.Dispose();
+                try { Directory.Delete(folder, true); } catch (IOException) { }
+            }
+
+            // Assert
+            Assert.AreEqual(2, failures);
+        }
+
         [TestCleanup]
         public void Cleanup()
         {
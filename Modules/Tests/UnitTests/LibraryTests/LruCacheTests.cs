@@ -0,0 +1,160 @@
+using System;
+using System.IO;
+using System.Threading.Tasks;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class LruCacheTests
+    {
+        [TestMethod]
+        public void Set_OverMaxEntries_ShouldEvictLeastRecentlyUsed()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(2, 1000);
+            cache.Set("a", "1");
+            cache.Set("b", "2");
+
+            // Act - touching "a" makes "b" the oldest
+            cache.TryGet("a", out _);
+            cache.Set("c", "3");
+
+            // Assert
+            Assert.IsTrue(cache.TryGet("a", out _));
+            Assert.IsFalse(cache.TryGet("b", out _));
+            Assert.IsTrue(cache.TryGet("c", out _));
+            Assert.AreEqual(1L, cache.Evictions);
+        }
+
+        [TestMethod]
+        public void Set_OverMaxBytes_ShouldEvictUntilWithinLimit()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(100, 10, value => value.Length);
+
+            // Act
+            cache.Set("a", "aaaa");
+            cache.Set("b", "bbbb");
+            cache.Set("c", "cccc");
+
+            // Assert
+            Assert.AreEqual(2, cache.Count);
+            Assert.AreEqual(8L, cache.ApproximateBytes);
+            Assert.IsFalse(cache.TryGet("a", out _));
+        }
+
+        [TestMethod]
+        public void Set_ValueLargerThanMaxBytes_ShouldNotBeCached()
+        {
+            var cache = new LruCache<string, string>(10, 3, value => value.Length);
+            cache.Set("a", "too long");
+            Assert.AreEqual(0, cache.Count);
+            Assert.AreEqual(0L, cache.ApproximateBytes);
+        }
+
+        [TestMethod]
+        public void TryGet_InvalidEntry_ShouldBeRemovedAndCounted()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(10, 1000);
+            cache.Set("a", "stale");
+
+            // Act
+            bool found = cache.TryGet("a", out string value, cached => cached != "stale");
+
+            // Assert
+            Assert.IsFalse(found);
+            Assert.IsNull(value);
+            Assert.AreEqual(0, cache.Count);
+            Assert.AreEqual(1L, cache.Invalidations);
+            Assert.AreEqual(1L, cache.Misses);
+        }
+
+        [TestMethod]
+        public void TryGet_SlowValidation_ShouldNotBlockOtherCallers()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(10, 1000);
+            cache.Set("a", "valid");
+            cache.Set("b", "other");
+            bool otherCallerRan = false;
+
+            // Act - another thread uses the cache while the validation of "a" is still running
+            bool found = cache.TryGet("a", out string value, cached =>
+            {
+                otherCallerRan = Task.Run(() => cache.TryGet("b", out string other)).Wait(2000);
+                return true;
+            });
+
+            // Assert
+            Assert.IsTrue(otherCallerRan);
+            Assert.IsTrue(found);
+            Assert.AreEqual("valid", value);
+            Assert.AreEqual(2L, cache.Hits);
+        }
+
+        [TestMethod]
+        public void GetStatistics_ShouldReportHitsMissesAndHitRate()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(10, 1000);
+            cache.Set("a", "1");
+
+            // Act
+            cache.TryGet("a", out _);
+            cache.TryGet("a", out _);
+            cache.TryGet("b", out _);
+            var statistics = cache.GetStatistics();
+
+            // Assert
+            Assert.AreEqual(2L, statistics["Hits"]);
+            Assert.AreEqual(1L, statistics["Misses"]);
+            Assert.AreEqual(2.0 / 3, (double)statistics["HitRate"], 1e-9);
+        }
+
+        [TestMethod]
+        public void RemoveWhere_ShouldDropMatchingEntriesAndReplaceKeepsSize()
+        {
+            // Arrange
+            var cache = new LruCache<string, string>(10, 1000, value => value.Length);
+            cache.Set("a", "x");
+            cache.Set("b", "yy");
+            cache.Set("b", "zzz");
+
+            // Act
+            int removed = cache.RemoveWhere((key, value) => key == "a");
+
+            // Assert
+            Assert.AreEqual(1, removed);
+            Assert.AreEqual(1, cache.Count);
+            Assert.AreEqual(3L, cache.ApproximateBytes);
+        }
+
+        [TestMethod]
+        public void SourceFileStamp_ShouldSurviveTouchButNotContentChange()
+        {
+            // Arrange
+            string path = Path.GetTempFileName();
+            try
+            {
+                File.WriteAllText(path, "revision 1");
+                var stamp = VariableSearchCoordinator.SourceFileStamp.Capture(path);
+
+                // Act & Assert - same bytes, new mtime
+                File.SetLastWriteTimeUtc(path, DateTime.UtcNow.AddMinutes(5));
+                Assert.IsTrue(stamp.IsCurrent());
+
+                // Same length, different bytes
+                File.WriteAllText(path, "revision 2");
+                File.SetLastWriteTimeUtc(path, DateTime.UtcNow.AddMinutes(10));
+                Assert.IsFalse(stamp.IsCurrent());
+            }
+            finally
+            {
+                File.Delete(path);
+            }
+        }
+    }
+}
@@ -0,0 +1,119 @@
+using System;
+using System.Linq;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class NameNgramIndexTests
+    {
+        private NameNgramIndex _index;
+
+        [TestInitialize]
+        public void Setup()
+        {
+            _index = new NameNgramIndex(new[]
+            {
+                "AccP_rAccP", "AccP_rAccPSens1", "AccP_rAccPSens2", "AccP_bHdPtMon", "AccPEM_rAccP",
+                "CoPTSt_bEngStop", "CoPTSt_bEngRun", "Ext_pwrElCmprLimReqMaxSat_C", "accp_raccp", "  ", null
+            });
+        }
+
+        [TestMethod]
+        public void Constructor_DuplicatesAndBlanks_ShouldBeSkipped()
+        {
+            // Assert - "accp_raccp" is the same name as "AccP_rAccP", blanks and null are ignored
+            Assert.AreEqual(8, _index.Count);
+            Assert.IsTrue(_index.Names.Contains("AccP_rAccP"));
+            Assert.IsFalse(_index.Names.Contains("accp_raccp"));
+        }
+
+        [TestMethod]
+        public void Contains_ShouldBeCaseInsensitiveAndTrimmed()
+        {
+            Assert.IsTrue(_index.Contains("ACCP_RACCP"));
+            Assert.IsTrue(_index.Contains("  CoPTSt_bEngStop "));
+            Assert.IsFalse(_index.Contains("CoPTSt_bEngStp"));
+            Assert.IsFalse(_index.Contains(null));
+        }
+
+        [TestMethod]
+        public void Prefix_ShouldReturnMatchingNamesAlphabetically()
+        {
+            // Act
+            var results = _index.Prefix("accp_r", 10);
+
+            // Assert
+            CollectionAssert.AreEqual(new[] { "AccP_rAccP", "AccP_rAccPSens1", "AccP_rAccPSens2" }, results);
+            Assert.AreEqual(2, _index.Prefix("AccP_", 2).Count);
+            Assert.AreEqual(0, _index.Prefix("Zzz").Count);
+        }
+
+        [TestMethod]
+        public void Suggest_Typo_ShouldRankClosestNameFirst()
+        {
+            // Act
+            var suggestions = _index.Suggest("CoPTSt_bEngStp", 3);
+
+            // Assert
+            Assert.AreEqual("CoPTSt_bEngStop", suggestions[0].Name);
+            Assert.AreEqual(1, suggestions[0].EditDistance);
+            Assert.IsTrue(suggestions.Count <= 3);
+        }
+
+        [TestMethod]
+        public void Suggest_ExistingName_ShouldReturnItFirst()
+        {
+            // Act
+            var suggestions = _index.Suggest("accp_raccp");
+
+            // Assert
+            Assert.AreEqual("AccP_rAccP", suggestions[0].Name);
+            Assert.AreEqual(0, suggestions[0].EditDistance);
+            Assert.AreEqual(1.0, suggestions[0].Similarity, 1e-9);
+        }
+
+        [TestMethod]
+        public void Suggest_UnrelatedQuery_ShouldReturnEmpty()
+        {
+            Assert.AreEqual(0, _index.Suggest("XYZ").Count);
+            Assert.AreEqual(0, _index.Suggest("").Count);
+        }
+
+        [TestMethod]
+        public void Wildcard_ShouldMatchWholeNameCaseInsensitive()
+        {
+            CollectionAssert.AreEquivalent(new[] { "AccP_rAccPSens1", "AccP_rAccPSens2" }, _index.Wildcard("*sens?"));
+            CollectionAssert.AreEquivalent(new[] { "AccP_rAccP", "AccPEM_rAccP" }, _index.Wildcard("acc*_raccp"));
+            CollectionAssert.AreEquivalent(new[] { "CoPTSt_bEngStop", "CoPTSt_bEngRun" }, _index.Wildcard("C*"));
+            Assert.AreEqual(_index.Count, _index.Wildcard("*").Count);
+            Assert.AreEqual(0, _index.Wildcard("*NotThere*").Count);
+        }
+
+        [TestMethod]
+        public void Wildcard_MaxResults_ShouldLimitResults()
+        {
+            Assert.AreEqual(2, _index.Wildcard("AccP*", 2).Count);
+        }
+
+        [TestMethod]
+        public void Empty_ShouldAnswerEveryQueryWithNothing()
+        {
+            Assert.AreEqual(0, NameNgramIndex.Empty.Count);
+            Assert.IsFalse(NameNgramIndex.Empty.Contains("AccP_rAccP"));
+            Assert.AreEqual(0, NameNgramIndex.Empty.Prefix("A").Count);
+            Assert.AreEqual(0, NameNgramIndex.Empty.Suggest("AccP").Count);
+            Assert.AreEqual(0, NameNgramIndex.Empty.Wildcard("A*").Count);
+        }
+
+        [TestMethod]
+        public void EditDistance_ShouldCountInsertionsDeletionsAndSubstitutions()
+        {
+            Assert.AreEqual(0, NameNgramIndex.EditDistance("abc", "abc"));
+            Assert.AreEqual(1, NameNgramIndex.EditDistance("abc", "abxc"));
+            Assert.AreEqual(1, NameNgramIndex.EditDistance("abc", "abd"));
+            Assert.AreEqual(3, NameNgramIndex.EditDistance("", "abc"));
+        }
+    }
+}
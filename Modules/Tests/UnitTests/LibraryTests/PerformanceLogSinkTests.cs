@@ -0,0 +1,282 @@
+using System;
+using System.IO;
+using System.Text;
+using System.Threading.Tasks;
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using Check_carasi_DF_ContextClearing;
+
+namespace Check_carasi_DF_ContextClearing.Tests.UnitTests.LibraryTests
+{
+    [TestClass]
+    public class PerformanceLogSinkTests
+    {
+        private string _testDirectory;
+
+        // Cuts the next block write in half and throws, as a full disk would
+        private class FailingStream : MemoryStream
+        {
+            public bool FailNextWrite;
+
+            public override void Write(byte[] buffer, int offset, int count)
+            {
+                if (FailNextWrite)
+                {
+                    FailNextWrite = false;
+                    base.Write(buffer, offset, count / 2);
+                    throw new IOException("Disk full");
+                }
+                base.Write(buffer, offset, count);
+            }
+        }
+
+        [TestInitialize]
+        public void Setup()
+        {
+            _testDirectory = Path.Combine(Path.GetTempPath(), "PerformanceLogSinkTests");
+            if (!Directory.Exists(_testDirectory))
+            {
+                Directory.CreateDirectory(_testDirectory);
+            }
+        }
+
+        private static PerformanceLogRecord CreateRecord(int index)
+        {
+            return new PerformanceLogRecord(new DateTime(2025, 9, 10, 8, 0, 0).AddMilliseconds(index).Ticks,
+                "COMPLETE", "Search_Operation", index, $"var_{index}", 42.5, 3);
+        }
+
+        [TestMethod]
+        [ExpectedException(typeof(ArgumentException))]
+        public void Ring_CapacityNotPowerOfTwo_ShouldThrowArgumentException()
+        {
+            // Act
+            new PerformanceLogRing(1000);
+        }
+
+        [TestMethod]
+        public void Ring_EnqueueDequeue_ShouldPreserveOrder()
+        {
+            // Arrange
+            var ring = new PerformanceLogRing(8);
+
+            // Act
+            for (int i = 0; i < 5; i++)
+            {
+                Assert.IsTrue(ring.TryEnqueue(CreateRecord(i)));
+            }
+
+            // Assert
+            Assert.AreEqual(5, ring.Count);
+            for (int i = 0; i < 5; i++)
+            {
+                PerformanceLogRecord record;
+                Assert.IsTrue(ring.TryDequeue(out record));
+                Assert.AreEqual(i, record.ElapsedMs);
+            }
+            PerformanceLogRecord empty;
+            Assert.IsFalse(ring.TryDequeue(out empty));
+        }
+
+        [TestMethod]
+        public void Ring_Full_ShouldRejectInsteadOfBlocking()
+        {
+            // Arrange
+            var ring = new PerformanceLogRing(4);
+            for (int i = 0; i < 4; i++)
+            {
+                ring.TryEnqueue(CreateRecord(i));
+            }
+
+            // Act
+            bool accepted = ring.TryEnqueue(CreateRecord(4));
+
+            // Assert
+            Assert.IsFalse(accepted);
+            Assert.AreEqual(4, ring.Count);
+        }
+
+        [TestMethod]
+        public void Writer_ConcurrentProducers_ShouldWriteEveryAcceptedRecord()
+        {
+            // Arrange
+            string path = Path.Combine(_testDirectory, "concurrent.csv");
+            long accepted = 0;
+
+            // Act
+            using (var writer = new PerformanceLogWriter(path, PerformanceLogFormat.Csv, 64))
+            {
+                Parallel.For(0, 4, producer =>
+                {
+                    for (int i = 0; i < 1000; i++)
+                    {
+                        if (writer.Enqueue(CreateRecord(i)))
+                        {
+                            System.Threading.Interlocked.Increment(ref accepted);
+                        }
+                    }
+                });
+
+                Assert.IsTrue(writer.Flush(5000));
+                Assert.AreEqual(accepted, writer.WrittenCount);
+                Assert.AreEqual(4000 - accepted, writer.DroppedCount);
+            }
+
+            // Assert
+            string[] lines = File.ReadAllLines(path);
+            Assert.AreEqual(PerformanceLogWriter.CsvHeader, lines[0]);
+            Assert.AreEqual(accepted + 1, lines.Length);
+        }
+
+        [TestMethod]
+        public void Writer_Csv_ShouldKeepPerformanceLoggerLineFormat()
+        {
+            // Arrange
+            string path = Path.Combine(_testDirectory, "format.csv");
+
+            // Act
+            using (var writer = new PerformanceLogWriter(path, PerformanceLogFormat.Csv))
+            {
+                writer.Enqueue(CreateRecord(7));
+            }
+
+            // Assert
+            string[] lines = File.ReadAllLines(path);
+            Assert.AreEqual("2025-09-10 08:00:00.007,COMPLETE,Search_Operation,7,\"var_7\",42.5,3", lines[1]);
+        }
+
+        [TestMethod]
+        public void Writer_Binary_ShouldWriteHeaderAndFixedSizeRecords()
+        {
+            // Arrange
+            string path = Path.Combine(_testDirectory, "format.cplb");
+
+            // Act
+            using (var writer = new PerformanceLogWriter(path, PerformanceLogFormat.Binary))
+            {
+                writer.Enqueue(CreateRecord(1));
+            }
+
+            // Assert
+            using (var reader = new BinaryReader(File.OpenRead(path)))
+            {
+                CollectionAssert.AreEqual(PerformanceLogWriter.BinaryMagic, reader.ReadBytes(4));
+                Assert.AreEqual(PerformanceLogWriter.BinaryVersion, reader.ReadUInt16());
+                Assert.AreEqual(PerformanceLogWriter.BinaryRecordSize, reader.ReadUInt16());
+
+                // COMPLETE, Search_Operation and var_1 are defined in the block that first uses them
+                uint stringCount = reader.ReadUInt32();
+                Assert.AreEqual(3u, stringCount);
+                for (int i = 0; i < stringCount; i++)
+                {
+                    Assert.AreEqual(i, reader.ReadInt32());
+                    reader.ReadBytes(reader.ReadUInt16());
+                }
+
+                Assert.AreEqual(1u, reader.ReadUInt32());
+                Assert.AreEqual(CreateRecord(1).TimestampTicks, reader.ReadInt64());
+                Assert.AreEqual(1L, reader.ReadInt64());
+            }
+        }
+
+        [TestMethod]
+        public void Writer_Binary_LongString_ShouldTruncateOnCharacterBoundary()
+        {
+            // Arrange - 1 + 3 * 30000 UTF-8 bytes; a cut at 65535 bytes would split a '€'
+            string path = Path.Combine(_testDirectory, "truncate.cplb");
+            string details = "a" + new string('\u20AC', 30000);
+
+            // Act
+            using (var writer = new PerformanceLogWriter(path, PerformanceLogFormat.Binary))
+            {
+                writer.Enqueue(new PerformanceLogRecord(CreateRecord(1).TimestampTicks, "COMPLETE", "Search_Operation", 1, details, 42.5, 3));
+            }
+
+            // Assert
+            using (var reader = new BinaryReader(File.OpenRead(path)))
+            {
+                reader.ReadBytes(8);
+                Assert.AreEqual(3u, reader.ReadUInt32());
+                byte[] stored = null;
+                for (int i = 0; i < 3; i++)
+                {
+                    reader.ReadInt32();
+                    stored = reader.ReadBytes(reader.ReadUInt16());
+                }
+
+                Assert.AreEqual(1 + 3 * 21844, stored.Length);
+                Assert.AreEqual(details.Substring(0, 1 + 21844), new UTF8Encoding(false, true).GetString(stored));
+            }
+        }
+
+        [TestMethod]
+        public void Writer_Binary_FailedBlock_ShouldKeepLaterBlocksReadable()
+        {
+            // Arrange
+            var stream = new FailingStream();
+            byte[] written;
+
+            // Act - the block of record 2 fails halfway; records 1 and 3 each define a new Details string
+            using (var writer = new PerformanceLogWriter(stream, PerformanceLogFormat.Binary))
+            {
+                writer.Enqueue(CreateRecord(1));
+                Assert.IsTrue(writer.Flush());
+                stream.FailNextWrite = true;
+                writer.Enqueue(CreateRecord(2));
+                Assert.IsTrue(writer.Flush());
+                writer.Enqueue(CreateRecord(3));
+                Assert.IsTrue(writer.Flush());
+
+                Assert.AreEqual(2L, writer.WrittenCount);
+                Assert.AreEqual(1L, writer.DroppedCount);
+            }
+            written = stream.ToArray();
+
+            // Assert - read back like perf_binary_log.py: string ids without gaps, every record id defined
+            var strings = new System.Collections.Generic.List<string>();
+            var elapsed = new System.Collections.Generic.List<long>();
+            using (var reader = new BinaryReader(new MemoryStream(written)))
+            {
+                CollectionAssert.AreEqual(PerformanceLogWriter.BinaryMagic, reader.ReadBytes(4));
+                reader.ReadBytes(4);
+                while (reader.BaseStream.Position < reader.BaseStream.Length)
+                {
+                    uint stringCount = reader.ReadUInt32();
+                    for (int i = 0; i < stringCount; i++)
+                    {
+                        Assert.AreEqual(strings.Count, reader.ReadInt32());
+                        strings.Add(Encoding.UTF8.GetString(reader.ReadBytes(reader.ReadUInt16())));
+                    }
+
+                    uint recordCount = reader.ReadUInt32();
+                    for (int i = 0; i < recordCount; i++)
+                    {
+                        reader.ReadInt64();
+                        elapsed.Add(reader.ReadInt64());
+                        for (int field = 0; field < 3; field++)
+                            Assert.IsTrue(reader.ReadInt32() < strings.Count);
+                        reader.ReadBytes(8);
+                    }
+                }
+            }
+
+            CollectionAssert.AreEqual(new[] { 1L, 3L }, elapsed);
+            CollectionAssert.AreEqual(new[] { "COMPLETE", "Search_Operation", "var_1", "var_3" }, strings);
+        }
+
+        [TestCleanup]
+        public void Cleanup()
+        {
+            try
+            {
+                if (Directory.Exists(_testDirectory))
+                {
+                    Directory.Delete(_testDirectory, true);
+                }
+            }
+            catch
+            {
+                // Ignore cleanup errors
+            }
+        }
+    }
+}
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+A2L index tests (pytest): block name lookup after /begin, sharded scan and decode against the serial ones
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Headless'))
+
+import a2l_index  # noqa: E402
+from a2l_index import MEASUREMENT, A2LIndex, scan_blocks, scan_sharded  # noqa: E402
+
+
+def a2l_module(body):
+    return b'/begin PROJECT Demo ""\n/begin MODULE Engine ""\n' + body + b'\n/end MODULE\n/end PROJECT\n'
+
+
+def test_name_after_comments_and_whitespace():
+    buffer = a2l_module(b'/begin MEASUREMENT /* c */ // line\n  \t AccP_rAccP "" UBYTE CM 0 0 0 1\n/end MEASUREMENT')
+
+    project, modules, symbols, _ = scan_blocks(buffer)
+
+    assert (project, modules) == ('Demo', ['Engine'])
+    assert symbols['names'] == ['AccP_rAccP']
+    assert symbols['kinds'] == [MEASUREMENT]
+
+
+def test_missing_name_after_long_whitespace_is_linear():
+    # No name follows the keyword: the lookup used to backtrack exponentially over the whitespace run
+    buffer = a2l_module(b'/begin MEASUREMENT' + b' \t\r\n' * 50_000 + b'"no name"\n/end MEASUREMENT\n'
+                        b'/begin MEASUREMENT Next_Label "" UBYTE CM 0 0 0 1 /end MEASUREMENT')
+
+    started = time.perf_counter()
+    _, _, symbols, _ = scan_blocks(buffer)
+
+    assert time.perf_counter() - started < 2.0
+    assert symbols['names'] == ['Next_Label']
+
+
+def a2l_modules(modules=3, blocks=40, line_comment=False):
+    """Modules defining the same names, with a commented-out /begin and nested IF_DATA in every block"""
+    lines = ['ASAP2_VERSION 1 61', '/begin PROJECT Demo ""']
+    for m in range(modules):
+        lines += [f'  /begin MODULE Mod{m} ""',
+                  f'    /begin COMPU_METHOD CM_Temp "" RAT_FUNC "%6.2" "unit{m}"\n    /end COMPU_METHOD',
+                  '    /begin RECORD_LAYOUT RL_UWORD FNC_VALUES 1 UWORD COLUMN_DIR DIRECT /end RECORD_LAYOUT']
+        for i in range(blocks):
+            lines += [f'    /begin MEASUREMENT Meas_{i} "/begin in a string" UWORD CM_Temp 0 0 {-m} {i}',
+                      f'      ECU_ADDRESS 0x{0x1000 * (m + 1) + i:X} /* /begin MEASUREMENT Fake "" */',
+                      f'      /begin IF_DATA XCP /begin DAQ 0x{i:X} /end DAQ /end IF_DATA',
+                      '    /end MEASUREMENT',
+                      f'    /begin CHARACTERISTIC Cal_{i} "" VALUE 0x{0x8000 + i:X} RL_UWORD 0 CM_Temp 0 {m + 1}',
+                      '    /end CHARACTERISTIC']
+            if line_comment and i == blocks // 2:
+                lines += ['/*', '    /begin MEASUREMENT Commented_Out "" UBYTE CM_Temp 0 0 0 1', '*/']
+        lines.append('  /end MODULE')
+    lines.append('/end PROJECT')
+    return '\n'.join(lines).encode('latin-1')
+
+
+def build_both(tmp_path, monkeypatch, content):
+    path = tmp_path / 'variant.a2l'
+    path.write_bytes(content)
+    monkeypatch.setattr(a2l_index, 'MIN_SHARD_BYTES', 1)
+    monkeypatch.setattr(a2l_index, 'MIN_SHARD_BLOCKS', 1)
+    return path, A2LIndex.build(path, 1), A2LIndex.build(path, 4)
+
+
+def assert_same_index(serial, sharded):
+    assert (sharded.project, sharded.module_names) == (serial.project, serial.module_names)
+    for field in ('names', 'kinds', 'modules', 'starts', 'ends'):
+        assert getattr(sharded, field).tolist() == getattr(serial, field).tolist(), field
+
+
+def test_sharded_build_matches_serial(tmp_path, monkeypatch):
+    path, serial, sharded = build_both(tmp_path, monkeypatch, a2l_modules())
+
+    with serial, sharded:
+        assert scan_sharded(path, serial._buffer, 4) is not None  # Really merged from shards, no serial fallback
+        assert_same_index(serial, sharded)
+        assert serial.module_names == ['Mod0', 'Mod1', 'Mod2']
+        assert 'Fake' not in serial.names.tolist()
+        assert serial.names.tolist().count('Meas_0') == 3
+
+
+def test_sharded_build_with_begin_in_comment_at_line_start_matches_serial(tmp_path, monkeypatch):
+    _, serial, sharded = build_both(tmp_path, monkeypatch, a2l_modules(line_comment=True))
+
+    with serial, sharded:
+        assert_same_index(serial, sharded)
+        assert 'Commented_Out' not in serial.names.tolist()
+
+
+def test_parallel_decode_columns_matches_serial(tmp_path, monkeypatch):
+    _, serial, _ = build_both(tmp_path, monkeypatch, a2l_modules())
+
+    def comparable(columns):
+        return {field: [None if isinstance(value, float) and math.isnan(value) else value for value in values]
+                for field, values in columns.items()}
+
+    with serial:
+        decoded = serial.decode_columns(1)
+        assert comparable(serial.decode_columns(4)) == comparable(decoded)
+        assert decoded['unit'][decoded['name'].index('Meas_0')] == 'unit0'
+        assert decoded['upper_limit'][len(decoded['name']) - 1] == 3.0
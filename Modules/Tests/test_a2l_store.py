@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+A2L symbol store tests (pytest): cold and warm lookups, --rebuild and stale sidecars
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Headless'))
+
+import a2l_store  # noqa: E402
+from a2l_store import A2LSymbolTable, load_a2l, stored_tables  # noqa: E402
+from workbook_store import cached_content_hash, store_dir  # noqa: E402
+
+VARIABLES = ['Meas_0', 'MEAS_1', 'Cal_0', 'Missing_Var']
+
+
+def write_a2l(path, upper_limit=1):
+    path.write_text('/begin PROJECT Demo ""\n/begin MODULE Engine ""\n'
+                    '/begin COMPU_METHOD CM "" RAT_FUNC "%6.2" "degC" /end COMPU_METHOD\n'
+                    '/begin MEASUREMENT Meas_0 "first" UBYTE CM 0 0 0 1 ECU_ADDRESS 0x1000 /end MEASUREMENT\n'
+                    f'/begin MEASUREMENT Meas_1 "" UWORD CM 0 0 -40 {upper_limit} /end MEASUREMENT\n'
+                    '/begin CHARACTERISTIC Cal_0 "" VALUE 0x8000 RL 0 CM 0 100 /end CHARACTERISTIC\n'
+                    '/end MODULE\n/end PROJECT\n')
+    return str(path)
+
+
+def comparable(results):
+    return {variable: [{field: None if isinstance(value, float) and math.isnan(value) else value
+                        for field, value in symbol.items()} for symbol in symbols]
+            for variable, symbols in results.items()}
+
+
+def test_warm_load_maps_the_sidecar_and_answers_like_the_cold_build(tmp_path):
+    path = write_a2l(tmp_path / 'engine.a2l')
+
+    cold = load_a2l(path, workers=1)
+    sidecars = list(stored_tables(path))
+    warm = load_a2l(path, workers=1)
+
+    assert isinstance(warm, A2LSymbolTable) and warm.project == 'Demo'
+    assert sidecars == [a2l_store.symbol_table_path(path, cached_content_hash(path))]
+    assert comparable(warm.lookup_many(VARIABLES)) == comparable(cold.lookup_many(VARIABLES))
+    assert comparable(warm.lookup_many(VARIABLES)) == comparable(load_a2l(path, use_store=False).lookup_many(VARIABLES))
+    assert warm.lookup('meas_0')[0]['address'] == 0x1000
+    assert warm.lookup('Missing_Var') == []
+
+
+def test_changed_content_replaces_the_stale_sidecar(tmp_path):
+    path = write_a2l(tmp_path / 'engine.a2l')
+    load_a2l(path, workers=1)
+    stale = list(stored_tables(path))
+
+    write_a2l(tmp_path / 'engine.a2l', upper_limit=255)
+    symbols = load_a2l(path, workers=1)
+
+    assert symbols.lookup('Meas_1')[0]['upper_limit'] == 255.0
+    assert not any(sidecar.exists() for sidecar in stale)
+    assert list(stored_tables(path)) == [a2l_store.symbol_table_path(path, cached_content_hash(path))]
+
+
+def test_rebuild_drops_only_this_a2l_symbol_tables(tmp_path, monkeypatch, capsys):
+    # 'v[1].a2l' as an unescaped glob would also match the sidecars of 'v1.a2l'
+    path = write_a2l(tmp_path / 'v[1].a2l')
+    neighbour = write_a2l(tmp_path / 'v1.a2l')
+    load_a2l(path, workers=1)
+    load_a2l(neighbour, workers=1)
+    neighbour_tables = list(stored_tables(neighbour))
+    next(stored_tables(path)).write_bytes(b'stale')  # Only read back, never rewritten, without --rebuild
+    line_index = store_dir(path) / 'v[1].a2l.lines.v1.idx'  # Written by the C# A2LLineIndex
+    line_index.write_bytes(b'lines')
+
+    monkeypatch.setattr(sys, 'argv', ['a2l_store.py', path, '--rebuild', '--find', 'Meas_0', '--serial'])
+    a2l_store.main()
+
+    assert '✅ MEASUREMENT Meas_0' in capsys.readouterr().out
+    assert next(stored_tables(path)).read_bytes() != b'stale'
+    assert line_index.exists()
+    assert all(table.exists() for table in neighbour_tables)
+    assert list(stored_tables(path)) == [a2l_store.symbol_table_path(path, cached_content_hash(path))]
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+A2L variant diff tests (pytest): variable order and duplicates of --all
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Headless'))
+
+from a2l_store import load_a2l  # noqa: E402
+from a2l_variants import all_variables, unique_names  # noqa: E402
+
+
+def write_a2l(path, names):
+    blocks = ''.join(f'/begin MEASUREMENT {name} "" UBYTE CM 0 0 0 1 /end MEASUREMENT\n' for name in names)
+    path.write_text(f'/begin PROJECT Demo ""\n/begin MODULE Engine ""\n{blocks}/end MODULE\n/end PROJECT\n')
+    return str(path)
+
+
+def test_all_variables_keeps_file_order_with_store(tmp_path):
+    first = [f"Zeta_{i}" for i in range(20)] + ['Alpha', 'Mid_Label']
+    second = ['alpha', 'New_Label', 'ZETA_3']
+    sources = [load_a2l(write_a2l(tmp_path / 'v1.a2l', first), use_store=True),
+               load_a2l(write_a2l(tmp_path / 'v2.a2l', second), use_store=True)]
+
+    assert all_variables(sources) == first + ['New_Label']
+
+
+def test_unique_names_is_case_insensitive_and_keeps_first_spelling():
+    assert unique_names(['AccP_rAccP', 'Other', 'ACCP_RACCP ', 'other', 'Last']) == ['AccP_rAccP', 'Other', 'Last']
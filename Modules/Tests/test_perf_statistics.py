@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Significance-tested latency comparison tests (pytest): the percentile that decides the verdict
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Performance'))
+
+from compare_performance import verdict_summary  # noqa: E402
+from perf_statistics import IMPROVEMENT, NO_CHANGE, compare_latency, deciding_change  # noqa: E402
+
+
+def latencies(tail_ms, seed):
+    rng = np.random.default_rng(seed)
+    return np.concatenate([100 + rng.normal(0, 1, 900), np.full(100, tail_ms)])
+
+
+def test_tail_only_improvement_is_decided_by_p95():
+    result = compare_latency(latencies(1000.0, 1), latencies(300.0, 2))
+
+    assert result['verdict'] == IMPROVEMENT
+    assert deciding_change(result) == ('p95', 70.0)
+    assert verdict_summary(result) == "✅ IMPROVEMENT: 70.0% faster (p95, significant)"
+
+
+def test_no_change_reports_p50():
+    result = compare_latency(latencies(1000.0, 1), latencies(1000.0, 2))
+
+    assert result['verdict'] == NO_CHANGE
+    assert result['deciding'] == 'p50'
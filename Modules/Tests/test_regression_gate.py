@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Regression gate baseline tests (pytest): change points of signed metrics such as TabSlopeMs
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Performance'))
+
+from regression_gate import PASS, baseline_window, change_point  # noqa: E402
+
+
+def history_with_tab_slope(tab_slopes):
+    builds = len(tab_slopes)
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'Build': [f"b{i}" for i in range(builds)],
+        'Status': PASS,
+        'Search_Operation_P50': 100 + rng.normal(0, 1, builds),
+        'Search_Operation_P95': 180 + rng.normal(0, 2, builds),
+        'TabSlopeMs': tab_slopes,
+    })
+
+
+def test_signed_metric_changing_sign_is_not_a_change_point():
+    # TabSlopeMs drifting from +0.25 to -0.15 ms/tab - well inside the 1 ms noise band, but a log
+    # transform clips the negatives to 1e-9 and sees a huge level shift
+    slopes = [0.3, 0.2, 0.25, 0.3, 0.2, 0.3, -0.1, -0.2, -0.15, -0.1, -0.2, -0.1]
+
+    baseline, shifted_metric = baseline_window(history_with_tab_slope(slopes), window=20)
+
+    assert shifted_metric is None
+    assert len(baseline) == len(slopes)
+
+
+def test_signed_metric_level_shift_is_still_found():
+    slopes = [0.2, -0.1, 0.1, -0.2, 0.0, 0.1, 6.0, 6.3, 5.8, 6.1, 6.2, 5.9]
+
+    index, _ = change_point(slopes, signed=True, noise_floor=0.5)
+    baseline, shifted_metric = baseline_window(history_with_tab_slope(slopes), window=20)
+
+    assert index == 6
+    assert shifted_metric == 'TabSlopeMs'
+    assert baseline['Build'].tolist() == [f"b{i}" for i in range(6, 12)]
+
+
+def test_positive_metric_still_uses_relative_shift():
+    index, _ = change_point([100, 101, 99, 100, 150, 151, 149, 150])
+    assert index == 4
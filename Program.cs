@@ -25,6 +25,9 @@ namespace Check_carasi_DF_ContextClearing
         [STAThread]
         static void Main(string[] args)
         {
+            // A2L INDEX LOGGING: index builds go to the performance log (the Library class has no WinForms dependency)
+            A2LLineIndex.LogDuration = (operation, elapsedMs, details) => PerformanceLogger.LogDuration(operation, elapsedMs, details);
+
             // Check if running in CLI mode
             if (args.Length > 0)
             {